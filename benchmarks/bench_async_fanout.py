@@ -0,0 +1,59 @@
+"""
+Compares report fan-out throughput of AsyncAPIClient with the sync APIClient,
+both talking to the local stub server.
+
+Usage:
+    python -m benchmarks.bench_async_fanout [--reports 200] [--concurrency 20] [--latency 0.02]
+
+The stub server sleeps --latency seconds per request to stand in for network
+and server time, which is what concurrency overlaps.
+"""
+import argparse
+import asyncio
+import time
+
+from geekbot_cli.api_client import APIClient
+from geekbot_cli.async_api_client import AsyncAPIClient
+from geekbot_cli.stub_server import StubGeekbotServer
+
+ANSWERS = {101: {'text': 'Benchmark answer'}}
+
+
+def run_sync(url: str, reports: int) -> float:
+    with APIClient(base_url=url) as client:
+        client.set_headers('bench')
+        start = time.perf_counter()
+        for _ in range(reports):
+            client.post_report(1, ANSWERS)
+        return time.perf_counter() - start
+
+
+async def run_async(url: str, reports: int, concurrency: int) -> float:
+    async with AsyncAPIClient(base_url=url, max_concurrency=concurrency) as client:
+        client.set_headers('bench')
+        start = time.perf_counter()
+        await asyncio.gather(*(client.post_report(1, ANSWERS) for _ in range(reports)))
+        return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--reports', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.02)
+    args = parser.parse_args()
+
+    with StubGeekbotServer(standups=1, latency=args.latency) as server:
+        sync_seconds = run_sync(server.url, args.reports)
+        connections_before = server.connections
+        async_seconds = asyncio.run(run_async(server.url, args.reports, args.concurrency))
+        async_connections = server.connections - connections_before
+
+    print(f"APIClient (sequential)      {args.reports / sync_seconds:9.1f} reports/s")
+    print(f"AsyncAPIClient (x{args.concurrency:<3})      {args.reports / async_seconds:9.1f} reports/s"
+          f"  {async_connections} connections")
+    print(f"speedup                     {sync_seconds / async_seconds:9.2f}x")
+
+
+if __name__ == '__main__':
+    main()
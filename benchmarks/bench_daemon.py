@@ -0,0 +1,91 @@
+"""
+Compares the wall time of `geekbot` runs with and without `geekbot daemon`,
+against a stub server.
+
+Each run lists the standups and exits without picking one. Runs without the
+daemon start from a fresh standup cache, as in the first run of a session.
+
+Usage:
+    python -m benchmarks.bench_daemon [--runs 10] [--standups 50] [--latency 0.05]
+"""
+import argparse
+import multiprocessing
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from geekbot_cli.stub_server import StubGeekbotServer
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def serve(connection, standups: int, latency: float) -> None:
+    """
+    Runs the stub server in a child process, adding latency to every response
+    to stand in for the round trips to the real service.
+    """
+    with StubGeekbotServer(standups=standups, latency=latency) as server:
+        connection.send(server.url)
+        connection.recv()
+
+
+def run_geekbot(env: dict, *args: str) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-m', 'geekbot_cli.main', *args], cwd=ROOT, env=env,
+                   input=b'0\n', capture_output=True, check=True)
+    return time.perf_counter() - start
+
+
+def interpreter_time() -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', 'pass'], check=True)
+    return time.perf_counter() - start
+
+
+def report(name: str, timings: list, interpreter: float) -> None:
+    median = statistics.median(timings)
+    print(f"{name:16} median {median * 1000:7.1f} ms  best {min(timings) * 1000:7.1f} ms  "
+          f"({(median - interpreter) * 1000:.1f} ms over a bare interpreter)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--standups', type=int, default=50)
+    parser.add_argument('--latency', type=float, default=0.05, help='Seconds added to each stub response')
+    args = parser.parse_args()
+
+    parent, child = multiprocessing.Pipe()
+    server = multiprocessing.Process(target=serve, args=(child, args.standups, args.latency), daemon=True)
+    server.start()
+    url = parent.recv()
+    with tempfile.TemporaryDirectory() as home:
+        env = dict(os.environ, GEEKBOT_API_URL=url, GEEKBOT_API_KEY='bench', XDG_RUNTIME_DIR=home,
+                   XDG_CACHE_HOME=os.path.join(home, 'cache'), XDG_DATA_HOME=os.path.join(home, 'data'))
+        interpreter = statistics.median(interpreter_time() for _ in range(args.runs))
+        cold = []
+        for _ in range(args.runs):
+            cold.append(run_geekbot(env, '--refresh'))
+        report('without daemon', cold, interpreter)
+
+        daemon = subprocess.Popen([sys.executable, '-m', 'geekbot_cli.main', 'daemon'], cwd=ROOT, env=env,
+                                  stderr=subprocess.PIPE)
+        try:
+            daemon.stderr.readline()  # "geekbot daemon listening on ..."
+            run_geekbot(env)  # Loads the standups into the daemon
+            warm = [run_geekbot(env) for _ in range(args.runs)]
+            report('with daemon', warm, interpreter)
+        finally:
+            subprocess.run([sys.executable, '-m', 'geekbot_cli.main', 'daemon', '--stop'], cwd=ROOT, env=env,
+                           capture_output=True)
+            daemon.wait(10)
+    parent.send('stop')
+    server.join()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""
+Compares per-call latency of module-level requests calls against the pooled
+APIClient session, both talking to the local stub server.
+
+Usage:
+    python -m benchmarks.bench_http_session [--calls 200] [--latency 0.0]
+"""
+import argparse
+import time
+
+import requests
+
+from geekbot_cli.api_client import APIClient
+from geekbot_cli.stub_server import StubGeekbotServer
+
+
+def per_call_ms(func, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - start) / calls * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--calls', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=0.0)
+    args = parser.parse_args()
+
+    with StubGeekbotServer(standups=10, latency=args.latency) as server:
+        url = f"{server.url}/v1/standups"
+        headers = {'Content-Type': 'application/json', 'Authorization': 'bench'}
+        unpooled = per_call_ms(lambda: requests.get(url, headers=headers).json(), args.calls)
+        unpooled_connections = server.connections
+
+        with APIClient(base_url=server.url) as client:
+            client.set_headers('bench')
+            pooled = per_call_ms(client.get_standups, args.calls)
+        pooled_connections = server.connections - unpooled_connections
+
+    print(f"requests.get     {unpooled:8.3f} ms/call  {unpooled_connections} connections")
+    print(f"APIClient pooled {pooled:8.3f} ms/call  {pooled_connections} connections")
+    print(f"speedup          {unpooled / pooled:8.2f}x")
+
+
+if __name__ == '__main__':
+    main()
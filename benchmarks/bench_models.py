@@ -0,0 +1,63 @@
+"""
+Compares memory use and parse time of raw standup dictionaries against the
+slotted Standup/Question models.
+
+Usage:
+    python -m benchmarks.bench_models [--standups 5000] [--questions 20]
+"""
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+
+from geekbot_cli.models import Standup
+from geekbot_cli.stub_server import make_standups
+
+
+def measure(build, body: str, repeat: int = 3):
+    """
+    Returns (best seconds, bytes retained) for building objects from a JSON body.
+
+    Time is measured without tracemalloc, which slows allocation down.
+    """
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        build(body)
+        timings.append(time.perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    result = build(body)
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return min(timings), retained
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--standups', type=int, default=5000)
+    parser.add_argument('--questions', type=int, default=20)
+    args = parser.parse_args()
+
+    standups = make_standups(args.standups, args.questions)
+    for standup in standups:
+        for question in standup['questions']:
+            question['answer_type'] = 'multiple_choice'
+            question['answer_choices'] = ['Great', 'Good', 'Okay', 'Bad']
+    body = json.dumps(standups)
+    print(f"{args.standups} standups x {args.questions} questions, {len(body) / 1e6:.1f} MB of JSON")
+
+    # Parse times include json.loads, since both paths start from the response body.
+    dict_time, dict_memory = measure(json.loads, body)
+    model_time, model_memory = measure(lambda data: Standup.from_dicts(json.loads(data)), body)
+    print(f"dicts   {dict_time * 1000:8.1f} ms  {dict_memory / 1e6:8.1f} MB retained")
+    print(f"models  {model_time * 1000:8.1f} ms  {model_memory / 1e6:8.1f} MB retained")
+    print(f"memory  {dict_memory / model_memory:8.2f}x smaller")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""
+Measures keystroke-to-redraw time of the standup picker: narrowing the list to
+the query typed so far and rendering the visible window.
+
+Usage:
+    python -m benchmarks.bench_picker [--standups 10000] [--recent 20]
+"""
+import argparse
+import random
+import statistics
+import time
+
+from geekbot_cli.models import Standup
+from geekbot_cli.picker import StandupIndex, StandupPicker
+
+TEAMS = ['Platform', 'Mobile', 'Payments', 'Growth', 'Data', 'Infra', 'Design', 'Support',
+         'Sales', 'Marketing', 'Security', 'Billing', 'Search', 'Onboarding', 'Android', 'iOS']
+KINDS = ['Daily Standup', 'Weekly Retro', 'Sprint Planning', 'Check-in', 'Sync', 'Demo', 'Mood Survey']
+QUERIES = ['daily standup', 'payments retro', 'sync', 'pltfrm', 'ios check', 'team 42']
+
+
+def make_names(count: int):
+    rng = random.Random(0)
+    return [f"{rng.choice(TEAMS)} {rng.choice(KINDS)} Team {number}" for number in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--standups', type=int, default=10000)
+    parser.add_argument('--recent', type=int, default=20)
+    args = parser.parse_args()
+
+    standups = [Standup(number, name, ()) for number, name in enumerate(make_names(args.standups))]
+    start = time.perf_counter()
+    index = StandupIndex(standups, recent_ids=range(0, args.standups, max(args.standups // args.recent, 1)))
+    picker = StandupPicker(index)
+    picker.fragments()
+    print(f"{args.standups} standups indexed in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    latencies = []
+    for query in QUERIES:
+        # Type the query, then erase it, one keystroke at a time.
+        for text in [query[:length] for length in range(1, len(query) + 1)] + \
+                    [query[:length] for length in range(len(query) - 1, -1, -1)]:
+            start = time.perf_counter()
+            picker.set_query(text)
+            picker.fragments()
+            latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99)]
+    print(f"{len(latencies)} keystrokes: median {statistics.median(latencies) * 1000:.2f} ms  "
+          f"p99 {p99 * 1000:.2f} ms  max {latencies[-1] * 1000:.2f} ms  (budget 16 ms)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Measures full-text search latency over a synthetic local report store.
+
+Usage:
+    python -m benchmarks.bench_search [--reports 100000] [--questions 3] [--queries 50]
+"""
+import argparse
+import itertools
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from geekbot_cli.store import ReportStore
+from geekbot_cli.stub_server import make_report, make_standups
+
+WORDS = (
+    'deploy review migration billing parser release hotfix incident oncall refactor '
+    'database cache latency dashboard customer sprint planning retro docs tests '
+    'pipeline kubernetes terraform invoice onboarding design meeting pairing bug'
+).split()
+
+
+# Filler vocabulary with a Zipf-like distribution, as in real prose.
+FILLER = [f"w{index}" for index in range(5000)]
+FILLER_WEIGHTS = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(FILLER))))
+
+
+def synthetic_answer(rng: random.Random) -> str:
+    words = rng.choices(FILLER, cum_weights=FILLER_WEIGHTS, k=12)
+    if rng.random() < 0.3:
+        words[rng.randrange(len(words))] = rng.choice(WORDS)
+    return ' '.join(words)
+
+
+def synthetic_reports(count: int, questions: int, seed: int = 1):
+    rng = random.Random(seed)
+    standups = make_standups(20, questions)
+    for report_id in range(1, count + 1):
+        standup = standups[report_id % len(standups)]
+        answers = {
+            str(question['id']): {'text': synthetic_answer(rng)}
+            for question in standup['questions']
+        }
+        report = make_report(report_id, standup, 1_600_000_000 + report_id * 60, answers)
+        report['member'] = {'id': f"U{report_id % 50}", 'username': f"user{report_id % 50}"}
+        yield report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--reports', type=int, default=100_000)
+    parser.add_argument('--questions', type=int, default=3)
+    parser.add_argument('--queries', type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir, ReportStore(Path(tmp_dir) / 'reports.sqlite3') as store:
+        start = time.perf_counter()
+        batch = []
+        for report in synthetic_reports(args.reports, args.questions):
+            batch.append(report)
+            if len(batch) == 1000:
+                store.upsert(batch)
+                batch = []
+        store.upsert(batch)
+        load = time.perf_counter() - start
+        answers = args.reports * args.questions
+        print(f"indexed {answers} answers in {load:.1f}s ({answers / load:,.0f} answers/s)")
+
+        rng = random.Random(2)
+        cases = {
+            'term': lambda: store.search(rng.choice(WORDS)),
+            'common term': lambda: store.search('w0'),
+            'phrase': lambda: store.search(f'"{rng.choice(WORDS)} {rng.choice(WORDS)}"'),
+            'term + user + range': lambda: store.search(
+                rng.choice(WORDS), user=f"user{rng.randrange(50)}",
+                since=1_600_000_000, until=1_600_000_000 + args.reports * 30
+            ),
+        }
+        for name, query in cases.items():
+            timings = []
+            for _ in range(args.queries):
+                query_start = time.perf_counter()
+                query()
+                timings.append((time.perf_counter() - query_start) * 1000)
+            print(f"{name:20} median {statistics.median(timings):7.2f} ms  max {max(timings):7.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
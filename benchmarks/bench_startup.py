@@ -0,0 +1,79 @@
+"""
+Measures cold-start cost of the `geekbot` entry point with `python -X importtime`
+and fails when it exceeds the time budget.
+
+Usage:
+    python -m benchmarks.bench_startup [--runs 5] [--budget-ms 100]
+
+The reported import time is the best cumulative time of `geekbot_cli.main`
+over all runs, which filters out scheduler noise. The command also fails if
+`import geekbot_cli.main` pulls in any of the heavy UI/network dependencies.
+"""
+import argparse
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ('rich', 'prompt_toolkit', 'requests', 'keyring')
+
+
+def import_time_us(module: str) -> int:
+    """
+    Returns the cumulative import time of a module in microseconds, in a fresh interpreter.
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    for line in result.stderr.splitlines():
+        fields = [field.strip() for field in line.split('|')]
+        if len(fields) == 3 and fields[2] == module:
+            return int(fields[1])
+    raise RuntimeError(f"No importtime entry found for {module}")
+
+
+def loaded_heavy_modules(module: str) -> list:
+    """
+    Returns the heavy dependencies loaded as a side effect of importing a module.
+    """
+    code = (
+        f'import sys, {module}; '
+        f'print(" ".join(m for m in {HEAVY_MODULES!r} if m in sys.modules))'
+    )
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return result.stdout.split()
+
+
+def wall_time_ms(args: list) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable] + args, cwd=ROOT, capture_output=True, check=True)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget-ms', type=float, default=100.0)
+    args = parser.parse_args()
+
+    import_ms = min(import_time_us('geekbot_cli.main') for _ in range(args.runs)) / 1000
+    interpreter_ms = min(wall_time_ms(['-c', 'pass']) for _ in range(args.runs))
+    version_ms = min(wall_time_ms(['-m', 'geekbot_cli.main', '--version']) for _ in range(args.runs))
+    heavy = loaded_heavy_modules('geekbot_cli.main')
+
+    print(f"import geekbot_cli.main   {import_ms:8.1f} ms (budget {args.budget_ms:.0f} ms)")
+    print(f"geekbot --version         {version_ms:8.1f} ms wall ({version_ms - interpreter_ms:.1f} ms over bare interpreter)")
+    failed = False
+    if heavy:
+        print(f"FAIL: importing geekbot_cli.main loads {', '.join(heavy)}")
+        failed = True
+    if import_ms > args.budget_ms:
+        print(f"FAIL: import time {import_ms:.1f} ms exceeds the {args.budget_ms:.0f} ms budget")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Compares get_standups, which parses the whole body at once, with
+stream_standups, which parses one standup at a time, on a large response.
+
+Usage:
+    python -m benchmarks.bench_streaming [--standups 5000] [--questions 20]
+"""
+import argparse
+import multiprocessing
+import time
+import tracemalloc
+
+from geekbot_cli.api_client import APIClient
+from geekbot_cli.stub_server import StubGeekbotServer
+
+
+def serve(connection, standups: int, questions: int) -> None:
+    """
+    Runs the stub server in a child process, so its own allocations and CPU
+    time do not pollute the measurements.
+    """
+    with StubGeekbotServer(standups=standups, questions=questions) as server:
+        connection.send(server.url)
+        connection.recv()
+
+
+def run(name: str, fetch) -> None:
+    start = time.perf_counter()
+    first = None
+    count = 0
+    for _ in fetch():
+        count += 1
+        if first is None:
+            first = time.perf_counter() - start
+    total = time.perf_counter() - start
+
+    tracemalloc.start()
+    for _ in fetch():
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:16} first standup {first * 1000:8.1f} ms  all {count} in {total * 1000:8.1f} ms  "
+          f"peak {peak / 1e6:6.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--standups', type=int, default=5000)
+    parser.add_argument('--questions', type=int, default=20)
+    args = parser.parse_args()
+
+    parent, child = multiprocessing.Pipe()
+    server = multiprocessing.Process(target=serve, args=(child, args.standups, args.questions), daemon=True)
+    server.start()
+    url = parent.recv()
+    try:
+        with APIClient(base_url=url) as client:
+            client.set_headers('bench')
+            client.get_standups()  # Warm the connection
+            # Standups are discarded as they are consumed, so the peak shows
+            # what parsing itself holds on to.
+            run('get_standups', client.get_standups)
+            run('stream_standups', lambda: client.stream_standups()[0])
+    finally:
+        parent.send('stop')
+        server.join()
+
+
+if __name__ == '__main__':
+    main()
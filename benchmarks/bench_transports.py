@@ -0,0 +1,80 @@
+"""
+Compares the APIClient transports talking to the local stub server: the
+latency of sequential calls, and report fan-out throughput with the number of
+connections it took.
+
+Usage:
+    python -m benchmarks.bench_transports [--calls 200] [--reports 400] [--workers 20] [--latency 0.02]
+
+The stub server runs in a child process and sleeps --latency seconds per
+request to stand in for network and server time, which the workers overlap.
+It speaks HTTP/1.1 and, for the http2 transport, HTTP/2 with prior knowledge.
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from geekbot_cli.api_client import APIClient
+from geekbot_cli.stub_server import StubProcess
+from geekbot_cli.transport import TRANSPORTS, make_transport
+
+ANSWERS = {101: {'text': 'Benchmark answer'}}
+
+
+def available_transports() -> list:
+    names = []
+    for name in TRANSPORTS:
+        try:
+            make_transport(name).close()
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def per_call_ms(client: APIClient, calls: int) -> float:
+    client.get_standups()  # Warm the connection
+    start = time.perf_counter()
+    for _ in range(calls):
+        client.get_standups()
+    return (time.perf_counter() - start) / calls * 1000
+
+
+def fan_out(client: APIClient, reports: int, workers: int) -> float:
+    """
+    Posts reports from a pool of threads and returns the reports per second.
+    """
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(lambda _: client.post_report(1, ANSWERS), range(reports)))
+    return reports / (time.perf_counter() - start)
+
+
+def run(name: str, args) -> dict:
+    with StubProcess(standups=10, http2=True) as stub:
+        with APIClient(base_url=stub.url, transport=name) as client:
+            client.set_headers('bench')
+            sequential = per_call_ms(client, args.calls)
+    with StubProcess(standups=10, latency=args.latency, http2=True) as stub:
+        with APIClient(base_url=stub.url, transport=name, pool_maxsize=args.workers) as client:
+            client.set_headers('bench')
+            throughput = fan_out(client, args.reports, args.workers)
+    return {'ms_per_call': sequential, 'reports_per_s': throughput, 'connections': stub.stats['connections']}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--calls', type=int, default=200)
+    parser.add_argument('--reports', type=int, default=400)
+    parser.add_argument('--workers', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.02)
+    args = parser.parse_args()
+
+    print(f"{'transport':10} {'ms/call':>9} {'reports/s':>10} {'connections':>12}")
+    for name in available_transports():
+        result = run(name, args)
+        print(f"{name:10} {result['ms_per_call']:9.3f} {result['reports_per_s']:10.1f} {result['connections']:12d}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Measures how many reports per second the local answer validator checks,
+next to the cost of decoding the same records from JSONL.
+
+Usage:
+    python -m benchmarks.bench_validation [--records 200000] [--standups 50] [--questions 10]
+"""
+import argparse
+import json
+import random
+import time
+
+from geekbot_cli.models import Standup
+from geekbot_cli.stub_server import make_standups
+from geekbot_cli.validation import ReportValidator
+
+ANSWER_TYPES = ('text', 'numeric', 'multiple_choice')
+CHOICES = ['Great', 'Good', 'Okay', 'Bad']
+
+
+def make_schema(standups: int, questions: int) -> list:
+    """
+    Returns standup dictionaries whose questions cycle through the answer types.
+    """
+    items = make_standups(standups, questions)
+    for item in items:
+        for index, question in enumerate(item['questions']):
+            question['answer_type'] = ANSWER_TYPES[index % len(ANSWER_TYPES)]
+            if question['answer_type'] == 'multiple_choice':
+                question['answer_choices'] = CHOICES
+    return items
+
+
+def make_lines(items: list, records: int, invalid: float, rng: random.Random) -> list:
+    """
+    Returns JSONL records answering every question, a fraction of them with
+    one wrong answer.
+    """
+    samples = {'text': 'Shipped the release', 'numeric': '7.5', 'multiple_choice': 'Good'}
+    lines = []
+    for _ in range(records):
+        item = rng.choice(items)
+        answers = {str(question['id']): {'text': samples[question['answer_type']]} for question in item['questions']}
+        if rng.random() < invalid:
+            answers[rng.choice(list(answers))] = {'text': 'not a choice or number' if rng.random() < 0.5 else ''}
+        lines.append(json.dumps({'standup_id': item['id'], 'answers': answers}))
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--records', type=int, default=200000)
+    parser.add_argument('--standups', type=int, default=50)
+    parser.add_argument('--questions', type=int, default=10)
+    parser.add_argument('--invalid', type=float, default=0.1, help='Fraction of records with a wrong answer')
+    args = parser.parse_args()
+
+    items = make_schema(args.standups, args.questions)
+    lines = make_lines(items, args.records, args.invalid, random.Random(0))
+    print(f"{args.records} records, {args.standups} standups x {args.questions} questions")
+
+    start = time.perf_counter()
+    reports = [(record['standup_id'], record['answers']) for record in map(json.loads, lines)]
+    decode = time.perf_counter() - start
+
+    start = time.perf_counter()
+    validator = ReportValidator(Standup.from_dicts(items))
+    invalid = sum(1 for _ in validator.validate_many(reports))
+    validate = time.perf_counter() - start
+
+    print(f"decode    {decode:8.3f} s  {args.records / decode:12,.0f} records/s")
+    print(f"validate  {validate:8.3f} s  {args.records / validate:12,.0f} records/s  "
+          f"({validate / args.records / args.questions * 1e9:.0f} ns per answer)")
+    print(f"invalid   {invalid} ({invalid / args.records:.1%})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,262 @@
+"""
+Runs the benchmark suite against the local stub server and writes the results
+as JSON, optionally comparing them with a stored baseline.
+
+Usage:
+    python -m benchmarks.suite [--output results.json] [--compare baseline.json]
+                               [--threshold 0.1] [--only get_standups]
+                               [--latency 0.0] [--error-rate 0.0] [--rate-limit-rate 0.0]
+
+Each metric records whether lower or higher is better. With --compare, a
+metric that got worse than the baseline by more than --threshold (a fraction)
+is flagged, and the command exits with status 1 if any was.
+"""
+import argparse
+import io
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Optional
+from unittest.mock import Mock, patch
+
+from benchmarks.bench_picker import make_names
+from benchmarks.bench_startup import import_time_us, wall_time_ms
+from benchmarks.bench_transports import available_transports, fan_out
+from benchmarks.bench_validation import make_lines, make_schema
+from geekbot_cli.api_client import APIClient
+from geekbot_cli.exceptions import StandupException
+from geekbot_cli.models import Standup
+from geekbot_cli.picker import StandupIndex, StandupPicker
+from geekbot_cli.resilience import RetryPolicy
+from geekbot_cli.stub_server import StubProcess, make_standups
+from geekbot_cli.validation import ReportValidator
+
+STANDUP_COUNTS = (10, 1000, 10000)
+
+
+def metric(value: float, unit: str, better: str = 'lower') -> dict:
+    return {'value': round(value, 4), 'unit': unit, 'better': better}
+
+
+def median_ms(function, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+@contextmanager
+def stub_process(args, standups: int, stats: Optional[dict] = None, **options):
+    """
+    Runs the stub server in a child process, so its CPU time and the GIL do
+    not pollute the client's measurements. Yields its URL, and copies the
+    server's counts into stats when it stops.
+    """
+    with StubProcess(standups=standups, latency=args.latency, error_rate=args.error_rate,
+                     rate_limit_rate=args.rate_limit_rate, seed=0, **options) as stub:
+        yield stub.url
+    if stats is not None:
+        stats.update(stub.stats)
+
+
+def client_for(url: str, workers: int = 1, transport: Optional[str] = None) -> APIClient:
+    # Injected 429s carry Retry-After: 0, so retries measure the client, not sleeping.
+    client = APIClient(base_url=url, pool_maxsize=workers, retry_policy=RetryPolicy(max_attempts=5),
+                       transport=transport)
+    client.set_headers('bench')
+    return client
+
+
+def bench_cold_start(args) -> dict:
+    runs = max(args.repeat // 2, 3)
+    return {
+        'cold_start.import_main': metric(min(import_time_us('geekbot_cli.main') for _ in range(runs)) / 1000, 'ms'),
+        'cold_start.version': metric(min(wall_time_ms(['-m', 'geekbot_cli.main', '--version'])
+                                         for _ in range(runs)), 'ms'),
+    }
+
+
+def bench_get_standups(args) -> dict:
+    results = {}
+    for count in STANDUP_COUNTS:
+        with stub_process(args, count) as url, client_for(url) as client:
+            client.get_standups()  # Warm the connection
+            results[f"get_standups.{count}"] = metric(median_ms(client.get_standups, args.repeat), 'ms')
+            results[f"get_standups.{count}.received"] = metric(
+                client.transfer.bytes_received / client.transfer.requests / 1000, 'kB'
+            )
+    return results
+
+
+def bench_post_report(args) -> dict:
+    results = {}
+    reports = args.reports
+    with stub_process(args, 10) as url:
+        for workers in (1, 8):
+            failures = 0
+            with client_for(url, workers) as client:
+                def post(index):
+                    client.post_report(1 + index % 10, {101: {'text': 'Done'}}, idempotency_key=f"bench-{workers}-{index}")
+
+                start = time.perf_counter()
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    for future in [executor.submit(post, index) for index in range(reports)]:
+                        try:
+                            future.result()
+                        except StandupException:
+                            failures += 1
+                elapsed = time.perf_counter() - start
+            results[f"post_report.workers_{workers}"] = metric((reports - failures) / elapsed, 'reports/s', 'higher')
+            results[f"post_report.workers_{workers}.failed"] = metric(failures, 'reports')
+    return results
+
+
+def bench_parse(args) -> dict:
+    results = {}
+    for count in STANDUP_COUNTS:
+        body = json.dumps(make_standups(count, 20))
+        results[f"parse.{count}"] = metric(
+            median_ms(lambda: Standup.from_dicts(json.loads(body)), args.repeat), 'ms'
+        )
+    return results
+
+
+def bench_render(args) -> dict:
+    from rich.console import Console
+    from geekbot_cli.cli import CLI
+    results = {}
+    cli = CLI(Mock(), Mock())
+    for count in STANDUP_COUNTS[:2]:
+        standups = Standup.from_dicts(make_standups(count, 1))
+        console = Console(file=io.StringIO(), width=120, force_terminal=True)
+        with patch('geekbot_cli.cli.console', console):
+            results[f"render.{count}"] = metric(median_ms(lambda: cli.render_standups(standups), args.repeat), 'ms')
+    return results
+
+
+def bench_picker(args) -> dict:
+    standups = [Standup(number, name, ()) for number, name in enumerate(make_names(10000))]
+    picker = StandupPicker(StandupIndex(standups))
+    timings = []
+    for query in ('daily standup', 'payments retro', 'pltfrm'):
+        for length in list(range(1, len(query) + 1)) + list(range(len(query) - 1, -1, -1)):
+            start = time.perf_counter()
+            picker.set_query(query[:length])
+            picker.fragments()
+            timings.append(time.perf_counter() - start)
+    timings.sort()
+    return {'picker.keystroke_p99.10000': metric(timings[int(len(timings) * 0.99)] * 1000, 'ms')}
+
+
+def bench_validate(args) -> dict:
+    items = make_schema(50, 10)
+    reports = [(record['standup_id'], record['answers'])
+               for record in map(json.loads, make_lines(items, 20000, 0.1, random.Random(0)))]
+    standups = Standup.from_dicts(items)
+    return {'validate.20000': metric(
+        median_ms(lambda: sum(1 for _ in ReportValidator(standups).validate_many(reports)), args.repeat), 'ms'
+    )}
+
+
+def bench_transports(args) -> dict:
+    results = {}
+    for name in available_transports():
+        with stub_process(args, 10, http2=True) as url, client_for(url, transport=name) as client:
+            client.get_standups()  # Warm the connection
+            results[f"transports.{name}.get_standups"] = metric(median_ms(client.get_standups, args.repeat), 'ms')
+        stats = {}
+        with stub_process(args, 10, stats, http2=True) as url, client_for(url, 8, name) as client:
+            results[f"transports.{name}.fan_out"] = metric(fan_out(client, args.reports, 8), 'reports/s', 'higher')
+        results[f"transports.{name}.connections"] = metric(stats['connections'], 'connections')
+    return results
+
+
+BENCHMARKS = {
+    'cold_start': bench_cold_start,
+    'get_standups': bench_get_standups,
+    'post_report': bench_post_report,
+    'parse': bench_parse,
+    'render': bench_render,
+    'picker': bench_picker,
+    'validate': bench_validate,
+    'transports': bench_transports,
+}
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list:
+    """
+    Returns (name, baseline value, current value, relative change, regressed)
+    for every metric present in both result sets.
+    """
+    rows = []
+    for name, result in current.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        before, after = previous['value'], result['value']
+        if before:
+            change = (after - before) / before
+        else:
+            change = float('inf') if after > before else 0.0
+        worse = change if result['better'] == 'lower' else -change
+        rows.append((name, before, after, change, worse > threshold))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--output', help='Writes the results to this JSON file')
+    parser.add_argument('--compare', metavar='BASELINE', help='Compares with results written by --output')
+    parser.add_argument('--threshold', type=float, default=0.10, help='Tolerated slowdown, as a fraction')
+    parser.add_argument('--only', action='append', choices=sorted(BENCHMARKS), help='Runs only these benchmarks')
+    parser.add_argument('--repeat', type=int, default=7, help='Runs per timing; the median is kept')
+    parser.add_argument('--reports', type=int, default=200, help='Reports posted per post_report run')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds the stub waits before answering')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of stub responses that are 503')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='Fraction of stub responses that are 429')
+    args = parser.parse_args()
+
+    metrics = {}
+    for name in args.only or BENCHMARKS:
+        start = time.perf_counter()
+        metrics.update(BENCHMARKS[name](args))
+        print(f"{name} done in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+    results = {
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': {key: value for key, value in vars(args).items() if key not in ('output', 'compare')},
+        'metrics': metrics,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            json.dump(results, output, indent=2)
+            output.write('\n')
+
+    if not args.compare:
+        for name, result in metrics.items():
+            print(f"{name:32} {result['value']:12.3f} {result['unit']}")
+        return
+    with open(args.compare, encoding='utf-8') as baseline_file:
+        baseline = json.load(baseline_file)['metrics']
+    rows = compare(baseline, metrics, args.threshold)
+    for name, before, after, change, regressed in rows:
+        flag = 'REGRESSION' if regressed else ''
+        print(f"{name:32} {before:12.3f} -> {after:12.3f} {metrics[name]['unit']:10} {change:+7.1%} {flag}")
+    regressions = [row for row in rows if row[4]]
+    if regressions:
+        print(f"{len(regressions)} metric(s) regressed by more than {args.threshold:.0%}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,47 +1,614 @@
 ## api_client.py
-import requests
+import gzip
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from geekbot_cli import tracing
 from geekbot_cli.exceptions import (
+    HTTPStatusError,
+    TransportConnectionError,
+    TransportError,
     StandupAPIError,
     StandupValidationError,
     InvalidAPIKeyError,
-    StandupNotFoundError
+    StandupNotFoundError,
+    StandupServerError,
+    StandupConnectionError,
+    RateLimitedError
 )
-from typing import List, Dict
+from geekbot_cli.models import Standup
+from geekbot_cli.streaming import iter_json_array
+from geekbot_cli.resilience import CircuitBreaker, Deadline, RetryPolicy, TokenBucket, parse_retry_after
+from geekbot_cli.transport import Response, Transport, make_transport
+from typing import Callable, Iterator, List, Dict, Optional, Tuple, Union
+
+# The service's base URL, unless GEEKBOT_API_URL points elsewhere (e.g. at a stub server).
+DEFAULT_BASE_URL = 'https://api.geekbot.com'
+
+# (connect, read) timeouts in seconds applied to every request.
+DEFAULT_TIMEOUT = (3.05, 30)
+
+# Reports requested per page when walking the report history.
+DEFAULT_PAGE_SIZE = 100
+
+# Bytes read from the socket at a time when streaming a response body.
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Report bodies at least this large are gzipped when request compression is on.
+COMPRESS_THRESHOLD = 16 * 1024
+
+def default_base_url() -> str:
+    """
+    Returns the base URL from GEEKBOT_API_URL, or the public API's.
+    """
+    return os.environ.get('GEEKBOT_API_URL') or DEFAULT_BASE_URL
+
+def report_error(status_code: int, error: object, payload: Dict) -> StandupAPIError:
+    """
+    Maps the HTTP status of a failed report submission to a standup exception.
+
+    Args:
+        status_code: The HTTP status code of the response.
+        error: The underlying error, used in the message.
+        payload: The report payload that was rejected.
+
+    Returns:
+        The exception to raise.
+    """
+    if status_code == 400:
+        return StandupValidationError(f"Validation error: {error} {payload}")
+    elif status_code == 401:
+        return InvalidAPIKeyError(f"Invalid API key: {error}")
+    elif status_code == 404:
+        return StandupNotFoundError(f"Standup not found: {error}")
+    elif status_code == 429:
+        return RateLimitedError(f"Rate limited: {error}")
+    elif status_code >= 500:
+        return StandupServerError(f"Server error: {error}")
+    else:
+        return StandupAPIError(f"HTTP error occurred: {error}")
+
+def default_compress_requests() -> bool:
+    """
+    Returns whether GEEKBOT_COMPRESS_REQUESTS asks for gzipped report bodies.
+    """
+    return os.environ.get('GEEKBOT_COMPRESS_REQUESTS', '').lower() in ('1', 'true', 'yes')
+
+class TransferStats:
+    """
+    Counts the request and response body bytes of a client, both as sent over
+    the wire and uncompressed, to show what compression saves.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.bytes_sent = 0
+        self.bytes_sent_uncompressed = 0
+        self.bytes_received = 0
+        self.bytes_received_decoded = 0
+
+    def record_sent(self, wire: int, uncompressed: int) -> None:
+        with self._lock:
+            self.requests += 1
+            self.bytes_sent += wire
+            self.bytes_sent_uncompressed += uncompressed
+
+    def record_received(self, wire: int, decoded: int) -> None:
+        with self._lock:
+            self.bytes_received += wire
+            self.bytes_received_decoded += decoded
+
+    def summary(self) -> str:
+        return (f"{self.requests} request(s): sent {self.bytes_sent / 1000:.1f} kB "
+                f"({self.bytes_sent_uncompressed / 1000:.1f} kB uncompressed), received "
+                f"{self.bytes_received / 1000:.1f} kB ({self.bytes_received_decoded / 1000:.1f} kB decoded)")
+
+def record_response(span, response: Response, payload: Optional[Dict]) -> None:
+    """
+    Records a response's status, sizes and time to its headers on an http.request span.
+    """
+    span.set('http.status_code', response.status_code)
+    span.set('http.time_to_headers_ms', round(response.elapsed.total_seconds() * 1000, 3))
+    content_length = response.headers.get('Content-Length')
+    if content_length is not None and content_length.isdigit():
+        span.set('http.response_content_length', int(content_length))
+    content_encoding = response.headers.get('Content-Encoding')
+    if content_encoding:
+        span.set('http.response_content_encoding', content_encoding)
+    if payload is not None:
+        span.set('http.request_content_length', len(json.dumps(payload)))
+
+
+def decode_standups(response: Response) -> List[Standup]:
+    """
+    Parses a fully read /v1/standups response into Standup instances.
+    """
+    with tracing.span('json.decode') as decode_span:
+        standups = Standup.from_dicts(response.json())
+        if decode_span.recording:
+            decode_span.set('bytes', len(response.content))
+            decode_span.set('standups', len(standups))
+    return standups
+
 
 class APIClient:
     """
     Manages HTTP communication with the standup service.
+
+    The client owns a long-lived transport (see transport.py) so that
+    consecutive calls reuse warm keep-alive connections instead of paying a
+    fresh DNS lookup, TCP connect and TLS handshake every time.
+
+    Responses are requested gzip- or deflate-compressed, and brotli-compressed
+    when the brotli package is installed; report bodies can be gzipped too.
+    The bytes this saves are counted in `transfer`.
     """
-    def __init__(self, base_url: str = 'https://api.geekbot.com'):
-        self.base_url = base_url
-        self.headers = {'Content-Type': 'application/json'}
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT,
+        pool_connections: int = 1,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        session=None,
+        transport: Union[str, Transport, None] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        deadline: Optional[float] = None,
+        compress_requests: Optional[bool] = None,
+        compress_threshold: int = COMPRESS_THRESHOLD,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """
+        Initializes the API client and its connection pool.
+
+        Args:
+            base_url: The base URL of the standup service. Defaults to default_base_url().
+            timeout: Either a single timeout or a (connect, read) tuple in seconds.
+            pool_connections: The number of per-host connection pools to cache.
+            pool_maxsize: The maximum number of connections kept alive per host.
+            pool_block: Whether to block instead of opening extra connections
+                once pool_maxsize connections to a host are in use.
+            keep_alive: Whether connections are kept open between requests.
+            session: An optional pre-configured requests.Session for the requests transport.
+            transport: The transport, or the name of one in transport.TRANSPORTS.
+                Defaults to transport.default_transport().
+            retry_policy: When to retry failed requests. Defaults to RetryPolicy().
+            rate_limiter: An optional TokenBucket shared by every thread using this client.
+            circuit_breaker: Fails fast during outages. Defaults to CircuitBreaker().
+            deadline: An overall budget in seconds for every request made by this
+                client, e.g. for the duration of one command.
+            compress_requests: Whether to gzip report bodies of at least
+                compress_threshold bytes. Defaults to default_compress_requests().
+                Turned off for the client's lifetime if the service answers
+                415 Unsupported Media Type, after resending the report as is.
+            compress_threshold: The smallest report body, in bytes, that is gzipped.
+            sleep: The function used to wait between retries.
+        """
+        self.base_url = base_url or default_base_url()
+        if not isinstance(transport, Transport):
+            transport = make_transport(transport, pool_connections, pool_maxsize, pool_block, session)
+        self.transport = transport
+        # The requests.Session of the requests transport, None with the others.
+        self.session = getattr(transport, 'session', None)
+        self.headers = {'Content-Type': 'application/json', 'Accept-Encoding': transport.accept_encoding}
+        if not keep_alive:
+            self.headers['Connection'] = 'close'
+        self.timeout = timeout
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker if circuit_breaker is not None else CircuitBreaker()
+        self.deadline = Deadline(deadline) if deadline is not None else None
+        self.compress_requests = default_compress_requests() if compress_requests is None else compress_requests
+        self.compress_threshold = compress_threshold
+        self.transfer = TransferStats()
+        self._sleep = sleep
+
+    def close(self) -> None:
+        """
+        Closes the transport and every pooled connection.
+        """
+        self.transport.close()
+
+    def warm_up(self) -> bool:
+        """
+        Opens a pooled connection to the service ahead of the first request,
+        so the DNS lookup, TCP connect and TLS handshake can overlap with
+        other startup work.
+
+        This is best effort: failures are left for the first request to report.
+
+        Returns:
+            Whether a connection was opened.
+        """
+        return self.transport.warm_up(self.base_url)
+
+    def __enter__(self) -> 'APIClient':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def set_deadline(self, seconds: Optional[float]) -> None:
+        """
+        Starts an overall time budget for the requests that follow, or removes it.
+
+        Args:
+            seconds: The budget in seconds, or None for no deadline.
+        """
+        self.deadline = Deadline(seconds) if seconds is not None else None
+
+    def _request_timeout(self) -> Union[float, Tuple[float, float]]:
+        """
+        Returns the per-request timeout, shortened so it never outlives the deadline.
+        """
+        if self.deadline is None:
+            return self.timeout
+        self.deadline.check()
+        remaining = self.deadline.remaining()
+        if isinstance(self.timeout, tuple):
+            return tuple(min(part, remaining) for part in self.timeout)
+        return min(self.timeout, remaining)
+
+    def _wait(self, delay: Optional[float]) -> bool:
+        """
+        Sleeps before a retry. Returns False if the retry should not happen.
+        """
+        if delay is None:
+            return False
+        if self.deadline is not None and delay >= self.deadline.remaining():
+            return False
+        self._sleep(delay)
+        return True
+
+    def _send(self, method: str, url: str, retryable: bool, uncompressed_length: Optional[int] = None,
+              **kwargs) -> Response:
+        """
+        Sends a request through the circuit breaker, rate limiter and retry policy.
+
+        Only idempotent requests, or those carrying an idempotency key, are
+        retried. Retries honour Retry-After and stop at the deadline.
+
+        Args:
+            method: The HTTP method, 'get' or 'post'.
+            url: The request URL.
+            retryable: Whether the request may be sent more than once.
+            uncompressed_length: The size of a compressed request body before
+                compression, for the transfer counters.
+            **kwargs: Passed on to Transport.request.
+
+        Returns:
+            The last response received; its status is not checked.
+
+        Raises:
+            RateLimitedError: If the service still answers 429 after the last attempt.
+            CircuitOpenError: If the circuit breaker refuses the call.
+            DeadlineExceededError: If the deadline is exceeded.
+            TransportError: If the request cannot be sent.
+        """
+        attempt = 0
+        while True:
+            trial = self.circuit_breaker.before_call()
+            recorded = False
+            try:
+                if self.rate_limiter is not None:
+                    self.rate_limiter.acquire(self.deadline)
+                with tracing.span('http.request', {'http.method': method.upper(), 'http.url': url,
+                                                   'http.attempt': attempt}) as request_span:
+                    response = self.transport.request(method, url, self._request_timeout(), **kwargs)
+                    if request_span.recording:
+                        record_response(request_span, response, kwargs.get('json'))
+                self._count_transfer(response, uncompressed_length, kwargs.get('stream', False))
+            except TransportConnectionError:
+                self.circuit_breaker.record_failure()
+                recorded = True
+                if retryable and self._wait(self.retry_policy.delay(attempt)):
+                    attempt += 1
+                    continue
+                raise
+            else:
+                if response.status_code in range(500, 600):
+                    self.circuit_breaker.record_failure()
+                else:
+                    self.circuit_breaker.record_success()
+                recorded = True
+            finally:
+                # Anything else that ends the attempt must not leave a
+                # half-open circuit waiting forever for its trial.
+                if trial and not recorded:
+                    self.circuit_breaker.release_trial()
+            status_code = response.status_code
+            if status_code in self.retry_policy.retry_statuses:
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                if retryable and self._wait(self.retry_policy.delay(attempt, retry_after)):
+                    # Release the connection of the answer being dropped.
+                    response.close()
+                    attempt += 1
+                    continue
+                if status_code == 429:
+                    response.close()
+                    raise RateLimitedError(f"Rate limited by the standup service, retry after {retry_after}s")
+            return response
 
-    def get_standups(self) -> List[Dict]:
+    def _count_transfer(self, response: Response, uncompressed_length: Optional[int],
+                        streamed: bool) -> None:
+        """
+        Adds a response and its request to the transfer counters. A streamed
+        body is counted by _iter_standups once it has been read. Responses
+        whose request size is unknown, like test doubles, are not counted.
+        """
+        sent = response.request_body_length
+        if sent is None:
+            return
+        self.transfer.record_sent(sent, uncompressed_length or sent)
+        if not streamed:
+            decoded = len(response.content)
+            self.transfer.record_received(response.wire_length(decoded), decoded)
+
+    def get_standups(self) -> List[Standup]:
         """
         Retrieves a list of available standups from the service.
 
         Returns:
-            A list of standup dictionaries.
+            A list of Standup instances.
+
+        Raises:
+            StandupAPIError: If the API call fails.
+        """
+        try:
+            response = self._send('get', f"{self.base_url}/v1/standups", True, headers=self.headers)
+            response.raise_for_status()
+            return decode_standups(response)
+        except HTTPStatusError as e:
+            raise StandupAPIError(f"HTTP error occurred: {e} ")
+        except TransportError as e:
+            raise StandupConnectionError(f"Error occurred during the API call: {e}")
+
+    def stream_standups(
+        self,
+        chunk_size: int = STREAM_CHUNK_SIZE
+    ) -> Tuple[Iterator[Standup], Optional[str], Optional[str]]:
+        """
+        Requests the standups and parses the body incrementally as it arrives.
+
+        The request is sent and its status checked right away; the body is
+        only read while the returned iterator is consumed, one standup at a
+        time, so callers can show the first standups before the download ends.
+
+        Args:
+            chunk_size: The number of bytes read from the socket at a time.
+
+        Returns:
+            A (standups, etag, last_modified) tuple, where standups is an
+            iterator of Standup instances.
+
+        Raises:
+            StandupAPIError: If the API call fails, here or while iterating.
+        """
+        try:
+            response = self._send('get', f"{self.base_url}/v1/standups", True, headers=self.headers, stream=True)
+            response.raise_for_status()
+        except HTTPStatusError as e:
+            raise StandupAPIError(f"HTTP error occurred: {e} ")
+        except TransportError as e:
+            raise StandupConnectionError(f"Error occurred during the API call: {e}")
+        return (
+            self._iter_standups(response, chunk_size, self.transfer),
+            response.headers.get('ETag'),
+            response.headers.get('Last-Modified')
+        )
+
+    @staticmethod
+    def _iter_standups(response: Response, chunk_size: int,
+                       transfer: Optional[TransferStats] = None) -> Iterator[Standup]:
+        decoded = 0
+
+        def counted(chunks):
+            nonlocal decoded
+            for chunk in chunks:
+                decoded += len(chunk)
+                yield chunk
+
+        try:
+            for item in iter_json_array(counted(response.iter_content(chunk_size))):
+                yield Standup.from_dict(item)
+            if transfer is not None:
+                transfer.record_received(response.wire_length(decoded), decoded)
+        except (ValueError, KeyError, TypeError) as e:
+            raise StandupAPIError(f"Malformed standups response: {e}")
+        except TransportError as e:
+            raise StandupConnectionError(f"Error occurred during the API call: {e}")
+        finally:
+            # Returns the connection to the pool, or drops it if the body was not read to the end.
+            response.close()
+
+    def get_standups_if_modified(
+        self,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ) -> Tuple[Optional[List[Standup]], Optional[str], Optional[str]]:
+        """
+        Retrieves the standups unless they are unchanged since the given validators.
+
+        Args:
+            etag: The ETag of the copy held by the caller.
+            last_modified: The Last-Modified value of the copy held by the caller.
+
+        Returns:
+            A (standups, etag, last_modified) tuple of Standup instances and the
+            response validators. standups is None when the
+            service answered 304 Not Modified, in which case the body is not parsed.
 
         Raises:
             StandupAPIError: If the API call fails.
         """
+        headers = dict(self.headers)
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
         try:
-            response = requests.get(f"{self.base_url}/v1/standups", headers=self.headers)
+            response = self._send('get', f"{self.base_url}/v1/standups", True, headers=headers)
+            if response.status_code == 304:
+                return None, etag, last_modified
+            response.raise_for_status()
+            standups = decode_standups(response)
+            return standups, response.headers.get('ETag'), response.headers.get('Last-Modified')
+        except HTTPStatusError as e:
+            raise StandupAPIError(f"HTTP error occurred: {e} ")
+        except TransportError as e:
+            raise StandupConnectionError(f"Error occurred during the API call: {e}")
+
+    def get_reports(
+        self,
+        standup_id: Optional[int] = None,
+        after: Optional[int] = None,
+        before: Optional[int] = None,
+        limit: int = DEFAULT_PAGE_SIZE
+    ) -> List[Dict]:
+        """
+        Retrieves one page of reports from the service, newest first.
+
+        Args:
+            standup_id: Only return reports of this standup.
+            after: Only return reports submitted after this Unix timestamp.
+            before: Only return reports submitted before this Unix timestamp.
+            limit: The maximum number of reports returned.
+
+        Returns:
+            A list of report dictionaries.
+
+        Raises:
+            StandupAPIError: If the API call fails.
+        """
+        params = {'limit': limit}
+        if standup_id is not None:
+            params['standup_id'] = standup_id
+        if after is not None:
+            params['after'] = after
+        if before is not None:
+            params['before'] = before
+        try:
+            response = self._send('get', f"{self.base_url}/v1/reports", True, headers=self.headers, params=params)
             response.raise_for_status()
             return response.json()
-        except requests.exceptions.HTTPError as e:
+        except HTTPStatusError as e:
             raise StandupAPIError(f"HTTP error occurred: {e} ")
-        except requests.exceptions.RequestException as e:
-            raise StandupAPIError(f"Error occurred during the API call: {e}")
+        except TransportError as e:
+            raise StandupConnectionError(f"Error occurred during the API call: {e}")
+
+    def iter_report_pages(
+        self,
+        standup_id: Optional[int] = None,
+        after: Optional[int] = None,
+        before: Optional[int] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True
+    ) -> Iterator[List[Dict]]:
+        """
+        Lazily walks the report history, newest first, one page at a time.
+
+        Each page is requested with `before` just past the oldest report of the
+        previous page, and reports already yielded are skipped, so reports that
+        share a timestamp across a page boundary are neither lost nor repeated.
+        A full page whose reports all share one timestamp cannot be paged
+        past that way; that second is then requested on its own, with a limit
+        doubled until every one of its reports fits, and the walk continues
+        before it. With prefetch enabled the next page is downloaded in the
+        background while the caller consumes the current one.
+
+        Args:
+            standup_id: Only yield reports of this standup.
+            after: Only yield reports submitted after this Unix timestamp.
+            before: Only yield reports submitted before this Unix timestamp.
+            page_size: The number of reports requested per page.
+            prefetch: Whether to request the next page before the current one is consumed.
+
+        Yields:
+            Non-empty lists of report dictionaries, at most page_size except
+            for a second holding more reports than that.
+
+        Raises:
+            StandupAPIError: If an API call fails.
+        """
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+
+        def fetch(cursor):
+            return self.get_reports(standup_id=standup_id, after=after, before=cursor, limit=page_size)
+
+        def fetch_second(timestamp):
+            limit = page_size * 2
+            while True:
+                reports = self.get_reports(standup_id=standup_id, after=timestamp - 1, before=timestamp + 1,
+                                           limit=limit)
+                if len(reports) < limit:
+                    return reports
+                limit *= 2
+
+        try:
+            page = fetch(before)
+            # Ids of the reports yielded so far with the timestamp `seen_timestamp`.
+            seen_ids = set()
+            seen_timestamp = None
+            while page:
+                oldest = min(report['timestamp'] for report in page)
+                last = len(page) < page_size
+                if not last and all(report['timestamp'] == oldest for report in page):
+                    page = fetch_second(oldest)
+                    cursor = oldest
+                else:
+                    cursor = oldest + 1
+                next_page = executor.submit(fetch, cursor) if executor and not last else None
+                fresh = [report for report in page if report['id'] not in seen_ids]
+                if oldest != seen_timestamp:
+                    seen_ids, seen_timestamp = set(), oldest
+                seen_ids.update(report['id'] for report in page if report['timestamp'] == oldest)
+                if fresh:
+                    yield fresh
+                if last:
+                    break
+                page = next_page.result() if next_page else fetch(cursor)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
 
-    def post_report(self, standup_id: int, answers: List[Dict]) -> Dict:
+    def iter_reports(
+        self,
+        standup_id: Optional[int] = None,
+        after: Optional[int] = None,
+        before: Optional[int] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True
+    ) -> Iterator[Dict]:
+        """
+        Lazily yields the report history, newest first. See iter_report_pages.
+
+        Yields:
+            Report dictionaries.
+
+        Raises:
+            StandupAPIError: If an API call fails.
+        """
+        for page in self.iter_report_pages(standup_id, after, before, page_size, prefetch):
+            yield from page
+
+    def post_report(self, standup_id: int, answers: List[Dict], idempotency_key: Optional[str] = None,
+                    retry: bool = True) -> Dict:
         """
         Posts a standup report to the service.
 
         Args:
             standup_id: The ID of the standup to report on.
             answers: A list of answer dictionaries.
+            idempotency_key: A client-generated key sent as the Idempotency-Key
+                header, so a resent report is not recorded twice.
+            retry: Whether the retry policy may resend a report carrying an
+                idempotency key. False sends it once, for callers that retry
+                themselves or must not wait.
 
         Returns:
             A dictionary containing the response from the service.
@@ -49,30 +616,44 @@ class APIClient:
         Raises:
             StandupValidationError: If the validation of the report fails.
             InvalidAPIKeyError: If the API key provided is invalid.
+            StandupServerError: If the service fails with a 5xx status.
+            StandupConnectionError: If the service cannot be reached.
+            RateLimitedError: If the service keeps rate limiting the client.
             StandupAPIError: If the API call fails.
         """
+        headers = self.headers
+        if idempotency_key:
+            headers = dict(self.headers, **{'Idempotency-Key': idempotency_key})
         try:
             payload = {
                 'standup_id': standup_id,
                 'answers': answers
             }
-            response = requests.post(f"{self.base_url}/v1/reports", json=payload, headers=self.headers)
+            response = None
+            if self.compress_requests:
+                body = json.dumps(payload).encode('utf-8')
+                if len(body) >= self.compress_threshold:
+                    response = self._send(
+                        'post', f"{self.base_url}/v1/reports", retry and bool(idempotency_key), len(body),
+                        data=gzip.compress(body, compresslevel=6),
+                        headers=dict(headers, **{'Content-Encoding': 'gzip'})
+                    )
+                    if response.status_code == 415:
+                        # The service does not take compressed bodies; it
+                        # rejected this one unread, so resending is safe.
+                        self.compress_requests = False
+                        response = None
+            if response is None:
+                response = self._send(
+                    'post', f"{self.base_url}/v1/reports", retry and bool(idempotency_key), json=payload,
+                    headers=headers
+                )
             response.raise_for_status()
             return response.json()
-        except requests.exceptions.HTTPError as e:
-            status_code = e.response.status_code
-            if status_code == 400:
-                raise StandupValidationError(f"Validation error: {e} {payload}")
-            elif status_code == 401:
-                raise InvalidAPIKeyError(f"Invalid API key: {e}")
-            elif status_code == 404:
-                raise StandupNotFoundError(f"Standup not found: {e}")
-            elif status_code >= 500:
-                raise StandupAPIError(f"Server error: {e}")
-            else:
-                raise StandupAPIError(f"HTTP error occurred: {e}")
-        except requests.exceptions.RequestException as e:
-            raise StandupAPIError(f"Error occurred during the API call: {e}")
+        except HTTPStatusError as e:
+            raise report_error(e.status_code, e, payload)
+        except TransportError as e:
+            raise StandupConnectionError(f"Error occurred during the API call: {e}")
 
     def set_headers(self, api_key: str) -> None:
         """
@@ -80,7 +661,7 @@ class APIClient:
 
         Args:
             api_key: The API key to be used for authorization.
-        
+
         Raises:
             InvalidAPIKeyError: If the API key is invalid.
         """
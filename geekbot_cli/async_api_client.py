@@ -0,0 +1,138 @@
+## async_api_client.py
+import asyncio
+from geekbot_cli.api_client import DEFAULT_TIMEOUT, default_base_url, report_error
+from geekbot_cli.exceptions import StandupAPIError, StandupConnectionError, InvalidAPIKeyError
+from geekbot_cli.models import Standup
+from typing import List, Dict, Optional, Tuple, Union
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - depends on the installed extras
+    raise ImportError("AsyncAPIClient requires httpx; install it with `pip install geekbot_cli[async]`.")
+
+
+class AsyncAPIClient:
+    """
+    Asyncio counterpart of APIClient with the same methods and exceptions.
+
+    All requests share one httpx.AsyncClient connection pool, and a semaphore
+    caps how many requests are in flight at once, so fanning out over hundreds
+    of standups neither opens hundreds of connections nor floods the service.
+    """
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT,
+        max_concurrency: int = 10,
+        max_keepalive_connections: Optional[int] = None
+    ):
+        """
+        Initializes the client and its connection pool.
+
+        Args:
+            base_url: The base URL of the standup service. Defaults to default_base_url().
+            timeout: Either a single timeout or a (connect, read) tuple in seconds.
+            max_concurrency: The maximum number of requests in flight, which is
+                also the maximum number of open connections.
+            max_keepalive_connections: The number of idle connections kept open.
+                Defaults to max_concurrency, so no connection is dropped between bursts.
+        """
+        self.base_url = base_url or default_base_url()
+        self.headers = {'Content-Type': 'application/json'}
+        if isinstance(timeout, tuple):
+            connect_timeout, read_timeout = timeout
+            self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        else:
+            self.timeout = httpx.Timeout(timeout)
+        self.client = httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_connections=max_concurrency,
+                max_keepalive_connections=max_keepalive_connections or max_concurrency
+            )
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def aclose(self) -> None:
+        """
+        Closes every pooled connection.
+        """
+        await self.client.aclose()
+
+    async def __aenter__(self) -> 'AsyncAPIClient':
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.aclose()
+
+    async def get_standups(self) -> List[Standup]:
+        """
+        Retrieves a list of available standups from the service.
+
+        Returns:
+            A list of Standup instances.
+
+        Raises:
+            StandupAPIError: If the API call fails.
+        """
+        try:
+            async with self._semaphore:
+                response = await self.client.get(f"{self.base_url}/v1/standups", headers=self.headers)
+            response.raise_for_status()
+            return Standup.from_dicts(response.json())
+        except httpx.HTTPStatusError as e:
+            raise StandupAPIError(f"HTTP error occurred: {e} ")
+        except httpx.HTTPError as e:
+            raise StandupConnectionError(f"Error occurred during the API call: {e}")
+
+    async def post_report(self, standup_id: int, answers: List[Dict], idempotency_key: Optional[str] = None) -> Dict:
+        """
+        Posts a standup report to the service.
+
+        Args:
+            standup_id: The ID of the standup to report on.
+            answers: A list of answer dictionaries.
+            idempotency_key: A client-generated key sent as the Idempotency-Key
+                header, so a resent report is not recorded twice.
+
+        Returns:
+            A dictionary containing the response from the service.
+
+        Raises:
+            StandupValidationError: If the validation of the report fails.
+            InvalidAPIKeyError: If the API key provided is invalid.
+            StandupNotFoundError: If the standup does not exist.
+            StandupServerError: If the service fails with a 5xx status.
+            StandupConnectionError: If the service cannot be reached.
+            StandupAPIError: If the API call fails.
+        """
+        headers = self.headers
+        if idempotency_key:
+            headers = dict(self.headers, **{'Idempotency-Key': idempotency_key})
+        payload = {
+            'standup_id': standup_id,
+            'answers': answers
+        }
+        try:
+            async with self._semaphore:
+                response = await self.client.post(f"{self.base_url}/v1/reports", json=payload, headers=headers)
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            raise report_error(e.response.status_code, e, payload)
+        except httpx.HTTPError as e:
+            raise StandupConnectionError(f"Error occurred during the API call: {e}")
+
+    def set_headers(self, api_key: str) -> None:
+        """
+        Sets the authorization headers for the API client.
+
+        Args:
+            api_key: The API key to be used for authorization.
+
+        Raises:
+            InvalidAPIKeyError: If the API key is invalid.
+        """
+        if not isinstance(api_key, str) or not api_key:
+            raise InvalidAPIKeyError("Invalid API key provided.")
+        self.headers['Authorization'] = f"{api_key}"
@@ -0,0 +1,37 @@
+## atomic.py
+import os
+import tempfile
+from pathlib import Path
+from typing import Union
+
+# Imported by completion.py, so this module must stay standard library only.
+
+
+def atomic_write(path: Union[str, Path], data: str) -> None:
+    """
+    Replaces a file with new text so readers see either the old or the new
+    content, never a partial write, even if the process dies midway.
+
+    The text goes to a temporary file in the same directory, which is flushed
+    to disk and then renamed over the target. The temporary file is removed
+    if anything fails before the rename.
+
+    Args:
+        path: The file to write; missing parent directories are created.
+        data: The complete new content.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}-")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as tmp_file:
+            tmp_file.write(data)
+            tmp_file.flush()
+            os.fsync(tmp_file.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,322 @@
+## bulk.py
+import csv
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterator, Optional, TextIO, Tuple
+from geekbot_cli.atomic import atomic_write
+from geekbot_cli.exceptions import (
+    StandupException,
+    StandupValidationError,
+    StandupNotFoundError
+)
+from geekbot_cli.outbox import new_idempotency_key
+
+if TYPE_CHECKING:
+    from geekbot_cli.validation import ReportValidator
+
+# Errors that will not go away by posting the same record again.
+PERMANENT_ERRORS = (StandupValidationError, StandupNotFoundError)
+
+
+def detect_format(path: str) -> str:
+    """
+    Guesses the record format from a file extension, defaulting to JSONL.
+    """
+    return 'csv' if str(path).lower().endswith('.csv') else 'jsonl'
+
+
+def read_records(stream: TextIO, record_format: str = 'jsonl') -> Iterator[Tuple[int, object]]:
+    """
+    Lazily reads raw records from a JSONL or CSV stream.
+
+    JSONL records are objects of the form
+    {"standup_id": 1, "answers": {"<question_id>": {"text": "..."}}}.
+    CSV files have a standup_id column and one column per question id.
+
+    Args:
+        stream: The open input stream.
+        record_format: Either 'jsonl' or 'csv'.
+
+    Yields:
+        (record_number, raw_record) tuples. Records are numbered from 1; blank
+        JSONL lines are not counted.
+        raw_record is a line of text for JSONL and a row dictionary for CSV.
+    """
+    if record_format == 'csv':
+        for number, row in enumerate(csv.DictReader(stream), start=1):
+            yield number, row
+    else:
+        lines = (line for line in stream if line.strip())
+        for number, line in enumerate(lines, start=1):
+            yield number, line
+
+
+def record_idempotency_key(source: str, number: int, raw: object) -> str:
+    """
+    Derives the idempotency key of a record from where it came from and what
+    it says, so posting it again after a crash or on a resumed run reuses the
+    key of the first attempt and the service does not store it twice.
+
+    Args:
+        source: The input file the record was read from.
+        number: The record number, as produced by read_records.
+        raw: The raw record; a JSONL line or a CSV row dictionary.
+    """
+    content = json.dumps(raw, sort_keys=True) if isinstance(raw, dict) else str(raw).strip()
+    digest = hashlib.sha256(f"{os.path.abspath(source)}\n{number}\n{content}".encode('utf-8'))
+    return digest.hexdigest()[:32]
+
+
+def parse_record(raw: object) -> Tuple[int, Dict]:
+    """
+    Validates a raw record and converts it to post_report arguments.
+
+    Args:
+        raw: A JSONL line or a CSV row dictionary.
+
+    Returns:
+        A (standup_id, answers) tuple.
+
+    Raises:
+        StandupValidationError: If the record is malformed.
+    """
+    if isinstance(raw, dict):
+        record = {
+            'standup_id': raw.get('standup_id'),
+            'answers': {
+                question_id: {'text': text}
+                for question_id, text in raw.items()
+                if question_id != 'standup_id' and text not in (None, '')
+            }
+        }
+    else:
+        try:
+            record = json.loads(raw)
+        except ValueError as e:
+            raise StandupValidationError(f"Malformed JSON: {e}")
+        if not isinstance(record, dict):
+            raise StandupValidationError("Record must be a JSON object.")
+    try:
+        standup_id = int(record.get('standup_id'))
+    except (TypeError, ValueError):
+        raise StandupValidationError("Record has no valid standup_id.")
+    answers = record.get('answers')
+    if not isinstance(answers, dict) or not answers:
+        raise StandupValidationError("Record has no answers.")
+    for question_id, answer in answers.items():
+        if not str(question_id).isdigit():
+            raise StandupValidationError(f"Invalid question id: {question_id}")
+        if not isinstance(answer, dict) or not isinstance(answer.get('text'), str):
+            raise StandupValidationError(f"Answer to question {question_id} must have a text.")
+    return standup_id, answers
+
+
+class Checkpoint:
+    """
+    Remembers which records of an input file are finished, so an interrupted
+    run can resume without re-posting them.
+
+    State is a watermark below which every record was handled, the records
+    above it that are finished, and the records that failed transiently and
+    must be retried. Since workers only run a bounded window ahead of the
+    watermark and transient failures are rare, the state stays small however
+    long the input is.
+
+    Updates are written at most once per `interval` seconds and on flush(),
+    each replacing the file atomically. A crash loses at most the last
+    interval, whose records are posted again under the same idempotency keys.
+    """
+    def __init__(self, path: Path, interval: float = 1.0):
+        self.path = Path(path)
+        self.interval = interval
+        self.watermark = 0
+        self.done = set()
+        self.failed = set()
+        self._dirty = False
+        self._written_at = None
+        try:
+            with open(self.path, encoding='utf-8') as checkpoint_file:
+                state = json.load(checkpoint_file)
+            self.watermark = int(state.get('watermark', 0))
+            self.done = set(state.get('done', []))
+            self.failed = set(state.get('failed', []))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, AttributeError, TypeError) as e:
+            raise StandupException(f"Unreadable checkpoint {self.path}: {e}")
+
+    def is_done(self, number: int) -> bool:
+        return number not in self.failed and (number <= self.watermark or number in self.done)
+
+    def mark_done(self, number: int) -> None:
+        self.failed.discard(number)
+        if number > self.watermark:
+            self.done.add(number)
+        self._advance()
+
+    def mark_failed(self, number: int) -> None:
+        """
+        Records a transient failure; the record is retried on the next run.
+        """
+        self.failed.add(number)
+        self._advance()
+
+    def flush(self) -> None:
+        """
+        Writes pending updates now.
+        """
+        if self._dirty:
+            self._write()
+
+    def clear(self) -> None:
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def _advance(self) -> None:
+        while self.watermark + 1 in self.done or self.watermark + 1 in self.failed:
+            self.watermark += 1
+            self.done.discard(self.watermark)
+        self._dirty = True
+        if self._written_at is None or time.monotonic() - self._written_at >= self.interval:
+            self._write()
+
+    def _write(self) -> None:
+        state = {'watermark': self.watermark, 'done': sorted(self.done), 'failed': sorted(self.failed)}
+        atomic_write(self.path, json.dumps(state))
+        self._dirty = False
+        self._written_at = time.monotonic()
+
+
+class BulkSubmitter:
+    """
+    Posts reports from a record stream through a pool of worker threads.
+
+    At most `workers * 2` records are held in memory at any time, so arbitrarily
+    large inputs are processed with bounded memory.
+
+    With a validator, records are parsed and checked as they are read, and
+    invalid ones are reported without being posted or taking up a worker.
+    """
+    def __init__(self, api_client, workers: int = 4, checkpoint: Optional[Checkpoint] = None,
+                 validator: Optional['ReportValidator'] = None, source: Optional[str] = None):
+        """
+        Initializes the submitter.
+
+        Args:
+            api_client: The APIClient used to post reports. Its connection pool
+                should allow at least `workers` connections.
+            workers: The number of reports posted concurrently.
+            checkpoint: Where finished records are remembered, if anywhere.
+            validator: Checks records against the standups' questions before
+                they are posted, if given.
+            source: The input file the records come from. Their idempotency
+                keys are derived from it, so a resumed run cannot post a
+                record twice; without it every post gets a fresh key.
+        """
+        self.api_client = api_client
+        self.workers = max(1, workers)
+        self.checkpoint = checkpoint
+        self.validator = validator
+        self.source = source
+
+    def _check(self, number: int, raw: object) -> Tuple[Optional[Tuple[int, Dict]], Optional[Dict]]:
+        """
+        Parses and validates a record before it is posted.
+
+        Returns:
+            The (standup_id, answers) tuple and None, or None and the error
+            result of an invalid record.
+        """
+        try:
+            record = parse_record(raw)
+            self.validator.check(*record)
+        except StandupValidationError as e:
+            result = {'record': number, 'status': 'error', 'error': type(e).__name__, 'message': str(e),
+                      'permanent': True, 'latency_ms': 0.0}
+            if e.errors:
+                result['errors'] = [error.to_dict() for error in e.errors]
+            return None, result
+        return record, None
+
+    def _post(self, number: int, raw: object, record: Optional[Tuple[int, Dict]] = None) -> Dict:
+        start = time.perf_counter()
+        result = {'record': number, 'status': 'ok'}
+        try:
+            standup_id, answers = record if record is not None else parse_record(raw)
+            if self.source is not None:
+                idempotency_key = record_idempotency_key(self.source, number, raw)
+            else:
+                idempotency_key = new_idempotency_key()
+            response = self.api_client.post_report(standup_id, answers, idempotency_key=idempotency_key)
+            result['report_id'] = response.get('id') if isinstance(response, dict) else None
+        except StandupException as e:
+            result['status'] = 'error'
+            result['error'] = type(e).__name__
+            result['message'] = str(e)
+            result['permanent'] = isinstance(e, PERMANENT_ERRORS)
+        result['latency_ms'] = round((time.perf_counter() - start) * 1000, 3)
+        return result
+
+    def _finish(self, result: Dict, results: TextIO, summary: Dict) -> None:
+        permanent = result.pop('permanent', False)
+        results.write(json.dumps(result) + '\n')
+        summary[result['status']] += 1
+        if self.checkpoint is None:
+            return
+        if result['status'] == 'ok' or permanent:
+            self.checkpoint.mark_done(result['record'])
+        elif result['status'] == 'error':
+            self.checkpoint.mark_failed(result['record'])
+
+    def submit(self, records: Iterator[Tuple[int, object]], results: TextIO) -> Dict[str, int]:
+        """
+        Posts every record and writes one JSON result line per record.
+
+        Result lines have the record number, a status of 'ok', 'error' or
+        'skipped', the latency in milliseconds and, for errors, the exception
+        class name from geekbot_cli.exceptions and its message. Records
+        rejected by the validator also list their FieldErrors under 'errors'. Records that
+        were posted or failed permanently are checkpointed; transient failures
+        are retried on the next run.
+
+        Args:
+            records: (record_number, raw_record) tuples as produced by read_records.
+            results: The stream result lines are written to.
+
+        Returns:
+            The number of records per status.
+        """
+        summary = {'ok': 0, 'error': 0, 'skipped': 0}
+        try:
+            self._submit(records, results, summary)
+        finally:
+            if self.checkpoint is not None:
+                self.checkpoint.flush()
+        return summary
+
+    def _submit(self, records: Iterator[Tuple[int, object]], results: TextIO, summary: Dict) -> None:
+        in_flight = set()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for number, raw in records:
+                if self.checkpoint is not None and self.checkpoint.is_done(number):
+                    self._finish({'record': number, 'status': 'skipped'}, results, summary)
+                    continue
+                record = None
+                if self.validator is not None:
+                    record, invalid = self._check(number, raw)
+                    if invalid is not None:
+                        self._finish(invalid, results, summary)
+                        continue
+                if len(in_flight) >= self.workers * 2:
+                    completed, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in completed:
+                        self._finish(future.result(), results, summary)
+                in_flight.add(executor.submit(self._post, number, raw, record))
+            for future in wait(in_flight).done:
+                self._finish(future.result(), results, summary)
@@ -0,0 +1,158 @@
+## cache.py
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+from geekbot_cli.atomic import atomic_write
+from geekbot_cli.completion import INDEX_SUFFIX, write_index
+from geekbot_cli.models import Standup
+from geekbot_cli.paths import cache_dir, standup_cache_path
+
+# Seconds a cached standup list is served without revalidation.
+DEFAULT_TTL = 300
+
+
+def default_cache_dir() -> Path:
+    """
+    Returns the per-user cache directory, honouring XDG_CACHE_HOME.
+    """
+    return Path(cache_dir())
+
+
+def key_fingerprint(api_key: str) -> str:
+    """
+    Returns a one-way fingerprint of an API key, safe to store on disk.
+    """
+    return hashlib.sha256(api_key.encode('utf-8')).hexdigest()
+
+
+class StandupCache:
+    """
+    Stores the /v1/standups response on disk together with its ETag and
+    Last-Modified validators.
+
+    Entries are bound to a fingerprint of the API key that fetched them, so a
+    different key never sees another workspace's standups.
+
+    Every write also refreshes the shell completion index next to the cache
+    file, which lists the standup ids and names only.
+    """
+    def __init__(self, path: Optional[Path] = None, ttl: float = DEFAULT_TTL):
+        """
+        Initializes the cache.
+
+        Args:
+            path: The cache file. Defaults to standups.json in the user cache directory.
+            ttl: Seconds an entry is considered fresh.
+        """
+        self.path = Path(path if path is not None else standup_cache_path())
+        self.index_path = self.path.with_suffix(INDEX_SUFFIX)
+        self.ttl = ttl
+
+    def load(self, api_key: str) -> Optional[Dict]:
+        """
+        Reads the cached entry for the given API key.
+
+        Args:
+            api_key: The API key the entry must belong to.
+
+        Returns:
+            A dictionary with 'standups' (as dictionaries), 'etag',
+            'last_modified' and 'fetched_at', or None if there is no usable entry.
+        """
+        try:
+            with open(self.path, encoding='utf-8') as cache_file:
+                entry = json.load(cache_file)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or entry.get('key') != key_fingerprint(api_key):
+            return None
+        if not isinstance(entry.get('standups'), list):
+            return None
+        return entry
+
+    def is_fresh(self, entry: Dict) -> bool:
+        """
+        Tells whether an entry is younger than the TTL.
+        """
+        return time.time() - entry.get('fetched_at', 0) < self.ttl
+
+    def store(self, api_key: str, standups: List[Standup], etag: Optional[str] = None,
+              last_modified: Optional[str] = None) -> Dict:
+        """
+        Writes a new entry, replacing the previous one atomically.
+
+        Args:
+            api_key: The API key the standups were fetched with.
+            standups: The Standup instances returned by the service.
+            etag: The ETag response header, if any.
+            last_modified: The Last-Modified response header, if any.
+
+        Returns:
+            The stored entry.
+        """
+        entry = {
+            'key': key_fingerprint(api_key),
+            'fetched_at': time.time(),
+            'etag': etag,
+            'last_modified': last_modified,
+            'standups': [standup.to_dict() for standup in standups]
+        }
+        self._write(entry)
+        return entry
+
+    def touch(self, entry: Dict) -> None:
+        """
+        Marks an entry as freshly validated, e.g. after a 304 Not Modified.
+        """
+        entry['fetched_at'] = time.time()
+        self._write(entry)
+
+    def invalidate(self) -> None:
+        """
+        Removes the cache file and the completion index, if they exist.
+        """
+        for path in (self.path, self.index_path):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def fetch(self, api_client, api_key: str, refresh: bool = False) -> List[Standup]:
+        """
+        Fetches the standups from the service, revalidating the cached entry
+        with If-None-Match/If-Modified-Since unless a refresh is forced.
+
+        Args:
+            api_client: The APIClient used for the request.
+            api_key: The API key the client is authorized with.
+            refresh: Whether to ignore the cached validators and re-download.
+
+        Returns:
+            A list of Standup instances.
+
+        Raises:
+            StandupAPIError: If the API call fails.
+        """
+        entry = None if refresh else self.load(api_key)
+        if entry is None:
+            standups, etag, last_modified = api_client.get_standups_if_modified()
+        else:
+            standups, etag, last_modified = api_client.get_standups_if_modified(
+                entry.get('etag'), entry.get('last_modified')
+            )
+        if standups is None:
+            # 304 Not Modified: the cached body is still current.
+            self.touch(entry)
+            return Standup.from_dicts(entry['standups'])
+        self.store(api_key, standups, etag, last_modified)
+        return standups
+
+    def _write(self, entry: Dict) -> None:
+        atomic_write(self.path, json.dumps(entry))
+        try:
+            write_index(str(self.index_path), ((standup['id'], standup['name']) for standup in entry['standups']))
+        except OSError:
+            # Completion degrades to nothing; the cache itself was written.
+            pass
@@ -1,20 +1,42 @@
 ## cli.py
+import sys
 import click
 from rich.prompt import Prompt
-from geekbot_cli.api_client import APIClient
+from geekbot_cli import tracing
+from geekbot_cli.cache import StandupCache
 from geekbot_cli.config_manager import ConfigManager
 from geekbot_cli.exceptions import StandupException, APIKeyNotFoundError, InvalidAPIKeyError
 from geekbot_cli.models import Standup, Question
-from typing import List, Dict
+from geekbot_cli.outbox import Outbox, TRANSIENT_ERRORS, new_idempotency_key
+from geekbot_cli.paths import DEFAULT_PROFILE
+from typing import Iterable, Iterator, List, Dict, Optional, Tuple, TYPE_CHECKING
+from concurrent.futures import Future, ThreadPoolExecutor
+import threading
+from geekbot_cli.startup import PhaseTimer, in_background
 
 from rich.console import Console
 from rich.columns import Columns
+from rich.cells import cell_len
 from rich.panel import Panel
-from prompt_toolkit.shortcuts import radiolist_dialog
+
+if TYPE_CHECKING:
+    from geekbot_cli.api_client import APIClient
+    from geekbot_cli.picker import RecentStandups
+    from geekbot_cli.workspaces import Workspace
 
 
 console = Console()
 
+
+def __getattr__(name):
+    # prompt_toolkit is only needed for multiple_choice questions, so it is
+    # imported the first time `radiolist_dialog` is looked up on this module.
+    if name == 'radiolist_dialog':
+        from prompt_toolkit.shortcuts import radiolist_dialog
+        globals()['radiolist_dialog'] = radiolist_dialog
+        return radiolist_dialog
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 def get_multiline_input(prompt_color, answer_type):
     lines = []
     while True:
@@ -32,9 +54,25 @@ def get_multiline_input(prompt_color, answer_type):
         lines.append(line)
     return "\n".join(lines)
 
+def is_interactive() -> bool:
+    """Tells whether both stdin and stdout are terminals, so the search picker can be shown."""
+    return sys.stdin.isatty() and sys.stdout.isatty()
+
+def discard_standups(loading: Future) -> None:
+    """
+    Closes the standups a cancelled startup loaded but never used, so a
+    download still streaming releases its connection.
+    """
+    if loading.cancelled() or loading.exception() is not None or loading.result() is None:
+        return
+    standups, _ = loading.result()
+    close = getattr(standups, 'close', None)
+    if close is not None:
+        close()
+
 def get_table_item(standup, index):
     """Extract text from standups to display in table."""
-    return f"[b]({index+1}[/b])\n[yellow]{standup['name']}"
+    return f"[b]({index+1}[/b])\n[yellow]{standup.name}"
 
 class CLI:
 
@@ -44,59 +82,377 @@ class CLI:
         """
         event.current_buffer.insert_text('\n')
 
-    def __init__(self, api_client: APIClient, config_manager: ConfigManager):
+    def __init__(self, api_client: Optional['APIClient'], config_manager: ConfigManager,
+                 standup_cache: Optional[StandupCache] = None, outbox: Optional[Outbox] = None,
+                 recent_standups: Optional['RecentStandups'] = None, timings: bool = False,
+                 workspaces: Optional[List['Workspace']] = None, profile: str = DEFAULT_PROFILE):
         self.api_client = api_client
         self.config_manager = config_manager
+        self.standup_cache = standup_cache
+        self.outbox = outbox
+        self.recent_standups = recent_standups
+        self.timings = timings
+        self.workspaces = workspaces
+        self.profile = profile
+        self.timer = PhaseTimer()
 
-    def start(self) -> None:
+    def start(self, refresh: bool = False) -> None:
         """
         Entry point for the CLI. Manages the workflow of the standup reporting process.
-        """
-        try:
-            api_key = self.config_manager.get_api_key()
 
-        except APIKeyNotFoundError or InvalidAPIKeyError as e:
-            console.print("Please enter your API key. Get one here:")
-            console.print("https://app.geekbot.com/dashboard/api-webhooks", style="link https://app.geekbot.com/dashboard/api-webhooks")
-            api_key = Prompt.ask("API key: ", password=True)
-            self.config_manager.save_api_key(api_key)
+        Startup is pipelined: a background thread looks the API key up, opens
+        a connection and loads the standups while the picker's modules are
+        imported, and the outbox is flushed as soon as the key is known.
+        Errors from the background thread are raised here, and its result is
+        discarded if startup fails or is interrupted first.
+
+        With workspaces, the standups of every workspace are listed together
+        instead; see start_workspaces.
 
+        Args:
+            refresh: Whether to bypass the standup cache and re-fetch the list.
+        """
+        if self.workspaces:
+            self.start_workspaces(refresh)
+            return
+        self.timer = PhaseTimer()
+        credentials = Future()
+        cancelled = threading.Event()
+        loading = in_background(self.resolve_and_load, refresh, credentials, cancelled, name='geekbot-startup')
+        received = False
         try:
-            self.api_client.set_headers(api_key)
-            standups = self.api_client.get_standups()
+            with self.timer.phase('ui'):
+                self.prepare_ui()
+            try:
+                api_key = credentials.result()
+            except (APIKeyNotFoundError, InvalidAPIKeyError):
+                console.print("Please enter your API key. Get one here:")
+                console.print("https://app.geekbot.com/dashboard/api-webhooks", style="link https://app.geekbot.com/dashboard/api-webhooks")
+                api_key = Prompt.ask("API key: ", password=True)
+                self.config_manager.save_api_key(api_key)
+                self.api_client.set_headers(api_key)
+                loading = in_background(self.load_in_background, api_key, refresh, cancelled, name='geekbot-startup')
+
+            with self.timer.phase('outbox'):
+                self.flush_outbox()
+            standups, revalidation = loading.result()
+            received = True
+            if self.timings:
+                click.echo(self.timer.summary(), err=True)
             selected_standup = self.select_standup(standups)
+            if selected_standup and revalidation is not None:
+                selected_standup = self.refresh_selection(selected_standup, revalidation)
             if selected_standup:
-                answers = self.input_answers(selected_standup['questions'])
-                report_response = self.send_report(selected_standup['id'], answers)
-                if report_response['done_at'] > 0:
-                    console.print(f"Report submitted successfully! Check #{report_response['channel']}", style="green")
-                else:
-                    console.print(f"Report could not be saved")
-                
+                self.submit_report(selected_standup, self.send_report, self.outbox)
             else:
                 console.print("No standup selected.", style="yellow")
         except StandupException as e:
             console.print(f"An error occurred: {e}", style="red")
+        finally:
+            if not received:
+                cancelled.set()
+                loading.add_done_callback(discard_standups)
+            transfer = getattr(self.api_client, 'transfer', None)
+            if self.timings and transfer is not None:
+                click.echo(transfer.summary(), err=True)
+
+    def start_workspaces(self, refresh: bool = False) -> None:
+        """
+        Lists the standups of every workspace in one picker, labelled with
+        their profile, and reports on the picked one through its workspace.
+
+        Each workspace's API key is looked up, its standups loaded and its
+        outbox flushed on a thread of its own, so waiting takes as long as the
+        slowest workspace rather than all of them in turn. The picker opens
+        right away and each workspace's standups appear as soon as they are
+        loaded. Workspaces that fail to load are reported and left out.
+
+        Args:
+            refresh: Whether to bypass the standup caches and re-fetch the lists.
+        """
+        from geekbot_cli.workspaces import merge_standups
+        self.timer = PhaseTimer()
+        loads = [(workspace, in_background(self.load_workspace, workspace, refresh,
+                                           name=f"geekbot-{workspace.profile}"))
+                 for workspace in self.workspaces]
+        skipped = []
+        try:
+            with self.timer.phase('ui'):
+                self.prepare_ui()
+            selected = self.select_standup(merge_standups(loads, skipped))
+            for workspace in self.workspaces:
+                if workspace.flushed and workspace.flushed['sent']:
+                    console.print(f"Sent {workspace.flushed['sent']} queued report(s) from the "
+                                  f"{workspace.profile} outbox.", style="green")
+            for reason in skipped:
+                console.print(f"Skipped workspace {reason}", style="yellow")
+            if selected is None:
+                console.print("No standup selected.", style="yellow")
+                return
+            workspace, standup = selected.workspace, selected.standup
+            if workspace.revalidation is not None:
+                standup = self.refresh_selection(standup, workspace.revalidation)
+
+            def send_report(standup_id, answers, idempotency_key):
+                return workspace.api_client.post_report(standup_id, answers, idempotency_key=idempotency_key)
+            self.submit_report(standup, send_report, workspace.outbox)
+        except StandupException as e:
+            console.print(f"An error occurred: {e}", style="red")
+        finally:
+            if self.timings:
+                click.echo(self.timer.summary(), err=True)
+                for workspace in self.workspaces:
+                    click.echo(f"{workspace.profile}: {workspace.api_client.transfer.summary()}", err=True)
 
-    def select_standup(self, standups: List[Dict]) -> Dict:
+    def load_workspace(self, workspace: 'Workspace', refresh: bool) -> List[Standup]:
         """
-        Displays a list of standups and prompts the user to select one.
+        Authorizes a workspace's client, loads its standups in full and
+        flushes its outbox. Runs in the background, one thread per workspace.
+
+        The stale-cache revalidation and the outbox statistics are left on the
+        workspace.
+
+        Returns:
+            The workspace's standups.
+        """
+        with self.timer.phase(f"standups:{workspace.profile}"):
+            api_key = workspace.config_manager.get_api_key()
+            workspace.api_client.set_headers(api_key)
+            loader = CLI(workspace.api_client, workspace.config_manager, workspace.standup_cache)
+            standups, workspace.revalidation = loader.load_standups(api_key, refresh)
+            standups = list(standups)
+        if workspace.outbox is not None and workspace.outbox.depth():
+            workspace.flushed = workspace.outbox.flush(workspace.api_client, max_attempts=1)
+        return standups
+
+    def submit_report(self, standup: Standup, send_report, outbox: Optional[Outbox]) -> None:
+        """
+        Asks the standup's questions and sends the answers, keeping them in the
+        outbox if the service cannot be reached.
 
         Args:
-            standups: A list of standup dictionaries.
+            standup: The standup to report on.
+            send_report: Called as send_report(standup_id, answers, idempotency_key).
+            outbox: Where the report is queued on transient errors, if anywhere.
+        """
+        answers = self.input_answers(standup.questions)
+        idempotency_key = new_idempotency_key()
+        try:
+            report_response = send_report(standup.id, answers, idempotency_key)
+        except TRANSIENT_ERRORS as e:
+            if outbox is None:
+                raise
+            outbox.enqueue(standup.id, answers, idempotency_key, error=str(e))
+            console.print("Geekbot could not be reached, so your report was saved to the outbox. "
+                          "It will be sent on the next run or with `geekbot outbox flush`.", style="yellow")
+            return
+        if report_response['done_at'] > 0:
+            console.print(f"Report submitted successfully! Check #{report_response['channel']}", style="green")
+        else:
+            console.print(f"Report could not be saved")
+
+    def resolve_and_load(self, refresh: bool, credentials: Future, cancelled: threading.Event) -> Tuple[Iterable[Standup], Optional[Future]]:
+        """
+        Looks the API key up and authorizes the client with it, then loads the
+        standups. Runs in the background during startup.
+
+        Args:
+            refresh: Whether to bypass the standup cache.
+            credentials: Resolved with the API key once the client is
+                authorized, or with the error that prevented it.
+            cancelled: Set when startup no longer needs the standups.
+
+        Returns:
+            The result of load_standups, or None if cancelled.
+        """
+        try:
+            with self.timer.phase('credentials'):
+                api_key = self.config_manager.get_api_key()
+                self.api_client.set_headers(api_key)
+        except BaseException as e:
+            credentials.set_exception(e)
+            raise
+        credentials.set_result(api_key)
+        return self.load_in_background(api_key, refresh, cancelled)
+
+    def load_in_background(self, api_key: str, refresh: bool, cancelled: threading.Event) -> Tuple[Iterable[Standup], Optional[Future]]:
+        """
+        Loads the standups while a connection for the report is opened
+        alongside. Runs in the background during startup.
 
         Returns:
-            The selected standup dictionary or None if no selection is made.
+            The result of load_standups, or None if cancelled.
+        """
+        if cancelled.is_set():
+            return None
+        in_background(self.warm_up, name='geekbot-connect')
+        with self.timer.phase('standups'):
+            return self.load_standups(api_key, refresh)
+
+    def warm_up(self) -> None:
+        """
+        Opens a connection to the service ahead of the first request.
+        """
+        with self.timer.phase('connect'):
+            self.api_client.warm_up()
+
+    def prepare_ui(self) -> None:
+        """
+        Imports what the standup picker needs, while the standups load.
+        """
+        if is_interactive():
+            from geekbot_cli.picker import import_prompt_toolkit
+            import_prompt_toolkit()
+
+    def flush_outbox(self) -> None:
+        """
+        Sends reports left in the outbox by earlier runs, without retrying, so
+        a still-unavailable service does not hold up the prompt.
+        """
+        if self.outbox is None or not self.outbox.depth():
+            return
+        stats = self.outbox.flush(self.api_client, max_attempts=1)
+        if stats['sent']:
+            console.print(f"Sent {stats['sent']} queued report(s) from the outbox.", style="green")
+        if stats['failed']:
+            console.print(f"{stats['failed']} queued report(s) were rejected; see `geekbot outbox status`.", style="red")
+        if stats['remaining']:
+            console.print(f"{stats['remaining']} report(s) are still waiting in the outbox.", style="yellow")
+
+    def load_standups(self, api_key: str, refresh: bool = False) -> Tuple[Iterable[Standup], Optional[Future]]:
+        """
+        Loads the standups, serving them from the cache when possible.
+
+        A fresh cache entry is used as is. A stale one is returned right away
+        while it is revalidated in the background (stale-while-revalidate).
+        Otherwise the list is downloaded and returned as an iterator that
+        parses each standup as soon as it arrives, so the picker can start
+        rendering before the download ends.
+
+        Args:
+            api_key: The API key the client is authorized with.
+            refresh: Whether to bypass the cache and re-fetch the list.
+
+        Returns:
+            A (standups, revalidation) tuple. standups is a list or an iterator
+            of Standup instances. revalidation is a Future resolving to the
+            up-to-date standups, or None if standups is already current.
+        """
+        if self.standup_cache is None:
+            standups, _, _ = self.api_client.stream_standups()
+            return standups, None
+        entry = None if refresh else self.standup_cache.load(api_key)
+        if entry is None:
+            return self.stream_into_cache(api_key), None
+        if self.standup_cache.is_fresh(entry):
+            return Standup.from_dicts(entry['standups']), None
+        executor = ThreadPoolExecutor(max_workers=1)
+        revalidation = executor.submit(self.standup_cache.fetch, self.api_client, api_key)
+        executor.shutdown(wait=False)
+        return Standup.from_dicts(entry['standups']), revalidation
+
+    def stream_into_cache(self, api_key: str) -> Iterator[Standup]:
+        """
+        Streams the standups from the service and caches them once the whole
+        list has been received.
+
+        The request is sent before this returns, so errors surface right away.
+
+        Args:
+            api_key: The API key the client is authorized with.
+
+        Returns:
+            An iterator of Standup instances.
+        """
+        standups, etag, last_modified = self.api_client.stream_standups()
+
+        def caching() -> Iterator[Standup]:
+            received = []
+            for standup in standups:
+                received.append(standup)
+                yield standup
+            self.standup_cache.store(api_key, received, etag, last_modified)
+        return caching()
+
+    def refresh_selection(self, selected_standup: Standup, revalidation: Future) -> Standup:
+        """
+        Swaps a standup picked from a stale cache for its revalidated version,
+        so answers are collected against the current questions.
+
+        Args:
+            selected_standup: The standup picked from the cached list.
+            revalidation: The Future returned by load_standups.
+
+        Returns:
+            The up-to-date standup, or the cached one if revalidation
+            failed or the standup is no longer listed.
+        """
+        try:
+            standups = revalidation.result()
+        except StandupException:
+            return selected_standup
+        for standup in standups:
+            if standup.id == selected_standup.id:
+                return standup
+        return selected_standup
+
+    def select_standup(self, standups: Iterable[Standup]) -> Optional[Standup]:
+        """
+        Lets the user select a standup.
+
+        On a terminal, a picker narrows the list as the user types, with
+        recently used standups first. Otherwise the standups are numbered and
+        the user is prompted for a number.
+
+        Args:
+            standups: A list or iterator of Standup instances. Standups from an
+                iterator are shown as they arrive.
+
+        Returns:
+            The selected Standup or None if no selection is made.
+        """
+        if not is_interactive():
+            return self.prompt_standup(standups)
+        from geekbot_cli.picker import pick_standup
+        recent = self.recent_standups.load() if self.recent_standups is not None else []
+        with tracing.span('ui.pick_standup') as pick_span:
+            if self.workspaces:
+                from geekbot_cli.workspaces import recent_key
+                selected_standup = pick_standup(standups, recent, key=recent_key)
+            else:
+                selected_standup = pick_standup(
+                    standups, [standup_id for profile, standup_id in recent if profile == self.profile]
+                )
+            pick_span.set('selected', selected_standup is not None)
+        if selected_standup is not None:
+            console.print("Starting [i]" + selected_standup.name + "[/i]")
+            url = "https://app.geekbot.com/dashboard/w/" + str(selected_standup.id)
+            console.print(url, style="link " + url)
+            if self.recent_standups is not None:
+                profile = selected_standup.workspace.profile if self.workspaces else self.profile
+                self.recent_standups.touch(profile, selected_standup.id)
+        return selected_standup
+
+    def prompt_standup(self, standups: Iterable[Standup]) -> Optional[Standup]:
+        """
+        Displays the numbered standups and prompts the user for a number.
+
+        Args:
+            standups: A list or iterator of Standup instances. Standups from an
+                iterator are shown row by row as they arrive.
+
+        Returns:
+            The selected Standup or None if no selection is made.
         """
         console.print("Please select a standup to report on:", style="bold")
-        renderables = [Panel(get_table_item(standup, index), expand=True) for index, standup in enumerate(standups)]
-        console.print(Columns(renderables))
-        selected_index = Prompt.ask("Enter the number of the standup", default="0", show_choices=False)
+        standups = self.render_standups(standups)
+        with tracing.span('ui.prompt_standup'):
+            selected_index = Prompt.ask("Enter the number of the standup", default="0", show_choices=False)
         try:
             selected_index = int(selected_index) - 1
-            name = standups[selected_index]['name']
+            name = standups[selected_index].name
             console.print("Starting [i]" + name + "[/i]")
-            url = "https://app.geekbot.com/dashboard/w/" + str(standups[selected_index]['id'])
+            url = "https://app.geekbot.com/dashboard/w/" + str(standups[selected_index].id)
             console.print(url, style="link " + url)
             if 0 <= selected_index <= len(standups):
                 return standups[selected_index]
@@ -104,52 +460,80 @@ class CLI:
             console.print("Invalid selection. Please enter a number.", style="red")
         return None
 
-    def input_answers(self, questions: List[Dict]) -> List[Dict]:
+    def render_standups(self, standups: Iterable[Standup]) -> List[Standup]:
+        """
+        Prints a panel per standup, one row at a time, as soon as a row is full.
+
+        Returns:
+            The rendered standups, in order.
+        """
+        with tracing.span('ui.render_standups') as render_span:
+            rendered = []
+            row = []
+            row_width = 0
+            for standup in standups:
+                # Content, plus borders and padding, plus the gap between columns.
+                width = max(cell_len(f"({len(rendered) + 1})"), cell_len(standup.name)) + 5
+                if row and row_width + width > console.width:
+                    console.print(Columns(row))
+                    row, row_width = [], 0
+                row.append(Panel(get_table_item(standup, len(rendered)), expand=True))
+                row_width += width
+                rendered.append(standup)
+            if row:
+                console.print(Columns(row))
+            render_span.set('standups', len(rendered))
+        return rendered
+
+    def input_answers(self, questions: List[Question]) -> Dict:
         """
         Prompts the user to answer each question for the selected standup.
 
         Args:
-            questions: A list of question dictionaries.
+            questions: The Question instances of the selected standup.
 
         Returns:
-            A list of answer dictionaries.
+            Answer dictionaries keyed by question id.
         """
         answers = {}
         for question in questions:
-            console.print("[#" + question['color'] + "]| [/#" + question['color'] + "]" + question['text'], style="bold")
-            if question['answer_type'] == 'text' or question['answer_type'] == 'numeric':
-                answer = get_multiline_input(question['color'], question['answer_type'])
-            elif question['answer_type'] == 'multiple_choice':
-                # todo: This method will create a fullscreen window in order to get user's selection
-                #  It should be displayed right after the question
-                #  If this isn't possible, here is an alternative approach: https://python-prompt-toolkit.readthedocs.io/en/master/pages/asking_for_input.html#autocompletion
-                dialog_choices = []
-                for q in question['answer_choices']:
-                    dialog_choices.append((q, q))
-
-                answer = radiolist_dialog(
-                    title="Choose one",
-                    text=question['text'],
-                    values=dialog_choices
-                ).run()
-            else:
-                # todo: raise exception
-                console.print("Unhandled question type: " + question['answer_type'])
-            answers[question['id']] ={'text': answer}
+            with tracing.span('ui.answer', {'question_id': question.id, 'answer_type': question.answer_type}):
+                console.print("[#" + question.color + "]| [/#" + question.color + "]" + question.text, style="bold")
+                if question.answer_type == 'text' or question.answer_type == 'numeric':
+                    answer = get_multiline_input(question.color, question.answer_type)
+                elif question.answer_type == 'multiple_choice':
+                    # todo: This method will create a fullscreen window in order to get user's selection
+                    #  It should be displayed right after the question
+                    #  If this isn't possible, here is an alternative approach: https://python-prompt-toolkit.readthedocs.io/en/master/pages/asking_for_input.html#autocompletion
+                    dialog_choices = []
+                    for q in question.answer_choices:
+                        dialog_choices.append((q, q))
+
+                    # Looked up through the module so the lazy import above kicks in
+                    answer = sys.modules[__name__].radiolist_dialog(
+                        title="Choose one",
+                        text=question.text,
+                        values=dialog_choices
+                    ).run()
+                else:
+                    # todo: raise exception
+                    console.print("Unhandled question type: " + question.answer_type)
+                answers[question.id] ={'text': answer}
         return answers
 
-    def send_report(self, standup_id: int, answers: List[Dict]) -> Dict:
+    def send_report(self, standup_id: int, answers: List[Dict], idempotency_key: Optional[str] = None) -> Dict:
         """
         Sends the standup report to the service.
 
         Args:
             standup_id: The ID of the standup to report on.
             answers: A list of answer dictionaries.
+            idempotency_key: The key that deduplicates resends of this report.
 
         Returns:
             A dictionary containing the response from the service.
         """
-        return self.api_client.post_report(standup_id, answers)
+        return self.api_client.post_report(standup_id, answers, idempotency_key=idempotency_key)
 
 @click.command()
 @click.version_option(version='1.0.0')
@@ -157,9 +541,11 @@ def main():
     """
     The main function that sets up the CLI and starts the interaction.
     """
+    from geekbot_cli.api_client import APIClient
+    from geekbot_cli.picker import RecentStandups
     api_client = APIClient()
     config_manager = ConfigManager()
-    cli = CLI(api_client, config_manager)
+    cli = CLI(api_client, config_manager, recent_standups=RecentStandups())
     cli.start()
 
 if __name__ == '__main__':
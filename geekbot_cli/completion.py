@@ -0,0 +1,178 @@
+## completion.py
+import os
+import sys
+from typing import Iterable, List, Optional, Tuple
+from geekbot_cli.atomic import atomic_write
+from geekbot_cli.paths import DEFAULT_PROFILE, standup_cache_path
+
+# Shell completion runs on every <TAB>, so it must answer in milliseconds.
+# `geekbot-complete` therefore imports nothing but the standard library
+# modules above: no click, requests, rich or keyring, and no network. Standup
+# ids and names come from a small index that StandupCache rewrites whenever
+# it stores a standup list, next to the cache file.
+
+# The `geekbot` subcommands, kept in step with main.py by the tests.
+COMMANDS = ('completion', 'daemon', 'export', 'loadtest', 'outbox', 'profile', 'report', 'search', 'submit',
+            'sync')
+
+# Options of `geekbot` itself that take a value, and so are not a subcommand.
+VALUE_OPTIONS = ('--profile', '--trace', '--trace-format')
+
+INDEX_SUFFIX = '.completion'
+
+BASH_SCRIPT = r'''# geekbot bash completion; add to ~/.bashrc: eval "$(geekbot completion bash)"
+_geekbot_complete() {
+    local IFS=$'\n'
+    COMPREPLY=($(geekbot-complete -- "${COMP_WORDS[@]:1:COMP_CWORD}" 2>/dev/null | cut -f1))
+}
+complete -o default -F _geekbot_complete geekbot
+'''
+
+ZSH_SCRIPT = r'''#compdef geekbot
+# geekbot zsh completion; add to ~/.zshrc: eval "$(geekbot completion zsh)"
+_geekbot_complete() {
+    local -a values descriptions
+    local line
+    for line in "${(@f)$(geekbot-complete -- "${(@)words[2,CURRENT]}" 2>/dev/null)}"; do
+        [[ -n $line ]] || continue
+        values+=("${line%%$'\t'*}")
+        descriptions+=("${line/$'\t'/  -- }")
+    done
+    if (( ${#values} )); then
+        compadd -U -l -d descriptions -a values
+    else
+        _files
+    fi
+}
+compdef _geekbot_complete geekbot
+'''
+
+FISH_SCRIPT = r'''# geekbot fish completion; save as ~/.config/fish/completions/geekbot.fish
+complete -c geekbot -a '(geekbot-complete -- (commandline -opc)[2..-1] (commandline -ct) 2>/dev/null)'
+'''
+
+SCRIPTS = {'bash': BASH_SCRIPT, 'zsh': ZSH_SCRIPT, 'fish': FISH_SCRIPT}
+
+
+def index_path(profile: str = DEFAULT_PROFILE) -> str:
+    """
+    Returns the completion index of a profile's standup cache.
+    """
+    return os.path.splitext(standup_cache_path(profile))[0] + INDEX_SUFFIX
+
+
+def write_index(path: str, standups: Iterable[Tuple[int, str]]) -> None:
+    """
+    Replaces a completion index atomically.
+
+    Args:
+        path: The index file.
+        standups: (id, name) pairs. Tabs and line breaks in names become spaces.
+    """
+    lines = []
+    for standup_id, name in standups:
+        lines.append(f"{int(standup_id)}\t{' '.join(str(name).split())}\n")
+    atomic_write(path, ''.join(lines))
+
+
+def read_index(path: str) -> List[Tuple[str, str]]:
+    """
+    Reads a completion index.
+
+    Returns:
+        (id, name) pairs as strings, or an empty list if there is no index.
+    """
+    try:
+        with open(path, encoding='utf-8') as index_file:
+            return [tuple(line.rstrip('\n').split('\t', 1)) for line in index_file if '\t' in line]
+    except OSError:
+        return []
+
+
+def complete_standups(prefix: str, standups: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """
+    Matches a typed word against standup ids, or against the words of their
+    names when it is not a number. Either way the standup id is the completion.
+
+    Returns:
+        (id, name) pairs to offer.
+    """
+    if not prefix or prefix.isdigit():
+        return [standup for standup in standups if standup[0].startswith(prefix)]
+    prefix = prefix.casefold()
+    return [standup for standup in standups
+            if any(word.startswith(prefix) for word in standup[1].casefold().split())]
+
+
+def complete(words: List[str]) -> List[Tuple[str, str]]:
+    """
+    Completes a `geekbot` command line.
+
+    Args:
+        words: The words after `geekbot` up to the cursor, the last one being
+            the word under the cursor (empty if the cursor follows a space).
+
+    Returns:
+        (completion, description) pairs.
+    """
+    *previous, current = words or ['']
+    # Bash splits `--standup=12` into `--standup`, `=` and `12`.
+    if previous and previous[-1] == '=':
+        previous = previous[:-1]
+    elif current.startswith('--standup=') or current.startswith('--profile='):
+        option, _, current = current.partition('=')
+        previous = previous + [option]
+
+    profile = os.environ.get('GEEKBOT_PROFILE') or 'default'
+    command = None
+    expects_value = False
+    for word in previous:
+        if expects_value:
+            expects_value = False
+        elif word in VALUE_OPTIONS:
+            expects_value = True
+        elif command is None and not word.startswith('-'):
+            command = word
+    for option, value in zip(previous, previous[1:]):
+        if option == '--profile':
+            profile = value
+
+    last = previous[-1] if previous else None
+    if last == '--standup':
+        return complete_standups(current, read_index(index_path(profile)))
+    if last == '--profile':
+        return [(name, 'profile') for name in ['default'] + read_profiles() if name.startswith(current)]
+    if command is None and not expects_value and not current.startswith('-'):
+        return [(name, 'command') for name in COMMANDS if name.startswith(current)]
+    return []
+
+
+def read_profiles() -> List[str]:
+    """
+    Returns the named profiles, read like ConfigManager.profiles() does.
+    """
+    import json
+    base = os.environ.get('XDG_CONFIG_HOME') or os.path.join(os.path.expanduser('~'), '.config')
+    try:
+        with open(os.path.join(base, 'geekbot-cli', 'profiles.json'), encoding='utf-8') as profiles_file:
+            names = json.load(profiles_file)
+    except (OSError, ValueError):
+        return []
+    return [name for name in names if isinstance(name, str)] if isinstance(names, list) else []
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Entry point of `geekbot-complete`, called by the completion scripts as
+    `geekbot-complete -- WORD...`. Prints one `completion<TAB>description`
+    line per candidate.
+    """
+    args = sys.argv[1:] if argv is None else argv
+    if args[:1] == ['--']:
+        args = args[1:]
+    sys.stdout.write(''.join(f"{value}\t{description}\n" for value, description in complete(args)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
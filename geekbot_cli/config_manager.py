@@ -1,32 +1,143 @@
-import keyring
+## config_manager.py
+from geekbot_cli import tracing
+from geekbot_cli.atomic import atomic_write
+from geekbot_cli.credentials import (
+    CredentialResolver,
+    default_config_dir,
+    default_resolvers,
+    profile_key_variable,
+    profile_resolvers
+)
 from geekbot_cli.exceptions import APIKeyNotFoundError
+from geekbot_cli.paths import DEFAULT_PROFILE
+from pathlib import Path
+from typing import Dict, List, Optional
+import json
+import re
 import sys
+import time
+
+_PROFILE_NAME = re.compile(r'[A-Za-z0-9][A-Za-z0-9_-]{0,31}')
+
+
+def default_profiles_file() -> Path:
+    """
+    Returns the file listing the named profiles.
+    """
+    return default_config_dir() / 'profiles.json'
+
+
+def is_valid_profile(name: str) -> bool:
+    """
+    Tells whether a profile name is safe to use in file names and environment variables.
+    """
+    return bool(_PROFILE_NAME.fullmatch(name))
+
 
 class ConfigManager:
     """
     Handles API key storage and retrieval using the system's secure key storage.
+
+    The API key is resolved through a chain of sources tried in order: the
+    GEEKBOT_API_KEY environment variable, a file descriptor or stdin, a
+    permission-checked key file and finally the keyring. The first key found
+    is kept for the lifetime of the manager, so the keyring is queried at
+    most once per session.
+
+    keyring is imported on first use; loading its backends is slow and most
+    commands never touch it.
+
+    Members of several workspaces keep one API key per named profile. A
+    profile's key comes from its own environment variable, key file or
+    keyring entry (see credentials.profile_resolvers), and the names of the
+    profiles with a saved key are listed in profiles.json.
     """
-    def __init__(self, service_name: str = 'Geekbot-CLI'):
+    def __init__(self, service_name: str = 'Geekbot-CLI', standup_cache=None,
+                 resolvers: Optional[List[CredentialResolver]] = None, profile: str = DEFAULT_PROFILE,
+                 profiles_path: Optional[Path] = None):
+        """
+        Initializes the configuration manager.
+
+        Args:
+            service_name: The keyring service the API key is stored under.
+            standup_cache: An optional StandupCache invalidated whenever the API key changes.
+            resolvers: The credential sources to try in order. Defaults to
+                env var, file descriptor, key file, keyring, or the profile's
+                own sources for a named profile.
+            profile: The profile whose API key is managed.
+            profiles_path: The file listing the named profiles. Defaults to
+                profiles.json in the user configuration directory.
+
+        Raises:
+            ValueError: If the profile name is not valid.
+        """
+        if not is_valid_profile(profile):
+            raise ValueError(f"Invalid profile name {profile!r}: use letters, digits, '-' and '_'.")
         self.service_name = service_name
+        self.standup_cache = standup_cache
+        self.profile = profile
+        self.profiles_path = Path(profiles_path) if profiles_path is not None else default_profiles_file()
+        if resolvers is None:
+            resolvers = (default_resolvers(service_name) if profile == DEFAULT_PROFILE
+                         else profile_resolvers(service_name, profile))
+        self.resolvers = resolvers
+        self.keyring_username = 'api_key' if profile == DEFAULT_PROFILE else f"api_key:{profile}"
+        self.api_key_source: Optional[str] = None
+        self.lookup_timings: Dict[str, float] = {}
+        self._api_key: Optional[str] = None
+        self._next_resolver = 0
 
     def get_api_key(self) -> str:
         """
-        Retrieves the API key from the system's secure key storage.
-        
+        Retrieves the API key from the first resolver that provides one.
+
         Returns:
             The API key if it exists, otherwise raises APIKeyNotFoundError.
-        
+
         Raises:
-            APIKeyNotFoundError: If the API key is not found in the keyring.
+            APIKeyNotFoundError: If no resolver provides an API key.
+            InsecureKeyFileError: If the key file is accessible by other users.
+            KeyFileError: If the key file is a directory or cannot be read.
             RuntimeError: If there is an error accessing the keyring.
         """
-        try:
-            api_key = keyring.get_password(self.service_name, 'api_key')
-            if api_key is None:
-                raise APIKeyNotFoundError("API key not found in keyring.")
-            return api_key
-        except keyring.errors.KeyringError as e:
-            raise RuntimeError(f"Error accessing keyring: {e}")
+        api_key = self.resolve_api_key()
+        if api_key is None:
+            raise APIKeyNotFoundError("API key not found in keyring.")
+        return api_key
+
+    def resolve_api_key(self, before: Optional[str] = None) -> Optional[str]:
+        """
+        Tries the resolvers in order until one provides the API key.
+
+        Sources that were tried are not tried again, so a key read from a
+        file descriptor is not lost when the lookup is resumed later.
+
+        Args:
+            before: The name of a resolver to stop at, e.g. 'keyring' to try
+                only the sources that are cheap to read.
+
+        Returns:
+            The API key, or None if the sources tried do not provide one.
+        """
+        if self._api_key is not None:
+            return self._api_key
+        while self._next_resolver < len(self.resolvers):
+            resolver = self.resolvers[self._next_resolver]
+            if resolver.name == before:
+                return None
+            start = time.perf_counter()
+            try:
+                with tracing.span('credentials.resolve', {'resolver': resolver.name}) as resolve_span:
+                    api_key = resolver.resolve()
+                    resolve_span.set('found', bool(api_key))
+            finally:
+                self.lookup_timings[resolver.name] = time.perf_counter() - start
+            self._next_resolver += 1
+            if api_key:
+                self._api_key = api_key
+                self.api_key_source = resolver.name
+                return api_key
+        return None
 
     def save_api_key(self, api_key: str) -> None:
         """
@@ -38,20 +149,72 @@ class ConfigManager:
         Raises:
             RuntimeError: If there is an error accessing the keyring.
         """
+        import keyring
         try:
-            keyring.set_password(self.service_name, 'api_key', api_key)
+            keyring.set_password(self.service_name, self.keyring_username, api_key)
         except keyring.errors.KeyringError as e:
             raise RuntimeError(f"Error accessing keyring: {e}")
-        
-    def delete_api_key(self, username: str = 'api_key') -> None:
+        self._api_key = api_key
+        self.api_key_source = 'keyring'
+        self._invalidate_cache()
+        if self.profile != DEFAULT_PROFILE and self.profile not in self.profiles():
+            self._write_profiles(self.profiles() + [self.profile])
+
+    def delete_api_key(self, username: Optional[str] = None) -> None:
         """
         Deletes a stored API key from the system's keyring.
 
         Args:
-            username (str): The username or key identifier. Defaults to 'api_key'.
+            username (str): The username or key identifier. Defaults to the profile's.
         """
+        import keyring
         try:
-            keyring.delete_password(self.service_name, username)
+            keyring.delete_password(self.service_name, username or self.keyring_username)
         except Exception as e:
             print(f"Failed to remove the key: {e}")
             sys.exit(1)
+        self._api_key = None
+        self.api_key_source = None
+        self._next_resolver = 0
+        self._invalidate_cache()
+        if self.profile != DEFAULT_PROFILE and self.profile in self.profiles():
+            self._write_profiles([name for name in self.profiles() if name != self.profile])
+
+    def profiles(self) -> List[str]:
+        """
+        Returns the names of the profiles with a saved API key, in the order they were added.
+        """
+        try:
+            with open(self.profiles_path, encoding='utf-8') as profiles_file:
+                names = json.load(profiles_file)
+        except (OSError, ValueError):
+            return []
+        if not isinstance(names, list):
+            return []
+        return [name for name in names if isinstance(name, str) and is_valid_profile(name)]
+
+    def clashing_profile(self, name: str) -> Optional[str]:
+        """
+        Returns the saved profile that a new profile NAME would share its
+        environment variable with, e.g. work-1 for work_1 or Work for work,
+        or None if there is none.
+        """
+        variable = profile_key_variable(name)
+        return next((other for other in self.profiles()
+                     if other != name and profile_key_variable(other) == variable), None)
+
+    def for_profile(self, profile: str, standup_cache=None) -> 'ConfigManager':
+        """
+        Returns a configuration manager for another profile, sharing the keyring service and profile list.
+        """
+        return ConfigManager(self.service_name, standup_cache, profile=profile, profiles_path=self.profiles_path)
+
+    def _write_profiles(self, names: List[str]) -> None:
+        atomic_write(self.profiles_path, json.dumps(names))
+
+    def _invalidate_cache(self) -> None:
+        """
+        Drops data cached under the previous API key.
+        """
+        if self.standup_cache is not None:
+            self.standup_cache.invalidate()
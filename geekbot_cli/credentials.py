@@ -0,0 +1,194 @@
+## credentials.py
+import os
+import stat
+from pathlib import Path
+from typing import List, Optional
+from geekbot_cli.exceptions import InsecureKeyFileError, KeyFileError
+
+API_KEY_ENV = 'GEEKBOT_API_KEY'
+API_KEY_FD_ENV = 'GEEKBOT_API_KEY_FD'
+API_KEY_FILE_ENV = 'GEEKBOT_API_KEY_FILE'
+
+
+def default_config_dir() -> Path:
+    """
+    Returns the per-user configuration directory, honouring XDG_CONFIG_HOME.
+    """
+    base = os.environ.get('XDG_CONFIG_HOME') or os.path.join(os.path.expanduser('~'), '.config')
+    return Path(base) / 'geekbot-cli'
+
+
+def default_key_file(profile: Optional[str] = None) -> Path:
+    """
+    Returns the default API key file, or that of a named profile.
+    """
+    return default_config_dir() / (f"api_key.{profile}" if profile else 'api_key')
+
+
+def profile_key_variable(profile: str) -> str:
+    """
+    Returns the environment variable holding a named profile's API key,
+    e.g. GEEKBOT_API_KEY_WORK for the profile work.
+    """
+    return f"{API_KEY_ENV}_{profile.upper().replace('-', '_')}"
+
+
+class CredentialResolver:
+    """
+    A single source the API key can be read from.
+
+    Subclasses return the key from resolve(), or None if their source does
+    not provide one so the next resolver in the chain is tried.
+    """
+    name = 'resolver'
+
+    def resolve(self) -> Optional[str]:
+        raise NotImplementedError
+
+
+class EnvResolver(CredentialResolver):
+    """
+    Reads the API key from an environment variable.
+    """
+    name = 'env'
+
+    def __init__(self, variable: str = API_KEY_ENV):
+        self.variable = variable
+
+    def resolve(self) -> Optional[str]:
+        return os.environ.get(self.variable) or None
+
+
+class FileDescriptorResolver(CredentialResolver):
+    """
+    Reads the API key from the first line of an inherited file descriptor.
+
+    The descriptor number comes from GEEKBOT_API_KEY_FD; 0 reads the key from
+    stdin, e.g. `pass geekbot | GEEKBOT_API_KEY_FD=0 geekbot`. Descriptors other
+    than the standard streams are closed after reading.
+
+    The line is read unbuffered, a byte at a time, so nothing after it is
+    consumed: with GEEKBOT_API_KEY_FD=0 the rest of stdin is left for the
+    command, e.g. the answers piped to `geekbot report`.
+    """
+    name = 'fd'
+
+    def __init__(self, fd: Optional[int] = None, variable: str = API_KEY_FD_ENV):
+        self.fd = fd
+        self.variable = variable
+
+    def resolve(self) -> Optional[str]:
+        fd = self.fd
+        if fd is None:
+            value = os.environ.get(self.variable)
+            if not value:
+                return None
+            try:
+                fd = int(value)
+            except ValueError:
+                return None
+        line = bytearray()
+        try:
+            while True:
+                byte = os.read(fd, 1)
+                if not byte or byte == b'\n':
+                    break
+                line += byte
+        except OSError:
+            return None
+        finally:
+            if fd > 2:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        return line.decode('utf-8', errors='replace').strip() or None
+
+
+class KeyFileResolver(CredentialResolver):
+    """
+    Reads the API key from a file that only its owner can access.
+
+    The path comes from GEEKBOT_API_KEY_FILE and defaults to
+    ~/.config/geekbot-cli/api_key. Like ssh, a file readable by group or
+    others, or owned by another user, is refused rather than silently used.
+    """
+    name = 'file'
+
+    def __init__(self, path: Optional[Path] = None, variable: str = API_KEY_FILE_ENV):
+        self.path = path
+        self.variable = variable
+
+    def resolve(self) -> Optional[str]:
+        path = self.path or Path(os.environ.get(self.variable) or default_key_file())
+        try:
+            with open(path, encoding='utf-8') as key_file:
+                info = os.fstat(key_file.fileno())
+                if hasattr(os, 'getuid'):
+                    if info.st_uid != os.getuid():
+                        raise InsecureKeyFileError(f"API key file {path} is owned by another user.")
+                    if stat.S_IMODE(info.st_mode) & 0o077:
+                        raise InsecureKeyFileError(
+                            f"API key file {path} is accessible by other users; run `chmod 600 {path}`."
+                        )
+                api_key = key_file.readline().strip()
+        except FileNotFoundError:
+            return None
+        except IsADirectoryError:
+            raise KeyFileError(f"API key file {path} is a directory.")
+        except PermissionError:
+            raise KeyFileError(f"API key file {path} is not readable; check its permissions.")
+        return api_key or None
+
+
+class KeyringResolver(CredentialResolver):
+    """
+    Reads the API key from the system's secure key storage.
+
+    keyring is imported on first use; loading its backends is slow and, with
+    the Secret Service backend, may block on D-Bus.
+    """
+    name = 'keyring'
+
+    def __init__(self, service_name: str, username: str = 'api_key'):
+        self.service_name = service_name
+        self.username = username
+
+    def resolve(self) -> Optional[str]:
+        import keyring
+        try:
+            return keyring.get_password(self.service_name, self.username)
+        except keyring.errors.KeyringError as e:
+            raise RuntimeError(f"Error accessing keyring: {e}")
+
+
+def default_resolvers(service_name: str) -> List[CredentialResolver]:
+    """
+    Returns the default resolver chain, cheapest source first.
+
+    Args:
+        service_name: The keyring service the API key is stored under.
+    """
+    return [
+        EnvResolver(),
+        FileDescriptorResolver(),
+        KeyFileResolver(),
+        KeyringResolver(service_name)
+    ]
+
+
+def profile_resolvers(service_name: str, profile: str) -> List[CredentialResolver]:
+    """
+    Returns the resolver chain of a named profile: its environment variable
+    (see profile_key_variable), its key file ~/.config/geekbot-cli/api_key.<profile>
+    and its keyring entry.
+
+    Args:
+        service_name: The keyring service the API key is stored under.
+        profile: The profile name.
+    """
+    return [
+        EnvResolver(profile_key_variable(profile)),
+        KeyFileResolver(default_key_file(profile)),
+        KeyringResolver(service_name, f"api_key:{profile}")
+    ]
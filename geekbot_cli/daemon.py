@@ -0,0 +1,463 @@
+## daemon.py
+import hmac
+import json
+import os
+import socket
+import stat
+import struct
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from geekbot_cli import exceptions
+from geekbot_cli.cache import key_fingerprint
+from geekbot_cli.exceptions import DaemonError, StandupAPIError, StandupConnectionError, StandupException
+from geekbot_cli.models import Standup
+
+# The client side of this module only needs the standard library, so a warm
+# `geekbot` run never imports requests or keyring; socketserver is imported by
+# the daemon itself.
+
+# Seconds the daemon serves its standups before revalidating them.
+DEFAULT_TTL = 300
+
+# Seconds without a request after which the daemon exits.
+DEFAULT_IDLE_TIMEOUT = 8 * 60 * 60
+
+# Seconds a client waits for an answer, long enough for a retried request.
+CLIENT_TIMEOUT = 120
+
+# Stands in for the API key in the client process; the key itself stays in the daemon.
+DELEGATED_API_KEY = 'daemon'
+
+
+def is_supported() -> bool:
+    """
+    Tells whether the platform has Unix domain sockets and user ids, which
+    the daemon relies on to keep its socket private; Windows has neither.
+    """
+    return hasattr(socket, 'AF_UNIX') and hasattr(os, 'getuid')
+
+
+def default_socket_path() -> Path:
+    """
+    Returns the per-user socket path, in XDG_RUNTIME_DIR when it is set.
+    """
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir:
+        return Path(runtime_dir) / 'geekbot-cli' / 'daemon.sock'
+    return Path(tempfile.gettempdir()) / f"geekbot-cli-{os.getuid()}" / 'daemon.sock'
+
+
+def is_private_directory(path: Path) -> bool:
+    """
+    Tells whether a directory is owned by the current user and closed to
+    everyone else, so nobody else can plant or reach a socket in it.
+    """
+    try:
+        info = os.lstat(path)
+    except OSError:
+        return False
+    return stat.S_ISDIR(info.st_mode) and info.st_uid == os.getuid() and not info.st_mode & 0o077
+
+
+def raise_error(response: Dict) -> None:
+    """
+    Re-raises an error reported by the daemon as the standup exception it was.
+    """
+    error_class = getattr(exceptions, response.get('error', ''), None)
+    if not (isinstance(error_class, type) and issubclass(error_class, StandupException)):
+        error_class = StandupAPIError
+    raise error_class(response.get('message') or 'The geekbot daemon failed.')
+
+
+class DaemonClient:
+    """
+    Sends requests to a running `geekbot daemon`.
+
+    It has the APIClient methods the interactive CLI uses, so it can take an
+    APIClient's place when the daemon is running. Requests from several
+    threads share one connection and are answered in turn.
+    """
+    def __init__(self, connection: socket.socket, refresh: bool = False):
+        """
+        Initializes the client.
+
+        Args:
+            connection: A socket connected to the daemon.
+            refresh: Whether the daemon should re-fetch the standups the first
+                time this client asks for them.
+        """
+        self._connection = connection
+        self._reader = connection.makefile('rb')
+        self._lock = threading.Lock()
+        self.refresh = refresh
+
+    @classmethod
+    def connect(cls, path: Optional[Path] = None, refresh: bool = False) -> Optional['DaemonClient']:
+        """
+        Connects to the daemon, if one is running.
+
+        Args:
+            path: The socket path. Defaults to default_socket_path().
+            refresh: Whether the daemon should re-fetch the standups.
+
+        Returns:
+            A DaemonClient, or None if no daemon is listening on a socket
+            only the current user can reach, or the platform has no daemon.
+        """
+        if not is_supported():
+            return None
+        path = Path(path) if path is not None else default_socket_path()
+        if not is_private_directory(path.parent):
+            return None
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.settimeout(CLIENT_TIMEOUT)
+        try:
+            connection.connect(str(path))
+        except OSError:
+            connection.close()
+            return None
+        return cls(connection, refresh)
+
+    def call(self, op: str, **params) -> object:
+        """
+        Sends one request and waits for its answer.
+
+        Args:
+            op: The operation, e.g. 'standups' or 'post_report'.
+            **params: The operation's parameters.
+
+        Returns:
+            The operation's result.
+
+        Raises:
+            StandupConnectionError: If the daemon cannot be reached any more.
+            StandupException: The error the daemon ran into.
+        """
+        message = json.dumps(dict(params, op=op)).encode('utf-8') + b'\n'
+        with self._lock:
+            try:
+                self._connection.sendall(message)
+                line = self._reader.readline()
+            except OSError as e:
+                raise StandupConnectionError(f"Lost the connection to the geekbot daemon: {e}")
+        if not line:
+            raise StandupConnectionError("The geekbot daemon closed the connection.")
+        response = json.loads(line)
+        if 'error' in response:
+            raise_error(response)
+        return response['result']
+
+    def close(self) -> None:
+        """
+        Closes the connection to the daemon.
+        """
+        self._reader.close()
+        self._connection.close()
+
+    def __enter__(self) -> 'DaemonClient':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def set_headers(self, api_key: str) -> None:
+        """
+        Does nothing: the daemon authorizes requests with its own API key.
+        """
+
+    def warm_up(self) -> bool:
+        """
+        Does nothing: the daemon's connection is already warm.
+        """
+        return True
+
+    def get_standups(self) -> List[Standup]:
+        """
+        Returns the standups the daemon holds, revalidated once they are stale.
+        """
+        refresh, self.refresh = self.refresh, False
+        return Standup.from_dicts(self.call('standups', refresh=refresh))
+
+    def stream_standups(self, chunk_size: Optional[int] = None):
+        """
+        Returns the standups like APIClient.stream_standups; the daemon already holds all of them.
+        """
+        return iter(self.get_standups()), None, None
+
+    def post_report(self, standup_id: int, answers: Dict, idempotency_key: Optional[str] = None,
+                    retry: bool = True) -> Dict:
+        """
+        Submits a report through the daemon's connection.
+        """
+        return self.call('post_report', standup_id=standup_id, answers=answers, idempotency_key=idempotency_key,
+                         retry=retry)
+
+    def holds_key(self, api_key: Optional[str]) -> bool:
+        """
+        Tells whether the daemon is authorized with this API key, so requests
+        it sends on the caller's behalf use the key the caller resolved. Only
+        the key's fingerprint is sent.
+
+        Args:
+            api_key: The caller's key, or None for the key currently saved in
+                the keyring, which the daemon looks up so the caller does not
+                have to load keyring.
+        """
+        fingerprint = key_fingerprint(api_key) if api_key is not None else None
+        try:
+            return self.call('holds_key', fingerprint=fingerprint) is True
+        except StandupException:
+            return False  # Gone, or a daemon that cannot tell.
+
+    def status(self) -> Dict:
+        """
+        Returns the daemon's pid, uptime, request count and number of standups held.
+        """
+        return self.call('status')
+
+    def stop(self) -> None:
+        """
+        Asks the daemon to exit.
+        """
+        self.call('stop')
+
+
+class DelegatedCredentials:
+    """
+    Stands in for the ConfigManager when the daemon holds the API key.
+    """
+    def get_api_key(self) -> str:
+        return DELEGATED_API_KEY
+
+
+class GeekbotDaemon:
+    """
+    Serves requests over a per-user Unix domain socket, keeping a warm
+    APIClient, the resolved API key and the standup list in memory.
+
+    The socket lives in a directory only the current user can access, and
+    connections from other users are refused as well where the platform
+    reports the peer's credentials.
+    """
+    def __init__(self, api_client, api_key: str, standup_cache=None, path: Optional[Path] = None,
+                 ttl: float = DEFAULT_TTL, idle_timeout: float = DEFAULT_IDLE_TIMEOUT, clock=time.monotonic,
+                 saved_key: Optional[Callable[[], Optional[str]]] = None):
+        """
+        Initializes the daemon.
+
+        Args:
+            api_client: The APIClient requests are sent with.
+            api_key: The API key, which the client is authorized with here.
+            standup_cache: An optional StandupCache kept in sync with the
+                standups the daemon fetches.
+            path: The socket path. Defaults to default_socket_path().
+            ttl: Seconds the standups are served before being revalidated.
+            idle_timeout: Seconds without a request after which serve() returns.
+            clock: Returns the current time in seconds.
+            saved_key: Looks up the key currently saved in the keyring, for
+                clients that have no key of their own to compare.
+
+        Raises:
+            DaemonError: If the platform has no Unix domain sockets.
+        """
+        if not is_supported():
+            raise DaemonError("The geekbot daemon needs Unix domain sockets, which this platform does not have.")
+        self.api_client = api_client
+        self.api_key = api_key
+        self.saved_key = saved_key
+        self.standup_cache = standup_cache
+        self.path = Path(path) if path is not None else default_socket_path()
+        self.ttl = ttl
+        self.idle_timeout = idle_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._standups_json = None
+        self._standup_count = 0
+        self._fetched_at = 0.0
+        self._started_at = clock()
+        self._last_request_at = clock()
+        self._stopping = threading.Event()
+        self.requests = 0
+        api_client.set_headers(api_key)
+
+    def handle(self, request: Dict) -> str:
+        """
+        Answers one request.
+
+        Args:
+            request: The decoded request, with an 'op' and its parameters.
+
+        Returns:
+            The JSON encoded response: {"result": ...}, or {"error": <exception
+            class name>, "message": ...} if the operation failed.
+        """
+        self._last_request_at = self._clock()
+        self.requests += 1
+        try:
+            op = request.get('op')
+            if op == 'standups':
+                # Sent as encoded once per fetch, not re-encoded per request.
+                return '{"result": ' + self.standups_json(bool(request.get('refresh'))) + '}'
+            if op == 'post_report':
+                result = self.api_client.post_report(
+                    request['standup_id'], request['answers'], idempotency_key=request.get('idempotency_key'),
+                    retry=request.get('retry', True)
+                )
+            elif op == 'holds_key':
+                result = self._holds_key(request['fingerprint'])
+            elif op == 'status':
+                result = {
+                    'pid': os.getpid(),
+                    'uptime': self._clock() - self._started_at,
+                    'requests': self.requests,
+                    'standups': self._standup_count
+                }
+            elif op == 'stop':
+                threading.Thread(target=self.stop, daemon=True).start()
+                result = None
+            else:
+                raise DaemonError(f"Unknown daemon operation: {op!r}")
+        except StandupException as e:
+            return json.dumps({'error': type(e).__name__, 'message': str(e)})
+        except (KeyError, TypeError) as e:
+            return json.dumps({'error': 'DaemonError', 'message': f"Malformed daemon request: {e}"})
+        return json.dumps({'result': result})
+
+    def _holds_key(self, fingerprint: Optional[str]) -> bool:
+        if fingerprint is None:
+            try:
+                saved_key = self.saved_key() if self.saved_key is not None else None
+            except RuntimeError:
+                return False
+            if saved_key is None:
+                return False
+            fingerprint = key_fingerprint(saved_key)
+        return hmac.compare_digest(str(fingerprint), key_fingerprint(self.api_key))
+
+    def standups_json(self, refresh: bool = False) -> str:
+        """
+        Returns the standups as a JSON array, fetching them on first use or
+        when a refresh is asked for. Stale standups are served as they are
+        while a background thread revalidates them.
+        """
+        with self._lock:
+            if self._standups_json is None or refresh:
+                self._store(*self._fetch_standups(refresh))
+            elif self._clock() - self._fetched_at >= self.ttl and not self._refreshing:
+                self._refreshing = True
+                threading.Thread(target=self._revalidate, name='geekbot-daemon-revalidate', daemon=True).start()
+            return self._standups_json
+
+    def _revalidate(self) -> None:
+        try:
+            # Fetched without the lock, so requests keep getting the stale
+            # standups meanwhile instead of waiting for the network.
+            standups_json, count = self._fetch_standups(False)
+            with self._lock:
+                self._store(standups_json, count)
+        except StandupException:
+            pass  # Keep serving the standups we have; the next request retries.
+        finally:
+            self._refreshing = False
+
+    def _fetch_standups(self, refresh: bool) -> Tuple[str, int]:
+        if self.standup_cache is not None:
+            standups = self.standup_cache.fetch(self.api_client, self.api_key, refresh=refresh)
+        else:
+            standups = self.api_client.get_standups()
+        return json.dumps([standup.to_dict() for standup in standups]), len(standups)
+
+    def _store(self, standups_json: str, count: int) -> None:
+        self._standups_json = standups_json
+        self._standup_count = count
+        self._fetched_at = self._clock()
+
+    def serve(self, ready: Optional[Callable[[], None]] = None) -> None:
+        """
+        Listens on the socket until stopped or idle for idle_timeout seconds.
+
+        Args:
+            ready: Called once the socket accepts connections.
+
+        Raises:
+            DaemonError: If another daemon is running or the socket directory
+                is not private.
+        """
+        server = self._bind()
+        if ready is not None:
+            ready()
+        try:
+            while not self._stopping.is_set():
+                server.handle_request()
+                if self._clock() - self._last_request_at >= self.idle_timeout:
+                    break
+        finally:
+            server.server_close()
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def stop(self) -> None:
+        """
+        Makes serve() return.
+        """
+        self._stopping.set()
+        # Wakes serve() up instead of leaving it waiting for its poll timeout.
+        wake_up = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            wake_up.connect(str(self.path))
+        except OSError:
+            pass
+        finally:
+            wake_up.close()
+
+    def _bind(self) -> 'socketserver.UnixStreamServer':
+        import socketserver
+        directory = self.path.parent
+        directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if not is_private_directory(directory):
+            raise DaemonError(f"{directory} must be a directory only you can access (chmod 700).")
+        if self.path.exists():
+            probe = DaemonClient.connect(self.path)
+            if probe is not None:
+                probe.close()
+                raise DaemonError(f"A geekbot daemon is already listening on {self.path}.")
+            self.path.unlink()  # Left behind by a daemon that did not exit cleanly.
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                if not daemon._same_user(self.connection):
+                    return
+                for line in self.rfile:
+                    try:
+                        request = json.loads(line)
+                    except ValueError:
+                        request = {}
+                    if not isinstance(request, dict):
+                        request = {}
+                    self.wfile.write(daemon.handle(request).encode('utf-8') + b'\n')
+
+        class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+            daemon_threads = True
+
+        umask = os.umask(0o177)
+        try:
+            server = Server(str(self.path), Handler)
+        finally:
+            os.umask(umask)
+        server.timeout = 1.0
+        return server
+
+    @staticmethod
+    def _same_user(connection: socket.socket) -> bool:
+        if not hasattr(socket, 'SO_PEERCRED'):
+            return True  # The private directory already keeps other users out.
+        credentials = connection.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize('3i'))
+        _, uid, _ = struct.unpack('3i', credentials)
+        return uid == os.getuid()
@@ -1,4 +1,6 @@
 ## exceptions.py
+from typing import Optional
+
 
 class StandupException(Exception):
     """
@@ -43,6 +45,104 @@ class StandupAPIError(StandupException):
 class StandupValidationError(StandupException):
     """
     Exception raised for validation errors when processing standup reports.
+
+    When the report was checked locally, errors lists a FieldError per mistake.
+    """
+    def __init__(self, message: str = "Validation error in standup report.", errors: Optional[list] = None):
+        super().__init__(message)
+        self.errors = errors or []
+
+
+class KeyFileError(StandupException):
+    """
+    Exception raised when the API key file exists but cannot be read.
+    """
+    def __init__(self, message: str = "API key file cannot be read."):
+        super().__init__(message)
+
+
+class InsecureKeyFileError(StandupException):
+    """
+    Exception raised when the API key file can be read by other users.
+    """
+    def __init__(self, message: str = "API key file is accessible by other users."):
+        super().__init__(message)
+
+
+class StandupServerError(StandupAPIError):
+    """
+    Exception raised when the service fails with a 5xx status.
+    """
+    def __init__(self, message: str = "The standup service failed to process the request."):
+        super().__init__(message)
+
+
+class StandupConnectionError(StandupAPIError):
+    """
+    Exception raised when the service cannot be reached or does not answer in time.
+    """
+    def __init__(self, message: str = "Could not connect to the standup service."):
+        super().__init__(message)
+
+
+class RateLimitedError(StandupAPIError):
+    """
+    Exception raised when the service keeps answering 429 Too Many Requests.
+    """
+    def __init__(self, message: str = "Rate limited by the standup service."):
+        super().__init__(message)
+
+
+class CircuitOpenError(StandupAPIError):
+    """
+    Exception raised without calling the service while it is considered down.
+    """
+    def __init__(self, message: str = "The standup service is unavailable."):
+        super().__init__(message)
+
+
+class DeadlineExceededError(StandupAPIError):
+    """
+    Exception raised when a command runs out of its overall time budget.
+    """
+    def __init__(self, message: str = "Deadline exceeded."):
+        super().__init__(message)
+
+
+class SearchQueryError(StandupException):
+    """
+    Exception raised when a search query cannot be parsed.
+    """
+    def __init__(self, message: str = "Invalid search query."):
+        super().__init__(message)
+
+
+class DaemonError(StandupException):
+    """
+    Exception raised when the geekbot daemon cannot start or serve a request.
+    """
+    def __init__(self, message: str = "The geekbot daemon failed."):
+        super().__init__(message)
+
+
+class TransportError(Exception):
+    """
+    Exception raised by a transport when a request cannot be completed.
+    APIClient maps it to the standup exceptions above.
+    """
+
+
+class TransportConnectionError(TransportError):
+    """
+    Exception raised by a transport when connecting fails, the connection
+    drops or the service does not answer in time.
+    """
+
+
+class HTTPStatusError(TransportError):
+    """
+    Exception raised by Response.raise_for_status for 4xx and 5xx responses.
     """
-    def __init__(self, message: str = "Validation error in standup report."):
+    def __init__(self, message: str, status_code: int):
         super().__init__(message)
+        self.status_code = status_code
@@ -0,0 +1,181 @@
+## export.py
+import csv
+import io
+import json
+import time
+from typing import BinaryIO, Dict, Iterable, Iterator, List
+
+# Columns of the flat, one-row-per-answer layout used by CSV and Parquet.
+ANSWER_COLUMNS = (
+    'report_id', 'standup_id', 'timestamp', 'user_id', 'username', 'channel',
+    'question_id', 'question', 'answer'
+)
+
+# Answers buffered before a Parquet row group is written.
+DEFAULT_ROW_GROUP_SIZE = 50_000
+
+
+def flatten_report(report: Dict) -> Iterator[Dict]:
+    """
+    Turns a report into one flat row per answer.
+
+    Args:
+        report: A report dictionary as returned by /v1/reports.
+
+    Yields:
+        Dictionaries with the keys in ANSWER_COLUMNS.
+    """
+    member = report.get('member') or {}
+    for question in report.get('questions') or []:
+        yield {
+            'report_id': report.get('id'),
+            'standup_id': report.get('standup_id'),
+            'timestamp': report.get('timestamp'),
+            'user_id': member.get('id'),
+            'username': member.get('username'),
+            'channel': report.get('channel'),
+            'question_id': question.get('question_id'),
+            'question': question.get('question'),
+            'answer': question.get('answer')
+        }
+
+
+class ExportWriter:
+    """
+    Writes batches of reports to a binary stream without holding more than
+    one batch, or one Parquet row group, in memory.
+    """
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+        self.rows = 0
+        self.bytes_written = 0
+
+    def write_batch(self, reports: List[Dict]) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        self.stream.flush()
+
+    def _write(self, data: bytes) -> None:
+        self.stream.write(data)
+        self.bytes_written += len(data)
+
+
+class NdjsonWriter(ExportWriter):
+    """
+    Writes one JSON report per line, exactly as returned by the service.
+    """
+    def write_batch(self, reports: List[Dict]) -> None:
+        self._write(''.join(json.dumps(report) + '\n' for report in reports).encode('utf-8'))
+        self.rows += len(reports)
+
+
+class CsvWriter(ExportWriter):
+    """
+    Writes one CSV row per answer, with a header row first.
+    """
+    def __init__(self, stream: BinaryIO):
+        super().__init__(stream)
+        self._buffer = io.StringIO()
+        self._writer = csv.DictWriter(self._buffer, fieldnames=ANSWER_COLUMNS)
+        self._writer.writeheader()
+
+    def write_batch(self, reports: List[Dict]) -> None:
+        for report in reports:
+            for row in flatten_report(report):
+                self._writer.writerow(row)
+                self.rows += 1
+        self._write(self._buffer.getvalue().encode('utf-8'))
+        self._buffer.seek(0)
+        self._buffer.truncate()
+
+
+class ParquetWriter(ExportWriter):
+    """
+    Writes one Parquet row per answer, in row groups of a fixed size.
+
+    Requires pyarrow, which is imported on first use.
+    """
+    def __init__(self, stream: BinaryIO, row_group_size: int = DEFAULT_ROW_GROUP_SIZE):
+        super().__init__(stream)
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("Parquet export requires pyarrow; install it with `pip install geekbot_cli[parquet]`.")
+        self._pyarrow = pyarrow
+        self.schema = pyarrow.schema([
+            ('report_id', pyarrow.int64()),
+            ('standup_id', pyarrow.int64()),
+            ('timestamp', pyarrow.timestamp('s', tz='UTC')),
+            ('user_id', pyarrow.string()),
+            ('username', pyarrow.string()),
+            ('channel', pyarrow.string()),
+            ('question_id', pyarrow.int64()),
+            ('question', pyarrow.string()),
+            ('answer', pyarrow.string()),
+        ])
+        self.row_group_size = row_group_size
+        self._columns = {column: [] for column in ANSWER_COLUMNS}
+        self._start = stream.tell()
+        self._writer = pyarrow.parquet.ParquetWriter(stream, self.schema, compression='zstd')
+
+    def write_batch(self, reports: List[Dict]) -> None:
+        for report in reports:
+            for row in flatten_report(report):
+                for column, values in self._columns.items():
+                    values.append(row[column])
+                self.rows += 1
+        if len(self._columns['report_id']) >= self.row_group_size:
+            self._flush_row_group()
+
+    def close(self) -> None:
+        self._flush_row_group()
+        self._writer.close()
+        super().close()
+        self.bytes_written = self.stream.tell() - self._start
+
+    def _flush_row_group(self) -> None:
+        if not self._columns['report_id']:
+            return
+        table = self._pyarrow.Table.from_pydict(self._columns, schema=self.schema)
+        self._writer.write_table(table, row_group_size=len(table))
+        self._columns = {column: [] for column in ANSWER_COLUMNS}
+
+
+WRITERS = {
+    'ndjson': NdjsonWriter,
+    'csv': CsvWriter,
+    'parquet': ParquetWriter
+}
+
+
+def export_reports(pages: Iterable[List[Dict]], writer: ExportWriter) -> Dict:
+    """
+    Streams pages of reports to a writer.
+
+    Args:
+        pages: Lists of report dictionaries, e.g. from APIClient.iter_report_pages.
+        writer: The ExportWriter the reports are written to. It is closed at the end.
+
+    Returns:
+        A dictionary with the number of 'reports' and 'rows' written, the
+        'bytes' written, the 'elapsed' seconds and the 'rows_per_second' and
+        'mb_per_second' throughput.
+    """
+    start = time.perf_counter()
+    reports = 0
+    for page in pages:
+        writer.write_batch(page)
+        reports += len(page)
+    writer.close()
+    elapsed = time.perf_counter() - start
+    return {
+        'reports': reports,
+        'rows': writer.rows,
+        'bytes': writer.bytes_written,
+        'elapsed': elapsed,
+        'rows_per_second': writer.rows / elapsed if elapsed else 0.0,
+        'mb_per_second': writer.bytes_written / elapsed / 1e6 if elapsed else 0.0
+    }
+
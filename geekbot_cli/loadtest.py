@@ -0,0 +1,205 @@
+## loadtest.py
+import math
+import random
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+from geekbot_cli.api_client import APIClient
+from geekbot_cli.exceptions import StandupException
+from geekbot_cli.outbox import new_idempotency_key
+
+# How simulated users arrive over the run:
+#   uniform  evenly spaced,
+#   poisson  independent arrivals at a constant average rate,
+#   burst    all at once, like a standup reminder sent to everyone,
+#   normal   clustered around the middle of the run.
+ARRIVAL_PATTERNS = ('uniform', 'poisson', 'burst', 'normal')
+
+# The operations every simulated user performs, in order.
+OPERATIONS = ('get_standups', 'post_report')
+
+# Percentiles reported for every operation.
+PERCENTILES = (50, 95, 99)
+
+
+def arrival_times(pattern: str, users: int, duration: float, rng: random.Random) -> List[float]:
+    """
+    Returns when each simulated user starts, in seconds from the start of the run.
+
+    Args:
+        pattern: One of ARRIVAL_PATTERNS.
+        users: The number of simulated users.
+        duration: The length of the run in seconds over which users arrive.
+        rng: The random generator, seeded for repeatable runs.
+
+    Returns:
+        The start offsets, sorted, all between 0 and duration.
+
+    Raises:
+        ValueError: If the pattern is unknown.
+    """
+    if pattern == 'uniform':
+        times = [duration * user / users for user in range(users)]
+    elif pattern == 'poisson':
+        rate = users / duration if duration > 0 else float('inf')
+        times, offset = [], 0.0
+        for _ in range(users):
+            times.append(offset)
+            offset += rng.expovariate(rate) if rate != float('inf') else 0.0
+    elif pattern == 'burst':
+        times = [0.0] * users
+    elif pattern == 'normal':
+        times = [rng.gauss(duration / 2, duration / 6) for _ in range(users)]
+    else:
+        raise ValueError(f"Unknown arrival pattern {pattern!r}, expected one of {', '.join(ARRIVAL_PATTERNS)}")
+    return sorted(min(max(offset, 0.0), duration) for offset in times)
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """
+    Returns the nearest-rank percentile of sorted values, or 0 if there are none.
+    """
+    if not values:
+        return 0.0
+    rank = max(math.ceil(percent / 100 * len(values)) - 1, 0)
+    return values[min(rank, len(values) - 1)]
+
+
+class LoadTest:
+    """
+    Drives many simulated users through the real APIClient code paths,
+    retries and circuit breaker included, and measures what they see.
+
+    Each user has its own client, as separate geekbot processes would, so the
+    server sees one new connection per user. A user starts at its arrival
+    time, fetches the standups and posts a report to one of them.
+    """
+    def __init__(
+        self,
+        base_url: str,
+        users: int = 100,
+        duration: float = 10.0,
+        pattern: str = 'poisson',
+        concurrency: int = 100,
+        api_key: str = 'loadtest',
+        seed: Optional[int] = None,
+        client_factory: Optional[Callable[[], APIClient]] = None,
+        clock: Callable[[], float] = time.perf_counter,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """
+        Initializes the load test.
+
+        Args:
+            base_url: The URL of the server under test.
+            users: The number of simulated users.
+            duration: The seconds over which the users arrive.
+            pattern: How they arrive, one of ARRIVAL_PATTERNS.
+            concurrency: The most users active at once. A user arriving while
+                all are busy starts late, which shows as scheduling lag.
+            api_key: The API key every user sends.
+            seed: Seeds the arrival times, for repeatable runs.
+            client_factory: Builds each user's client. Defaults to APIClient(base_url).
+            clock: The function used to measure time.
+            sleep: The function used to wait for arrival times.
+        """
+        if pattern not in ARRIVAL_PATTERNS:
+            raise ValueError(f"Unknown arrival pattern {pattern!r}, expected one of {', '.join(ARRIVAL_PATTERNS)}")
+        self.base_url = base_url
+        self.users = users
+        self.duration = duration
+        self.pattern = pattern
+        self.concurrency = concurrency
+        self.api_key = api_key
+        self.seed = seed
+        self._client_factory = client_factory or (lambda: APIClient(base_url=base_url))
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._latencies = {operation: [] for operation in OPERATIONS}
+        self._errors = {operation: Counter() for operation in OPERATIONS}
+        self._lags = []
+
+    def run(self) -> Dict:
+        """
+        Runs every simulated user to completion.
+
+        Returns:
+            The summary described in summary().
+        """
+        offsets = arrival_times(self.pattern, self.users, self.duration, random.Random(self.seed))
+        start = self._clock()
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='loadtest-user') as executor:
+            futures = [executor.submit(self._user, number, start + offset) for number, offset in enumerate(offsets)]
+            for future in futures:
+                future.result()
+        return self.summary(self._clock() - start)
+
+    def _user(self, number: int, start_at: float) -> None:
+        delay = start_at - self._clock()
+        if delay > 0:
+            self._sleep(delay)
+        with self._lock:
+            self._lags.append(max(-delay, 0.0))
+        with self._client_factory() as client:
+            client.set_headers(self.api_key)
+            standups = self._timed('get_standups', client.get_standups)
+            if not standups:
+                return
+            standup = standups[number % len(standups)]
+            answers = {question.id: {'text': f"Load test answer from user {number}"} for question in standup.questions}
+            self._timed('post_report', client.post_report, standup.id, answers,
+                        idempotency_key=new_idempotency_key())
+
+    def _timed(self, operation: str, function: Callable, *args, **kwargs):
+        start = self._clock()
+        error = None
+        result = None
+        try:
+            result = function(*args, **kwargs)
+        except StandupException as e:
+            error = type(e).__name__
+        latency = self._clock() - start
+        with self._lock:
+            self._latencies[operation].append(latency)
+            if error:
+                self._errors[operation][error] += 1
+        return result
+
+    def summary(self, elapsed: float) -> Dict:
+        """
+        Summarizes the measurements taken so far.
+
+        Args:
+            elapsed: The wall-clock length of the run in seconds.
+
+        Returns:
+            A dictionary with the run's settings, and per operation the count,
+            the errors by exception class and the p50/p95/p99/max latencies in
+            seconds, plus the overall operations per second and the p99 delay
+            between a user's arrival time and its start.
+        """
+        operations = {}
+        with self._lock:
+            for operation in OPERATIONS:
+                latencies = sorted(self._latencies[operation])
+                stats = {'count': len(latencies), 'errors': dict(self._errors[operation])}
+                for percent in PERCENTILES:
+                    stats[f"p{percent}"] = percentile(latencies, percent)
+                stats['max'] = latencies[-1] if latencies else 0.0
+                operations[operation] = stats
+            lag_p99 = percentile(sorted(self._lags), 99)
+        total = sum(stats['count'] for stats in operations.values())
+        return {
+            'users': self.users,
+            'pattern': self.pattern,
+            'duration': self.duration,
+            'concurrency': self.concurrency,
+            'elapsed': elapsed,
+            'operations': operations,
+            'errors': dict(sum((Counter(stats['errors']) for stats in operations.values()), Counter())),
+            'operations_per_second': total / elapsed if elapsed > 0 else 0.0,
+            'start_lag_p99': lag_p99,
+        }
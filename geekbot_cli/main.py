@@ -1,16 +1,65 @@
+## main.py
 import click
-from geekbot_cli.api_client import APIClient
 from geekbot_cli.config_manager import ConfigManager
-from geekbot_cli.cli import CLI
+from geekbot_cli.workspaces import Workspace, all_workspaces
 import sys
 
-@click.command()
+# Heavy dependencies (requests, rich, prompt_toolkit, keyring) are imported by
+# the code paths that need them, so `--version`, `--help` and `--clear-api-key`
+# start without loading them.
+
+
+def print_version(ctx, param, value):
+    """
+    Prints the installed package version and exits.
+    """
+    if not value or ctx.resilient_parsing:
+        return
+    from importlib.metadata import version, PackageNotFoundError
+    try:
+        installed_version = version('geekbot_cli')
+    except PackageNotFoundError:
+        installed_version = 'unknown'
+    click.echo(f"{ctx.find_root().info_name}, version {installed_version}")
+    ctx.exit()
+
+def validate_profile(ctx, param, value):
+    """
+    Rejects profile names that cannot be used in file names.
+    """
+    from geekbot_cli.config_manager import is_valid_profile
+    if value is not None and not is_valid_profile(value):
+        raise click.BadParameter("use up to 32 letters, digits, '-' and '_'")
+    return value
+
+@click.group(invoke_without_command=True)
+@click.option('--version', is_flag=True, expose_value=False, is_eager=True, callback=print_version,
+              help='Show the version and exit.')
 @click.option('--clear-api-key', is_flag=True, help='Removes the saved API key from keyring')
-def main(clear_api_key):
+@click.option('--refresh', is_flag=True, help='Re-fetches the standup list instead of using the local cache')
+@click.option('--timings', is_flag=True, help='Prints how long each startup phase took to stderr')
+@click.option('--trace', 'trace_path', metavar='PATH', envvar='GEEKBOT_TRACE', type=click.Path(dir_okay=False),
+              help='Writes timed spans of this run to PATH  [env: GEEKBOT_TRACE]')
+@click.option('--trace-format', type=click.Choice(['jsonl', 'otlp']), envvar='GEEKBOT_TRACE_FORMAT',
+              help='Trace file format  [default: otlp for *.json, jsonl otherwise]')
+@click.option('--profile', default='default', envvar='GEEKBOT_PROFILE', callback=validate_profile,
+              help='Uses the API key, cache and outbox of this profile  [env: GEEKBOT_PROFILE]')
+@click.option('--all-profiles', is_flag=True, help='Lists the standups of every profile in one picker')
+@click.pass_context
+def main(ctx, clear_api_key, refresh, timings, trace_path, trace_format, profile, all_profiles):
     """
     Entry point for the CLI that can now handle `--clear-api-key` to remove the saved API key.
+
+    Without a command, interactively picks a standup and submits a report.
     """
-    config_manager = ConfigManager()
+    if trace_path:
+        from geekbot_cli import tracing
+        tracing.start(trace_path, trace_format, attributes={'command': ctx.invoked_subcommand or 'report'})
+        ctx.call_on_close(tracing.stop)
+    workspace = Workspace.for_profile(ConfigManager(), profile, connect=False)
+    config_manager, standup_cache, outbox = workspace.config_manager, workspace.standup_cache, workspace.outbox
+    ctx.obj = {'config_manager': config_manager, 'standup_cache': standup_cache, 'outbox': outbox,
+               'workspace': workspace}
     if clear_api_key:
         # If --clear-api-key was passed, ask for confirmation before clearing the API key
         # Explicitly include 'yes/no' in the prompt
@@ -19,15 +68,548 @@ def main(clear_api_key):
             click.echo("API key has been removed.")
         else:
             click.echo("Operation cancelled.")
-    else:
+    elif ctx.invoked_subcommand is None:
         # Normal CLI operation
         try:
-            api_client = APIClient()
-            cli = CLI(api_client, config_manager)
-            cli.start()
+            from contextlib import ExitStack
+            from geekbot_cli.cli import CLI
+            from geekbot_cli.daemon import DaemonClient, DelegatedCredentials
+            from geekbot_cli.paths import DEFAULT_PROFILE
+            from geekbot_cli.picker import RecentStandups
+            with ExitStack() as clients:
+                # The daemon holds the default profile's key only, and is used
+                # only while that is still the key the credential chain
+                # resolves, e.g. not with another GEEKBOT_API_KEY. The cheap
+                # sources are read here; the daemon checks the keyring itself.
+                daemon_client = None
+                if profile == DEFAULT_PROFILE and not all_profiles:
+                    daemon_client = DaemonClient.connect(refresh=refresh)
+                if daemon_client is not None:
+                    clients.enter_context(daemon_client)
+                    if not daemon_client.holds_key(config_manager.resolve_api_key(before='keyring')):
+                        daemon_client = None
+                if all_profiles:
+                    workspaces = all_workspaces(config_manager)
+                    for each in workspaces:
+                        clients.enter_context(each.api_client)
+                    # Every workspace reports through its own client.
+                    cli = CLI(None, config_manager, None, None, RecentStandups(), timings=timings,
+                              workspaces=workspaces)
+                elif daemon_client is not None:
+                    # A running `geekbot daemon` holds the credentials, a warm
+                    # connection and the standups; it also keeps their cache.
+                    cli = CLI(daemon_client, DelegatedCredentials(), None, outbox, RecentStandups(), timings=timings)
+                else:
+                    from geekbot_cli.api_client import APIClient
+                    api_client = clients.enter_context(APIClient())
+                    cli = CLI(api_client, config_manager, standup_cache, outbox, RecentStandups(), timings=timings,
+                              profile=profile)
+                cli.start(refresh=refresh)
         except Exception as e:
             click.echo(f"Error: {e}")
             sys.exit(1)
 
+@main.command()
+@click.option('--standup', 'standup_query', required=True, metavar='ID|NAME',
+              help='The standup to report on, by id or name')
+@click.option('--answer', 'answer_options', multiple=True, metavar='QUESTION_ID=TEXT',
+              help="Answers a question, reading TEXT from stdin if it is '-'; repeatable")
+@click.option('--edit', is_flag=True, help='Writes or reviews the answers in $EDITOR before posting')
+@click.pass_obj
+def report(obj, standup_query, answer_options, edit):
+    """
+    Posts a report without the picker.
+
+    Answers come from --answer options, from an answers document piped to
+    stdin, or from $EDITOR, which also opens when no answers are given on a
+    terminal. In the document each answer follows a '## QUESTION_ID' line.
+
+    A standup given by id is posted to in a single request; names and the
+    editor's questions are looked up in the standup cache first. Answers to
+    a cached standup are checked against its questions before posting.
+    """
+    from geekbot_cli.api_client import APIClient
+    from geekbot_cli.exceptions import StandupException
+    from geekbot_cli.models import Standup
+    from geekbot_cli.outbox import TRANSIENT_ERRORS, new_idempotency_key
+    from geekbot_cli.report import answers_template, find_standup, parse_answer, parse_answers, resolve_standup
+    stdin = click.get_text_stream('stdin')
+    answers = {}
+    for option in answer_options:
+        try:
+            question_id, text = parse_answer(option)
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint='--answer')
+        answers[question_id] = text
+    from_stdin = [question_id for question_id, text in answers.items() if text == '-']
+    if len(from_stdin) > 1:
+        raise click.BadParameter('only one answer can be read from stdin', param_hint='--answer')
+    if from_stdin:
+        answers[from_stdin[0]] = stdin.read().strip()
+    elif not answers and not edit:
+        if stdin.isatty():
+            edit = True
+        else:
+            answers = parse_answers(stdin.read())
+    standup_cache = obj['standup_cache']
+    try:
+        with APIClient() as api_client:
+            api_key = obj['config_manager'].get_api_key()
+            api_client.set_headers(api_key)
+
+            def cached_standups():
+                entry = standup_cache.load(api_key)
+                return Standup.from_dicts(entry['standups']) if entry is not None else []
+            standup_id, standup = resolve_standup(standup_query, cached_standups,
+                                                  lambda: standup_cache.fetch(api_client, api_key), need_questions=edit)
+            if edit:
+                document = click.edit(answers_template(standup, answers), extension='.md')
+                if document is None:
+                    click.echo("The answers were not saved, so no report was sent.", err=True)
+                    sys.exit(1)
+                answers = parse_answers(document)
+            if not answers:
+                click.echo("No answers were given, so no report was sent.", err=True)
+                sys.exit(1)
+            answers = {question_id: {'text': text} for question_id, text in answers.items()}
+            if standup is not None:
+                from geekbot_cli.validation import ReportValidator
+                errors = ReportValidator([standup]).errors(standup_id, answers)
+                if errors:
+                    # The cached questions may be out of date; check them once.
+                    standup = find_standup(standup_cache.fetch(api_client, api_key), str(standup_id))
+                    errors = ReportValidator([standup] if standup else []).errors(standup_id, answers)
+                if errors:
+                    for error in errors:
+                        click.echo(f"Error: {error}", err=True)
+                    sys.exit(1)
+            idempotency_key = new_idempotency_key()
+            try:
+                report_response = api_client.post_report(standup_id, answers, idempotency_key=idempotency_key)
+            except TRANSIENT_ERRORS as e:
+                obj['outbox'].enqueue(standup_id, answers, idempotency_key, error=str(e))
+                click.echo("Geekbot could not be reached, so your report was saved to the outbox. "
+                           "It will be sent on the next run or with `geekbot outbox flush`.", err=True)
+                return
+    except (StandupException, RuntimeError) as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+    if report_response['done_at'] > 0:
+        click.echo(f"Report submitted successfully! Check #{report_response['channel']}")
+    else:
+        click.echo("Report could not be saved", err=True)
+        sys.exit(1)
+
+@main.command()
+@click.option('--from', 'source', required=True, type=click.Path(exists=True, dir_okay=False),
+              help='JSONL or CSV file with one report per record')
+@click.option('--format', 'record_format', type=click.Choice(['jsonl', 'csv']),
+              help='Record format, detected from the file extension by default')
+@click.option('--workers', default=4, show_default=True, type=click.IntRange(1, 64),
+              help='Number of reports posted concurrently')
+@click.option('--results', type=click.File('w'), default='-',
+              help='Where to write one JSON result line per record  [default: stdout]')
+@click.option('--checkpoint', type=click.Path(dir_okay=False),
+              help='Progress file used to resume after a crash  [default: <from>.checkpoint]')
+@click.option('--restart', is_flag=True, help='Ignores an existing checkpoint and starts over')
+@click.option('--rate', type=click.FloatRange(min=0.1),
+              help='Maximum requests per second across all workers')
+@click.option('--deadline', type=click.FloatRange(min=1),
+              help='Gives up on records still unsent after this many seconds')
+@click.option('--no-validate', 'validate', is_flag=True, default=True, flag_value=False,
+              help="Posts records without checking them against the standups' questions first")
+@click.pass_obj
+def submit(obj, source, record_format, workers, results, checkpoint, restart, rate, deadline, validate):
+    """
+    Submits reports in bulk without prompting.
+
+    Records are checked against the standups' questions before anything is
+    posted, so invalid ones are reported without a request each.
+    """
+    from geekbot_cli.api_client import APIClient
+    from geekbot_cli.bulk import BulkSubmitter, Checkpoint, detect_format, read_records
+    from geekbot_cli.exceptions import StandupException
+    from geekbot_cli.resilience import TokenBucket
+    try:
+        progress = Checkpoint(checkpoint or f"{source}.checkpoint")
+        if restart:
+            progress.clear()
+            progress = Checkpoint(progress.path)
+        rate_limiter = TokenBucket(rate) if rate else None
+        with APIClient(pool_maxsize=workers, rate_limiter=rate_limiter, deadline=deadline) as api_client:
+            api_key = obj['config_manager'].get_api_key()
+            api_client.set_headers(api_key)
+            validator = None
+            if validate:
+                from geekbot_cli.validation import ReportValidator
+                # One conditional request, usually answered 304 from the cache.
+                validator = ReportValidator(obj['standup_cache'].fetch(api_client, api_key))
+            submitter = BulkSubmitter(api_client, workers=workers, checkpoint=progress, validator=validator,
+                                      source=source)
+            with open(source, newline='', encoding='utf-8') as stream:
+                summary = submitter.submit(read_records(stream, record_format or detect_format(source)), results)
+    except (StandupException, RuntimeError) as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+    click.echo(
+        f"{summary['ok']} submitted, {summary['error']} failed, {summary['skipped']} already done",
+        err=True
+    )
+    if summary['error']:
+        sys.exit(1)
+
+@main.command()
+@click.option('--standup', 'standup_id', type=int, help='Only syncs reports of this standup')
+@click.option('--full', is_flag=True, help='Ignores the last sync and downloads every report again')
+@click.pass_obj
+def sync(obj, standup_id, full):
+    """
+    Copies new reports into the local report store.
+    """
+    from geekbot_cli.api_client import APIClient
+    from geekbot_cli.cache import key_fingerprint
+    from geekbot_cli.exceptions import StandupException
+    from geekbot_cli.store import ReportStore
+    try:
+        api_key = obj['config_manager'].get_api_key()
+        with APIClient() as api_client, ReportStore(obj['workspace'].report_store_path) as store:
+            api_client.set_headers(api_key)
+            stats = store.sync(api_client, key_fingerprint(api_key), standup_id=standup_id, full=full)
+            total = store.count()
+    except (StandupException, RuntimeError) as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+    click.echo(
+        f"Fetched {stats['fetched']} report(s), {stats['new']} new, in {stats['elapsed']:.1f}s; "
+        f"{total} stored locally"
+    )
+
+@main.command()
+@click.argument('query')
+@click.option('--standup', 'standup_id', type=int, help='Only searches answers of this standup')
+@click.option('--question', 'question_id', type=int, help='Only searches answers to this question')
+@click.option('--user', help='Only searches answers of this user ID or username')
+@click.option('--since', type=click.DateTime(['%Y-%m-%d']), help='Only searches reports from this day on')
+@click.option('--until', type=click.DateTime(['%Y-%m-%d']), help='Only searches reports up to this day')
+@click.option('--limit', default=20, show_default=True, type=click.IntRange(1, 1000),
+              help='Maximum number of results')
+@click.pass_obj
+def search(obj, query, standup_id, question_id, user, since, until, limit):
+    """
+    Searches the answers stored by `geekbot sync`.
+
+    QUERY is a full-text query, e.g. deploy, "code review" or migrat*.
+    """
+    import time
+    from datetime import timedelta
+    from geekbot_cli.exceptions import StandupException
+    from geekbot_cli.store import MATCH_END, MATCH_START, ReportStore
+    start = time.perf_counter()
+    try:
+        with ReportStore(obj['workspace'].report_store_path) as store:
+            results = store.search(
+                query,
+                standup_id=standup_id,
+                question_id=question_id,
+                user=user,
+                since=int(since.timestamp()) if since else None,
+                until=int((until + timedelta(days=1)).timestamp()) if until else None,
+                limit=limit
+            )
+    except StandupException as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+    elapsed = time.perf_counter() - start
+    for result in results:
+        day = time.strftime('%Y-%m-%d', time.localtime(result['timestamp']))
+        snippet = result['snippet'].replace(MATCH_START, '\x1b[1m').replace(MATCH_END, '\x1b[22m')
+        click.echo(f"{day} {result['username']} (standup {result['standup_id']}) {result['question']}")
+        click.echo(f"    {snippet}")
+    click.echo(f"{len(results)} result(s) in {elapsed * 1000:.0f} ms", err=True)
+
+@main.command()
+@click.option('--format', 'export_format', type=click.Choice(['ndjson', 'csv', 'parquet']), default='ndjson',
+              show_default=True, help='Output format; csv and parquet have one row per answer')
+@click.option('--output', '-o', default='-', type=click.Path(dir_okay=False, allow_dash=True),
+              help='Output file  [default: stdout; required for parquet]')
+@click.option('--standup', 'standup_ids', type=int, multiple=True, help='Only exports this standup; repeatable')
+@click.option('--since', type=click.DateTime(['%Y-%m-%d']), help='Only exports reports from this day on')
+@click.option('--until', type=click.DateTime(['%Y-%m-%d']), help='Only exports reports up to this day')
+@click.pass_obj
+def export(obj, export_format, output, standup_ids, since, until):
+    """
+    Streams reports from the service to a file, page by page.
+    """
+    from datetime import timedelta
+    from itertools import chain
+    from geekbot_cli.api_client import APIClient
+    from geekbot_cli.exceptions import StandupException
+    from geekbot_cli.export import WRITERS, export_reports
+    if export_format == 'parquet' and output == '-':
+        raise click.UsageError('Parquet cannot be written to stdout; pass --output.')
+    # `after` and `before` are exclusive.
+    after = int(since.timestamp()) - 1 if since else None
+    before = int((until + timedelta(days=1)).timestamp()) if until else None
+    try:
+        with APIClient() as api_client, click.open_file(output, 'wb') as stream:
+            api_client.set_headers(obj['config_manager'].get_api_key())
+            pages = chain.from_iterable(
+                api_client.iter_report_pages(standup_id=standup_id, after=after, before=before)
+                for standup_id in (standup_ids or [None])
+            )
+            stats = export_reports(pages, WRITERS[export_format](stream))
+    except (StandupException, RuntimeError, ImportError) as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+    click.echo(
+        f"Exported {stats['reports']} report(s), {stats['rows']} row(s), {stats['bytes'] / 1e6:.1f} MB "
+        f"in {stats['elapsed']:.1f}s ({stats['rows_per_second']:,.0f} rows/s, {stats['mb_per_second']:.1f} MB/s)",
+        err=True
+    )
+
+@main.command()
+@click.option('--idle-timeout', default=480, show_default=True, type=click.FloatRange(min=1),
+              help='Exits after this many minutes without a request')
+@click.option('--status', 'show_status', is_flag=True, help='Shows whether a daemon is running and exits')
+@click.option('--stop', is_flag=True, help='Stops the running daemon')
+@click.pass_obj
+def daemon(obj, idle_timeout, show_status, stop):
+    """
+    Keeps the API key, a warm connection and the standups in memory, so
+    `geekbot` starts faster while it runs.
+
+    The daemon runs in the foreground; start it in the background with
+    `geekbot daemon &` or from a service manager. `geekbot` uses it when it
+    is running and works on its own otherwise.
+    """
+    from geekbot_cli.daemon import DaemonClient, GeekbotDaemon, is_supported
+    from geekbot_cli.exceptions import StandupException
+    if not is_supported():
+        click.echo("Error: The geekbot daemon needs Unix domain sockets, which this platform does not have.", err=True)
+        sys.exit(1)
+    if show_status or stop:
+        daemon_client = DaemonClient.connect()
+        if daemon_client is None:
+            click.echo("No geekbot daemon is running.")
+            return
+        try:
+            with daemon_client:
+                if stop:
+                    daemon_client.stop()
+                    click.echo("Stopped the geekbot daemon.")
+                else:
+                    stats = daemon_client.status()
+                    click.echo(
+                        f"geekbot daemon {stats['pid']} up for {stats['uptime'] / 60:.0f} min, "
+                        f"{stats['requests']} request(s) served, {stats['standups']} standup(s) held"
+                    )
+        except StandupException as e:
+            click.echo(f"Error: {e}", err=True)
+            sys.exit(1)
+        return
+
+    from geekbot_cli.api_client import APIClient
+    from geekbot_cli.credentials import KeyringResolver
+    try:
+        api_key = obj['config_manager'].get_api_key()
+        with APIClient() as api_client:
+            server = GeekbotDaemon(api_client, api_key, obj['standup_cache'], idle_timeout=idle_timeout * 60,
+                                   saved_key=KeyringResolver(obj['config_manager'].service_name).resolve)
+            api_client.warm_up()
+            server.serve(ready=lambda: click.echo(f"geekbot daemon listening on {server.path}", err=True))
+    except (StandupException, RuntimeError) as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+    except KeyboardInterrupt:
+        pass
+
+@main.command()
+@click.option('--users', default=100, show_default=True, type=click.IntRange(1, 100000),
+              help='Number of simulated users')
+@click.option('--duration', default=10.0, show_default=True, type=click.FloatRange(min=0),
+              help='Seconds over which the users arrive')
+@click.option('--pattern', default='poisson', show_default=True,
+              type=click.Choice(['uniform', 'poisson', 'burst', 'normal']), help='How the users arrive')
+@click.option('--concurrency', default=100, show_default=True, type=click.IntRange(1, 1000),
+              help='Most users active at once')
+@click.option('--url', help='Server to load  [default: a local stub server]')
+@click.option('--standups', default=10, show_default=True, type=click.IntRange(1),
+              help='Standups served by the stub server')
+@click.option('--latency', default=0.0, show_default=True, type=click.FloatRange(min=0),
+              help='Seconds the stub server waits before answering')
+@click.option('--error-rate', default=0.0, show_default=True, type=click.FloatRange(0, 1),
+              help='Fraction of stub responses that are 503')
+@click.option('--rate-limit-rate', default=0.0, show_default=True, type=click.FloatRange(0, 1),
+              help='Fraction of stub responses that are 429')
+@click.option('--seed', type=int, help='Seeds arrival times and stub faults, for repeatable runs')
+@click.option('--json', 'as_json', is_flag=True, help='Prints the results as JSON')
+def loadtest(users, duration, pattern, concurrency, url, standups, latency, error_rate, rate_limit_rate, seed,
+             as_json):
+    """
+    Drives simulated users through the API client (fetch the standups, post
+    a report) and reports latency percentiles, errors and throughput.
+
+    Without --url a stub of the Geekbot API runs in a child process, and the
+    requests and connections it saw are reported too. Never point --url at
+    the real service.
+    """
+    import json
+    from contextlib import nullcontext
+    from geekbot_cli.loadtest import LoadTest
+    from geekbot_cli.stub_server import StubProcess
+    stub = None
+    if url is None:
+        stub = StubProcess(standups=standups, latency=latency, error_rate=error_rate,
+                           rate_limit_rate=rate_limit_rate, seed=seed)
+    with stub if stub is not None else nullcontext():
+        results = LoadTest(url or stub.url, users=users, duration=duration, pattern=pattern,
+                           concurrency=concurrency, seed=seed).run()
+    if stub is not None:
+        operations = sum(stats['count'] for stats in results['operations'].values())
+        results['server'] = dict(
+            stub.stats,
+            requests_per_second=stub.stats['requests'] / results['elapsed'] if results['elapsed'] else 0.0,
+            # Server requests per client operation; above 1 means retries.
+            retry_amplification=stub.stats['requests'] / operations if operations else 0.0,
+            connections_per_user=stub.stats['connections'] / users
+        )
+    if as_json:
+        click.echo(json.dumps(results, indent=2))
+        return
+
+    click.echo(
+        f"{users} user(s) arriving {pattern} over {duration:g}s, {concurrency} at a time: "
+        f"finished in {results['elapsed']:.1f}s, {results['operations_per_second']:.1f} operations/s"
+    )
+    click.echo(f"{'operation':14} {'count':>6} {'errors':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for operation, stats in results['operations'].items():
+        click.echo(
+            f"{operation:14} {stats['count']:6} {sum(stats['errors'].values()):6} "
+            + ' '.join(f"{stats[key] * 1000:8.1f}" for key in ('p50', 'p95', 'p99', 'max'))
+        )
+    if results['errors']:
+        click.echo("errors: " + ', '.join(f"{name} {count}" for name, count in sorted(results['errors'].items())))
+    click.echo(f"start lag p99: {results['start_lag_p99'] * 1000:.1f} ms")
+    server = results.get('server')
+    if server:
+        responses = ', '.join(f"{status}: {count}" for status, count in sorted(server['responses'].items()))
+        click.echo(
+            f"server: {server['requests']} request(s), {server['requests_per_second']:.1f}/s, "
+            f"{server['retry_amplification']:.2f} per operation; {server['connections']} connection(s), "
+            f"{server['connections_per_user']:.2f} per user; responses {responses}; "
+            f"{server['bytes_sent'] / users / 1000:.1f} kB sent per user"
+        )
+
+@main.command()
+@click.argument('shell', type=click.Choice(['bash', 'zsh', 'fish']))
+def completion(shell):
+    """
+    Prints the completion script for SHELL.
+
+    The script completes subcommands, profiles and standup ids and names
+    from the local standup cache, without network access. Standups appear
+    once `geekbot` has fetched them.
+    """
+    from geekbot_cli.completion import SCRIPTS
+    click.echo(SCRIPTS[shell], nl=False)
+
+@main.group()
+def profile():
+    """
+    Manages the profiles used to report to several workspaces.
+    """
+
+@profile.command('add')
+@click.argument('name', callback=validate_profile)
+@click.pass_obj
+def add_profile(obj, name):
+    """
+    Saves the API key of the workspace reached as profile NAME.
+    """
+    if name == 'default':
+        raise click.BadParameter('the default profile is set up by running `geekbot`', param_hint='NAME')
+    clash = obj['config_manager'].clashing_profile(name)
+    if clash is not None:
+        raise click.BadParameter(f"it would share the API key variable of profile {clash}", param_hint='NAME')
+    api_key = click.prompt('API key', hide_input=True)
+    try:
+        obj['config_manager'].for_profile(name).save_api_key(api_key)
+    except RuntimeError as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+    click.echo(f"Saved profile {name}. Use it with `geekbot --profile {name}`, or `geekbot --all-profiles`.")
+
+@profile.command('list')
+@click.pass_obj
+def list_profiles(obj):
+    """
+    Lists the named profiles.
+    """
+    for name in obj['config_manager'].profiles():
+        click.echo(name)
+
+@profile.command('remove')
+@click.argument('name', callback=validate_profile)
+@click.pass_obj
+def remove_profile(obj, name):
+    """
+    Removes the API key of profile NAME.
+    """
+    if name not in obj['config_manager'].profiles():
+        click.echo(f"No profile named {name}.", err=True)
+        sys.exit(1)
+    obj['config_manager'].for_profile(name).delete_api_key()
+    click.echo(f"Removed profile {name}.")
+
+@main.group()
+def outbox():
+    """
+    Inspects and sends reports that could not be delivered.
+    """
+
+@outbox.command()
+@click.pass_obj
+def status(obj):
+    """
+    Shows how many reports are waiting in the outbox.
+    """
+    pending = obj['outbox'].pending()
+    failed = obj['outbox'].failed()
+    click.echo(f"{len(pending)} report(s) waiting, {len(failed)} rejected")
+    for entry in failed:
+        click.echo(f"  standup {entry['standup_id']}: {entry['error']}")
+
+@outbox.command()
+@click.option('--attempts', default=5, show_default=True, type=click.IntRange(1, 20),
+              help='Attempts per report before giving up')
+@click.option('--deadline', type=click.FloatRange(min=1),
+              help='Stops sending after this many seconds, leaving the rest queued')
+@click.pass_obj
+def flush(obj, attempts, deadline):
+    """
+    Sends the queued reports, backing off while the service is unavailable.
+    """
+    from geekbot_cli.api_client import APIClient
+    from geekbot_cli.exceptions import StandupException
+    if not obj['outbox'].depth():
+        click.echo("The outbox is empty.")
+        return
+    try:
+        with APIClient(deadline=deadline) as api_client:
+            api_client.set_headers(obj['config_manager'].get_api_key())
+            stats = obj['outbox'].flush(api_client, max_attempts=attempts)
+    except (StandupException, RuntimeError) as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+    if stats['busy']:
+        click.echo("Another geekbot process is already flushing the outbox.")
+        return
+    click.echo(
+        f"Sent {stats['sent']} report(s) in {stats['elapsed']:.1f}s ({stats['rate']:.1f}/s), "
+        f"{stats['failed']} rejected, {stats['remaining']} still queued"
+    )
+    if stats['remaining'] or stats['failed']:
+        sys.exit(1)
+
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
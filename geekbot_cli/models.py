@@ -1,9 +1,18 @@
 ## models.py
+from sys import intern
+from typing import Dict, Iterable, List, Tuple
+
+# Models use __slots__ instead of a per-instance __dict__, and from_dict interns
+# the strings that repeat across thousands of questions (colors, answer types,
+# choices and question templates), so large standup lists stay compact.
+
 
 class Standup:
     """
     Represents a standup with its ID, name, and list of questions.
     """
+    __slots__ = ('_id', '_name', '_questions')
+
     def __init__(self, id: int, name: str, questions: list):
         """
         Initializes a new instance of the Standup class.
@@ -17,6 +26,43 @@ class Standup:
         self._name = name
         self._questions = questions
 
+    @property
+    def id(self) -> int:
+        return self._id
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def questions(self) -> Tuple['Question', ...]:
+        return self._questions
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Standup':
+        """
+        Builds a Standup and its questions from a /v1/standups item.
+
+        Args:
+            data: A standup dictionary as returned by the service.
+
+        Returns:
+            A Standup instance. Fields the CLI does not use are dropped.
+        """
+        return cls(
+            data['id'],
+            data.get('name', ''),
+            tuple(Question.from_dict(question) for question in data.get('questions') or ())
+        )
+
+    @classmethod
+    def from_dicts(cls, items: Iterable[Dict]) -> List['Standup']:
+        """
+        Builds Standups from a /v1/standups response body.
+        """
+        from_dict = cls.from_dict
+        return [from_dict(item) for item in items]
+
     def to_dict(self) -> dict:
         """
         Converts the Standup instance into a dictionary.
@@ -30,11 +76,27 @@ class Standup:
             'questions': [question.to_dict() for question in self._questions]
         }
 
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Standup):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def _key(self) -> tuple:
+        return (self._id, self._name, tuple(self._questions))
+
+    def __repr__(self) -> str:
+        return f"Standup(id={self._id!r}, name={self._name!r}, questions={len(self._questions)})"
+
 
 class Question:
     """
     Represents a question within a standup.
     """
+    __slots__ = ('_id', '_text', '_color', '_answer_type', '_answer_choices')
+
     def __init__(self, id: int, text: str, color: str, answer_type: str, answer_choices: list):
         """
         Initializes a new instance of the Question class.
@@ -49,6 +111,46 @@ class Question:
         self._answer_type = answer_type
         self._answer_choices = answer_choices
 
+    @property
+    def id(self) -> int:
+        return self._id
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    @property
+    def color(self) -> str:
+        return self._color
+
+    @property
+    def answer_type(self) -> str:
+        return self._answer_type
+
+    @property
+    def answer_choices(self) -> Tuple[str, ...]:
+        return self._answer_choices
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Question':
+        """
+        Builds a Question from an item of a standup's questions.
+
+        Args:
+            data: A question dictionary as returned by the service.
+
+        Returns:
+            A Question instance with its repeated strings interned.
+        """
+        return cls(
+            data['id'],
+            intern(data.get('text') or ''),
+            intern(data.get('color') or 'FFFFFF'),
+            intern(data.get('answer_type') or 'text'),
+            tuple(intern(choice) if isinstance(choice, str) else choice
+                  for choice in data.get('answer_choices') or ())
+        )
+
     def to_dict(self) -> dict:
         """
         Converts the Question instance into a dictionary.
@@ -61,5 +163,19 @@ class Question:
             'text': self._text,
             'color': self._color,
             'answer_type': self._answer_type,
-            'answer_choices': self._answer_choices
+            'answer_choices': list(self._answer_choices)
         }
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Question):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def _key(self) -> tuple:
+        return (self._id, self._text, self._color, self._answer_type, tuple(self._answer_choices))
+
+    def __repr__(self) -> str:
+        return f"Question(id={self._id!r}, text={self._text!r}, answer_type={self._answer_type!r})"
@@ -0,0 +1,267 @@
+## outbox.py
+import json
+import os
+import random
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from geekbot_cli.atomic import atomic_write
+from geekbot_cli.exceptions import (
+    StandupException,
+    StandupConnectionError,
+    StandupServerError,
+    RateLimitedError,
+    CircuitOpenError,
+    DeadlineExceededError
+)
+from geekbot_cli.paths import outbox_path
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    import msvcrt
+
+# Failures worth retrying later; anything else will fail the same way again.
+TRANSIENT_ERRORS = (
+    StandupServerError,
+    StandupConnectionError,
+    RateLimitedError,
+    CircuitOpenError,
+    DeadlineExceededError
+)
+
+
+def new_idempotency_key() -> str:
+    """
+    Returns a fresh client-generated idempotency key for a report.
+    """
+    return uuid.uuid4().hex
+
+
+@contextmanager
+def _file_lock(path: Path, blocking: bool = True):
+    """
+    Holds an exclusive inter-process lock on a lock file.
+
+    Yields:
+        True if the lock was acquired, False if it is held elsewhere and
+        blocking is False.
+    """
+    with open(path, 'a+b') as lock_file:
+        try:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            else:  # pragma: no cover - Windows
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+        except OSError:
+            if blocking:
+                raise
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+            else:  # pragma: no cover - Windows
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class Outbox:
+    """
+    A durable, append-only journal of reports that could not be delivered.
+
+    Every change is a JSON line appended and fsynced under an inter-process
+    lock: 'queued' adds a report with its idempotency key, 'sent' and 'failed'
+    settle it. Replaying the journal gives the pending reports, so a crash at
+    any point loses at most a torn last line, which is ignored. Draining is
+    guarded by a second lock so that concurrent `geekbot` processes never send
+    the same report at the same time, and the idempotency key lets the service
+    drop duplicates if a report is resent after an ambiguous failure.
+    """
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Initializes the outbox.
+
+        Args:
+            path: The journal file. Defaults to outbox.jsonl in the user data directory.
+        """
+        self.path = Path(path if path is not None else outbox_path())
+        self._lock_path = self.path.with_name(self.path.name + '.lock')
+        self._drain_lock_path = self.path.with_name(self.path.name + '.drain.lock')
+
+    def enqueue(self, standup_id: int, answers: Dict, idempotency_key: Optional[str] = None,
+                error: Optional[str] = None) -> str:
+        """
+        Durably queues a report for later delivery.
+
+        Args:
+            standup_id: The ID of the standup to report on.
+            answers: The answers to send.
+            idempotency_key: The key used for the failed attempt, if any.
+            error: Why the report could not be sent.
+
+        Returns:
+            The idempotency key of the queued report.
+        """
+        key = idempotency_key or new_idempotency_key()
+        self._append({
+            'op': 'queued',
+            'key': key,
+            'standup_id': standup_id,
+            'answers': answers,
+            'queued_at': time.time(),
+            'error': error
+        })
+        return key
+
+    def pending(self) -> List[Dict]:
+        """
+        Returns the queued reports not yet sent or given up on, oldest first.
+        """
+        return [entry for entry in self._replay().values() if entry['op'] == 'queued']
+
+    def failed(self) -> List[Dict]:
+        """
+        Returns the reports the service rejected permanently.
+        """
+        return [entry for entry in self._replay().values() if entry['op'] == 'failed']
+
+    def depth(self) -> int:
+        """
+        Returns the number of reports waiting to be sent.
+        """
+        return len(self.pending())
+
+    def flush(self, api_client, max_attempts: int = 5, base_delay: float = 0.5, max_delay: float = 30.0,
+              sleep: Callable[[float], None] = time.sleep) -> Dict:
+        """
+        Sends the pending reports in order, retrying transient failures with
+        exponential backoff and jitter.
+
+        Draining stops at the first report that still fails transiently after
+        max_attempts, since the service is most likely still unavailable.
+        Reports rejected for any other reason are marked failed and kept in the
+        journal so their answers are not lost.
+
+        Args:
+            api_client: The authorized APIClient used to post the reports.
+                Each attempt posts once, bypassing the client's retry policy.
+            max_attempts: Attempts per report before giving up for this flush.
+            base_delay: The backoff before the second attempt, in seconds.
+            max_delay: The upper bound of a single backoff, in seconds.
+            sleep: The function used to wait between attempts.
+
+        Returns:
+            A dictionary with the number of 'sent', 'failed' and 'remaining'
+            reports, the 'elapsed' seconds, the 'rate' in reports per second and
+            whether another process was already 'busy' draining the outbox.
+        """
+        start = time.perf_counter()
+        stats = {'sent': 0, 'failed': 0, 'remaining': 0, 'elapsed': 0.0, 'rate': 0.0, 'busy': False}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with _file_lock(self._drain_lock_path, blocking=False) as acquired:
+            if not acquired:
+                stats['busy'] = True
+                stats['remaining'] = self.depth()
+                return stats
+            pending = self.pending()
+            for index, entry in enumerate(pending):
+                if not self._deliver(api_client, entry, stats, max_attempts, base_delay, max_delay, sleep):
+                    stats['remaining'] = len(pending) - index
+                    break
+            self._compact()
+        stats['elapsed'] = time.perf_counter() - start
+        if stats['elapsed'] > 0:
+            stats['rate'] = stats['sent'] / stats['elapsed']
+        return stats
+
+    def _deliver(self, api_client, entry: Dict, stats: Dict, max_attempts: int, base_delay: float,
+                 max_delay: float, sleep: Callable[[float], None]) -> bool:
+        """
+        Sends one queued report. Returns False if it is still pending.
+        """
+        for attempt in range(max_attempts):
+            if attempt:
+                sleep(random.uniform(0, min(max_delay, base_delay * 2 ** (attempt - 1))))
+            try:
+                api_client.post_report(entry['standup_id'], entry['answers'], idempotency_key=entry['key'],
+                                       retry=False)
+            except DeadlineExceededError:
+                return False
+            except TRANSIENT_ERRORS:
+                continue
+            except StandupException as e:
+                self._append({'op': 'failed', 'key': entry['key'], 'error': f"{type(e).__name__}: {e}"})
+                stats['failed'] += 1
+                return True
+            self._append({'op': 'sent', 'key': entry['key']})
+            stats['sent'] += 1
+            return True
+        return False
+
+    def _append(self, record: Dict) -> None:
+        line = (json.dumps(record) + '\n').encode('utf-8')
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with _file_lock(self._lock_path):
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o600)
+            try:
+                size = os.fstat(fd).st_size
+                if size and os.pread(fd, 1, size - 1) != b'\n':
+                    # A previous writer crashed mid-line; keep its garbage on its own line.
+                    line = b'\n' + line
+                os.write(fd, line)
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    def _replay(self) -> Dict[str, Dict]:
+        if not self.path.exists():
+            return {}
+        with _file_lock(self._lock_path):
+            return self._replay_unlocked()
+
+    def _replay_unlocked(self) -> Dict[str, Dict]:
+        """
+        Folds the journal into the latest state of each report, keyed by
+        idempotency key. The caller must hold the journal lock.
+        """
+        entries = {}
+        try:
+            with open(self.path, encoding='utf-8', errors='replace') as journal:
+                lines = journal.readlines()
+        except FileNotFoundError:
+            return entries
+        for line in lines:
+            try:
+                record = json.loads(line)
+                key = record['key']
+            except (ValueError, TypeError, KeyError):
+                continue
+            if record.get('op') == 'queued':
+                entries[key] = record
+            elif key in entries:
+                entries[key] = dict(entries[key], op=record.get('op'), error=record.get('error'))
+        return entries
+
+    def _compact(self) -> None:
+        """
+        Atomically rewrites the journal without the reports that were sent,
+        so it does not grow without bound. Failed reports are kept.
+        """
+        with _file_lock(self._lock_path):
+            if not self.path.exists():
+                return
+            live = [entry for entry in self._replay_unlocked().values() if entry['op'] != 'sent']
+            lines = []
+            for entry in live:
+                queued = {k: v for k, v in entry.items() if k != 'op'}
+                lines.append(json.dumps(dict(queued, op='queued')) + '\n')
+                if entry['op'] == 'failed':
+                    lines.append(json.dumps({'op': 'failed', 'key': entry['key'], 'error': entry['error']}) + '\n')
+            atomic_write(self.path, ''.join(lines))
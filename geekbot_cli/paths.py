@@ -0,0 +1,46 @@
+## paths.py
+import os
+
+# Where each profile keeps its files. Imported by completion.py, so this
+# module must stay standard library only.
+
+# The profile used without --profile; its key is stored as before profiles existed.
+DEFAULT_PROFILE = 'default'
+
+
+def cache_dir() -> str:
+    """
+    Returns the per-user cache directory, honouring XDG_CACHE_HOME.
+    """
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'geekbot-cli')
+
+
+def data_dir() -> str:
+    """
+    Returns the per-user data directory, honouring XDG_DATA_HOME.
+    """
+    base = os.environ.get('XDG_DATA_HOME') or os.path.join(os.path.expanduser('~'), '.local', 'share')
+    return os.path.join(base, 'geekbot-cli')
+
+
+def profile_file(directory: str, stem: str, extension: str, profile: str = DEFAULT_PROFILE) -> str:
+    """
+    Returns the file of a profile. The default profile keeps the name used
+    without profiles; named profiles get their own, suffixed with the
+    profile name, e.g. outbox-work.jsonl.
+    """
+    name = stem if profile == DEFAULT_PROFILE else f"{stem}-{profile}"
+    return os.path.join(directory, name + extension)
+
+
+def standup_cache_path(profile: str = DEFAULT_PROFILE) -> str:
+    return profile_file(cache_dir(), 'standups', '.json', profile)
+
+
+def outbox_path(profile: str = DEFAULT_PROFILE) -> str:
+    return profile_file(data_dir(), 'outbox', '.jsonl', profile)
+
+
+def report_store_path(profile: str = DEFAULT_PROFILE) -> str:
+    return profile_file(data_dir(), 'reports', '.sqlite3', profile)
@@ -0,0 +1,415 @@
+## picker.py
+import bisect
+import json
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Hashable, Iterable, List, Optional, Sequence, Tuple
+from geekbot_cli.atomic import atomic_write
+from geekbot_cli.cache import default_cache_dir
+from geekbot_cli.models import Standup
+from geekbot_cli.paths import DEFAULT_PROFILE
+
+# prompt_toolkit is imported by pick_standup, so the index and the recent list
+# can be used (and tested) without a terminal.
+
+# Number of standups remembered as recently used.
+DEFAULT_RECENT_LIMIT = 20
+
+# Rows of standups shown at once.
+DEFAULT_HEIGHT = 10
+
+# Seconds between redraws caused by standups arriving in the background.
+REDRAW_INTERVAL = 0.05
+
+# Number of queries whose results are remembered.
+SEARCH_CACHE_SIZE = 256
+
+_WORD = re.compile(r'\w+')
+
+
+class RecentStandups:
+    """
+    Remembers the standups picked last, most recent first, so the picker can
+    list them before the others. Standups of different workspaces may share
+    an id, so each is remembered with its profile.
+    """
+    def __init__(self, path: Optional[Path] = None, limit: int = DEFAULT_RECENT_LIMIT):
+        """
+        Initializes the recent list.
+
+        Args:
+            path: The file the list is kept in. Defaults to recent.json in the user cache directory.
+            limit: The number of standups remembered.
+        """
+        self.path = Path(path) if path is not None else default_cache_dir() / 'recent.json'
+        self.limit = limit
+
+    def load(self) -> List[Tuple[str, int]]:
+        """
+        Returns the recently used standups as (profile, standup id) pairs,
+        most recent first. Bare ids, written before profiles existed, belong
+        to the default profile.
+        """
+        try:
+            with open(self.path, encoding='utf-8') as recent_file:
+                entries = json.load(recent_file)
+        except (OSError, ValueError):
+            return []
+        if not isinstance(entries, list):
+            return []
+        recent = []
+        for entry in entries:
+            if isinstance(entry, int):
+                recent.append((DEFAULT_PROFILE, entry))
+            elif (isinstance(entry, list) and len(entry) == 2 and isinstance(entry[0], str)
+                  and isinstance(entry[1], int)):
+                recent.append((entry[0], entry[1]))
+        return recent[:self.limit]
+
+    def touch(self, profile: str, standup_id: int) -> None:
+        """
+        Moves a profile's standup to the front of the list, replacing the file atomically.
+        """
+        key = (profile, standup_id)
+        recent = [key] + [entry for entry in self.load() if entry != key]
+        atomic_write(self.path, json.dumps(recent[:self.limit]))
+
+
+class StandupIndex:
+    """
+    A search index over standup names that narrows the list as a query is typed.
+
+    Every word of every name is kept in a sorted list, so the standups with a
+    word starting with a query token are found by bisection instead of a scan.
+    Names that do not match word by word still match if the query's letters
+    appear in them in order (a fuzzy match), e.g. "dst" for "Daily Standup".
+
+    Results are ranked as: names starting with the query, then names whose
+    words start with every query token, then fuzzy matches. Within a rank,
+    recently used standups come first and the others keep the service's order.
+
+    Anything matching a query also matches its prefixes, so the matches of the
+    longest prefix searched before are all that is re-examined as the user
+    types, and erasing a character returns remembered results.
+    """
+    def __init__(self, standups: Iterable[Standup] = (), recent_ids: Sequence[Hashable] = (),
+                 key: Optional[Callable[[Standup], Hashable]] = None):
+        """
+        Initializes the index.
+
+        Args:
+            standups: The standups to index. More can be added with add().
+            recent_ids: Recently used standups, most recent first, as given by key.
+            key: Identifies a standup in recent_ids. Defaults to its id.
+        """
+        self._recent = {recent: rank for rank, recent in enumerate(recent_ids)}
+        self._key = key
+        self._standups = []
+        self._names = []
+        self._words = []  # (word, position), sorted when searched
+        self._words_sorted = True
+        self._order = []  # (recency rank, position), sorted
+        self._searches = {}  # query -> (matches in listing order, ranked results)
+        self.version = 0
+        for standup in standups:
+            self.add(standup)
+        self._sort_words()
+
+    def __len__(self) -> int:
+        return len(self._standups)
+
+    def add(self, standup: Standup) -> None:
+        """
+        Adds a standup to the index.
+        """
+        position = len(self._standups)
+        name = standup.name.lower()
+        self._standups.append(standup)
+        self._names.append(name)
+        self._words.extend((word, position) for word in set(_WORD.findall(name)))
+        self._words_sorted = False
+        recent = self._key(standup) if self._key is not None else standup.id
+        rank = self._recent.get(recent, len(self._recent))
+        if rank < len(self._recent):
+            bisect.insort(self._order, (rank, position))
+        else:
+            self._order.append((rank, position))
+        self._searches.clear()
+        self.version += 1
+
+    def search(self, query: str) -> List[Standup]:
+        """
+        Finds the standups matching a query.
+
+        Args:
+            query: The text typed so far. Case and surrounding whitespace are ignored.
+
+        Returns:
+            The matching standups, best first. An empty query matches all of them.
+        """
+        query = ' '.join(query.lower().split())
+        if not query:
+            return [self._standups[position] for _, position in self._order]
+        if query in self._searches:
+            return list(self._searches[query][1])
+        candidates = next((self._searches[query[:length]][0] for length in range(len(query) - 1, 0, -1)
+                           if query[:length] in self._searches), None)
+        if candidates is None:
+            candidates = [position for _, position in self._order]
+
+        tokens = _WORD.findall(query)
+        word_matches = self._word_matches(tokens) if tokens else set()
+        # "abc" becomes "[^a]*a[^b]*b[^c]*c": each letter matches its first
+        # occurrence after the previous one, so a miss fails without backtracking.
+        fuzzy = re.compile(''.join(f"[^{re.escape(char)}]*{re.escape(char)}"
+                                   for char in query.replace(' ', ''))).match
+        names = self._names
+        matches, starts, words, others = [], [], [], []
+        for position in candidates:
+            name = names[position]
+            if position in word_matches:
+                (starts if name.startswith(query) else words).append(position)
+            elif fuzzy(name):
+                others.append(position)
+            else:
+                continue
+            matches.append(position)
+
+        standups = self._standups
+        results = [standups[position] for group in (starts, words, others) for position in group]
+        if len(self._searches) >= SEARCH_CACHE_SIZE:
+            self._searches.clear()
+        self._searches[query] = (matches, results)
+        return list(results)
+
+    def _word_matches(self, tokens: List[str]) -> set:
+        """
+        Returns the positions of the names with a word starting with every token.
+        """
+        self._sort_words()
+        matches = None
+        for token in sorted(set(tokens), key=len, reverse=True):
+            low = bisect.bisect_left(self._words, (token,))
+            high = bisect.bisect_left(self._words, (token + '\U0010ffff',))
+            found = {position for _, position in self._words[low:high]}
+            matches = found if matches is None else matches & found
+            if not matches:
+                break
+        return matches
+
+    def _sort_words(self) -> None:
+        if not self._words_sorted:
+            self._words.sort()
+            self._words_sorted = True
+
+
+class StandupPicker:
+    """
+    The state of the interactive picker: the query, its results and the
+    highlighted row. Only the rows in the visible window are ever rendered,
+    so redrawing costs the same for ten standups as for ten thousand.
+    """
+    def __init__(self, index: StandupIndex, height: int = DEFAULT_HEIGHT):
+        """
+        Initializes the picker.
+
+        Args:
+            index: The index searched as the query changes. It may keep
+                growing while the picker is shown.
+            height: The number of rows of standups shown at once.
+        """
+        self.index = index
+        self.height = height
+        self.query = ''
+        self.results = index.search('')
+        self.cursor = 0
+        self.top = 0
+        self.loading = False
+        self._version = index.version
+
+    @property
+    def selected(self) -> Optional[Standup]:
+        """
+        The highlighted standup, or None if nothing matches.
+        """
+        return self.results[self.cursor] if self.results else None
+
+    def set_query(self, query: str) -> None:
+        """
+        Narrows the results to a new query and highlights the best match.
+        """
+        self.query = query
+        self.results = self.index.search(query)
+        self._version = self.index.version
+        self.cursor = self.top = 0
+
+    def refresh(self) -> None:
+        """
+        Re-runs the query if standups were added to the index since, keeping
+        the highlighted standup in place when it still matches.
+        """
+        if self._version == self.index.version:
+            return
+        selected = self.selected
+        self.results = self.index.search(self.query)
+        self._version = self.index.version
+        self.cursor = next((row for row, standup in enumerate(self.results) if standup is selected),
+                           min(self.cursor, max(len(self.results) - 1, 0)))
+        self._scroll()
+
+    def move(self, rows: int) -> None:
+        """
+        Moves the highlight by a number of rows, scrolling the window along.
+        """
+        if self.results:
+            self.cursor = min(max(self.cursor + rows, 0), len(self.results) - 1)
+            self._scroll()
+
+    def fragments(self) -> List[tuple]:
+        """
+        Renders the visible rows and a status line as prompt_toolkit
+        formatted text fragments.
+        """
+        self.refresh()
+        lines = []
+        for row in range(self.top, min(self.top + self.height, len(self.results))):
+            style = 'reverse' if row == self.cursor else ''
+            lines.append((style, f" {self.results[row].name} "))
+            lines.append(('', '\n'))
+        lines.append(('', '\n' * (self.height - len(lines) // 2)))
+        status = f" {len(self.results)}/{len(self.index)} standups"
+        if self.loading:
+            status += ", loading..."
+        lines.append(('italic', status))
+        return lines
+
+    def _scroll(self) -> None:
+        if self.cursor < self.top:
+            self.top = self.cursor
+        elif self.cursor >= self.top + self.height:
+            self.top = self.cursor - self.height + 1
+
+
+def import_prompt_toolkit() -> None:
+    """
+    Imports the prompt_toolkit modules pick_standup uses, e.g. while the
+    standups are still loading.
+    """
+    import prompt_toolkit.application
+    import prompt_toolkit.key_binding
+    import prompt_toolkit.layout
+    import prompt_toolkit.layout.processors
+
+
+def pick_standup(standups: Iterable[Standup], recent_ids: Sequence[Hashable] = (),
+                 height: int = DEFAULT_HEIGHT, key: Optional[Callable[[Standup], Hashable]] = None
+                 ) -> Optional[Standup]:
+    """
+    Lets the user pick a standup by typing part of its name.
+
+    Standups from an iterator are indexed by a background thread as they
+    arrive, so the picker is usable before the download ends.
+
+    Args:
+        standups: A list or iterator of Standup instances.
+        recent_ids: Recently used standups, listed first, as given by key.
+        height: The number of rows of standups shown at once.
+        key: Identifies a standup in recent_ids. Defaults to its id.
+
+    Returns:
+        The picked Standup, or None if the picker was dismissed.
+
+    Raises:
+        StandupException: If downloading the standups fails.
+    """
+    from prompt_toolkit.application import Application
+    from prompt_toolkit.buffer import Buffer
+    from prompt_toolkit.key_binding import KeyBindings
+    from prompt_toolkit.layout import HSplit, Layout, Window
+    from prompt_toolkit.layout.controls import BufferControl, FormattedTextControl
+    from prompt_toolkit.layout.processors import BeforeInput
+
+    lock = threading.Lock()
+    failure = []
+    if isinstance(standups, (list, tuple)):
+        index = StandupIndex(standups, recent_ids, key)
+        picker = StandupPicker(index, height)
+    else:
+        index = StandupIndex((), recent_ids, key)
+        picker = StandupPicker(index, height)
+        picker.loading = True
+
+    def locked(method):
+        def call(*args):
+            with lock:
+                return method(*args)
+        return call
+
+    buffer = Buffer(multiline=False, on_text_changed=locked(lambda changed: picker.set_query(changed.text)))
+    bindings = KeyBindings()
+
+    @bindings.add('up')
+    @bindings.add('c-p')
+    def _(event):
+        locked(picker.move)(-1)
+
+    @bindings.add('down')
+    @bindings.add('c-n')
+    def _(event):
+        locked(picker.move)(1)
+
+    @bindings.add('pageup')
+    def _(event):
+        locked(picker.move)(-height)
+
+    @bindings.add('pagedown')
+    def _(event):
+        locked(picker.move)(height)
+
+    @bindings.add('enter')
+    def _(event):
+        event.app.exit(result=locked(lambda: picker.selected)())
+
+    @bindings.add('escape', eager=True)
+    @bindings.add('c-c')
+    def _(event):
+        event.app.exit(result=None)
+
+    application = Application(
+        layout=Layout(HSplit([
+            Window(BufferControl(buffer, input_processors=[BeforeInput('Standup: ', style='bold')]), height=1),
+            Window(FormattedTextControl(locked(picker.fragments)), height=height + 1),
+        ])),
+        key_bindings=bindings,
+        erase_when_done=True,
+    )
+
+    def feed():
+        redrawn_at = 0.0
+        try:
+            for standup in standups:
+                with lock:
+                    index.add(standup)
+                # Arriving standups redraw at most every REDRAW_INTERVAL, so
+                # they do not compete with keystrokes for the event loop.
+                if time.monotonic() - redrawn_at >= REDRAW_INTERVAL:
+                    redrawn_at = time.monotonic()
+                    application.invalidate()
+        except Exception as e:
+            failure.append(e)
+            application.loop.call_soon_threadsafe(application.exit)
+        finally:
+            picker.loading = False
+            application.invalidate()
+
+    def start_feeding():
+        # Called once the event loop is running, so the feed can stop it.
+        if picker.loading:
+            threading.Thread(target=feed, name='standup-picker-feed', daemon=True).start()
+
+    result = application.run(pre_run=start_feeding)
+    if failure:
+        raise failure[0]
+    return result
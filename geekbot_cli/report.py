@@ -0,0 +1,122 @@
+## report.py
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+from geekbot_cli.exceptions import StandupNotFoundError
+from geekbot_cli.models import Standup
+
+# `geekbot report` posts a report for a standup named on the command line,
+# without the picker. Standups and their questions are looked up in the
+# local standup cache; the list is only downloaded when a name is not in the
+# cache or the questions of an uncached standup are needed for the editor.
+
+# In the answers document (stdin or $EDITOR) a line like "## 101" or
+# "## 101 What did you do?" starts the answer to question 101. Other lines
+# starting with '#' are comments.
+_ANSWER_HEADER = re.compile(r'^##\s*(\d+)\b')
+
+
+def parse_answer(value: str) -> Tuple[int, str]:
+    """
+    Parses an --answer option of the form QUESTION_ID=TEXT.
+
+    Raises:
+        ValueError: If the question id is missing or not a number.
+    """
+    question_id, separator, text = value.partition('=')
+    if not separator or not question_id.strip().isdigit():
+        raise ValueError(f"expected QUESTION_ID=TEXT, got {value!r}")
+    return int(question_id), text
+
+
+def parse_answers(document: str) -> Dict[int, str]:
+    """
+    Parses an answers document, as written in $EDITOR or piped to stdin.
+
+    Returns:
+        The non-empty answers keyed by question id, in document order.
+    """
+    answers: Dict[int, List[str]] = {}
+    lines = None
+    for line in document.splitlines():
+        header = _ANSWER_HEADER.match(line)
+        if header:
+            lines = answers.setdefault(int(header.group(1)), [])
+        elif line.startswith('#'):
+            continue
+        elif lines is not None:
+            lines.append(line)
+    return {question_id: '\n'.join(lines).strip() for question_id, lines in answers.items()
+            if '\n'.join(lines).strip()}
+
+
+def answers_template(standup: Standup, answers: Optional[Dict[int, str]] = None) -> str:
+    """
+    Returns the answers document opened in $EDITOR, one section per question.
+
+    Args:
+        standup: The standup reported on.
+        answers: Answers given already, filled in below their questions.
+    """
+    answers = answers or {}
+    sections = [
+        f"# Report for {standup.name}. Write each answer below its question.\n"
+        "# Lines starting with '#' are ignored, and questions left empty are not answered.\n"
+    ]
+    for question in standup.questions:
+        choices = f"\n# One of: {', '.join(question.answer_choices)}" if question.answer_choices else ''
+        sections.append(f"## {question.id} {question.text}{choices}\n{answers.get(question.id, '')}\n")
+    return '\n'.join(sections)
+
+
+def find_standup(standups: List[Standup], query: str) -> Optional[Standup]:
+    """
+    Finds a standup by id, by name (ignoring case), or by the start of its
+    name or of a word in it when that matches a single standup.
+
+    Returns:
+        The standup, or None if none matches.
+
+    Raises:
+        StandupNotFoundError: If the name matches several standups.
+    """
+    if query.isdigit():
+        return next((standup for standup in standups if standup.id == int(query)), None)
+    folded = query.casefold()
+    exact = [standup for standup in standups if standup.name.casefold() == folded]
+    matches = exact or [standup for standup in standups
+                        if standup.name.casefold().startswith(folded)
+                        or any(word.startswith(folded) for word in standup.name.casefold().split())]
+    if len(matches) > 1:
+        listed = ', '.join(f"{standup.name} ({standup.id})" for standup in matches[:5])
+        raise StandupNotFoundError(f"{query!r} matches several standups: {listed}. Use the standup id.")
+    return matches[0] if matches else None
+
+
+def resolve_standup(query: str, cached: Callable[[], List[Standup]], fetch: Callable[[], List[Standup]],
+                    need_questions: bool) -> Tuple[int, Optional[Standup]]:
+    """
+    Resolves the --standup option, preferring the cached standup list.
+
+    The list is fetched only when a name is not in the cache, or when the
+    questions of a standup given by id are needed but not cached. A standup
+    given by id is otherwise trusted as is, so the report goes out in a
+    single request.
+
+    Args:
+        query: A standup id or name.
+        cached: Returns the cached standups, or an empty list.
+        fetch: Downloads the standups.
+        need_questions: Whether the standup's questions are required.
+
+    Returns:
+        The standup id and, if known, the standup.
+
+    Raises:
+        StandupNotFoundError: If no standup matches the name, or several do.
+    """
+    standup = find_standup(cached(), query)
+    if standup is None and (need_questions or not query.isdigit()):
+        standup = find_standup(fetch(), query)
+        if standup is None:
+            raise StandupNotFoundError(f"No standup matches {query!r}.")
+    return (standup.id if standup is not None else int(query)), standup
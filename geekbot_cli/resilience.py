@@ -0,0 +1,198 @@
+## resilience.py
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Iterable, Optional
+from geekbot_cli.exceptions import CircuitOpenError, DeadlineExceededError
+
+# Statuses worth retrying: rate limiting and gateway/availability errors.
+RETRY_STATUSES = frozenset((429, 502, 503, 504))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parses a Retry-After header given either in seconds or as an HTTP date.
+
+    Returns:
+        The number of seconds to wait, or None if the header is missing or invalid.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+class RetryPolicy:
+    """
+    Decides whether and when a failed request is retried.
+
+    Delays grow exponentially with full jitter, so clients that failed together
+    do not retry together. A Retry-After sent by the service takes precedence
+    over the computed delay.
+    """
+    def __init__(self, max_attempts: int = 3, backoff_base: float = 0.5, backoff_max: float = 30.0,
+                 retry_statuses: Iterable[int] = RETRY_STATUSES, max_retry_after: float = 60.0):
+        """
+        Initializes the policy.
+
+        Args:
+            max_attempts: The total number of attempts, 1 disables retries.
+            backoff_base: The upper bound of the first delay, in seconds.
+            backoff_max: The upper bound of any computed delay, in seconds.
+            retry_statuses: The HTTP statuses that are retried.
+            max_retry_after: The longest Retry-After honoured; longer waits fail instead.
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = frozenset(retry_statuses)
+        self.max_retry_after = max_retry_after
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> Optional[float]:
+        """
+        Returns how long to wait before the attempt after `attempt` (0-based),
+        or None if the request should not be retried.
+        """
+        if attempt + 1 >= self.max_attempts:
+            return None
+        if retry_after is not None:
+            return retry_after if retry_after <= self.max_retry_after else None
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket that limits the request rate of one client.
+
+    Every thread sharing the client draws from the same bucket, so the rate
+    holds for the whole process however many workers are running.
+    """
+    def __init__(self, rate: float, capacity: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        """
+        Initializes a full bucket.
+
+        Args:
+            rate: Tokens added per second, i.e. the sustained requests per second.
+            capacity: The largest burst allowed. Defaults to one second's worth.
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, deadline: Optional['Deadline'] = None) -> None:
+        """
+        Takes one token, waiting for it if the bucket is empty.
+
+        Raises:
+            DeadlineExceededError: If the token would only be available after the deadline.
+        """
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            if deadline is not None and wait > deadline.remaining():
+                raise DeadlineExceededError("Deadline exceeded while waiting for the rate limiter.")
+            self._sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    Fails fast while the service is down instead of piling up timeouts.
+
+    After `failure_threshold` consecutive failures the circuit opens and calls
+    raise CircuitOpenError right away. Once `reset_timeout` seconds have passed
+    a single trial call is let through: success closes the circuit, failure
+    opens it again.
+    """
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return 'closed'
+            if self._clock() - self._opened_at >= self.reset_timeout:
+                return 'half-open'
+            return 'open'
+
+    def before_call(self) -> bool:
+        """
+        Raises CircuitOpenError if calls are currently refused.
+
+        Returns:
+            True if the call is the trial of a half-open circuit. Its caller
+            must record its outcome or, if it ends without one, call
+            release_trial().
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return False
+            if self._clock() - self._opened_at >= self.reset_timeout and not self._trial_running:
+                self._trial_running = True
+                return True
+        raise CircuitOpenError("The standup service is failing; not sending requests for now.")
+
+    def release_trial(self) -> None:
+        """
+        Lets another trial call through after one ended without telling
+        whether the service works, e.g. on a deadline or a local error.
+        """
+        with self._lock:
+            self._trial_running = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+            self._trial_running = False
+
+
+class Deadline:
+    """
+    An overall time budget shared by every request of one command.
+    """
+    def __init__(self, seconds: float, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self.expires_at = clock() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - self._clock())
+
+    def check(self) -> None:
+        """
+        Raises DeadlineExceededError once the budget is spent.
+        """
+        if self.remaining() <= 0:
+            raise DeadlineExceededError("Deadline exceeded.")
@@ -0,0 +1,90 @@
+## startup.py
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Tuple
+from geekbot_cli import tracing
+
+
+def in_background(function: Callable, *args, name: str = 'geekbot-background') -> Future:
+    """
+    Calls a function on a daemon thread.
+
+    Unlike ThreadPoolExecutor workers, the thread does not hold up interpreter
+    exit, so a request still in flight when the user quits is abandoned
+    instead of waited for.
+
+    Args:
+        function: The function to call.
+        *args: The arguments passed to it.
+        name: The thread name.
+
+    Returns:
+        A Future resolving to the function's result or exception. Cancelling
+        it before the thread starts running the function skips the call.
+    """
+    future = Future()
+    parent = tracing.current_span()
+
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            with tracing.attached(parent):
+                result = function(*args)
+        except BaseException as e:
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+
+    threading.Thread(target=run, name=name, daemon=True).start()
+    return future
+
+
+class PhaseTimer:
+    """
+    Records when each startup phase ran and for how long, from any thread,
+    to show how much of the startup work overlapped.
+    """
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        """
+        Initializes the timer; phase offsets are relative to this moment.
+
+        Args:
+            clock: Returns the current time in seconds.
+        """
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.started = clock()
+        self.phases: List[Tuple[str, float, float]] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Times the enclosed block as the named phase, also if it raises, and
+        traces it as a startup.<name> span.
+        """
+        start = self._clock()
+        try:
+            with tracing.span(f"startup.{name}"):
+                yield
+        finally:
+            end = self._clock()
+            with self._lock:
+                self.phases.append((name, start - self.started, end - start))
+
+    def summary(self) -> str:
+        """
+        Formats the phases in start order, followed by how long they took
+        back to back compared with the wall time they spanned.
+        """
+        with self._lock:
+            phases = sorted(self.phases, key=lambda phase: phase[1])
+        lines = [f"{name:<12} at {start * 1000:7.1f} ms  took {duration * 1000:7.1f} ms"
+                 for name, start, duration in phases]
+        sequential = sum(duration for _, _, duration in phases)
+        wall = max((start + duration for _, start, duration in phases), default=0.0)
+        lines.append(f"{len(phases)} phases take {sequential * 1000:.1f} ms back to back, "
+                     f"{wall * 1000:.1f} ms pipelined ({(sequential - wall) * 1000:.1f} ms overlapped)")
+        return '\n'.join(lines)
@@ -0,0 +1,254 @@
+## store.py
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from geekbot_cli.api_client import DEFAULT_PAGE_SIZE
+from geekbot_cli.exceptions import SearchQueryError
+from geekbot_cli.paths import report_store_path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    id INTEGER PRIMARY KEY,
+    standup_id INTEGER NOT NULL,
+    timestamp INTEGER NOT NULL,
+    user_id TEXT,
+    username TEXT,
+    channel TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS reports_standup_timestamp ON reports (standup_id, timestamp);
+CREATE INDEX IF NOT EXISTS reports_timestamp ON reports (timestamp);
+CREATE TABLE IF NOT EXISTS answers (
+    id INTEGER PRIMARY KEY,
+    report_id INTEGER NOT NULL REFERENCES reports (id) ON DELETE CASCADE,
+    question_id INTEGER,
+    question TEXT,
+    answer TEXT
+);
+CREATE INDEX IF NOT EXISTS answers_report ON answers (report_id);
+CREATE INDEX IF NOT EXISTS answers_question ON answers (question_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS answers_fts USING fts5 (
+    answer, content='answers', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS answers_fts_insert AFTER INSERT ON answers BEGIN
+    INSERT INTO answers_fts (rowid, answer) VALUES (new.id, new.answer);
+END;
+CREATE TRIGGER IF NOT EXISTS answers_fts_delete AFTER DELETE ON answers BEGIN
+    INSERT INTO answers_fts (answers_fts, rowid, answer) VALUES ('delete', old.id, old.answer);
+END;
+CREATE TRIGGER IF NOT EXISTS answers_fts_update AFTER UPDATE ON answers BEGIN
+    INSERT INTO answers_fts (answers_fts, rowid, answer) VALUES ('delete', old.id, old.answer);
+    INSERT INTO answers_fts (rowid, answer) VALUES (new.id, new.answer);
+END;
+CREATE TABLE IF NOT EXISTS sync_state (
+    scope TEXT PRIMARY KEY,
+    high_water INTEGER,
+    synced_at REAL
+);
+"""
+
+# Marks placed around matched terms in search snippets.
+MATCH_START = '\x02'
+MATCH_END = '\x03'
+
+
+class ReportStore:
+    """
+    A local SQLite copy of the report history, kept current by `sync`.
+
+    The newest report timestamp seen by the last complete sync is kept as a
+    high-water mark per workspace and standup filter. The next sync only asks
+    the service for reports from that second on, so re-syncing an unchanged
+    workspace costs a single request. Reports are upserted, which makes the
+    one-second overlap harmless.
+
+    Answers are indexed in an FTS5 table kept current by triggers, so every
+    upsert updates the search index in the same transaction.
+    """
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Opens the store, creating the database if needed.
+
+        Args:
+            path: The database file. Defaults to reports.sqlite3 in the user data directory.
+        """
+        self.path = Path(path if path is not None else report_store_path())
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(self.path))
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA foreign_keys=ON')
+        indexed = self.connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'answers_fts'"
+        ).fetchone()
+        self.connection.executescript(SCHEMA)
+        if not indexed:
+            # Stores created before search existed already hold answers.
+            with self.connection:
+                self.connection.execute("INSERT INTO answers_fts (answers_fts) VALUES ('rebuild')")
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> 'ReportStore':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    @staticmethod
+    def scope(workspace: str, standup_id: Optional[int] = None) -> str:
+        """
+        Returns the key under which a high-water mark is kept.
+
+        Args:
+            workspace: A fingerprint of the API key the reports are read with.
+            standup_id: The standup the sync is restricted to, if any.
+        """
+        return f"{workspace}:{standup_id if standup_id is not None else '*'}"
+
+    def high_water(self, scope: str) -> Optional[int]:
+        """
+        Returns the newest report timestamp seen by the last complete sync of a scope.
+        """
+        row = self.connection.execute('SELECT high_water FROM sync_state WHERE scope = ?', (scope,)).fetchone()
+        return row[0] if row else None
+
+    def upsert(self, reports: Iterable[Dict]) -> int:
+        """
+        Inserts or replaces reports and their answers in one transaction.
+
+        Returns:
+            The number of reports written.
+        """
+        count = 0
+        with self.connection:
+            for report in reports:
+                member = report.get('member') or {}
+                self.connection.execute(
+                    'INSERT OR REPLACE INTO reports (id, standup_id, timestamp, user_id, username, channel, data) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    (report['id'], report['standup_id'], report['timestamp'], member.get('id'),
+                     member.get('username'), report.get('channel'), json.dumps(report))
+                )
+                self.connection.execute('DELETE FROM answers WHERE report_id = ?', (report['id'],))
+                self.connection.executemany(
+                    'INSERT INTO answers (report_id, question_id, question, answer) VALUES (?, ?, ?, ?)',
+                    [
+                        (report['id'], question.get('question_id'), question.get('question'), question.get('answer'))
+                        for question in report.get('questions') or []
+                    ]
+                )
+                count += 1
+        return count
+
+    def sync(self, api_client, workspace: str, standup_id: Optional[int] = None, full: bool = False,
+             page_size: int = DEFAULT_PAGE_SIZE) -> Dict:
+        """
+        Fetches the reports submitted since the last sync and stores them.
+
+        Reports arrive newest first, so the high-water mark only moves once the
+        whole walk has finished; an interrupted sync starts over from the
+        previous mark and rewrites what it already stored.
+
+        Args:
+            api_client: The authorized APIClient used to read the reports.
+            workspace: A fingerprint of the API key, see cache.key_fingerprint.
+            standup_id: Only sync reports of this standup.
+            full: Whether to ignore the high-water mark and fetch everything.
+            page_size: The number of reports requested per page.
+
+        Returns:
+            A dictionary with the number of 'fetched' and 'new' reports, the
+            'high_water' timestamp and the 'elapsed' seconds.
+
+        Raises:
+            StandupAPIError: If an API call fails.
+        """
+        start = time.perf_counter()
+        scope = self.scope(workspace, standup_id)
+        high_water = None if full else self.high_water(scope)
+        # `after` is exclusive; stepping back one second picks up reports
+        # stored in the same second as the last sync.
+        after = high_water - 1 if high_water is not None else None
+        pages = api_client.iter_report_pages(standup_id=standup_id, after=after, page_size=page_size)
+        stats = {'fetched': 0, 'new': 0, 'high_water': high_water, 'elapsed': 0.0}
+        before = self.count()
+        for batch in pages:
+            stats['fetched'] += self.upsert(batch)
+            newest = max(report['timestamp'] for report in batch)
+            stats['high_water'] = max(newest, stats['high_water'] or newest)
+        stats['new'] = self.count() - before
+        with self.connection:
+            self.connection.execute(
+                'INSERT OR REPLACE INTO sync_state (scope, high_water, synced_at) VALUES (?, ?, ?)',
+                (scope, stats['high_water'], time.time())
+            )
+        stats['elapsed'] = time.perf_counter() - start
+        return stats
+
+    def search(self, query: str, standup_id: Optional[int] = None, question_id: Optional[int] = None,
+               user: Optional[str] = None, since: Optional[int] = None, until: Optional[int] = None,
+               limit: int = 20) -> List[Dict]:
+        """
+        Finds the answers matching a full-text query, best matches first.
+
+        Args:
+            query: An FTS5 query, e.g. `deploy`, `"code review"` or `migrat*`.
+            standup_id: Only match answers of this standup.
+            question_id: Only match answers to this question.
+            user: Only match answers of this user ID or username.
+            since: Only match reports submitted at or after this Unix timestamp.
+            until: Only match reports submitted before this Unix timestamp.
+            limit: The maximum number of results.
+
+        Returns:
+            A list of dictionaries with the 'report_id', 'standup_id',
+            'question_id', 'question', 'username', 'timestamp', the matched
+            'snippet' with matches between MATCH_START and MATCH_END, and the
+            bm25 'rank' (lower is better).
+
+        Raises:
+            SearchQueryError: If the query is not valid FTS5 syntax.
+        """
+        conditions = ['answers_fts MATCH ?']
+        params = [query]
+        if standup_id is not None:
+            conditions.append('reports.standup_id = ?')
+            params.append(standup_id)
+        if question_id is not None:
+            conditions.append('answers.question_id = ?')
+            params.append(question_id)
+        if user is not None:
+            conditions.append('(reports.user_id = ? OR reports.username = ?)')
+            params.extend((user, user))
+        if since is not None:
+            conditions.append('reports.timestamp >= ?')
+            params.append(since)
+        if until is not None:
+            conditions.append('reports.timestamp < ?')
+            params.append(until)
+        sql = (
+            "SELECT answers.report_id, reports.standup_id, answers.question_id, answers.question, "
+            "reports.username, reports.timestamp, "
+            "snippet(answers_fts, 0, ?, ?, '…', 12), bm25(answers_fts) AS rank "
+            "FROM answers_fts "
+            "JOIN answers ON answers.id = answers_fts.rowid "
+            "JOIN reports ON reports.id = answers.report_id "
+            f"WHERE {' AND '.join(conditions)} "
+            "ORDER BY rank LIMIT ?"
+        )
+        try:
+            rows = self.connection.execute(sql, [MATCH_START, MATCH_END, *params, limit]).fetchall()
+        except sqlite3.OperationalError as e:
+            raise SearchQueryError(f"Invalid search query {query!r}: {e}")
+        columns = ('report_id', 'standup_id', 'question_id', 'question', 'username', 'timestamp', 'snippet', 'rank')
+        return [dict(zip(columns, row)) for row in rows]
+
+    def count(self) -> int:
+        """
+        Returns the number of stored reports.
+        """
+        return self.connection.execute('SELECT COUNT(*) FROM reports').fetchone()[0]
+
@@ -0,0 +1,97 @@
+## streaming.py
+import codecs
+import json
+from typing import Iterable, Iterator
+
+_WHITESPACE = ' \t\n\r'
+_NUMBER_CHARS = frozenset('0123456789.eE+-')
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[object]:
+    """
+    Incrementally parses a JSON array from a stream of byte chunks.
+
+    Each element is yielded as soon as its last byte has arrived, and consumed
+    text is dropped from the buffer, so memory is bounded by the largest
+    element plus one chunk rather than by the whole document. Elements are
+    decoded by the C JSON scanner; an element split across chunks is retried
+    once more data has arrived.
+
+    Args:
+        chunks: The UTF-8 encoded document, e.g. from Response.iter_content.
+
+    Yields:
+        The decoded array elements, in order.
+
+    Raises:
+        ValueError: If the document is not a well-formed JSON array.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder('utf-8')()
+    chunks = iter(chunks)
+    buffer = ''
+    position = 0
+    exhausted = False
+    state = 'start'  # start -> element -> separator -> ... -> end
+
+    def more() -> bool:
+        nonlocal buffer, position, exhausted
+        if exhausted:
+            return False
+        chunk = next(chunks, None)
+        if chunk is None:
+            exhausted = True
+            text = utf8.decode(b'', final=True)
+        else:
+            text = utf8.decode(chunk)
+        buffer = buffer[position:] + text
+        position = 0
+        return True
+
+    while True:
+        while position < len(buffer) and buffer[position] in _WHITESPACE:
+            position += 1
+        if position >= len(buffer):
+            if more():
+                continue
+            raise ValueError("Unexpected end of JSON array")
+        char = buffer[position]
+        if state == 'start':
+            if char != '[':
+                raise ValueError(f"Expected a JSON array, found {char!r}")
+            position += 1
+            state = 'first'
+        elif state in ('first', 'element'):
+            if state == 'first' and char == ']':
+                return
+            try:
+                element, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                # Most likely cut off by the chunk boundary; fails for real at
+                # EOF. Reading at least as much again before retrying keeps a
+                # large element arriving in small chunks linear to decode.
+                pending = len(buffer) - position
+                grew = False
+                while more():
+                    grew = True
+                    if len(buffer) - position >= 2 * pending:
+                        break
+                if grew:
+                    continue
+                raise ValueError("Malformed JSON array element")
+            if (isinstance(element, (int, float)) and not exhausted
+                    and _NUMBER_CHARS.issuperset(buffer[end:])):
+                # A number cut off by the chunk boundary, e.g. "1." of "1.5",
+                # parses as a shorter number; wait for what follows it.
+                more()
+                continue
+            position = end
+            state = 'separator'
+            yield element
+        else:
+            position += 1
+            if char == ']':
+                return
+            if char != ',':
+                raise ValueError(f"Expected ',' or ']' in JSON array, found {char!r}")
+            state = 'element'
@@ -0,0 +1,633 @@
+## stub_server.py
+import gzip
+import json
+import multiprocessing
+import random
+import socket
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+STUB_MEMBER = {'id': 'U0001', 'username': 'stub', 'realname': 'Stub User'}
+
+# Response bodies smaller than this are sent uncompressed, like most servers do.
+COMPRESS_MIN_LENGTH = 1024
+
+# What an HTTP/2 client with prior knowledge sends first, instead of a request line.
+HTTP2_PREFACE = b'PRI * HTTP/2.0\r\n\r\nSM\r\n\r\n'
+
+
+def make_standups(count: int, questions: int = 3) -> List[Dict]:
+    """
+    Builds a deterministic list of standup dictionaries shaped like /v1/standups.
+
+    Args:
+        count: The number of standups to generate.
+        questions: The number of questions per standup.
+
+    Returns:
+        A list of standup dictionaries.
+    """
+    return [
+        {
+            'id': standup_id,
+            'name': f"Standup {standup_id}",
+            'questions': [
+                {
+                    'id': standup_id * 100 + index,
+                    'text': f"Question {index} of standup {standup_id}?",
+                    'color': 'EEEEEE',
+                    'answer_type': 'text',
+                    'answer_choices': []
+                }
+                for index in range(questions)
+            ]
+        }
+        for standup_id in range(1, count + 1)
+    ]
+
+
+def make_report(report_id: int, standup: Dict, timestamp: int, answers: Optional[Dict] = None) -> Dict:
+    """
+    Builds a report dictionary shaped like the items of /v1/reports.
+
+    Args:
+        report_id: The ID of the report.
+        standup: The standup dictionary the report belongs to.
+        timestamp: When the report was submitted, in seconds since the epoch.
+        answers: Answer dictionaries keyed by question id. Defaults to generated text.
+
+    Returns:
+        A report dictionary.
+    """
+    answers = answers or {}
+    return {
+        'id': report_id,
+        'standup_id': standup['id'],
+        'timestamp': timestamp,
+        'channel': 'general',
+        'member': STUB_MEMBER,
+        'questions': [
+            {
+                'id': report_id * 1000 + index,
+                'question_id': question['id'],
+                'question': question['text'],
+                'color': question['color'],
+                'answer': (answers.get(str(question['id'])) or {}).get('text', f"Answer {report_id}.{index}")
+            }
+            for index, question in enumerate(standup['questions'])
+        ]
+    }
+
+
+class _StubRoutes:
+    """
+    Answers requests to the stub's endpoints. Subclasses provide stub, path,
+    headers and _read_body() for the request, and write the responses in
+    their protocol with _write() and _write_streamed().
+    """
+    def _accepts_gzip(self) -> bool:
+        accepted = self.headers.get('Accept-Encoding') or ''
+        return 'gzip' in [coding.split(';')[0].strip() for coding in accepted.split(',')]
+
+    def _send_json(self, status: int, body, headers: Optional[Dict[str, str]] = None) -> None:
+        data = json.dumps(body).encode('utf-8')
+        stub = self.stub
+        stub.record_response(status)
+        response_headers = {'Content-Type': 'application/json'}
+        if stub.compress_responses and len(data) >= COMPRESS_MIN_LENGTH and self._accepts_gzip():
+            data = gzip.compress(data, compresslevel=6)
+            response_headers['Content-Encoding'] = 'gzip'
+        stub.record_sent(len(data))
+        response_headers['Content-Length'] = str(len(data))
+        response_headers.update(headers or {})
+        self._write(status, response_headers, data)
+
+    def _send_fault(self) -> bool:
+        """
+        Answers with an injected 429 or 503 if the stub draws one for this request.
+        """
+        stub = self.stub
+        status = stub.draw_fault()
+        if status == 429:
+            self._send_json(429, {'message': 'Too Many Requests'}, {'Retry-After': f"{stub.retry_after:g}"})
+        elif status == 503:
+            self._send_json(503, {'message': 'Service Unavailable'})
+        return status is not None
+
+    def _send_json_chunked(self, items: List, delay: float) -> None:
+        """
+        Sends a JSON array one element per chunk (or HTTP/2 DATA frame) and
+        `delay` seconds apart, like a slow multi-megabyte download.
+        """
+        self.stub.record_response(200)
+        pieces = ['['] + [('' if index == 0 else ',') + json.dumps(item) for index, item in enumerate(items)] + [']']
+        self._write_streamed(200, {'Content-Type': 'application/json'},
+                             (piece.encode('utf-8') for piece in pieces), delay)
+
+    def do_GET(self):
+        stub = self.stub
+        stub.record_request()
+        time.sleep(stub.latency)
+        if not self.headers.get('Authorization'):
+            self._send_json(401, {'message': 'Unauthorized'})
+        elif self._send_fault():
+            pass
+        elif urlsplit(self.path).path.rstrip('/') == '/v1/standups':
+            if stub.stream_delay:
+                self._send_json_chunked(stub.standups, stub.stream_delay)
+            else:
+                self._send_json(200, stub.standups)
+        elif urlsplit(self.path).path.rstrip('/') == '/v1/reports':
+            query = {name: values[0] for name, values in parse_qs(urlsplit(self.path).query).items()}
+            try:
+                self._send_json(200, stub.query_reports(
+                    standup_id=int(query['standup_id']) if 'standup_id' in query else None,
+                    after=int(query['after']) if 'after' in query else None,
+                    before=int(query['before']) if 'before' in query else None,
+                    limit=int(query.get('limit', 100))
+                ))
+            except ValueError:
+                self._send_json(400, {'message': 'Invalid query'})
+        else:
+            self._send_json(404, {'message': 'Not found'})
+
+    def do_POST(self):
+        stub = self.stub
+        stub.record_request()
+        body = self._read_body()
+        time.sleep(stub.latency)
+        if self.path.rstrip('/') != '/v1/reports':
+            self._send_json(404, {'message': 'Not found'})
+            return
+        if not self.headers.get('Authorization'):
+            self._send_json(401, {'message': 'Unauthorized'})
+            return
+        if self._send_fault():
+            return
+        encoding = (self.headers.get('Content-Encoding') or 'identity').lower()
+        if encoding == 'gzip' and stub.compressed_requests:
+            try:
+                body = gzip.decompress(body)
+            except (OSError, EOFError):
+                self._send_json(400, {'message': 'Malformed gzip body'})
+                return
+        elif encoding != 'identity':
+            self._send_json(415, {'message': f"Unsupported Content-Encoding {encoding}"})
+            return
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            self._send_json(400, {'message': 'Malformed JSON'})
+            return
+        if not isinstance(payload, dict) or not payload.get('answers'):
+            self._send_json(400, {'message': 'Answers are required'})
+            return
+        if payload.get('standup_id') not in stub.standup_ids:
+            self._send_json(404, {'message': 'Standup not found'})
+            return
+        report = stub.add_report(payload['standup_id'], payload['answers'])
+        self._send_json(200, {
+            'id': report['id'],
+            'standup_id': report['standup_id'],
+            'done_at': report['timestamp'],
+            'channel': report['channel']
+        })
+
+
+class _StubHandler(_StubRoutes, BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        # Headers and body are written separately; without TCP_NODELAY the
+        # body waits on the client's delayed ACK on keep-alive connections.
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.stub = self.server.stub
+        self.stub.record_connection()
+
+    def handle(self):
+        if self.stub.http2 and self._starts_http2():
+            _H2Connection(self.connection, self.stub).serve()
+        else:
+            super().handle()
+
+    def _starts_http2(self) -> bool:
+        """
+        Returns whether the client opened with the HTTP/2 connection preface,
+        without consuming it.
+        """
+        data = self.connection.recv(len(HTTP2_PREFACE), socket.MSG_PEEK)
+        if data and len(data) < len(HTTP2_PREFACE) and HTTP2_PREFACE.startswith(data):
+            data = self.connection.recv(len(HTTP2_PREFACE), socket.MSG_PEEK | socket.MSG_WAITALL)
+        return data == HTTP2_PREFACE
+
+    def log_message(self, format, *args):
+        pass
+
+    def _write(self, status: int, headers: Dict[str, str], data: bytes) -> None:
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _write_streamed(self, status: int, headers: Dict[str, str], pieces, delay: float) -> None:
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        for data in pieces:
+            self.stub.record_sent(len(data))
+            self.wfile.write(f"{len(data):x}\r\n".encode('ascii') + data + b'\r\n')
+            self.wfile.flush()
+            time.sleep(delay)
+        self.wfile.write(b'0\r\n\r\n')
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        self.stub.record_received(len(body))
+        return body
+
+
+class _H2Headers(dict):
+    """
+    Request headers of an HTTP/2 stream, looked up regardless of case.
+    """
+    def get(self, name, default=None):
+        return super().get(name.lower(), default)
+
+
+class _H2Stream(_StubRoutes):
+    """
+    Answers one request received on an HTTP/2 connection.
+    """
+    def __init__(self, connection: '_H2Connection', stream_id: int, headers: List, body: bytes):
+        self.stub = connection.stub
+        self._connection = connection
+        self._stream_id = stream_id
+        self.headers = _H2Headers(headers)
+        self.path = self.headers.get(':path', '/')
+        self._body = body
+
+    def handle(self) -> None:
+        method = self.headers.get(':method')
+        try:
+            if method == 'GET':
+                self.do_GET()
+            elif method == 'POST':
+                self.do_POST()
+            else:
+                self._send_json(501, {'message': f"Unsupported method {method}"})
+        except _H2StreamClosed:
+            pass
+
+    def _read_body(self) -> bytes:
+        self.stub.record_received(len(self._body))
+        return self._body
+
+    def _write(self, status: int, headers: Dict[str, str], data: bytes) -> None:
+        self._connection.send_headers(self._stream_id, status, headers)
+        self._connection.send_data(self._stream_id, data, end_stream=True)
+
+    def _write_streamed(self, status: int, headers: Dict[str, str], pieces, delay: float) -> None:
+        self._connection.send_headers(self._stream_id, status, headers)
+        for data in pieces:
+            self.stub.record_sent(len(data))
+            self._connection.send_data(self._stream_id, data)
+            time.sleep(delay)
+        self._connection.send_data(self._stream_id, b'', end_stream=True)
+
+
+class _H2StreamClosed(Exception):
+    pass
+
+
+class _H2Connection:
+    """
+    Serves an HTTP/2 connection opened with prior knowledge (h2c), answering
+    each request on its own thread so the streams are multiplexed.
+    """
+    def __init__(self, sock: socket.socket, stub: 'StubGeekbotServer'):
+        import h2.config
+        import h2.connection
+        import h2.events
+        import h2.exceptions
+        self.stub = stub
+        self._sock = sock
+        self._events = h2.events
+        self._errors = h2.exceptions
+        self._h2 = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False, header_encoding='utf-8'))
+        # Guards the h2 state machine and the socket's writes; senders wait on
+        # it for the client to open the flow control window.
+        self._condition = threading.Condition()
+        self._closed = False
+
+    def _flush(self) -> None:
+        data = self._h2.data_to_send()
+        if data:
+            self._sock.sendall(data)
+
+    def serve(self) -> None:
+        requests = {}
+        with self._condition:
+            self._h2.initiate_connection()
+            self._flush()
+        try:
+            while True:
+                data = self._sock.recv(65535)
+                if not data:
+                    break
+                with self._condition:
+                    events = self._h2.receive_data(data)
+                    self._flush()
+                    self._condition.notify_all()
+                for event in events:
+                    if isinstance(event, self._events.RequestReceived):
+                        requests[event.stream_id] = (event.headers, bytearray())
+                    elif isinstance(event, self._events.DataReceived):
+                        requests[event.stream_id][1].extend(event.data)
+                        with self._condition:
+                            self._h2.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+                            self._flush()
+                    elif isinstance(event, self._events.StreamEnded):
+                        headers, body = requests.pop(event.stream_id)
+                        stream = _H2Stream(self, event.stream_id, headers, bytes(body))
+                        threading.Thread(target=stream.handle, daemon=True).start()
+                    elif isinstance(event, self._events.ConnectionTerminated):
+                        return
+        except (OSError, self._errors.ProtocolError):
+            pass
+        finally:
+            with self._condition:
+                self._closed = True
+                self._condition.notify_all()
+
+    def send_headers(self, stream_id: int, status: int, headers: Dict[str, str]) -> None:
+        response_headers = [(':status', str(status))] + [(name.lower(), value) for name, value in headers.items()]
+        with self._condition:
+            try:
+                self._h2.send_headers(stream_id, response_headers)
+                self._flush()
+            except (OSError, self._errors.ProtocolError):
+                raise _H2StreamClosed()
+
+    def send_data(self, stream_id: int, data: bytes, end_stream: bool = False) -> None:
+        """
+        Sends a body in frames as the flow control windows allow.
+        """
+        with self._condition:
+            try:
+                if not data:
+                    if end_stream:
+                        self._h2.end_stream(stream_id)
+                        self._flush()
+                    return
+                while data:
+                    window = min(self._h2.local_flow_control_window(stream_id), self._h2.max_outbound_frame_size)
+                    if window <= 0:
+                        if self._closed:
+                            raise _H2StreamClosed()
+                        self._condition.wait(1)
+                        continue
+                    chunk, data = data[:window], data[window:]
+                    self._h2.send_data(stream_id, chunk, end_stream=end_stream and not data)
+                    self._flush()
+            except (OSError, self._errors.ProtocolError):
+                raise _H2StreamClosed()
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    # The default backlog of 5 drops connections under concurrent fan-out.
+    request_queue_size = 128
+    daemon_threads = True
+
+
+class StubGeekbotServer:
+    """
+    A local, in-process stand-in for the Geekbot API used by tests and benchmarks.
+
+    Serves /v1/standups and /v1/reports over HTTP/1.1 keep-alive and counts the
+    connections and requests it receives. Posted reports are kept in memory and
+    listed newest first by GET /v1/reports, which supports the standup_id,
+    after, before and limit parameters; after and before are exclusive. Like the real service it answers 401
+    without an Authorization header, 400 for reports without answers and 404
+    for unknown standups.
+
+    Authorized requests can be failed at random with 503 Service Unavailable
+    or 429 Too Many Requests, to exercise retries; the responses sent are
+    counted by status in `responses`.
+
+    JSON bodies of at least COMPRESS_MIN_LENGTH bytes are gzipped for clients
+    that accept it, and gzipped report bodies are accepted (or answered with
+    415 Unsupported Media Type if compressed_requests is off). Body bytes are
+    counted as sent over the wire in `bytes_sent` and `bytes_received`.
+
+    With http2 on, connections that open with the HTTP/2 preface are served
+    as cleartext HTTP/2 (h2c with prior knowledge, which needs the h2
+    package), answering their streams concurrently; HTTP/1.1 keeps working
+    on the same port.
+    """
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, standups: int = 10,
+                 questions: int = 3, latency: float = 0.0, stream_delay: float = 0.0,
+                 error_rate: float = 0.0, rate_limit_rate: float = 0.0, retry_after: float = 0.0,
+                 seed: Optional[int] = None, compress_responses: bool = True,
+                 compressed_requests: bool = True, http2: bool = False):
+        """
+        Initializes the stub server without starting it.
+
+        Args:
+            host: The interface to bind to.
+            port: The port to bind to, 0 picks a free one.
+            standups: The number of standups served by /v1/standups.
+            questions: The number of questions per standup.
+            latency: Seconds to sleep before answering each request.
+            stream_delay: If set, /v1/standups is streamed one standup per
+                chunk, this many seconds apart.
+            error_rate: The fraction of authorized requests answered 503.
+            rate_limit_rate: The fraction of authorized requests answered 429.
+            retry_after: The Retry-After value, in seconds, sent with a 429.
+            seed: Seeds the draw of failed requests, for repeatable runs.
+            compress_responses: Whether to gzip large responses for clients that accept it.
+            compressed_requests: Whether to accept gzipped report bodies.
+            http2: Whether to also speak HTTP/2 with prior knowledge.
+        """
+        self.standups = make_standups(standups, questions)
+        self.standup_ids = {standup['id'] for standup in self.standups}
+        self.latency = latency
+        self.stream_delay = stream_delay
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.compress_responses = compress_responses
+        self.compressed_requests = compressed_requests
+        self.http2 = http2
+        self._random = random.Random(seed)
+        self.responses = Counter()
+        self.connections = 0
+        self.requests = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self._report_id = 0
+        self.reports = []
+        self._lock = threading.Lock()
+        self._httpd = _StubHTTPServer((host, port), _StubHandler)
+        self._httpd.stub = self
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def record_connection(self) -> None:
+        with self._lock:
+            self.connections += 1
+
+    def record_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def record_response(self, status: int) -> None:
+        with self._lock:
+            self.responses[status] += 1
+
+    def record_sent(self, length: int) -> None:
+        with self._lock:
+            self.bytes_sent += length
+
+    def record_received(self, length: int) -> None:
+        with self._lock:
+            self.bytes_received += length
+
+    def draw_fault(self) -> Optional[int]:
+        """
+        Returns 429 or 503 if the next request is to fail, at the configured rates.
+        """
+        if not (self.rate_limit_rate or self.error_rate):
+            return None
+        with self._lock:
+            draw = self._random.random()
+        if draw < self.rate_limit_rate:
+            return 429
+        if draw < self.rate_limit_rate + self.error_rate:
+            return 503
+        return None
+
+    def add_report(self, standup_id: int, answers: Optional[Dict] = None,
+                   timestamp: Optional[int] = None) -> Dict:
+        """
+        Stores a report as if it had been posted.
+
+        Args:
+            standup_id: The ID of a served standup.
+            answers: Answer dictionaries keyed by question id.
+            timestamp: The submission time. Defaults to now.
+
+        Returns:
+            The stored report dictionary.
+        """
+        standup = next(standup for standup in self.standups if standup['id'] == standup_id)
+        with self._lock:
+            self._report_id += 1
+            report = make_report(
+                self._report_id, standup, int(time.time()) if timestamp is None else timestamp, answers
+            )
+            self.reports.append(report)
+        return report
+
+    def query_reports(self, standup_id: Optional[int] = None, after: Optional[int] = None,
+                      before: Optional[int] = None, limit: int = 100) -> List[Dict]:
+        """
+        Returns the stored reports matching the filters, newest first.
+        """
+        with self._lock:
+            reports = list(self.reports)
+        matching = [
+            report for report in reports
+            if (standup_id is None or report['standup_id'] == standup_id)
+            and (after is None or report['timestamp'] > after)
+            and (before is None or report['timestamp'] < before)
+        ]
+        matching.sort(key=lambda report: (report['timestamp'], report['id']), reverse=True)
+        return matching[:limit]
+
+    def start(self) -> 'StubGeekbotServer':
+        """
+        Starts serving in a background thread.
+        """
+        self._thread = threading.Thread(target=self._httpd.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Stops serving and releases the listening socket.
+        """
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> 'StubGeekbotServer':
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+
+def _serve_in_child(connection, options: Dict) -> None:
+    with StubGeekbotServer(**options) as server:
+        connection.send(server.url)
+        connection.recv()
+        connection.send({
+            'requests': server.requests,
+            'connections': server.connections,
+            'responses': dict(server.responses),
+            'bytes_sent': server.bytes_sent,
+            'bytes_received': server.bytes_received
+        })
+
+
+class StubProcess:
+    """
+    Runs a StubGeekbotServer in a child process, so the server's CPU time
+    does not compete with the client being measured for the GIL.
+
+    Usage:
+        with StubProcess(standups=1000, latency=0.05) as stub:
+            client = APIClient(base_url=stub.url)
+        print(stub.stats['requests'])
+    """
+    def __init__(self, **options):
+        """
+        Initializes the process without starting it.
+
+        Args:
+            **options: Keyword arguments for StubGeekbotServer.
+        """
+        self.options = options
+        self.url = None
+        self.stats = None
+        self._connection = None
+        self._process = None
+
+    def __enter__(self) -> 'StubProcess':
+        self._connection, child = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(target=_serve_in_child, args=(child, self.options), daemon=True)
+        self._process.start()
+        self.url = self._connection.recv()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """
+        Stops the server and collects its request, connection and response counts into `stats`.
+        """
+        self._connection.send('stop')
+        self.stats = self._connection.recv()
+        self._process.join()
@@ -0,0 +1,336 @@
+## tracing.py
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+# Tracing is off unless turned on by `geekbot --trace PATH` or GEEKBOT_TRACE,
+# in which case every span is kept in memory and written to PATH on exit.
+# While it is off, span() returns a shared object whose methods do nothing,
+# and attributes that cost something to compute are guarded by `recording`.
+
+# Written formats: JSON lines, one span per line, or an OTLP/JSON file that
+# OpenTelemetry collectors and trace viewers can import.
+TRACE_FORMATS = ('jsonl', 'otlp')
+
+# The service name recorded in OTLP resources.
+SERVICE_NAME = 'geekbot-cli'
+
+_tracer = None
+
+
+class _NoSpan:
+    """
+    Stands in for a span while tracing is off.
+    """
+    __slots__ = ()
+    recording = False
+
+    def __enter__(self) -> '_NoSpan':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        return False
+
+    def set(self, key: str, value) -> None:
+        pass
+
+
+NO_SPAN = _NoSpan()
+
+
+class Span:
+    """
+    A timed operation with attributes, nested under the span that was open
+    on the same thread when it started.
+    """
+    __slots__ = ('tracer', 'name', 'attributes', 'span_id', 'parent_id', 'thread', 'start', 'end', 'error')
+    recording = True
+
+    def __init__(self, tracer: 'Tracer', name: str, attributes: Optional[Dict] = None):
+        self.tracer = tracer
+        self.name = name
+        self.attributes = dict(attributes) if attributes else {}
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = None
+        self.thread = None
+        self.start = None
+        self.end = None
+        self.error = None
+
+    def set(self, key: str, value) -> None:
+        """
+        Sets an attribute, e.g. a status code known only once the span ends.
+        """
+        self.attributes[key] = value
+
+    def __enter__(self) -> 'Span':
+        stack = self.tracer._stack()
+        if stack:
+            self.parent_id = stack[-1].span_id
+        stack.append(self)
+        self.thread = threading.current_thread().name
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        self.end = time.perf_counter_ns()
+        if exc_type is not None:
+            self.error = f"{exc_type.__name__}: {exc_value}"
+        stack = self.tracer._stack()
+        if stack and stack[-1] is self:
+            stack.pop()
+        self.tracer._finish(self)
+        return False
+
+
+class _Attached:
+    """
+    Makes a span from another thread the parent of the spans opened on this one.
+    """
+    __slots__ = ('tracer', 'span')
+
+    def __init__(self, tracer: 'Tracer', span: Span):
+        self.tracer = tracer
+        self.span = span
+
+    def __enter__(self) -> Span:
+        self.tracer._stack().append(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        stack = self.tracer._stack()
+        if stack and stack[-1] is self.span:
+            stack.pop()
+        return False
+
+
+class Tracer:
+    """
+    Collects the finished spans of one process run, all under one trace id,
+    and writes them out.
+    """
+    def __init__(self, path: str, trace_format: str = 'jsonl'):
+        """
+        Initializes the tracer.
+
+        Args:
+            path: The file the spans are written to.
+            trace_format: One of TRACE_FORMATS.
+
+        Raises:
+            ValueError: If the format is unknown.
+        """
+        if trace_format not in TRACE_FORMATS:
+            raise ValueError(f"Unknown trace format {trace_format!r}, expected one of {', '.join(TRACE_FORMATS)}")
+        self.path = path
+        self.format = trace_format
+        self.trace_id = os.urandom(16).hex()
+        self.spans: List[Span] = []
+        self.root: Optional[Span] = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # perf_counter_ns() + _epoch is the wall clock time in ns.
+        self._epoch = time.time_ns() - time.perf_counter_ns()
+
+    def span(self, name: str, attributes: Optional[Dict] = None) -> Span:
+        return Span(self, name, attributes)
+
+    def current(self) -> Optional[Span]:
+        stack = self._stack()
+        return stack[-1] if stack else None
+
+    def _stack(self) -> List[Span]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _finish(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def records(self) -> List[Dict]:
+        """
+        Returns the finished spans as flat dictionaries, in start order.
+        """
+        with self._lock:
+            spans = sorted(self.spans, key=lambda span: span.start)
+        return [{
+            'trace_id': self.trace_id,
+            'span_id': span.span_id,
+            'parent_id': span.parent_id,
+            'name': span.name,
+            'thread': span.thread,
+            'start_unix_nano': span.start + self._epoch,
+            'duration_ms': round((span.end - span.start) / 1e6, 3),
+            'attributes': span.attributes,
+            'error': span.error,
+        } for span in spans]
+
+    def otlp(self) -> Dict:
+        """
+        Returns the finished spans as an OTLP/JSON ExportTraceServiceRequest.
+        """
+        spans = []
+        for record in self.records():
+            span = {
+                'traceId': record['trace_id'],
+                'spanId': record['span_id'],
+                'name': record['name'],
+                'kind': 1,  # SPAN_KIND_INTERNAL
+                'startTimeUnixNano': str(record['start_unix_nano']),
+                'endTimeUnixNano': str(record['start_unix_nano'] + int(record['duration_ms'] * 1e6)),
+                'attributes': [otlp_attribute(key, value) for key, value in
+                               dict(record['attributes'], **{'thread.name': record['thread']}).items()],
+            }
+            if record['parent_id']:
+                span['parentSpanId'] = record['parent_id']
+            if record['error']:
+                span['status'] = {'code': 2, 'message': record['error']}  # STATUS_CODE_ERROR
+            spans.append(span)
+        return {'resourceSpans': [{
+            'resource': {'attributes': [otlp_attribute('service.name', SERVICE_NAME)]},
+            'scopeSpans': [{'scope': {'name': 'geekbot_cli'}, 'spans': spans}],
+        }]}
+
+    def write(self) -> None:
+        """
+        Writes the finished spans to the tracer's file in its format.
+        """
+        with open(self.path, 'w', encoding='utf-8') as trace_file:
+            if self.format == 'otlp':
+                json.dump(self.otlp(), trace_file)
+                trace_file.write('\n')
+            else:
+                for record in self.records():
+                    trace_file.write(json.dumps(record, default=str) + '\n')
+
+
+def otlp_attribute(key: str, value) -> Dict:
+    """
+    Encodes an attribute as an OTLP/JSON KeyValue.
+    """
+    if isinstance(value, bool):
+        encoded = {'boolValue': value}
+    elif isinstance(value, int):
+        encoded = {'intValue': str(value)}
+    elif isinstance(value, float):
+        encoded = {'doubleValue': value}
+    else:
+        encoded = {'stringValue': str(value)}
+    return {'key': key, 'value': encoded}
+
+
+def default_format(path: str) -> str:
+    """
+    Guesses the trace format from a file name: OTLP for .json, JSON lines otherwise.
+    """
+    return 'otlp' if str(path).lower().endswith('.json') else 'jsonl'
+
+
+def span(name: str, attributes: Optional[Dict] = None):
+    """
+    Starts a span, to be used as a context manager.
+
+    Args:
+        name: The operation, e.g. 'http.request'.
+        attributes: Attributes known when the span starts.
+
+    Returns:
+        A Span, or NO_SPAN while tracing is off.
+    """
+    tracer = _tracer
+    if tracer is None:
+        return NO_SPAN
+    return Span(tracer, name, attributes)
+
+
+def current_span() -> Optional[Span]:
+    """
+    Returns the innermost span open on this thread, or None.
+    """
+    tracer = _tracer
+    return tracer.current() if tracer is not None else None
+
+
+def attached(parent: Optional[Span]):
+    """
+    Nests the spans opened on this thread under a span from another thread,
+    e.g. one captured with current_span() before starting a background thread.
+    """
+    tracer = _tracer
+    if tracer is None or parent is None:
+        return NO_SPAN
+    return _Attached(tracer, parent)
+
+
+def is_enabled() -> bool:
+    return _tracer is not None
+
+
+def start(path: str, trace_format: Optional[str] = None, root: str = 'geekbot',
+          attributes: Optional[Dict] = None) -> Tracer:
+    """
+    Turns tracing on and opens a root span on the calling thread, which stop() ends.
+
+    Args:
+        path: The file the spans are written to by stop().
+        trace_format: One of TRACE_FORMATS. Defaults to default_format(path).
+        root: The root span's name.
+        attributes: The root span's attributes.
+
+    Returns:
+        The active Tracer.
+    """
+    global _tracer
+    tracer = Tracer(path, trace_format or default_format(path))
+    _tracer = tracer
+    tracer.root = tracer.span(root, attributes).__enter__()
+    return tracer
+
+
+def stop() -> None:
+    """
+    Ends the root span, writes the trace and turns tracing off.
+    """
+    global _tracer
+    tracer, _tracer = _tracer, None
+    if tracer is None:
+        return
+    tracer.root.__exit__(None, None, None)
+    tracer.write()
+
+
+def instrument_session(session) -> None:
+    """
+    Makes a requests.Session's connections record 'http.connect' spans for
+    connection setup and, inside them, 'net.connect' spans for the DNS lookup
+    and TCP handshake, so the rest of an HTTPS connect is the TLS handshake.
+    """
+    from urllib3.connection import HTTPConnection, HTTPSConnection
+    from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+    def traced(connection_class):
+        class TracedConnection(connection_class):
+            def _new_conn(self):
+                with span('net.connect', {'net.peer.name': self.host, 'net.peer.port': self.port}):
+                    return super()._new_conn()
+
+            def connect(self):
+                with span('http.connect', {'net.peer.name': self.host,
+                                           'tls': connection_class is HTTPSConnection}):
+                    super().connect()
+        TracedConnection.__name__ = f"Traced{connection_class.__name__}"
+        return TracedConnection
+
+    class TracedHTTPConnectionPool(HTTPConnectionPool):
+        ConnectionCls = traced(HTTPConnection)
+
+    class TracedHTTPSConnectionPool(HTTPSConnectionPool):
+        ConnectionCls = traced(HTTPSConnection)
+
+    pool_classes = {'http': TracedHTTPConnectionPool, 'https': TracedHTTPSConnectionPool}
+    for adapter in set(session.adapters.values()):
+        adapter.poolmanager.pool_classes_by_scheme = pool_classes
@@ -0,0 +1,704 @@
+## transport.py
+import asyncio
+import datetime
+import http.client
+import json as json_module
+import os
+import socket
+import ssl
+import threading
+import time
+import zlib
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urlencode, urlsplit
+from geekbot_cli import tracing
+from geekbot_cli.exceptions import HTTPStatusError, TransportConnectionError, TransportError
+
+# APIClient sends its requests through one of these transports:
+#   requests  The default: a urllib3 connection pool, proxies from the
+#             environment, brotli responses when brotli is installed.
+#   stdlib    http.client only, for installs without requests. Keeps idle
+#             connections alive per host, but ignores proxy settings.
+#   http2     httpx with h2 (`pip install geekbot-cli[http2]`). Concurrent
+#             requests share one multiplexed connection per host instead of
+#             opening one connection each.
+# They take the same request arguments and return a Response with the same
+# methods, and raise the TransportError family of exceptions, which APIClient
+# maps to the standup exceptions whatever the backend.
+TRANSPORTS = ('requests', 'stdlib', 'http2')
+
+# Bytes read from the socket at a time when a whole body is read.
+READ_CHUNK_SIZE = 64 * 1024
+
+# Methods that may be sent twice without changing the result (RFC 9110 9.2.2).
+IDEMPOTENT_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE', 'TRACE'))
+
+Timeout = Union[float, Tuple[float, float]]
+
+
+def default_transport() -> str:
+    """
+    Returns the transport named by GEEKBOT_TRANSPORT, or requests if it is
+    installed and stdlib otherwise.
+    """
+    name = os.environ.get('GEEKBOT_TRANSPORT', '').lower()
+    if name:
+        return name
+    try:
+        import requests  # noqa: F401
+    except ImportError:
+        return 'stdlib'
+    return 'requests'
+
+
+def make_transport(name: Optional[str] = None, pool_connections: int = 1, pool_maxsize: int = 10,
+                   pool_block: bool = False, session=None) -> 'Transport':
+    """
+    Builds a transport by name.
+
+    Args:
+        name: One of TRANSPORTS. Defaults to default_transport(), or requests
+            when a session is given.
+        pool_connections: The number of per-host connection pools the requests transport caches.
+        pool_maxsize: The maximum number of connections kept per host.
+        pool_block: Whether the requests transport blocks instead of opening
+            extra connections once pool_maxsize are in use.
+        session: A pre-configured requests.Session for the requests transport.
+
+    Raises:
+        ValueError: If the name is unknown.
+        ImportError: If the transport's dependencies are not installed.
+    """
+    name = name or ('requests' if session is not None else default_transport())
+    if name == 'requests':
+        return RequestsTransport(pool_connections, pool_maxsize, pool_block, session)
+    if name == 'stdlib':
+        return StdlibTransport(pool_maxsize)
+    if name == 'http2':
+        return HTTP2Transport(pool_maxsize)
+    raise ValueError(f"Unknown transport {name!r}, expected one of {', '.join(TRANSPORTS)}")
+
+
+def split_timeout(timeout: Timeout) -> Tuple[float, float]:
+    """
+    Returns the (connect, read) timeouts of a single or tuple timeout.
+    """
+    if isinstance(timeout, tuple):
+        return timeout[0], timeout[1]
+    return timeout, timeout
+
+
+def status_message(status_code: int, reason: str, url: str) -> str:
+    """
+    Describes an error status the way requests does, so messages read the same with every transport.
+    """
+    kind = 'Client' if status_code < 500 else 'Server'
+    return f"{status_code} {kind} Error: {reason} for url: {url}"
+
+
+def _brotli_available() -> bool:
+    try:
+        import brotli  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class Response:
+    """
+    A response returned by a transport.
+
+    Attributes:
+        status_code: The HTTP status code.
+        headers: The response headers; get() ignores the case of names.
+        url: The requested URL.
+        elapsed: A timedelta from sending the request to receiving the headers.
+        request_body_length: The bytes of request body sent, or None if unknown.
+    """
+    status_code: int = 0
+    reason: str = ''
+    headers = None
+    url: str = ''
+    elapsed: datetime.timedelta = datetime.timedelta(0)
+    request_body_length: Optional[int] = None
+
+    @property
+    def content(self) -> bytes:
+        """
+        The decoded body, read in full on first access.
+        """
+        raise NotImplementedError
+
+    def iter_content(self, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[bytes]:
+        """
+        Yields the decoded body as it arrives.
+        """
+        raise NotImplementedError
+
+    def json(self):
+        return json_module.loads(self.content)
+
+    def wire_length(self, decoded_length: int) -> int:
+        """
+        Returns the body bytes the response took on the wire, once it was read.
+        """
+        return decoded_length
+
+    def raise_for_status(self) -> None:
+        """
+        Raises HTTPStatusError for 4xx and 5xx statuses.
+        """
+        if self.status_code >= 400:
+            raise HTTPStatusError(status_message(self.status_code, self.reason, self.url), self.status_code)
+
+    def close(self) -> None:
+        """
+        Releases the connection, dropping it if the body was not read to the end.
+        """
+
+
+class Transport:
+    """
+    Sends HTTP requests for APIClient.
+    """
+    name = ''
+    # The Accept-Encoding header value listing the codings the transport decodes.
+    accept_encoding = 'gzip, deflate'
+
+    def request(self, method: str, url: str, timeout: Timeout, **kwargs) -> Response:
+        """
+        Sends a request.
+
+        Args:
+            method: 'get' or 'post'.
+            url: The request URL.
+            timeout: Either a single timeout or a (connect, read) tuple in seconds.
+            **kwargs: Any of headers, params, json, data and stream, as for requests.
+
+        Returns:
+            The response, with its body read unless stream is true.
+
+        Raises:
+            TransportConnectionError: If the request cannot be sent or answered in time.
+        """
+        raise NotImplementedError
+
+    def warm_up(self, url: str) -> bool:
+        """
+        Opens a connection to the URL's host ahead of the first request, if
+        the transport can. Returns whether it did.
+        """
+        return False
+
+    def close(self) -> None:
+        """
+        Closes every pooled connection.
+        """
+
+
+class RequestsResponse(Response):
+    """
+    Wraps a requests.Response.
+    """
+    def __init__(self, response, requests_module):
+        self._response = response
+        self._requests = requests_module
+
+    status_code = property(lambda self: self._response.status_code)
+    headers = property(lambda self: self._response.headers)
+    url = property(lambda self: self._response.url)
+    elapsed = property(lambda self: self._response.elapsed)
+    content = property(lambda self: self._response.content)
+
+    @property
+    def request_body_length(self) -> Optional[int]:
+        if not isinstance(self._response, self._requests.Response):
+            return None
+        return len(self._response.request.body or b'')
+
+    def json(self):
+        return self._response.json()
+
+    def iter_content(self, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[bytes]:
+        try:
+            yield from self._response.iter_content(chunk_size)
+        except self._requests.exceptions.RequestException as e:
+            raise TransportConnectionError(str(e)) from e
+
+    def wire_length(self, decoded_length: int) -> int:
+        # urllib3 counts the bytes it read before decoding, except for
+        # chunked bodies; those fall back to Content-Length.
+        raw = self._response.raw
+        read = raw.tell() if raw is not None else 0
+        if read:
+            return read
+        content_length = self._response.headers.get('Content-Length')
+        if content_length is not None and content_length.isdigit():
+            return int(content_length)
+        return decoded_length
+
+    def raise_for_status(self) -> None:
+        try:
+            self._response.raise_for_status()
+        except self._requests.exceptions.HTTPError as e:
+            response = e.response if e.response is not None else self._response
+            raise HTTPStatusError(str(e), response.status_code) from e
+
+    def close(self) -> None:
+        self._response.close()
+
+
+class RequestsTransport(Transport):
+    """
+    Sends requests through a requests.Session and its urllib3 connection pools.
+    """
+    name = 'requests'
+
+    def __init__(self, pool_connections: int = 1, pool_maxsize: int = 10, pool_block: bool = False,
+                 session=None):
+        """
+        Initializes the transport.
+
+        Args:
+            pool_connections: The number of per-host connection pools to cache.
+            pool_maxsize: The maximum number of connections kept alive per host.
+            pool_block: Whether to block instead of opening extra connections
+                once pool_maxsize connections to a host are in use.
+            session: An optional pre-configured session to use instead of creating one.
+        """
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.request import ACCEPT_ENCODING
+        self._requests = requests
+        self.accept_encoding = ACCEPT_ENCODING
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                                  pool_block=pool_block)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+        self.session = session
+        if tracing.is_enabled():
+            tracing.instrument_session(session)
+
+    def request(self, method: str, url: str, timeout: Timeout, **kwargs) -> Response:
+        # Through the session's get/post methods, which tests patch.
+        send = getattr(self.session, method)
+        try:
+            return RequestsResponse(send(url, timeout=timeout, **kwargs), self._requests)
+        except (self._requests.exceptions.ConnectionError, self._requests.exceptions.Timeout) as e:
+            raise TransportConnectionError(str(e)) from e
+        except self._requests.exceptions.HTTPError as e:
+            # Raised by session hooks that check the status.
+            raise HTTPStatusError(str(e), getattr(e.response, 'status_code', None)) from e
+        except self._requests.exceptions.RequestException as e:
+            raise TransportError(str(e)) from e
+
+    def warm_up(self, url: str) -> bool:
+        from urllib3.exceptions import HTTPError as URLLibHTTPError
+        if self._requests.utils.get_environ_proxies(url):
+            # Requests would go through the proxy's pool instead.
+            return False
+        try:
+            adapter = self.session.get_adapter(url)
+            pool = adapter.get_connection(url)
+            adapter.cert_verify(pool, url, self.session.verify, self.session.cert)
+            # urllib3 has no public way to pre-connect; check a connection out
+            # of the pool, connect it and hand it back for the next request.
+            connection = pool._get_conn()
+            try:
+                connection.connect()
+            except BaseException:
+                connection.close()
+                raise
+            finally:
+                pool._put_conn(connection)
+        except (OSError, URLLibHTTPError, self._requests.exceptions.RequestException):
+            return False
+        return True
+
+    def close(self) -> None:
+        self.session.close()
+
+
+def _decoder(content_encoding: Optional[str]):
+    """
+    Returns an object with decompress() and flush() for a Content-Encoding,
+    or None for identity.
+    """
+    coding = (content_encoding or '').strip().lower()
+    if coding in ('', 'identity'):
+        return None
+    if coding == 'gzip':
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if coding == 'deflate':
+        return _DeflateDecoder()
+    if coding == 'br' and _brotli_available():
+        import brotli
+        return _BrotliDecoder(brotli.Decompressor())
+    raise TransportError(f"Unsupported Content-Encoding {content_encoding}")
+
+
+class _DeflateDecoder:
+    """
+    Decodes deflate bodies, which servers send either zlib-wrapped or raw.
+    """
+    def __init__(self):
+        self._first = True
+        self._decoder = zlib.decompressobj()
+
+    def decompress(self, data: bytes) -> bytes:
+        if self._first and data:
+            self._first = False
+            try:
+                return self._decoder.decompress(data)
+            except zlib.error:
+                self._decoder = zlib.decompressobj(-zlib.MAX_WBITS)
+        return self._decoder.decompress(data)
+
+    def flush(self) -> bytes:
+        return self._decoder.flush()
+
+
+class _BrotliDecoder:
+    def __init__(self, decompressor):
+        self._decompressor = decompressor
+
+    def decompress(self, data: bytes) -> bytes:
+        return self._decompressor.process(data)
+
+    def flush(self) -> bytes:
+        return b''
+
+
+class StdlibResponse(Response):
+    """
+    A response read from an http.client connection, decoded as it is read.
+    The connection goes back to its transport's pool once the body is read.
+    """
+    def __init__(self, transport: 'StdlibTransport', key: Tuple, connection: http.client.HTTPConnection,
+                 response: http.client.HTTPResponse, url: str, elapsed: float, request_body_length: int):
+        self._transport = transport
+        self._key = key
+        self._connection = connection
+        self._response = response
+        self._decoder = _decoder(response.headers.get('Content-Encoding'))
+        self._content = None
+        self._wire = 0
+        self.status_code = response.status
+        self.reason = response.reason
+        self.headers = response.headers
+        self.url = url
+        self.elapsed = datetime.timedelta(seconds=elapsed)
+        self.request_body_length = request_body_length
+
+    @property
+    def content(self) -> bytes:
+        if self._content is None:
+            self._content = b''.join(self.iter_content(READ_CHUNK_SIZE))
+        return self._content
+
+    def iter_content(self, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[bytes]:
+        if self._content is not None:
+            yield self._content
+            return
+        try:
+            while True:
+                # read1 returns what has arrived, so chunked bodies stream.
+                data = self._response.read1(chunk_size)
+                if not data:
+                    break
+                self._wire += len(data)
+                if self._decoder is not None:
+                    data = self._decoder.decompress(data)
+                if data:
+                    yield data
+            # read1 leaves a fully read Content-Length body open, which would
+            # keep the connection from sending its next request.
+            self._response.close()
+            if self._decoder is not None:
+                tail = self._decoder.flush()
+                if tail:
+                    yield tail
+        except (OSError, http.client.HTTPException) as e:
+            self._drop()
+            raise TransportConnectionError(f"Connection broken while reading the response: {e!r}") from e
+        except zlib.error as e:
+            self._drop()
+            raise TransportError(f"Could not decode the response body: {e}") from e
+        self._release()
+
+    def wire_length(self, decoded_length: int) -> int:
+        return self._wire
+
+    def close(self) -> None:
+        if self._connection is not None:
+            if self._response.isclosed():
+                self._release()
+            else:
+                self._drop()
+
+    def _release(self) -> None:
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            self._transport._release(self._key, connection, self._response.will_close)
+
+    def _drop(self) -> None:
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            connection.close()
+
+
+class StdlibTransport(Transport):
+    """
+    Sends requests with http.client, keeping idle connections per host for reuse.
+    """
+    name = 'stdlib'
+
+    def __init__(self, pool_maxsize: int = 10, ssl_context: Optional[ssl.SSLContext] = None):
+        """
+        Initializes the transport.
+
+        Args:
+            pool_maxsize: The maximum number of idle connections kept per host.
+            ssl_context: The context for HTTPS connections. Defaults to
+                ssl.create_default_context().
+        """
+        self.pool_maxsize = pool_maxsize
+        self.accept_encoding = 'gzip, deflate, br' if _brotli_available() else 'gzip, deflate'
+        self._ssl_context = ssl_context
+        self._idle: Dict[Tuple, List[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+
+    def _new_connection(self, key: Tuple, connect_timeout: float) -> http.client.HTTPConnection:
+        scheme, host, port = key
+        if scheme == 'https':
+            if self._ssl_context is None:
+                self._ssl_context = ssl.create_default_context()
+            return http.client.HTTPSConnection(host, port, timeout=connect_timeout, context=self._ssl_context)
+        return http.client.HTTPConnection(host, port, timeout=connect_timeout)
+
+    def _checkout(self, key: Tuple) -> Optional[http.client.HTTPConnection]:
+        with self._lock:
+            idle = self._idle.get(key)
+            return idle.pop() if idle else None
+
+    def _release(self, key: Tuple, connection: http.client.HTTPConnection, will_close: bool) -> None:
+        if not will_close:
+            with self._lock:
+                idle = self._idle.setdefault(key, [])
+                if len(idle) < self.pool_maxsize:
+                    idle.append(connection)
+                    return
+        connection.close()
+
+    def _connect(self, connection: http.client.HTTPConnection, key: Tuple, read_timeout: float) -> None:
+        with tracing.span('http.connect', {'net.peer.name': key[1], 'tls': key[0] == 'https'}):
+            connection.connect()
+        connection.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        connection.sock.settimeout(read_timeout)
+
+    def request(self, method: str, url: str, timeout: Timeout, headers: Optional[Dict] = None,
+                params: Optional[Dict] = None, json=None, data: Optional[bytes] = None,
+                stream: bool = False) -> Response:
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == 'https' else 80))
+        target = parts.path or '/'
+        query = '&'.join(part for part in (parts.query, urlencode(params) if params else '') if part)
+        if query:
+            target = f"{target}?{query}"
+        headers = dict(headers or {})
+        body = data
+        if json is not None:
+            body = json_module.dumps(json).encode('utf-8')
+            headers.setdefault('Content-Type', 'application/json')
+        connect_timeout, read_timeout = split_timeout(timeout)
+        resendable = (method.upper() in IDEMPOTENT_METHODS
+                      or any(name.lower() == 'idempotency-key' for name in headers))
+        while True:
+            connection = self._checkout(key)
+            reused = connection is not None
+            try:
+                if connection is None:
+                    connection = self._new_connection(key, connect_timeout)
+                    self._connect(connection, key, read_timeout)
+                else:
+                    connection.sock.settimeout(read_timeout)
+                start = time.perf_counter()
+                connection.request(method.upper(), target, body=body, headers=headers)
+                response = connection.getresponse()
+                elapsed = time.perf_counter() - start
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError) as e:
+                connection.close()
+                if reused and resendable:
+                    # The server most likely closed an idle keep-alive
+                    # connection before reading the request; send it again on
+                    # a fresh one. Other requests may have been processed, so
+                    # they fail and APIClient decides whether to retry them.
+                    continue
+                raise TransportConnectionError(f"Connection aborted: {e!r}") from e
+            except socket.timeout as e:
+                connection.close()
+                raise TransportConnectionError(f"Timed out: {e}") from e
+            except (OSError, http.client.HTTPException) as e:
+                connection.close()
+                raise TransportConnectionError(f"Failed to connect to {key[1]}:{key[2]}: {e!r}") from e
+            break
+        result = StdlibResponse(self, key, connection, response, url, elapsed, len(body or b''))
+        if not stream:
+            result.content
+        return result
+
+    def warm_up(self, url: str) -> bool:
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == 'https' else 80))
+        connection = self._new_connection(key, 3.05)
+        try:
+            self._connect(connection, key, 30)
+        except OSError:
+            connection.close()
+            return False
+        self._release(key, connection, False)
+        return True
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection in connections:
+                connection.close()
+
+
+class HTTPXResponse(Response):
+    """
+    Wraps an httpx.Response read on an HTTP2Transport's event loop.
+    """
+    def __init__(self, transport: 'HTTP2Transport', response, elapsed: float):
+        self._transport = transport
+        self._response = response
+        self.status_code = response.status_code
+        self.reason = response.reason_phrase
+        self.headers = response.headers
+        self.url = str(response.request.url)
+        self.elapsed = datetime.timedelta(seconds=elapsed)
+        self.request_body_length = len(response.request.content)
+
+    @property
+    def content(self) -> bytes:
+        return self._transport._run(self._response.aread())
+
+    def iter_content(self, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[bytes]:
+        chunks = self._response.aiter_bytes(chunk_size)
+
+        async def next_chunk():
+            try:
+                return await chunks.__anext__()
+            except StopAsyncIteration:
+                return None
+
+        while True:
+            chunk = self._transport._run(next_chunk())
+            if chunk is None:
+                return
+            yield chunk
+
+    def wire_length(self, decoded_length: int) -> int:
+        return self._response.num_bytes_downloaded
+
+    def close(self) -> None:
+        self._transport._run(self._response.aclose())
+
+
+class HTTP2Transport(Transport):
+    """
+    Sends requests with httpx over HTTP/2, multiplexing concurrent requests
+    from any number of threads over one connection per host.
+
+    HTTPS hosts are asked for HTTP/2 when the connection is set up and fall
+    back to HTTP/1.1 if they do not offer it. Plain HTTP hosts are spoken to
+    in HTTP/2 directly ("prior knowledge"), which only servers that expect it,
+    like the stub server started with http2=True, understand.
+
+    The requests run on an httpx.AsyncClient in an event loop thread of the
+    transport's own: httpx's synchronous HTTP/2 connections can hand two
+    threads the same stream id, while on one event loop a stream is opened
+    without interruption.
+    """
+    name = 'http2'
+
+    def __init__(self, max_connections: int = 10):
+        """
+        Initializes the transport and starts its event loop thread.
+
+        Args:
+            max_connections: The maximum number of connections per host; each
+                carries up to the server's limit of concurrent streams.
+
+        Raises:
+            ImportError: If httpx or h2 is not installed.
+        """
+        try:
+            import httpx
+            import h2  # noqa: F401
+        except ImportError:
+            raise ImportError("The http2 transport requires httpx and h2; "
+                              "install them with `pip install geekbot-cli[http2]`.")
+        self._httpx = httpx
+        self.accept_encoding = 'gzip, deflate, br' if _brotli_available() else 'gzip, deflate'
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='geekbot-http2', daemon=True)
+        self._thread.start()
+        limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        # One client negotiates HTTP/2 over TLS, the other speaks it with
+        # prior knowledge over plain connections.
+        self._clients = {
+            'https': httpx.AsyncClient(http2=True, limits=limits),
+            'http': httpx.AsyncClient(http1=False, http2=True, limits=limits),
+        }
+
+    def _run(self, coroutine):
+        """
+        Runs a coroutine on the event loop and waits for its result, mapping httpx errors.
+        """
+        future = asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+        try:
+            return future.result()
+        except self._httpx.TransportError as e:
+            raise TransportConnectionError(f"{type(e).__name__}: {e}") from e
+        except self._httpx.RequestError as e:
+            raise TransportError(f"{type(e).__name__}: {e}") from e
+        except BaseException:
+            future.cancel()
+            raise
+
+    def request(self, method: str, url: str, timeout: Timeout, headers: Optional[Dict] = None,
+                params: Optional[Dict] = None, json=None, data: Optional[bytes] = None,
+                stream: bool = False) -> Response:
+        connect_timeout, read_timeout = split_timeout(timeout)
+        client = self._clients['https' if url.startswith('https:') else 'http']
+        request = client.build_request(
+            method.upper(), url, headers=headers, params=params, json=json, content=data,
+            timeout=self._httpx.Timeout(read_timeout, connect=connect_timeout)
+        )
+
+        async def send():
+            start = time.perf_counter()
+            response = await client.send(request, stream=True)
+            elapsed = time.perf_counter() - start
+            if not stream:
+                try:
+                    await response.aread()
+                finally:
+                    await response.aclose()
+            return response, elapsed
+
+        return HTTPXResponse(self, *self._run(send()))
+
+    def close(self) -> None:
+        if self._loop.is_closed():
+            return
+        for client in self._clients.values():
+            self._run(client.aclose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
@@ -0,0 +1,210 @@
+## validation.py
+import math
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from geekbot_cli.exceptions import StandupValidationError
+from geekbot_cli.models import Question, Standup
+
+# Reports are checked against the cached questions before they are posted, so
+# mistakes are caught without a round trip. Each standup's questions are
+# compiled once into a table of check functions keyed by question id, both as
+# an int and as a string, since JSON records carry string keys. Checking an
+# answer then costs a dictionary lookup and one call.
+
+# Codes of FieldError, one per kind of mistake.
+NO_ANSWERS = 'no_answers'
+UNKNOWN_STANDUP = 'unknown_standup'
+UNKNOWN_QUESTION = 'unknown_question'
+MISSING_ANSWER = 'missing_answer'
+NOT_TEXT = 'not_text'
+EMPTY = 'empty'
+NOT_NUMERIC = 'not_numeric'
+NOT_A_CHOICE = 'not_a_choice'
+
+
+class FieldError:
+    """
+    A mistake in one answer of a report, or in the report as a whole when
+    question_id is None.
+    """
+    __slots__ = ('question_id', 'code', 'message')
+
+    def __init__(self, question_id, code: str, message: str):
+        """
+        Initializes the error.
+
+        Args:
+            question_id: The question the answer was given to, as in the report.
+            code: One of the codes defined in this module.
+            message: A readable description.
+        """
+        self.question_id = question_id
+        self.code = code
+        self.message = message
+
+    def to_dict(self) -> Dict:
+        return {'question_id': self.question_id, 'code': self.code, 'message': self.message}
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, FieldError):
+            return NotImplemented
+        return (self.question_id, self.code, self.message) == (other.question_id, other.code, other.message)
+
+    def __repr__(self) -> str:
+        return f"FieldError(question_id={self.question_id!r}, code={self.code!r})"
+
+    def __str__(self) -> str:
+        return self.message if self.question_id is None else f"Question {self.question_id}: {self.message}"
+
+
+def _check_text(text: str) -> Optional[Tuple[str, str]]:
+    if not text or text.isspace():
+        return EMPTY, "the answer is empty"
+    return None
+
+
+def _check_numeric(text: str) -> Optional[Tuple[str, str]]:
+    try:
+        number = float(text)
+    except ValueError:
+        return NOT_NUMERIC, f"expected a number, got {text!r}"
+    if not math.isfinite(number):
+        return NOT_NUMERIC, f"expected a number, got {text!r}"
+    return None
+
+
+def _choice_check(choices: Tuple[str, ...]) -> Callable[[str], Optional[Tuple[str, str]]]:
+    allowed = frozenset(choices)
+    listed = ', '.join(choices)
+
+    def check(text: str) -> Optional[Tuple[str, str]]:
+        if text not in allowed:
+            return NOT_A_CHOICE, f"expected one of {listed}, got {text!r}"
+        return None
+    return check
+
+
+def compile_check(question: Question) -> Callable[[str], Optional[Tuple[str, str]]]:
+    """
+    Returns the check for answers to a question: a function that takes the
+    answer text and returns None, or an (error code, message) tuple.
+
+    Answer types this client does not know only need a non-empty text, so a
+    new type on the service side does not block reports.
+    """
+    if question.answer_type == 'numeric':
+        return _check_numeric
+    if question.answer_type == 'multiple_choice' and question.answer_choices:
+        return _choice_check(question.answer_choices)
+    return _check_text
+
+
+class StandupValidator:
+    """
+    Checks report answers against the questions of one standup.
+    """
+    __slots__ = ('standup_id', '_checks', '_question_ids')
+
+    def __init__(self, standup: Standup, require_all: bool = False):
+        """
+        Compiles the standup's questions into checks.
+
+        Args:
+            standup: The standup, with its questions.
+            require_all: Whether every question must be answered.
+        """
+        self.standup_id = standup.id
+        self._checks: Dict[object, Callable] = {}
+        for question in standup.questions:
+            check = compile_check(question)
+            self._checks[question.id] = check
+            self._checks[str(question.id)] = check
+        self._question_ids = tuple(question.id for question in standup.questions) if require_all else ()
+
+    def errors(self, answers: Dict) -> List[FieldError]:
+        """
+        Checks answers keyed by question id, as posted by post_report.
+
+        Returns:
+            The mistakes found, empty if the answers are valid.
+        """
+        if not isinstance(answers, dict) or not answers:
+            return [FieldError(None, NO_ANSWERS, "the report has no answers")]
+        errors = []
+        checks = self._checks
+        for question_id, answer in answers.items():
+            check = checks.get(question_id)
+            if check is None:
+                errors.append(FieldError(question_id, UNKNOWN_QUESTION,
+                                         f"standup {self.standup_id} has no such question"))
+                continue
+            text = answer.get('text') if isinstance(answer, dict) else None
+            if not isinstance(text, str):
+                errors.append(FieldError(question_id, NOT_TEXT, "the answer must have a text"))
+                continue
+            problem = check(text)
+            if problem is not None:
+                errors.append(FieldError(question_id, *problem))
+        for question_id in self._question_ids:
+            if question_id not in answers and str(question_id) not in answers:
+                errors.append(FieldError(question_id, MISSING_ANSWER, "the question is not answered"))
+        return errors
+
+
+class ReportValidator:
+    """
+    Checks reports for any of a set of standups, compiling each standup's
+    validator the first time one of its reports is checked.
+    """
+    def __init__(self, standups: Iterable[Standup], require_all: bool = False):
+        """
+        Initializes the validator.
+
+        Args:
+            standups: The standups reports may be posted to, e.g. the cached list.
+            require_all: Whether every question must be answered.
+        """
+        self._standups = {standup.id: standup for standup in standups}
+        self._validators: Dict[int, StandupValidator] = {}
+        self.require_all = require_all
+
+    def errors(self, standup_id: int, answers: Dict) -> List[FieldError]:
+        """
+        Checks a report's answers.
+
+        Returns:
+            The mistakes found, empty if the report is valid.
+        """
+        validator = self._validators.get(standup_id)
+        if validator is None:
+            standup = self._standups.get(standup_id)
+            if standup is None:
+                return [FieldError(None, UNKNOWN_STANDUP, f"there is no standup {standup_id}")]
+            validator = self._validators[standup_id] = StandupValidator(standup, self.require_all)
+        return validator.errors(answers)
+
+    def check(self, standup_id: int, answers: Dict) -> None:
+        """
+        Checks a report's answers.
+
+        Raises:
+            StandupValidationError: If there are mistakes, listed in its errors attribute.
+        """
+        errors = self.errors(standup_id, answers)
+        if errors:
+            raise StandupValidationError('; '.join(map(str, errors)), errors)
+
+    def validate_many(self, reports: Iterable[Tuple[int, Dict]]) -> Iterator[Tuple[int, List[FieldError]]]:
+        """
+        Checks many reports.
+
+        Args:
+            reports: (standup_id, answers) tuples.
+
+        Yields:
+            (index, errors) for each invalid report, indexed from 0.
+        """
+        errors = self.errors
+        for index, (standup_id, answers) in enumerate(reports):
+            found = errors(standup_id, answers)
+            if found:
+                yield index, found
@@ -0,0 +1,129 @@
+## workspaces.py
+from concurrent.futures import Future, as_completed
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from geekbot_cli.cache import StandupCache
+from geekbot_cli.config_manager import ConfigManager
+from geekbot_cli.exceptions import APIKeyNotFoundError
+from geekbot_cli.models import Standup
+from geekbot_cli.outbox import Outbox
+from geekbot_cli.paths import DEFAULT_PROFILE, outbox_path, report_store_path, standup_cache_path
+
+
+class Workspace:
+    """
+    One Geekbot workspace, reached through a profile: its credentials, its
+    client and its own standup cache, outbox and report store, so workspaces
+    never see each other's standups or reports.
+    """
+    def __init__(self, profile: str, config_manager: ConfigManager, api_client,
+                 standup_cache: Optional[StandupCache] = None, outbox: Optional[Outbox] = None,
+                 report_store_path: Optional[str] = None):
+        """
+        Initializes the workspace.
+
+        Args:
+            profile: The profile name, shown next to the workspace's standups.
+            config_manager: Resolves the profile's API key.
+            api_client: The client used for this workspace only, if any.
+            standup_cache: The workspace's standup cache, if any.
+            outbox: The workspace's outbox, if any.
+            report_store_path: Where `geekbot sync` stores the workspace's
+                reports, if anywhere.
+        """
+        self.profile = profile
+        self.config_manager = config_manager
+        self.api_client = api_client
+        self.standup_cache = standup_cache
+        self.outbox = outbox
+        self.report_store_path = report_store_path
+        # Set while the workspace's standups load: the Future revalidating a
+        # stale cached list, and what flushing the outbox achieved.
+        self.revalidation: Optional[Future] = None
+        self.flushed: Optional[Dict] = None
+
+    @classmethod
+    def for_profile(cls, config_manager: ConfigManager, profile: str, connect: bool = True) -> 'Workspace':
+        """
+        Builds the workspace of a profile. The default profile keeps the
+        files used without profiles; named profiles get their own, suffixed
+        with the profile name.
+
+        Args:
+            config_manager: Any configuration manager; its keyring service
+                and profile list are shared.
+            profile: The profile name.
+            connect: Whether to create the workspace's APIClient. Commands
+                that open their own clients pass False and leave it None.
+        """
+        standup_cache = StandupCache(standup_cache_path(profile))
+        api_client = None
+        if connect:
+            from geekbot_cli.api_client import APIClient
+            api_client = APIClient()
+        return cls(profile, config_manager.for_profile(profile, standup_cache), api_client, standup_cache,
+                   Outbox(outbox_path(profile)), report_store_path(profile))
+
+
+def all_workspaces(config_manager: ConfigManager) -> List[Workspace]:
+    """
+    Returns the workspaces of the default profile and of every named profile.
+    """
+    return [Workspace.for_profile(config_manager, profile)
+            for profile in [DEFAULT_PROFILE] + config_manager.profiles()]
+
+
+class WorkspaceStandup(Standup):
+    """
+    A standup listed in a multi-workspace picker. Its name carries the
+    workspace's profile, so typing the profile name narrows the list to it.
+    """
+    __slots__ = ('standup', 'workspace')
+
+    def __init__(self, standup: Standup, workspace: Workspace):
+        """
+        Initializes the labelled standup.
+
+        Args:
+            standup: The standup as returned by its workspace.
+            workspace: The workspace it belongs to.
+        """
+        super().__init__(standup.id, f"{standup.name} ({workspace.profile})", standup.questions)
+        self.standup = standup
+        self.workspace = workspace
+
+
+def recent_key(standup: WorkspaceStandup) -> Tuple[str, int]:
+    """
+    Returns the (profile, standup id) pair a labelled standup is remembered
+    under as recently used, since workspaces may reuse each other's ids.
+    """
+    return standup.workspace.profile, standup.id
+
+
+def merge_standups(loads: Sequence[Tuple[Workspace, Future]], skipped: List[str]) -> Iterator[WorkspaceStandup]:
+    """
+    Yields the standups of every workspace, labelled, one workspace at a
+    time in the order their loads complete.
+
+    A workspace that fails to load is left out: the default profile silently
+    when it has no API key, others with a message appended to skipped.
+
+    Args:
+        loads: (workspace, Future) pairs, each resolving to a list of the
+            workspace's standups.
+        skipped: Collects why workspaces were left out.
+    """
+    workspaces: Dict[Future, Workspace] = {future: workspace for workspace, future in loads}
+    for future in as_completed(workspaces):
+        workspace = workspaces[future]
+        try:
+            standups = future.result()
+        except APIKeyNotFoundError:
+            if workspace.profile != DEFAULT_PROFILE:
+                skipped.append(f"{workspace.profile}: no API key found")
+            continue
+        except Exception as e:
+            skipped.append(f"{workspace.profile}: {e}")
+            continue
+        for standup in standups:
+            yield WorkspaceStandup(standup, workspace)
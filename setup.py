@@ -30,11 +30,18 @@ setup(
     author_email="hey@geekbot.io",
     license="MIT",
     keywords="geekbot standup workflow",
-    packages=find_packages(exclude=["tests*"]),
+    packages=find_packages(exclude=["tests*", "benchmarks*"]),
     install_requires=requirements,
+    extras_require={
+        'async': ['httpx>=0.23'],
+        'brotli': ['brotli>=1.0'],
+        'http2': ['httpx[http2]>=0.23'],
+        'parquet': ['pyarrow>=8'],
+    },
     entry_points={
         'console_scripts': [
             'geekbot=geekbot_cli.main:main',
+            'geekbot-complete=geekbot_cli.completion:main',
         ],
     },
     cmdclass={
@@ -1,15 +1,29 @@
 ## test_api_client.py
+import time
 import unittest
 from unittest.mock import patch, Mock
 import requests
-from geekbot_cli.api_client import APIClient
-from geekbot_cli.exceptions import StandupAPIError, StandupValidationError, InvalidAPIKeyError, StandupNotFoundError
+from geekbot_cli.api_client import APIClient, DEFAULT_TIMEOUT
+from geekbot_cli.models import Standup
+from geekbot_cli.resilience import CircuitBreaker, RetryPolicy, TokenBucket
+from geekbot_cli.stub_server import StubGeekbotServer
+from geekbot_cli.exceptions import (
+    StandupAPIError,
+    StandupValidationError,
+    InvalidAPIKeyError,
+    StandupNotFoundError,
+    StandupServerError,
+    StandupConnectionError,
+    RateLimitedError,
+    CircuitOpenError,
+    DeadlineExceededError
+)
 
 class TestAPIClient(unittest.TestCase):
     def setUp(self):
-        self.api_client = APIClient(base_url='https://api.teststandup.example.com')
+        self.api_client = APIClient(base_url='https://api.teststandup.example.com', sleep=Mock())
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_get_standups_success(self, mock_get):
         mock_response = Mock()
         expected_standups = [
@@ -21,16 +35,21 @@ class TestAPIClient(unittest.TestCase):
         mock_get.return_value = mock_response
 
         standups = self.api_client.get_standups()
-        self.assertEqual(standups, expected_standups)
-        mock_get.assert_called_once_with('https://api.teststandup.example.com/v1/standups', headers=self.api_client.headers)
+        self.assertEqual(standups, Standup.from_dicts(expected_standups))
+        self.assertEqual(standups[0].name, 'Morning Standup')
+        mock_get.assert_called_once_with(
+            'https://api.teststandup.example.com/v1/standups',
+            headers=self.api_client.headers,
+            timeout=DEFAULT_TIMEOUT
+        )
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_get_standups_api_error(self, mock_get):
         mock_get.side_effect = requests.exceptions.HTTPError()
         with self.assertRaises(StandupAPIError):
             self.api_client.get_standups()
 
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_post_report_success(self, mock_post):
         mock_response = Mock()
         expected_response = {'success': True, 'message': 'Report submitted successfully'}
@@ -44,10 +63,11 @@ class TestAPIClient(unittest.TestCase):
         mock_post.assert_called_once_with(
             'https://api.teststandup.example.com/v1/reports',
             json={'standup_id': 1, 'answers': answers},
-            headers=self.api_client.headers
+            headers=self.api_client.headers,
+            timeout=DEFAULT_TIMEOUT
         )
 
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_post_report_validation_error(self, mock_post):
         mock_response = Mock()
         mock_response.status_code = 400
@@ -55,7 +75,7 @@ class TestAPIClient(unittest.TestCase):
         with self.assertRaises(StandupValidationError):
             self.api_client.post_report(1, [{'id': 1, 'text': ''}])  # Empty answer text
 
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_post_report_invalid_api_key_error(self, mock_post):
         mock_response = Mock()
         mock_response.status_code = 401
@@ -63,7 +83,7 @@ class TestAPIClient(unittest.TestCase):
         with self.assertRaises(InvalidAPIKeyError):
             self.api_client.post_report(1, [{'id': 1, 'text': 'Answer 1'}])
 
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_post_report_not_found_error(self, mock_post):
         mock_response = Mock()
         mock_response.status_code = 404
@@ -71,7 +91,7 @@ class TestAPIClient(unittest.TestCase):
         with self.assertRaises(StandupNotFoundError):
             self.api_client.post_report(999, [{'id': 1, 'text': 'Answer 1'}])  # Non-existent standup ID
 
-    @patch('geekbot_cli.api_client.requests.post')
+    @patch('requests.Session.post')
     def test_post_report_api_error(self, mock_post):
         # Setup the mock to raise HTTPError with a specific status code
         mock_response = Mock()
@@ -83,6 +103,21 @@ class TestAPIClient(unittest.TestCase):
         with self.assertRaises(StandupAPIError):
             client.post_report(1, [{'question_id': 1, 'answer': 'Test answer'}])
 
+        with self.assertRaises(StandupServerError):
+            client.post_report(1, [{'question_id': 1, 'answer': 'Test answer'}])
+
+    @patch('requests.Session.post')
+    def test_post_report_connection_error(self, mock_post):
+        mock_post.side_effect = requests.exceptions.ConnectionError()
+        with self.assertRaises(StandupConnectionError):
+            self.api_client.post_report(1, [{'id': 1, 'text': 'Answer 1'}])
+
+    @patch('requests.Session.post')
+    def test_post_report_idempotency_key(self, mock_post):
+        self.api_client.post_report(1, {1: {'text': 'Answer 1'}}, idempotency_key='abc')
+        self.assertEqual(mock_post.call_args.kwargs['headers']['Idempotency-Key'], 'abc')
+        self.assertNotIn('Idempotency-Key', self.api_client.headers)
+
     def test_set_headers_invalid_key(self):
         with self.assertRaises(InvalidAPIKeyError):
             self.api_client.set_headers('')  # Empty API key
@@ -99,5 +134,363 @@ class TestAPIClient(unittest.TestCase):
         # Corrected to match the expected format with "Bearer" prefix
         self.assertEqual(self.api_client.headers['Authorization'], f"{valid_api_key}")
 
+    @patch('requests.Session.get')
+    def test_get_standups_if_modified_not_modified(self, mock_get):
+        mock_get.return_value = Mock(status_code=304)
+        standups, etag, last_modified = self.api_client.get_standups_if_modified('"abc"', 'yesterday')
+        self.assertIsNone(standups)
+        self.assertEqual((etag, last_modified), ('"abc"', 'yesterday'))
+        headers = mock_get.call_args.kwargs['headers']
+        self.assertEqual(headers['If-None-Match'], '"abc"')
+        self.assertEqual(headers['If-Modified-Since'], 'yesterday')
+        self.assertNotIn('If-None-Match', self.api_client.headers)
+        mock_get.return_value.json.assert_not_called()
+
+    @patch('requests.Session.get')
+    def test_get_standups_if_modified_changed(self, mock_get):
+        expected_standups = [{'id': 1, 'name': 'Morning Standup', 'questions': []}]
+        mock_get.return_value = Mock(status_code=200, headers={'ETag': '"def"'})
+        mock_get.return_value.json.return_value = expected_standups
+        standups, etag, last_modified = self.api_client.get_standups_if_modified('"abc"')
+        self.assertEqual(standups, Standup.from_dicts(expected_standups))
+        self.assertEqual(etag, '"def"')
+        self.assertIsNone(last_modified)
+
+    def test_session_pool_configuration(self):
+        client = APIClient(pool_connections=2, pool_maxsize=5, pool_block=True)
+        adapter = client.session.get_adapter('https://api.geekbot.com')
+        self.assertEqual(adapter._pool_connections, 2)
+        self.assertEqual(adapter._pool_maxsize, 5)
+        self.assertTrue(adapter._pool_block)
+        client.close()
+
+    def test_keep_alive_disabled_sends_connection_close(self):
+        client = APIClient(keep_alive=False)
+        self.assertEqual(client.headers['Connection'], 'close')
+        client.close()
+
+    @patch('requests.Session.get')
+    def test_custom_timeout_is_sent(self, mock_get):
+        client = APIClient(timeout=(1, 2))
+        client.get_standups()
+        self.assertEqual(mock_get.call_args.kwargs['timeout'], (1, 2))
+
+    @patch('requests.Session.get')
+    def test_timeout_is_mapped_to_api_error(self, mock_get):
+        mock_get.side_effect = requests.exceptions.ReadTimeout()
+        with self.assertRaises(StandupAPIError):
+            self.api_client.get_standups()
+
+    def test_context_manager_closes_session(self):
+        with patch('requests.Session.close') as mock_close:
+            with APIClient():
+                pass
+        mock_close.assert_called_once()
+
+
+def make_response(status_code, body=None, headers=None):
+    response = Mock(status_code=status_code, headers=headers or {})
+    response.json.return_value = body
+    if status_code >= 400:
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError(response=response)
+    return response
+
+
+class TestAPIClientResilience(unittest.TestCase):
+    def setUp(self):
+        self.sleep = Mock()
+        self.api_client = APIClient(base_url='https://api.teststandup.example.com', sleep=self.sleep)
+
+    @patch('requests.Session.get')
+    def test_get_retries_transient_statuses(self, mock_get):
+        mock_get.side_effect = [make_response(502), make_response(503), make_response(200, [])]
+        self.assertEqual(self.api_client.get_standups(), [])
+        self.assertEqual(mock_get.call_count, 3)
+        self.assertEqual(self.sleep.call_count, 2)
+
+    @patch('requests.Session.get')
+    def test_get_retries_connection_errors(self, mock_get):
+        mock_get.side_effect = [requests.exceptions.ConnectionError(), make_response(200, [])]
+        self.assertEqual(self.api_client.get_standups(), [])
+
+    @patch('requests.Session.get')
+    def test_retried_and_rate_limited_responses_are_closed(self, mock_get):
+        failed, succeeded = make_response(503), make_response(200, [])
+        mock_get.side_effect = [failed, succeeded]
+        self.api_client.get_standups()
+        failed.close.assert_called_once()
+        succeeded.close.assert_not_called()
+        rate_limited = make_response(429, headers={'Retry-After': '3600'})
+        mock_get.side_effect = [rate_limited]
+        with self.assertRaises(RateLimitedError):
+            self.api_client.get_standups()
+        rate_limited.close.assert_called_once()
+
+    @patch('requests.Session.get')
+    def test_retry_after_is_honoured(self, mock_get):
+        mock_get.side_effect = [make_response(429, headers={'Retry-After': '7'}), make_response(200, [])]
+        self.api_client.get_standups()
+        self.sleep.assert_called_once_with(7.0)
+
+    @patch('requests.Session.get')
+    def test_too_long_retry_after_fails(self, mock_get):
+        mock_get.return_value = make_response(429, headers={'Retry-After': '3600'})
+        with self.assertRaises(RateLimitedError):
+            self.api_client.get_standups()
+        mock_get.assert_called_once()
+
+    @patch('requests.Session.get')
+    def test_retries_are_bounded(self, mock_get):
+        mock_get.return_value = make_response(503)
+        with self.assertRaises(StandupAPIError):
+            self.api_client.get_standups()
+        self.assertEqual(mock_get.call_count, 3)
+
+    @patch('requests.Session.post')
+    def test_post_without_idempotency_key_is_not_retried(self, mock_post):
+        mock_post.return_value = make_response(503)
+        with self.assertRaises(StandupServerError):
+            self.api_client.post_report(1, {1: {'text': 'Answer'}})
+        mock_post.assert_called_once()
+
+    @patch('requests.Session.post')
+    def test_post_with_idempotency_key_is_retried(self, mock_post):
+        mock_post.side_effect = [requests.exceptions.ConnectionError(), make_response(200, {'id': 1})]
+        self.assertEqual(self.api_client.post_report(1, {1: {'text': 'Answer'}}, idempotency_key='abc'), {'id': 1})
+        self.assertEqual(mock_post.call_count, 2)
+
+    @patch('requests.Session.post')
+    def test_post_without_retry_is_sent_once(self, mock_post):
+        mock_post.return_value = make_response(503)
+        with self.assertRaises(StandupServerError):
+            self.api_client.post_report(1, {1: {'text': 'Answer'}}, idempotency_key='abc', retry=False)
+        mock_post.assert_called_once()
+        self.sleep.assert_not_called()
+
+    @patch('requests.Session.get')
+    def test_circuit_breaker_fails_fast(self, mock_get):
+        mock_get.return_value = make_response(503)
+        api_client = APIClient(
+            retry_policy=RetryPolicy(max_attempts=1),
+            circuit_breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60),
+            sleep=self.sleep
+        )
+        for _ in range(2):
+            with self.assertRaises(StandupAPIError):
+                api_client.get_standups()
+        with self.assertRaises(CircuitOpenError):
+            api_client.get_standups()
+        self.assertEqual(mock_get.call_count, 2)
+
+    @patch('requests.Session.get')
+    def test_trial_that_ends_without_a_response_is_released(self, mock_get):
+        mock_get.return_value = make_response(200, [])
+        circuit_breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        circuit_breaker.record_failure()
+        rate_limiter = Mock(spec=TokenBucket)
+        rate_limiter.acquire.side_effect = [DeadlineExceededError("Deadline exceeded."), None]
+        api_client = APIClient(circuit_breaker=circuit_breaker, rate_limiter=rate_limiter, sleep=self.sleep)
+        with self.assertRaises(DeadlineExceededError):
+            api_client.get_standups()
+        # The next call is let through as a new trial, not refused.
+        self.assertEqual(api_client.get_standups(), [])
+        self.assertEqual(circuit_breaker.state, 'closed')
+
+    @patch('requests.Session.get')
+    def test_deadline_shortens_timeouts_and_stops_retries(self, mock_get):
+        mock_get.return_value = make_response(503, headers={'Retry-After': '1'})
+        api_client = APIClient(timeout=(3, 30), deadline=0.2, sleep=self.sleep)
+        with self.assertRaises(StandupAPIError):
+            api_client.get_standups()
+        connect_timeout, read_timeout = mock_get.call_args.kwargs['timeout']
+        self.assertLessEqual(read_timeout, 0.2)
+        self.sleep.assert_not_called()
+
+    def test_expired_deadline(self):
+        api_client = APIClient(deadline=0)
+        with self.assertRaises(DeadlineExceededError):
+            api_client.get_standups()
+
+    @patch('requests.Session.get')
+    def test_rate_limiter_is_used(self, mock_get):
+        mock_get.return_value = make_response(200, [])
+        rate_limiter = Mock(spec=TokenBucket)
+        APIClient(rate_limiter=rate_limiter).get_standups()
+        rate_limiter.acquire.assert_called_once()
+
+
+class TestAPIClientConnectionReuse(unittest.TestCase):
+    def test_calls_reuse_one_connection(self):
+        with StubGeekbotServer(standups=3) as server, APIClient(base_url=server.url) as client:
+            client.set_headers('test_api_key')
+            self.assertEqual(len(client.get_standups()), 3)
+            client.post_report(1, {101: {'text': 'Answer'}})
+            client.get_standups()
+        self.assertEqual(server.requests, 3)
+        self.assertEqual(server.connections, 1)
+
+    def test_warm_up_opens_the_connection_requests_reuse(self):
+        with StubGeekbotServer(standups=3) as server, APIClient(base_url=server.url) as client:
+            self.assertTrue(client.warm_up())
+            client.set_headers('test_api_key')
+            client.get_standups()
+        self.assertEqual(server.requests, 1)
+        self.assertEqual(server.connections, 1)
+
+    def test_injected_faults_are_retried(self):
+        with StubGeekbotServer(standups=3, rate_limit_rate=0.5, error_rate=0.3, seed=1) as server, \
+                APIClient(base_url=server.url, retry_policy=RetryPolicy(max_attempts=20), sleep=Mock()) as client:
+            client.set_headers('test_api_key')
+            for _ in range(5):
+                self.assertEqual(len(client.get_standups()), 3)
+        self.assertEqual(server.responses[200], 5)
+        self.assertGreater(server.responses[429], 0)
+        self.assertGreater(server.responses[503], 0)
+
+    def test_persistent_rate_limiting_surfaces(self):
+        with StubGeekbotServer(rate_limit_rate=1.0, retry_after=2) as server, \
+                APIClient(base_url=server.url, sleep=Mock()) as client:
+            client.set_headers('test_api_key')
+            with self.assertRaises(RateLimitedError):
+                client.post_report(1, {101: {'text': 'Answer'}}, idempotency_key='key')
+        self.assertEqual(server.responses, {429: 3})
+
+    def test_warm_up_failure_is_left_to_the_first_request(self):
+        with APIClient(base_url='http://127.0.0.1:9', timeout=0.5) as client:
+            self.assertFalse(client.warm_up())
+
+
+class TestAPIClientStreaming(unittest.TestCase):
+    def test_stream_standups(self):
+        with StubGeekbotServer(standups=20) as server, APIClient(base_url=server.url) as client:
+            client.set_headers('test_api_key')
+            standups, etag, last_modified = client.stream_standups(chunk_size=256)
+            self.assertEqual([standup.id for standup in standups], list(range(1, 21)))
+            self.assertEqual(len(client.get_standups()[0].questions), 3)
+        self.assertEqual(server.connections, 1)
+
+    def test_first_standup_arrives_before_the_download_ends(self):
+        with StubGeekbotServer(standups=5, stream_delay=0.05) as server, APIClient(base_url=server.url) as client:
+            client.set_headers('test_api_key')
+            start = time.perf_counter()
+            standups, _, _ = client.stream_standups(chunk_size=1)
+            first = next(standups)
+            first_latency = time.perf_counter() - start
+            self.assertEqual(first.id, 1)
+            self.assertEqual(len(list(standups)), 4)
+            self.assertLess(first_latency, time.perf_counter() - start - 0.1)
+
+    def test_stream_standups_errors(self):
+        with StubGeekbotServer(standups=1) as server, APIClient(base_url=server.url) as client:
+            with self.assertRaises(StandupAPIError):
+                client.stream_standups()  # No Authorization header
+
+    @patch('requests.Session.get')
+    def test_malformed_stream(self, mock_get):
+        mock_get.return_value = make_response(200)
+        mock_get.return_value.iter_content.return_value = iter([b'[{"id": 1}, {"name"'])
+        standups, _, _ = APIClient(sleep=Mock()).stream_standups()
+        self.assertEqual(next(standups).id, 1)
+        with self.assertRaises(StandupAPIError):
+            next(standups)
+        mock_get.return_value.close.assert_called_once()
+
+
+class TestAPIClientReports(unittest.TestCase):
+    def setUp(self):
+        self.server = StubGeekbotServer(standups=2).start()
+        # Several reports per second, so page boundaries split equal timestamps.
+        for index in range(25):
+            self.server.add_report(1 + index % 2, timestamp=1000 + index // 4)
+        self.client = APIClient(base_url=self.server.url)
+        self.client.set_headers('test_api_key')
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop()
+
+    def test_iter_reports_walks_every_page(self):
+        for prefetch in (True, False):
+            reports = list(self.client.iter_reports(page_size=10, prefetch=prefetch))
+            self.assertEqual(sorted(report['id'] for report in reports), list(range(1, 26)))
+            timestamps = [report['timestamp'] for report in reports]
+            self.assertEqual(timestamps, sorted(timestamps, reverse=True))
+
+    def test_seconds_with_more_reports_than_a_page_are_walked(self):
+        with StubGeekbotServer(standups=1) as server, APIClient(base_url=server.url) as client:
+            client.set_headers('test_api_key')
+            for timestamp in (10, 5, 5, 5, 5, 5, 5, 5, 4, 3):
+                server.add_report(1, timestamp=timestamp)
+            for prefetch in (True, False):
+                reports = list(client.iter_reports(page_size=3, prefetch=prefetch))
+                self.assertEqual(sorted(report['id'] for report in reports), list(range(1, 11)))
+                self.assertEqual([report['timestamp'] for report in reports], [10, 5, 5, 5, 5, 5, 5, 5, 4, 3])
+
+    def test_iter_reports_filters(self):
+        reports = list(self.client.iter_reports(standup_id=2, after=1002, page_size=3))
+        self.assertTrue(reports)
+        self.assertTrue(all(report['standup_id'] == 2 and report['timestamp'] > 1002 for report in reports))
+
+    def test_iter_reports_is_lazy(self):
+        reports = self.client.iter_reports(page_size=10, prefetch=False)
+        next(reports)
+        self.assertEqual(self.server.requests, 1)
+        reports.close()
+
+    def test_short_page_ends_the_walk(self):
+        list(self.client.iter_reports(page_size=100))
+        self.assertEqual(self.server.requests, 1)
+
+
+
+class TestAPIClientCompression(unittest.TestCase):
+    LONG_ANSWER = {101: {'text': '12:00:01 ERROR request failed at worker.py:42\n' * 500}}
+
+    def test_responses_are_negotiated_and_counted(self):
+        with StubGeekbotServer(standups=100) as server, APIClient(base_url=server.url) as client:
+            client.set_headers('test_api_key')
+            self.assertEqual(len(client.get_standups()), 100)
+            standups, _, _ = client.stream_standups()
+            self.assertEqual(len(list(standups)), 100)
+        self.assertIn('gzip', client.headers['Accept-Encoding'])
+        self.assertEqual(client.transfer.requests, 2)
+        self.assertEqual(client.transfer.bytes_received, server.bytes_sent)
+        self.assertLess(client.transfer.bytes_received * 5, client.transfer.bytes_received_decoded)
+
+    def test_uncompressed_responses_count_the_same_on_the_wire(self):
+        with StubGeekbotServer(standups=100, compress_responses=False) as server, \
+                APIClient(base_url=server.url) as client:
+            client.set_headers('test_api_key')
+            client.get_standups()
+        self.assertEqual(client.transfer.bytes_received, client.transfer.bytes_received_decoded)
+        self.assertEqual(client.transfer.bytes_received, server.bytes_sent)
+
+    def test_large_reports_are_gzipped_when_enabled(self):
+        with StubGeekbotServer(standups=3) as server, \
+                APIClient(base_url=server.url, compress_requests=True) as client:
+            client.set_headers('test_api_key')
+            client.post_report(1, {101: {'text': 'Short'}})
+            client.post_report(1, self.LONG_ANSWER)
+        self.assertEqual(server.reports[1]['questions'][1]['answer'], self.LONG_ANSWER[101]['text'])
+        self.assertEqual(client.transfer.bytes_sent, server.bytes_received)
+        self.assertLess(client.transfer.bytes_sent * 10, client.transfer.bytes_sent_uncompressed)
+
+    def test_rejected_compression_falls_back_and_is_turned_off(self):
+        with StubGeekbotServer(standups=3, compressed_requests=False) as server, \
+                APIClient(base_url=server.url, compress_requests=True) as client:
+            client.set_headers('test_api_key')
+            self.assertEqual(client.post_report(1, self.LONG_ANSWER)['standup_id'], 1)
+            client.post_report(1, self.LONG_ANSWER)
+            self.assertFalse(client.compress_requests)
+        self.assertEqual(server.responses, {415: 1, 200: 2})
+        self.assertEqual(len(server.reports), 2)
+
+    @patch.dict('os.environ', {'GEEKBOT_COMPRESS_REQUESTS': '1'})
+    def test_compression_of_requests_is_opt_in(self):
+        self.assertTrue(APIClient().compress_requests)
+        self.assertFalse(APIClient(compress_requests=False).compress_requests)
+        with patch.dict('os.environ', {'GEEKBOT_COMPRESS_REQUESTS': ''}):
+            self.assertFalse(APIClient().compress_requests)
+
 if __name__ == '__main__':
     unittest.main()
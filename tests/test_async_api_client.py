@@ -0,0 +1,75 @@
+## test_async_api_client.py
+import asyncio
+import unittest
+from geekbot_cli.exceptions import StandupAPIError, StandupValidationError, InvalidAPIKeyError, StandupNotFoundError
+from geekbot_cli.stub_server import StubGeekbotServer
+
+try:
+    from geekbot_cli.async_api_client import AsyncAPIClient
+except ImportError:
+    AsyncAPIClient = None
+
+
+@unittest.skipIf(AsyncAPIClient is None, "httpx is not installed")
+class TestAsyncAPIClient(unittest.TestCase):
+    def setUp(self):
+        self.server = StubGeekbotServer(standups=3).start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def run_with_client(self, scenario, api_key='test_api_key', **kwargs):
+        async def main():
+            async with AsyncAPIClient(base_url=self.server.url, **kwargs) as client:
+                if api_key:
+                    client.set_headers(api_key)
+                return await scenario(client)
+        return asyncio.run(main())
+
+    def test_get_standups(self):
+        standups = self.run_with_client(lambda client: client.get_standups())
+        self.assertEqual([standup.id for standup in standups], [1, 2, 3])
+
+    def test_get_standups_api_error(self):
+        with self.assertRaises(StandupAPIError):
+            self.run_with_client(lambda client: client.get_standups(), api_key=None)
+
+    def test_post_report_success(self):
+        response = self.run_with_client(lambda client: client.post_report(1, {101: {'text': 'Answer 1'}}))
+        self.assertEqual(response['standup_id'], 1)
+        self.assertGreater(response['done_at'], 0)
+
+    def test_post_report_error_mapping(self):
+        cases = [
+            (StandupValidationError, 'test_api_key', 1, {}),
+            (InvalidAPIKeyError, None, 1, {101: {'text': 'Answer 1'}}),
+            (StandupNotFoundError, 'test_api_key', 999, {101: {'text': 'Answer 1'}}),
+        ]
+        for exception, api_key, standup_id, answers in cases:
+            with self.assertRaises(exception):
+                self.run_with_client(lambda client: client.post_report(standup_id, answers), api_key=api_key)
+
+    def test_connection_error(self):
+        async def scenario(client):
+            client.base_url = 'http://127.0.0.1:9'
+            return await client.get_standups()
+        with self.assertRaises(StandupAPIError):
+            self.run_with_client(scenario)
+
+    def test_fan_out_is_bounded_and_reuses_connections(self):
+        async def scenario(client):
+            return await asyncio.gather(*(client.post_report(1, {101: {'text': str(i)}}) for i in range(20)))
+
+        responses = self.run_with_client(scenario, max_concurrency=4)
+
+        self.assertEqual(len(responses), 20)
+        self.assertLessEqual(self.server.connections, 4)
+
+    def test_set_headers_invalid_key(self):
+        async def scenario(client):
+            client.set_headers('')
+        with self.assertRaises(InvalidAPIKeyError):
+            self.run_with_client(scenario, api_key=None)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+from geekbot_cli.atomic import atomic_write
+
+
+class TestAtomicWrite(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / 'nested' / 'data.json'
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_creates_and_replaces(self):
+        atomic_write(self.path, 'first')
+        atomic_write(str(self.path), 'second')
+        self.assertEqual(self.path.read_text(encoding='utf-8'), 'second')
+        self.assertEqual(os.listdir(self.path.parent), ['data.json'])
+
+    def test_failed_write_keeps_the_old_file_and_no_temporary_file(self):
+        atomic_write(self.path, 'old')
+        with patch('geekbot_cli.atomic.os.replace', side_effect=OSError('disk full')):
+            with self.assertRaises(OSError):
+                atomic_write(self.path, 'new')
+        self.assertEqual(self.path.read_text(encoding='utf-8'), 'old')
+        self.assertEqual(os.listdir(self.path.parent), ['data.json'])
+
+    def test_interrupted_write_leaves_no_temporary_file(self):
+        with patch('geekbot_cli.atomic.os.fsync', side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                atomic_write(self.path, 'data')
+        self.assertEqual(os.listdir(self.path.parent), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
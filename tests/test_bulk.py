@@ -0,0 +1,201 @@
+## test_bulk.py
+import io
+import json
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import ANY, Mock, patch
+from geekbot_cli.bulk import BulkSubmitter, Checkpoint, detect_format, parse_record, read_records
+from geekbot_cli.exceptions import StandupAPIError, StandupValidationError
+from geekbot_cli.models import Question, Standup
+from geekbot_cli.validation import ReportValidator
+
+class TestRecords(unittest.TestCase):
+    def test_detect_format(self):
+        self.assertEqual(detect_format('reports.csv'), 'csv')
+        self.assertEqual(detect_format('reports.jsonl'), 'jsonl')
+
+    def test_read_jsonl_skips_blank_lines(self):
+        stream = io.StringIO('{"a": 1}\n\n{"b": 2}\n')
+        self.assertEqual(list(read_records(stream)), [(1, '{"a": 1}\n'), (2, '{"b": 2}\n')])
+
+    def test_read_and_parse_csv(self):
+        stream = io.StringIO('standup_id,101,102\n1,Done,\n')
+        records = list(read_records(stream, 'csv'))
+        self.assertEqual(parse_record(records[0][1]), (1, {'101': {'text': 'Done'}}))
+
+    def test_parse_jsonl(self):
+        line = json.dumps({'standup_id': 1, 'answers': {'101': {'text': 'Done'}}})
+        self.assertEqual(parse_record(line), (1, {'101': {'text': 'Done'}}))
+
+    def test_parse_invalid_records(self):
+        invalid = [
+            'not json',
+            '[]',
+            json.dumps({'answers': {'101': {'text': 'Done'}}}),
+            json.dumps({'standup_id': 1, 'answers': {}}),
+            json.dumps({'standup_id': 1, 'answers': {'abc': {'text': 'Done'}}}),
+            json.dumps({'standup_id': 1, 'answers': {'101': 'Done'}}),
+        ]
+        for raw in invalid:
+            with self.assertRaises(StandupValidationError, msg=raw):
+                parse_record(raw)
+
+class TestCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name) / 'reports.checkpoint'
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_watermark_compaction(self):
+        checkpoint = Checkpoint(self.path)
+        checkpoint.mark_done(2)
+        self.assertEqual((checkpoint.watermark, checkpoint.done), (0, {2}))
+        checkpoint.mark_done(1)
+        self.assertEqual((checkpoint.watermark, checkpoint.done), (2, set()))
+
+    def test_reload(self):
+        checkpoint = Checkpoint(self.path)
+        checkpoint.mark_done(1)
+        checkpoint.mark_done(3)
+        checkpoint.flush()
+        reloaded = Checkpoint(self.path)
+        self.assertTrue(reloaded.is_done(1))
+        self.assertFalse(reloaded.is_done(2))
+        self.assertTrue(reloaded.is_done(3))
+
+    def test_failed_records_do_not_hold_the_watermark_back(self):
+        checkpoint = Checkpoint(self.path)
+        checkpoint.mark_failed(1)
+        for number in range(2, 1001):
+            checkpoint.mark_done(number)
+        checkpoint.flush()
+        self.assertEqual((checkpoint.watermark, checkpoint.done, checkpoint.failed), (1000, set(), {1}))
+        self.assertEqual(json.loads(self.path.read_text()), {'watermark': 1000, 'done': [], 'failed': [1]})
+        reloaded = Checkpoint(self.path)
+        self.assertFalse(reloaded.is_done(1))
+        self.assertTrue(reloaded.is_done(2))
+        reloaded.mark_done(1)
+        self.assertTrue(reloaded.is_done(1))
+        self.assertEqual(reloaded.watermark, 1000)
+
+    def test_writes_are_batched(self):
+        checkpoint = Checkpoint(self.path, interval=60)
+        with patch('geekbot_cli.bulk.atomic_write') as atomic_write:
+            for number in range(1, 101):
+                checkpoint.mark_done(number)
+            self.assertEqual(atomic_write.call_count, 1)
+            checkpoint.flush()
+            checkpoint.flush()
+            self.assertEqual(atomic_write.call_count, 2)
+
+class TestBulkSubmitter(unittest.TestCase):
+    def record(self, standup_id):
+        return json.dumps({'standup_id': standup_id, 'answers': {'101': {'text': 'Done'}}})
+
+    def test_submit_writes_one_result_per_record(self):
+        api_client = Mock()
+        api_client.post_report.side_effect = [{'id': 7}, StandupAPIError("Server error")]
+        results = io.StringIO()
+
+        summary = BulkSubmitter(api_client, workers=1).submit(
+            iter([(1, self.record(1)), (2, self.record(2)), (3, 'not json')]), results
+        )
+
+        lines = sorted((json.loads(line) for line in results.getvalue().splitlines()), key=lambda line: line['record'])
+        self.assertEqual(summary, {'ok': 1, 'error': 2, 'skipped': 0})
+        self.assertEqual([line['record'] for line in lines], [1, 2, 3])
+        self.assertEqual(lines[0]['report_id'], 7)
+        self.assertEqual(lines[1]['error'], 'StandupAPIError')
+        self.assertEqual(lines[2]['error'], 'StandupValidationError')
+        self.assertIn('latency_ms', lines[0])
+        self.assertNotIn('permanent', lines[2])
+
+    def test_submit_resumes_from_checkpoint(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            checkpoint = Checkpoint(Path(tmp_dir) / 'checkpoint')
+            checkpoint.mark_done(1)
+            api_client = Mock()
+            api_client.post_report.side_effect = [StandupAPIError("Server error"), StandupValidationError("Bad")]
+            submitter = BulkSubmitter(api_client, workers=1, checkpoint=checkpoint)
+
+            summary = submitter.submit(
+                iter([(1, self.record(1)), (2, self.record(2)), (3, self.record(3))]), io.StringIO()
+            )
+
+            self.assertEqual(summary, {'ok': 0, 'error': 2, 'skipped': 1})
+            self.assertEqual(api_client.post_report.call_count, 2)
+            self.assertFalse(checkpoint.is_done(2))  # Transient failure, retried next run
+            self.assertTrue(checkpoint.is_done(3))   # Permanent failure, not retried
+
+    def test_resume_after_crash_reposts_with_the_same_key(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / 'checkpoint'
+            api_client = Mock()
+            api_client.post_report.return_value = {'id': 7}
+            records = [(1, self.record(1)), (2, self.record(1))]
+            # The process dies after the post, before the checkpoint records it.
+            with patch('geekbot_cli.bulk.atomic_write', side_effect=KeyboardInterrupt):
+                with self.assertRaises(KeyboardInterrupt):
+                    BulkSubmitter(api_client, workers=1, checkpoint=Checkpoint(path), source='reports.jsonl').submit(
+                        iter(records[:1]), io.StringIO()
+                    )
+            BulkSubmitter(api_client, workers=1, checkpoint=Checkpoint(path), source='reports.jsonl').submit(
+                iter(records), io.StringIO()
+            )
+
+        keys = [call.kwargs['idempotency_key'] for call in api_client.post_report.call_args_list]
+        self.assertEqual(len(keys), 3)
+        self.assertEqual(keys[0], keys[1])
+        # The same content at another position is another report.
+        self.assertNotEqual(keys[1], keys[2])
+
+    def test_submit_bounds_in_flight_records(self):
+        release = threading.Event()
+        consumed = []
+
+        def records():
+            for number in range(1, 21):
+                consumed.append(number)
+                yield number, self.record(number)
+
+        def post_report(standup_id, answers, idempotency_key=None):
+            release.wait(5)
+            return {'id': standup_id}
+
+        api_client = Mock()
+        api_client.post_report.side_effect = post_report
+        submitter = BulkSubmitter(api_client, workers=2)
+        thread = threading.Thread(target=submitter.submit, args=(records(), io.StringIO()))
+        thread.start()
+        thread.join(0.2)
+        self.assertLessEqual(len(consumed), 5)
+        release.set()
+        thread.join()
+        self.assertEqual(api_client.post_report.call_count, 20)
+
+    def test_submit_rejects_invalid_records_before_posting(self):
+        validator = ReportValidator([Standup(1, 'Daily', (Question(101, 'Done?', 'EEEEEE', 'text', []),))])
+        api_client = Mock()
+        api_client.post_report.return_value = {'id': 7}
+        results = io.StringIO()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            checkpoint = Checkpoint(Path(tmp_dir) / 'checkpoint')
+            summary = BulkSubmitter(api_client, workers=1, checkpoint=checkpoint, validator=validator).submit(
+                iter([(1, self.record(1)), (2, self.record(2)), (3, 'not json')]), results
+            )
+            self.assertTrue(checkpoint.is_done(2))
+
+        lines = {line['record']: line for line in map(json.loads, results.getvalue().splitlines())}
+        self.assertEqual(summary, {'ok': 1, 'error': 2, 'skipped': 0})
+        api_client.post_report.assert_called_once_with(1, {'101': {'text': 'Done'}}, idempotency_key=ANY)
+        self.assertEqual(lines[2]['errors'], [{'question_id': None, 'code': 'unknown_standup',
+                                               'message': 'there is no standup 2'}])
+        self.assertEqual(lines[3]['error'], 'StandupValidationError')
+        self.assertNotIn('errors', lines[3])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+## test_cache.py
+import json
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import Mock
+from geekbot_cli.cache import StandupCache, key_fingerprint
+from geekbot_cli.models import Standup
+
+class TestStandupCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name) / 'standups.json'
+        self.cache = StandupCache(path=self.path, ttl=60)
+        self.standups = Standup.from_dicts([{'id': 1, 'name': 'Daily Standup', 'questions': []}])
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_store_and_load(self):
+        self.cache.store('key', self.standups, etag='"abc"', last_modified='Mon, 01 Jan 2024 00:00:00 GMT')
+        entry = self.cache.load('key')
+        self.assertEqual(entry['standups'], [standup.to_dict() for standup in self.standups])
+        self.assertEqual(entry['etag'], '"abc"')
+        self.assertEqual(entry['last_modified'], 'Mon, 01 Jan 2024 00:00:00 GMT')
+        self.assertTrue(self.cache.is_fresh(entry))
+
+    def test_api_key_is_not_stored_in_plain_text(self):
+        self.cache.store('secret_key', self.standups)
+        self.assertNotIn('secret_key', self.path.read_text())
+        self.assertEqual(json.loads(self.path.read_text())['key'], key_fingerprint('secret_key'))
+
+    def test_cache_file_is_private(self):
+        self.cache.store('key', self.standups)
+        self.assertEqual(os.stat(self.path).st_mode & 0o077, 0)
+
+    def test_load_with_other_api_key(self):
+        self.cache.store('key', self.standups)
+        self.assertIsNone(self.cache.load('other_key'))
+
+    def test_load_missing_or_corrupted(self):
+        self.assertIsNone(self.cache.load('key'))
+        self.path.write_text('{not json')
+        self.assertIsNone(self.cache.load('key'))
+
+    def test_stale_entry(self):
+        entry = self.cache.store('key', self.standups)
+        entry['fetched_at'] = time.time() - 61
+        self.assertFalse(self.cache.is_fresh(entry))
+
+    def test_invalidate(self):
+        self.cache.store('key', self.standups)
+        self.cache.invalidate()
+        self.assertFalse(self.path.exists())
+        self.cache.invalidate()  # Idempotent
+
+    def test_fetch_not_modified_reuses_cached_body(self):
+        entry = self.cache.store('key', self.standups, etag='"abc"')
+        entry['fetched_at'] = 0
+        self.cache.touch(entry)
+        api_client = Mock()
+        api_client.get_standups_if_modified.return_value = (None, '"abc"', None)
+
+        standups = self.cache.fetch(api_client, 'key')
+
+        self.assertEqual(standups, self.standups)
+        api_client.get_standups_if_modified.assert_called_once_with('"abc"', None)
+        self.assertTrue(self.cache.is_fresh(self.cache.load('key')))
+
+    def test_fetch_modified_stores_new_body(self):
+        self.cache.store('key', self.standups, etag='"abc"')
+        new_standups = Standup.from_dicts([{'id': 2, 'name': 'Retro', 'questions': []}])
+        api_client = Mock()
+        api_client.get_standups_if_modified.return_value = (new_standups, '"def"', None)
+
+        self.assertEqual(self.cache.fetch(api_client, 'key'), new_standups)
+        self.assertEqual(self.cache.load('key')['etag'], '"def"')
+
+    def test_fetch_refresh_skips_validators(self):
+        self.cache.store('key', self.standups, etag='"abc"')
+        api_client = Mock()
+        api_client.get_standups_if_modified.return_value = (self.standups, '"abc"', None)
+
+        self.cache.fetch(api_client, 'key', refresh=True)
+
+        api_client.get_standups_if_modified.assert_called_once_with()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,12 @@
 # test_cli.py
+import threading
+import time
 import unittest
 from unittest.mock import Mock, patch, MagicMock
 from click.testing import CliRunner
 from geekbot_cli.cli import CLI, main
-from geekbot_cli.exceptions import StandupException,APIKeyNotFoundError
+from geekbot_cli.exceptions import StandupException,APIKeyNotFoundError,StandupServerError
+from geekbot_cli.models import Standup, Question
 
 
 class TestCLI(unittest.TestCase):
@@ -11,6 +14,7 @@ class TestCLI(unittest.TestCase):
     def setUp(self):
         self.runner = CliRunner()
         self.api_client_mock = MagicMock()
+        self.api_client_mock.stream_standups.return_value = (iter([]), None, None)
         self.config_manager_mock = MagicMock()
 
     @patch('geekbot_cli.cli.console')
@@ -19,14 +23,14 @@ class TestCLI(unittest.TestCase):
         # Setup mock responses
         mock_prompt_ask.return_value = '1'
         cli_instance = CLI(api_client=Mock(), config_manager=Mock())
-        standups = [{'id': 1, 'name': 'Daily Standup'}]
+        standups = [Standup(id=1, name='Daily Standup', questions=())]
 
         # Run the method under test
         selected_standup = cli_instance.select_standup(standups)
 
         # Check that the correct standup is selected
-        self.assertEqual(selected_standup['id'], 1)
-        self.assertEqual(selected_standup['name'], 'Daily Standup')
+        self.assertEqual(selected_standup.id, 1)
+        self.assertEqual(selected_standup.name, 'Daily Standup')
         mock_prompt_ask.assert_called_once_with("Enter the number of the standup", default="0", show_choices=False)
         mock_console.print.assert_called()  # You can add more specific checks here
 
@@ -39,7 +43,7 @@ class TestCLI(unittest.TestCase):
         """
         mock_prompt_ask.side_effect = ['invalid', '1']
         cli_instance = CLI(api_client=self.api_client_mock, config_manager=self.config_manager_mock)
-        standups = [{'id': 1, 'name': 'Daily Standup'}]
+        standups = [Standup(id=1, name='Daily Standup', questions=())]
 
         selected_standup = cli_instance.select_standup(standups)
 
@@ -47,12 +51,46 @@ class TestCLI(unittest.TestCase):
         mock_console.print.assert_called_with("Invalid selection. Please enter a number.", style="red")
 
 
+    @patch('geekbot_cli.cli.console')
+    @patch('geekbot_cli.picker.pick_standup')
+    @patch('geekbot_cli.cli.is_interactive', return_value=True)
+    def test_select_standup_uses_picker_on_a_terminal(self, mock_is_interactive, mock_pick_standup, mock_console):
+        standups = [Standup(id=1, name='Daily Standup', questions=()), Standup(id=2, name='Retro', questions=())]
+        mock_pick_standup.return_value = standups[1]
+        recent_standups = Mock()
+        recent_standups.load.return_value = [('default', 2), ('work', 1)]
+        cli_instance = CLI(api_client=Mock(), config_manager=Mock(), recent_standups=recent_standups)
+
+        selected_standup = cli_instance.select_standup(standups)
+
+        self.assertIs(selected_standup, standups[1])
+        mock_pick_standup.assert_called_once_with(standups, [2])
+        recent_standups.touch.assert_called_once_with('default', 2)
+
+    @patch('geekbot_cli.cli.console')
+    @patch('geekbot_cli.picker.pick_standup')
+    @patch('geekbot_cli.cli.is_interactive', return_value=True)
+    def test_select_standup_remembers_the_workspace(self, mock_is_interactive, mock_pick_standup, mock_console):
+        from geekbot_cli.workspaces import Workspace, WorkspaceStandup, recent_key
+        workspaces = [Workspace(profile, MagicMock(), MagicMock()) for profile in ('default', 'work')]
+        standups = [WorkspaceStandup(Standup(1, 'Daily', ()), workspace) for workspace in workspaces]
+        mock_pick_standup.return_value = standups[1]
+        recent_standups = Mock()
+        recent_standups.load.return_value = [('default', 1)]
+        cli_instance = CLI(None, Mock(), recent_standups=recent_standups, workspaces=workspaces)
+
+        cli_instance.select_standup(standups)
+
+        mock_pick_standup.assert_called_once_with(standups, [('default', 1)], key=recent_key)
+        self.assertEqual([recent_key(standup) for standup in standups], [('default', 1), ('work', 1)])
+        recent_standups.touch.assert_called_once_with('work', 1)
+
     @patch('geekbot_cli.cli.console')
     @patch('geekbot_cli.cli.get_multiline_input')
     def test_input_answers(self, mock_get_multiline_input, mock_console):
         mock_get_multiline_input.return_value = 'Test Answer'
         questions = [
-            {'id': 1, 'text': 'What did you do yesterday?', 'color': 'green', 'answer_type': 'text'},
+            Question.from_dict({'id': 1, 'text': 'What did you do yesterday?', 'color': 'green', 'answer_type': 'text'}),
             # ... add other question types as needed
         ]
         cli_instance = CLI(api_client=Mock(), config_manager=Mock())
@@ -73,7 +111,7 @@ class TestCLI(unittest.TestCase):
         # Mock radiolist_dialog to return a selected choice
         mock_radiolist_dialog.return_value.run.return_value = 'Choice 1'
         questions = [
-            {'id': 1, 'text': 'Select an option:', 'color': 'green', 'answer_type': 'multiple_choice', 'answer_choices': ['Choice 1', 'Choice 2']}
+            Question.from_dict({'id': 1, 'text': 'Select an option:', 'color': 'green', 'answer_type': 'multiple_choice', 'answer_choices': ['Choice 1', 'Choice 2']})
         ]
         cli_instance = CLI(api_client=self.api_client_mock, config_manager=self.config_manager_mock)
 
@@ -116,6 +154,146 @@ class TestCLI(unittest.TestCase):
         # Optionally, verify that the API key is saved after being prompted
         self.config_manager_mock.save_api_key.assert_called()
 
+    def test_load_standups_fresh_cache_skips_network(self):
+        standup_cache = MagicMock()
+        standup_cache.load.return_value = {'standups': [{'id': 1}]}
+        standup_cache.is_fresh.return_value = True
+        cli_instance = CLI(self.api_client_mock, self.config_manager_mock, standup_cache)
+
+        standups, revalidation = cli_instance.load_standups('key')
+
+        self.assertEqual(standups, [Standup(1, '', ())])
+        self.assertIsNone(revalidation)
+        standup_cache.fetch.assert_not_called()
+        self.api_client_mock.get_standups.assert_not_called()
+
+    def test_load_standups_stale_cache_revalidates_in_background(self):
+        standup_cache = MagicMock()
+        standup_cache.load.return_value = {'standups': [{'id': 1, 'questions': []}]}
+        standup_cache.is_fresh.return_value = False
+        standup_cache.fetch.return_value = Standup.from_dicts([{'id': 1, 'questions': [{'id': 5}]}])
+        cli_instance = CLI(self.api_client_mock, self.config_manager_mock, standup_cache)
+
+        standups, revalidation = cli_instance.load_standups('key')
+
+        self.assertEqual(standups, [Standup(1, '', ())])
+        self.assertEqual(cli_instance.refresh_selection(standups[0], revalidation).questions[0].id, 5)
+
+    def test_load_standups_refresh_streams_and_caches(self):
+        standup_cache = MagicMock()
+        self.api_client_mock.stream_standups.return_value = (iter([Standup(2, 'Retro', ())]), '"abc"', None)
+        cli_instance = CLI(self.api_client_mock, self.config_manager_mock, standup_cache)
+
+        standups, revalidation = cli_instance.load_standups('key', refresh=True)
+
+        standup_cache.store.assert_not_called()
+        self.assertEqual(list(standups), [Standup(2, 'Retro', ())])
+        standup_cache.load.assert_not_called()
+        standup_cache.store.assert_called_once_with('key', [Standup(2, 'Retro', ())], '"abc"', None)
+
+    @patch('geekbot_cli.cli.console')
+    def test_render_standups_prints_full_rows(self, mock_console):
+        mock_console.width = 40
+        standups = (Standup(index, f"Standup {index}", ()) for index in range(1, 6))
+        cli_instance = CLI(self.api_client_mock, self.config_manager_mock)
+
+        rendered = cli_instance.render_standups(standups)
+
+        self.assertEqual([standup.id for standup in rendered], [1, 2, 3, 4, 5])
+        rows = [call.args[0] for call in mock_console.print.call_args_list]
+        self.assertEqual([len(row.renderables) for row in rows], [2, 2, 1])
+
+    def test_refresh_selection_keeps_cached_standup_on_error(self):
+        revalidation = Mock()
+        revalidation.result.side_effect = StandupException("offline")
+        cli_instance = CLI(self.api_client_mock, self.config_manager_mock)
+        standup = Standup(1, 'Daily Standup', ())
+        self.assertIs(cli_instance.refresh_selection(standup, revalidation), standup)
+
+    @patch('geekbot_cli.cli.console')
+    @patch('geekbot_cli.cli.CLI.input_answers', return_value={1: {'text': 'Answer'}})
+    @patch('geekbot_cli.cli.CLI.select_standup', return_value=Standup(7, 'Daily Standup', ()))
+    def test_start_queues_report_when_service_is_down(self, mock_select_standup, mock_input_answers, mock_console):
+        self.api_client_mock.post_report.side_effect = StandupServerError("Server error: 503")
+        self.api_client_mock.get_standups.return_value = [Standup(7, 'Daily Standup', ())]
+        outbox = MagicMock()
+        outbox.depth.return_value = 0
+        cli_instance = CLI(self.api_client_mock, self.config_manager_mock, outbox=outbox)
+
+        cli_instance.start()
+
+        key = self.api_client_mock.post_report.call_args.kwargs['idempotency_key']
+        outbox.enqueue.assert_called_once_with(7, {1: {'text': 'Answer'}}, key, error="Server error: 503")
+
+    @patch('geekbot_cli.cli.console')
+    @patch('geekbot_cli.cli.CLI.select_standup', return_value=None)
+    def test_start_loads_standups_while_preparing_the_ui(self, mock_select_standup, mock_console):
+        loading = threading.Event()
+        cli_instance = CLI(self.api_client_mock, self.config_manager_mock, timings=True)
+        cli_instance.load_standups = Mock(side_effect=lambda *args: loading.set() or ([], None))
+        cli_instance.prepare_ui = Mock(side_effect=lambda: self.assertTrue(loading.wait(5)))
+
+        cli_instance.start()
+
+        mock_select_standup.assert_called_once_with([])
+        phases = {name for name, _, _ in cli_instance.timer.phases}
+        self.assertLessEqual({'credentials', 'ui', 'standups', 'outbox'}, phases)
+
+    @patch('geekbot_cli.cli.console')
+    def test_start_closes_standups_it_did_not_use(self, mock_console):
+        standups = Mock()
+        outbox = MagicMock()
+        outbox.depth.side_effect = StandupException("Outbox unreadable")
+        cli_instance = CLI(self.api_client_mock, self.config_manager_mock, outbox=outbox)
+        cli_instance.load_standups = Mock(return_value=(standups, None))
+
+        cli_instance.start()
+
+        mock_console.print.assert_called_with("An error occurred: Outbox unreadable", style="red")
+        for _ in range(100):
+            if standups.close.called:
+                break
+            time.sleep(0.05)
+        standups.close.assert_called_once_with()
+
+    @patch('geekbot_cli.cli.console')
+    def test_flush_outbox_sends_without_retrying(self, mock_console):
+        outbox = MagicMock()
+        outbox.depth.return_value = 2
+        outbox.flush.return_value = {'sent': 2, 'failed': 0, 'remaining': 0}
+        cli_instance = CLI(self.api_client_mock, self.config_manager_mock, outbox=outbox)
+
+        cli_instance.flush_outbox()
+
+        outbox.flush.assert_called_once_with(self.api_client_mock, max_attempts=1)
+        mock_console.print.assert_called_once_with("Sent 2 queued report(s) from the outbox.", style="green")
+
+    @patch('geekbot_cli.cli.console')
+    @patch('geekbot_cli.cli.CLI.input_answers', return_value={100: {'text': 'Done'}})
+    @patch('geekbot_cli.cli.CLI.select_standup')
+    def test_start_workspaces_loads_concurrently_and_reports_through_the_picked_one(self, mock_select_standup, mock_input_answers, mock_console):
+        from geekbot_cli.workspaces import Workspace
+        workspaces = []
+        for profile, standup_id in (('default', 1), ('work', 2)):
+            api_client = MagicMock()
+            def stream_standups(standup_id=standup_id):
+                time.sleep(0.3)
+                return iter([Standup(standup_id, 'Daily', ())]), None, None
+            api_client.stream_standups.side_effect = stream_standups
+            api_client.post_report.return_value = {'done_at': 1, 'channel': 'work'}
+            workspaces.append(Workspace(profile, MagicMock(), api_client))
+        mock_select_standup.side_effect = lambda standups: sorted(standups, key=lambda standup: standup.id)[-1]
+        cli_instance = CLI(workspaces[0].api_client, self.config_manager_mock, workspaces=workspaces)
+
+        started = time.perf_counter()
+        cli_instance.start()
+        elapsed = time.perf_counter() - started
+
+        self.assertLess(elapsed, 0.55)
+        workspaces[0].api_client.post_report.assert_not_called()
+        workspaces[1].api_client.post_report.assert_called_once()
+        self.assertEqual(workspaces[1].api_client.post_report.call_args[0][:2], (2, {100: {'text': 'Done'}}))
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
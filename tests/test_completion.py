@@ -0,0 +1,92 @@
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+from click.testing import CliRunner
+from geekbot_cli import completion
+from geekbot_cli.cache import StandupCache
+from geekbot_cli.config_manager import ConfigManager
+from geekbot_cli.main import main
+from geekbot_cli.models import Standup
+from geekbot_cli.workspaces import Workspace
+
+
+class TestCompletionIndex(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.environment = patch.dict(os.environ, {'XDG_CACHE_HOME': self.directory.name,
+                                                   'XDG_CONFIG_HOME': self.directory.name})
+        self.environment.start()
+        os.environ.pop('GEEKBOT_PROFILE', None)
+
+    def tearDown(self):
+        self.environment.stop()
+        self.directory.cleanup()
+
+    def test_cache_writes_and_removes_the_index(self):
+        cache = StandupCache()
+        cache.store('key', [Standup(12, 'Daily Standup', ()), Standup(7, 'Weekly\tRetro\n', ())])
+        self.assertEqual(str(cache.index_path), completion.index_path())
+        self.assertEqual(completion.read_index(completion.index_path()),
+                         [('12', 'Daily Standup'), ('7', 'Weekly Retro')])
+        cache.invalidate()
+        self.assertEqual(completion.read_index(completion.index_path()), [])
+
+    def test_profile_index_sits_next_to_the_profile_cache(self):
+        workspace = Workspace.for_profile(ConfigManager(), 'work')
+        self.assertEqual(str(workspace.standup_cache.index_path), completion.index_path('work'))
+
+    def test_completes_standup_ids_and_names(self):
+        completion.write_index(completion.index_path(), [(12, 'Daily Standup'), (120, 'Weekly Retro'), (3, 'Daily Sync')])
+        self.assertEqual(completion.complete(['--standup', '12']), [('12', 'Daily Standup'), ('120', 'Weekly Retro')])
+        self.assertEqual(completion.complete(['--standup', 'ret']), [('120', 'Weekly Retro')])
+        self.assertEqual([value for value, _ in completion.complete(['sync', '--standup', 'dai'])], ['12', '3'])
+        self.assertEqual(completion.complete(['--standup=3']), [('3', 'Daily Sync')])
+        self.assertEqual(completion.complete(['--standup', '=', '']), completion.complete(['--standup', '']))
+
+    def test_uses_the_selected_profile(self):
+        completion.write_index(completion.index_path(), [(1, 'Default')])
+        completion.write_index(completion.index_path('work'), [(2, 'Work')])
+        self.assertEqual(completion.complete(['--profile', 'work', 'sync', '--standup', '']), [('2', 'Work')])
+        with patch.dict(os.environ, {'GEEKBOT_PROFILE': 'work'}):
+            self.assertEqual(completion.complete(['--standup', '']), [('2', 'Work')])
+
+    def test_completes_commands_and_profiles(self):
+        Path(self.directory.name, 'geekbot-cli').mkdir()
+        Path(self.directory.name, 'geekbot-cli', 'profiles.json').write_text('["work", "oss"]')
+        self.assertEqual([value for value, _ in completion.complete(['s'])], ['search', 'submit', 'sync'])
+        self.assertEqual([value for value, _ in completion.complete(['--profile', ''])], ['default', 'work', 'oss'])
+        self.assertEqual(completion.complete(['--profile', 'work', 'sync', '']), [])
+        self.assertEqual(completion.complete(['--trace', '']), [])
+
+    def test_main_prints_tab_separated_candidates(self):
+        completion.write_index(completion.index_path(), [(12, 'Daily Standup')])
+        with patch('sys.stdout', new_callable=io.StringIO) as stdout:
+            self.assertEqual(completion.main(['--', '--standup', '']), 0)
+        self.assertEqual(stdout.getvalue(), '12\tDaily Standup\n')
+
+
+class TestCompletionEntryPoint(unittest.TestCase):
+    def test_commands_match_the_cli(self):
+        self.assertEqual(completion.COMMANDS, tuple(sorted(main.commands)))
+
+    def test_prints_scripts(self):
+        for shell in completion.SCRIPTS:
+            result = CliRunner().invoke(main, ['completion', shell])
+            self.assertEqual(result.exit_code, 0)
+            self.assertIn('geekbot-complete --', result.output)
+
+    def test_imports_only_the_standard_library(self):
+        code = ("import sys; import geekbot_cli.completion; "
+                "print(sorted(name for name in sys.modules if name.split('.')[0] in "
+                "('click', 'requests', 'rich', 'prompt_toolkit', 'keyring', 'urllib3')))")
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.strip(), '[]')
+
+
+if __name__ == '__main__':
+    unittest.main()
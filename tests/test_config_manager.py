@@ -1,10 +1,24 @@
 ## test_config_manager.py
+import os
+import tempfile
 import unittest
+from pathlib import Path
 from unittest.mock import patch, MagicMock
 from geekbot_cli.config_manager import ConfigManager
+from geekbot_cli.credentials import CredentialResolver
 from geekbot_cli.exceptions import APIKeyNotFoundError
 from io import StringIO
 
+class StaticResolver(CredentialResolver):
+    def __init__(self, name, api_key):
+        self.name = name
+        self.api_key = api_key
+        self.calls = 0
+
+    def resolve(self):
+        self.calls += 1
+        return self.api_key
+
 class TestConfigManager(unittest.TestCase):
     def setUp(self):
         self.config_manager = ConfigManager(service_name='TestStandupApp')
@@ -22,11 +36,58 @@ class TestConfigManager(unittest.TestCase):
             self.config_manager.get_api_key()
         self.assertTrue('API key not found in keyring.' in str(context.exception))
 
+    def test_get_api_key_first_resolver_wins(self):
+        env = StaticResolver('env', None)
+        file = StaticResolver('file', 'file_key')
+        keyring_resolver = StaticResolver('keyring', 'keyring_key')
+        config_manager = ConfigManager(resolvers=[env, file, keyring_resolver])
+
+        self.assertEqual(config_manager.get_api_key(), 'file_key')
+        self.assertEqual(config_manager.api_key_source, 'file')
+        self.assertEqual(keyring_resolver.calls, 0)
+        self.assertEqual(set(config_manager.lookup_timings), {'env', 'file'})
+
+    def test_get_api_key_is_cached_per_session(self):
+        keyring_resolver = StaticResolver('keyring', 'keyring_key')
+        config_manager = ConfigManager(resolvers=[keyring_resolver])
+
+        config_manager.get_api_key()
+        config_manager.get_api_key()
+
+        self.assertEqual(keyring_resolver.calls, 1)
+
+    def test_resolve_api_key_stops_before_a_resolver(self):
+        env, fd, keyring = StaticResolver('env', None), StaticResolver('fd', None), StaticResolver('keyring', 'kr')
+        config_manager = ConfigManager(service_name='TestStandupApp', resolvers=[env, fd, keyring])
+        self.assertIsNone(config_manager.resolve_api_key(before='keyring'))
+        self.assertEqual(keyring.calls, 0)
+        # Resuming the lookup does not read the earlier sources again.
+        self.assertEqual(config_manager.get_api_key(), 'kr')
+        self.assertEqual((env.calls, fd.calls, keyring.calls), (1, 1, 1))
+
+    def test_get_api_key_no_resolver_provides_key(self):
+        config_manager = ConfigManager(resolvers=[StaticResolver('env', None)])
+        with self.assertRaises(APIKeyNotFoundError):
+            config_manager.get_api_key()
+
+    @patch('keyring.set_password')
+    def test_save_api_key_updates_session_key(self, mock_set_password):
+        config_manager = ConfigManager(resolvers=[])
+        config_manager.save_api_key('new_test_api_key')
+        self.assertEqual(config_manager.get_api_key(), 'new_test_api_key')
+
     @patch('keyring.set_password')
     def test_save_api_key_success(self, mock_set_password):
         self.config_manager.save_api_key('new_test_api_key')
         mock_set_password.assert_called_once_with('TestStandupApp', 'api_key', 'new_test_api_key')
 
+    @patch('keyring.set_password')
+    def test_save_api_key_invalidates_standup_cache(self, mock_set_password):
+        standup_cache = MagicMock()
+        config_manager = ConfigManager(service_name='TestStandupApp', standup_cache=standup_cache)
+        config_manager.save_api_key('new_test_api_key')
+        standup_cache.invalidate.assert_called_once()
+
     @patch('keyring.set_password')
     def test_save_api_key_error(self, mock_set_password):
         mock_set_password.side_effect = RuntimeError('Error accessing keyring')
@@ -68,5 +129,50 @@ class TestConfigManager(unittest.TestCase):
             # Check that the expected error message was printed to stdout
             self.assertIn("Failed to remove the key: Failed to delete the key", fake_out.getvalue())
 
+class TestProfiles(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.profiles_path = Path(self.directory.name) / 'profiles.json'
+        self.config_manager = ConfigManager(service_name='TestStandupApp', profiles_path=self.profiles_path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    @patch.dict(os.environ, {'GEEKBOT_API_KEY': 'default_key', 'GEEKBOT_API_KEY_SIDE_PROJECT': 'side_key'})
+    def test_named_profile_reads_its_own_variable(self):
+        self.assertEqual(self.config_manager.get_api_key(), 'default_key')
+        side_project = self.config_manager.for_profile('side-project')
+        self.assertEqual(side_project.get_api_key(), 'side_key')
+        self.assertEqual(side_project.api_key_source, 'env')
+
+    @patch('keyring.delete_password')
+    @patch('keyring.set_password')
+    def test_saving_and_deleting_a_key_registers_the_profile(self, mock_set_password, mock_delete_password):
+        work = self.config_manager.for_profile('work')
+        work.save_api_key('work_key')
+        self.config_manager.for_profile('oss').save_api_key('oss_key')
+        work.save_api_key('work_key')
+        mock_set_password.assert_any_call('TestStandupApp', 'api_key:work', 'work_key')
+        self.assertEqual(self.config_manager.profiles(), ['work', 'oss'])
+
+        work.delete_api_key()
+        mock_delete_password.assert_called_once_with('TestStandupApp', 'api_key:work')
+        self.assertEqual(self.config_manager.profiles(), ['oss'])
+
+    @patch('keyring.set_password')
+    def test_clashing_profile(self, mock_set_password):
+        self.config_manager.for_profile('work-1').save_api_key('work_key')
+        self.assertEqual(self.config_manager.clashing_profile('work_1'), 'work-1')
+        self.assertEqual(self.config_manager.clashing_profile('WORK-1'), 'work-1')
+        self.assertIsNone(self.config_manager.clashing_profile('work-1'))
+        self.assertIsNone(self.config_manager.clashing_profile('work-2'))
+
+    def test_invalid_profile_names(self):
+        for name in ('', '../etc', 'a b', 'x' * 33):
+            with self.assertRaises(ValueError):
+                ConfigManager(profile=name)
+        self.profiles_path.write_text('["ok", "../bad", 3]')
+        self.assertEqual(self.config_manager.profiles(), ['ok'])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,111 @@
+## test_credentials.py
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+import keyring
+from geekbot_cli.credentials import (
+    EnvResolver,
+    FileDescriptorResolver,
+    KeyFileResolver,
+    KeyringResolver,
+    default_resolvers
+)
+from geekbot_cli.exceptions import InsecureKeyFileError, KeyFileError
+
+class TestEnvResolver(unittest.TestCase):
+    def test_resolve(self):
+        with patch.dict(os.environ, {'GEEKBOT_API_KEY': 'env_key'}):
+            self.assertEqual(EnvResolver().resolve(), 'env_key')
+
+    def test_resolve_unset_or_empty(self):
+        with patch.dict(os.environ, {'GEEKBOT_API_KEY': ''}):
+            self.assertIsNone(EnvResolver().resolve())
+
+class TestFileDescriptorResolver(unittest.TestCase):
+    def test_resolve_from_pipe(self):
+        read_fd, write_fd = os.pipe()
+        os.write(write_fd, b'fd_key\n')
+        os.close(write_fd)
+        with patch.dict(os.environ, {'GEEKBOT_API_KEY_FD': str(read_fd)}):
+            self.assertEqual(FileDescriptorResolver().resolve(), 'fd_key')
+        with self.assertRaises(OSError):
+            os.fstat(read_fd)  # Closed after reading
+
+    def test_resolve_without_variable(self):
+        with patch.dict(os.environ, {}, clear=True):
+            self.assertIsNone(FileDescriptorResolver().resolve())
+
+    def test_resolve_invalid_descriptor(self):
+        self.assertIsNone(FileDescriptorResolver(fd=9999).resolve())
+
+    def test_reads_no_further_than_the_key_line(self):
+        read_fd, write_fd = os.pipe()
+        os.write(write_fd, b'fd_key\nfirst answer\nsecond answer\n')
+        os.close(write_fd)
+        with patch('geekbot_cli.credentials.os.close'):  # Stands in for stdin, which stays open
+            self.assertEqual(FileDescriptorResolver(fd=read_fd).resolve(), 'fd_key')
+        with os.fdopen(read_fd, encoding='utf-8') as rest:
+            self.assertEqual(rest.read(), 'first answer\nsecond answer\n')
+
+class TestKeyFileResolver(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name) / 'api_key'
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_resolve_private_file(self):
+        self.path.write_text('file_key\n')
+        os.chmod(self.path, 0o600)
+        self.assertEqual(KeyFileResolver(self.path).resolve(), 'file_key')
+
+    def test_resolve_path_from_environment(self):
+        self.path.write_text('file_key\n')
+        os.chmod(self.path, 0o600)
+        with patch.dict(os.environ, {'GEEKBOT_API_KEY_FILE': str(self.path)}):
+            self.assertEqual(KeyFileResolver().resolve(), 'file_key')
+
+    @unittest.skipUnless(hasattr(os, 'getuid'), "POSIX permissions only")
+    def test_resolve_world_readable_file(self):
+        self.path.write_text('file_key\n')
+        os.chmod(self.path, 0o644)
+        with self.assertRaises(InsecureKeyFileError):
+            KeyFileResolver(self.path).resolve()
+
+    def test_resolve_missing_file(self):
+        self.assertIsNone(KeyFileResolver(self.path).resolve())
+
+    def test_resolve_directory(self):
+        self.path.mkdir()
+        with self.assertRaises(KeyFileError):
+            KeyFileResolver(self.path).resolve()
+
+    def test_resolve_unreadable_file(self):
+        self.path.write_text('file_key\n')
+        with patch('builtins.open', side_effect=PermissionError):
+            with self.assertRaises(KeyFileError):
+                KeyFileResolver(self.path).resolve()
+
+class TestKeyringResolver(unittest.TestCase):
+    @patch('keyring.get_password')
+    def test_resolve(self, mock_get_password):
+        mock_get_password.return_value = 'keyring_key'
+        self.assertEqual(KeyringResolver('TestStandupApp').resolve(), 'keyring_key')
+        mock_get_password.assert_called_once_with('TestStandupApp', 'api_key')
+
+    @patch('keyring.get_password')
+    def test_resolve_keyring_error(self, mock_get_password):
+        mock_get_password.side_effect = keyring.errors.KeyringError('D-Bus timeout')
+        with self.assertRaises(RuntimeError):
+            KeyringResolver('TestStandupApp').resolve()
+
+class TestDefaultResolvers(unittest.TestCase):
+    def test_order(self):
+        names = [resolver.name for resolver in default_resolvers('TestStandupApp')]
+        self.assertEqual(names, ['env', 'fd', 'file', 'keyring'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import Mock, patch
+from geekbot_cli.daemon import DaemonClient, GeekbotDaemon
+from geekbot_cli.exceptions import DaemonError, StandupServerError
+from geekbot_cli.models import Standup
+
+
+class TestGeekbotDaemon(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name) / 'run' / 'daemon.sock'
+        self.api_client = Mock()
+        self.api_client.get_standups.return_value = [Standup(1, 'Daily Standup', ()), Standup(2, 'Retro', ())]
+        self.now = 0.0
+        self.daemon = GeekbotDaemon(self.api_client, 'key', path=self.path, clock=lambda: self.now)
+        ready = threading.Event()
+        self.thread = threading.Thread(target=self.daemon.serve, kwargs={'ready': ready.set})
+        self.thread.start()
+        self.assertTrue(ready.wait(5))
+        self.client = DaemonClient.connect(self.path)
+
+    def tearDown(self):
+        self.client.close()
+        self.daemon.stop()
+        self.thread.join(5)
+        self.directory.cleanup()
+
+    def test_socket_is_private(self):
+        self.assertEqual(os.stat(self.path.parent).st_mode & 0o777, 0o700)
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o600)
+        self.api_client.set_headers.assert_called_once_with('key')
+
+    def test_standups_are_fetched_once_and_kept(self):
+        self.assertEqual(self.client.get_standups(), self.api_client.get_standups.return_value)
+        self.assertEqual([standup.id for standup in self.client.stream_standups()[0]], [1, 2])
+        self.assertEqual(self.api_client.get_standups.call_count, 1)
+
+    def test_refresh_fetches_again(self):
+        self.client.get_standups()
+        self.client.refresh = True
+        self.client.get_standups()
+        self.client.get_standups()
+        self.assertEqual(self.api_client.get_standups.call_count, 2)
+
+    def test_stale_standups_are_served_while_revalidating(self):
+        self.client.get_standups()
+        self.now = self.daemon.ttl
+        revalidated = threading.Event()
+        self.api_client.get_standups.side_effect = lambda: revalidated.set() or [Standup(3, 'New', ())]
+        self.assertEqual(len(self.client.get_standups()), 2)
+        self.assertTrue(revalidated.wait(5))
+        self.wait_for_revalidation()
+        self.assertEqual([standup.id for standup in self.client.get_standups()], [3])
+
+    def test_requests_during_revalidation_do_not_wait(self):
+        self.client.get_standups()
+        self.now = self.daemon.ttl
+        started, release = threading.Event(), threading.Event()
+
+        def slow_fetch():
+            started.set()
+            release.wait(5)
+            return [Standup(3, 'New', ())]
+
+        self.api_client.get_standups.side_effect = slow_fetch
+        self.client.get_standups()
+        self.assertTrue(started.wait(5))
+        start = time.perf_counter()
+        self.assertEqual(len(self.client.get_standups()), 2)
+        self.assertEqual(self.client.status()['standups'], 2)
+        self.assertLess(time.perf_counter() - start, 1)
+        release.set()
+        self.wait_for_revalidation()
+        self.assertEqual([standup.id for standup in self.client.get_standups()], [3])
+
+    def wait_for_revalidation(self):
+        deadline = time.monotonic() + 5
+        while self.daemon._refreshing and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertFalse(self.daemon._refreshing)
+
+    def test_post_report_and_errors_go_through(self):
+        self.api_client.post_report.return_value = {'done_at': 1, 'channel': 'general'}
+        self.assertEqual(self.client.post_report(1, {'101': {'text': 'Done'}}, idempotency_key='abc'),
+                         {'done_at': 1, 'channel': 'general'})
+        self.api_client.post_report.assert_called_once_with(1, {'101': {'text': 'Done'}}, idempotency_key='abc',
+                                                            retry=True)
+        self.client.post_report(1, {}, idempotency_key='abc', retry=False)
+        self.assertFalse(self.api_client.post_report.call_args.kwargs['retry'])
+        self.api_client.post_report.side_effect = StandupServerError("Server error: 503")
+        with self.assertRaisesRegex(StandupServerError, '503'):
+            self.client.post_report(1, {})
+
+    def test_holds_key(self):
+        self.assertTrue(self.client.holds_key('key'))
+        self.assertFalse(self.client.holds_key('another key'))
+        # Without a key of its own the client defers to the keyring, which
+        # this daemon cannot read.
+        self.assertFalse(self.client.holds_key(None))
+        self.daemon.saved_key = lambda: 'key'
+        self.assertTrue(self.client.holds_key(None))
+        self.daemon.saved_key = lambda: 'changed key'
+        self.assertFalse(self.client.holds_key(None))
+
+    def test_unknown_operation(self):
+        with self.assertRaises(DaemonError):
+            self.client.call('explode')
+
+    def test_status(self):
+        self.client.get_standups()
+        status = self.client.status()
+        self.assertEqual((status['pid'], status['standups']), (os.getpid(), 2))
+
+    def test_second_daemon_is_refused(self):
+        with self.assertRaises(DaemonError):
+            GeekbotDaemon(Mock(), 'key', path=self.path).serve()
+
+    def test_stop_removes_the_socket(self):
+        self.client.stop()
+        self.thread.join(5)
+        self.assertFalse(self.thread.is_alive())
+        self.assertFalse(self.path.exists())
+        self.assertIsNone(DaemonClient.connect(self.path))
+
+
+class TestDaemonClientConnect(unittest.TestCase):
+    def test_no_daemon(self):
+        with tempfile.TemporaryDirectory() as directory:
+            os.chmod(directory, 0o700)
+            self.assertIsNone(DaemonClient.connect(Path(directory) / 'daemon.sock'))
+
+    def test_shared_directory_is_not_trusted(self):
+        with tempfile.TemporaryDirectory() as directory:
+            os.chmod(directory, 0o777)
+            self.assertIsNone(DaemonClient.connect(Path(directory) / 'daemon.sock'))
+
+    def test_platforms_without_unix_sockets(self):
+        for patched in (patch('geekbot_cli.daemon.socket', Mock(spec=['SOCK_STREAM'])),
+                        patch('geekbot_cli.daemon.os', Mock(spec=['environ', 'lstat']))):
+            with patched:
+                self.assertIsNone(DaemonClient.connect())
+                with self.assertRaises(DaemonError):
+                    GeekbotDaemon(Mock(), 'key')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+## test_export.py
+import csv
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from geekbot_cli.api_client import APIClient
+from geekbot_cli.export import CsvWriter, NdjsonWriter, ParquetWriter, export_reports, flatten_report
+from geekbot_cli.stub_server import StubGeekbotServer, make_report, make_standups
+
+try:
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover - depends on the installed extras
+    pyarrow = None
+
+
+def make_pages(pages: int, per_page: int):
+    standup = make_standups(1, questions=3)[0]
+    return [
+        [make_report(page * per_page + index + 1, standup, 1000 + index) for index in range(per_page)]
+        for page in range(pages)
+    ]
+
+
+class TestExport(unittest.TestCase):
+    def test_flatten_report(self):
+        rows = list(flatten_report(make_pages(1, 1)[0][0]))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0]['question_id'], 100)
+        self.assertEqual(rows[0]['username'], 'stub')
+
+    def test_ndjson(self):
+        stream = io.BytesIO()
+        stats = export_reports(make_pages(3, 4), NdjsonWriter(stream))
+        lines = stream.getvalue().decode('utf-8').splitlines()
+        self.assertEqual(len(lines), 12)
+        self.assertEqual(json.loads(lines[0])['id'], 1)
+        self.assertEqual(stats['reports'], 12)
+        self.assertEqual(stats['rows'], 12)
+        self.assertEqual(stats['bytes'], len(stream.getvalue()))
+
+    def test_csv(self):
+        stream = io.BytesIO()
+        stats = export_reports(make_pages(3, 4), CsvWriter(stream))
+        rows = list(csv.DictReader(io.StringIO(stream.getvalue().decode('utf-8'))))
+        self.assertEqual(len(rows), 36)
+        self.assertEqual(stats['rows'], 36)
+        self.assertEqual(rows[0]['answer'], 'Answer 1.0')
+        self.assertEqual(stats['bytes'], len(stream.getvalue()))
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_parquet_row_groups(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / 'reports.parquet'
+            with open(path, 'wb') as stream:
+                stats = export_reports(make_pages(5, 10), ParquetWriter(stream, row_group_size=60))
+            parquet_file = pyarrow.parquet.ParquetFile(path)
+            self.assertEqual(parquet_file.metadata.num_rows, 150)
+            self.assertEqual(parquet_file.metadata.num_row_groups, 3)
+            self.assertEqual(stats['bytes'], path.stat().st_size)
+            table = parquet_file.read(columns=['report_id', 'answer'])
+            self.assertEqual(table.column('answer')[0].as_py(), 'Answer 1.0')
+
+    def test_export_from_service(self):
+        with StubGeekbotServer(standups=2) as server, APIClient(base_url=server.url) as client:
+            for index in range(25):
+                server.add_report(1 + index % 2, timestamp=1000 + index)
+            client.set_headers('test_api_key')
+            stream = io.BytesIO()
+            stats = export_reports(client.iter_report_pages(standup_id=1, page_size=5), NdjsonWriter(stream))
+        self.assertEqual(stats['reports'], 13)
+        self.assertTrue(all(json.loads(line)['standup_id'] == 1 for line in stream.getvalue().splitlines()))
+
+
+if __name__ == '__main__':
+    unittest.main()
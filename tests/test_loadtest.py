@@ -0,0 +1,81 @@
+import random
+import unittest
+from geekbot_cli.api_client import APIClient
+from geekbot_cli.loadtest import ARRIVAL_PATTERNS, LoadTest, arrival_times, percentile
+from geekbot_cli.resilience import RetryPolicy
+from geekbot_cli.stub_server import StubGeekbotServer, StubProcess
+
+
+class TestArrivalTimes(unittest.TestCase):
+    def test_every_pattern_stays_within_the_run(self):
+        for pattern in ARRIVAL_PATTERNS:
+            times = arrival_times(pattern, 500, 10.0, random.Random(1))
+            self.assertEqual(len(times), 500, pattern)
+            self.assertEqual(times, sorted(times), pattern)
+            self.assertTrue(0.0 <= times[0] and times[-1] <= 10.0, pattern)
+
+    def test_shapes(self):
+        self.assertEqual(arrival_times('uniform', 4, 2.0, random.Random()), [0.0, 0.5, 1.0, 1.5])
+        self.assertEqual(arrival_times('burst', 3, 2.0, random.Random()), [0.0, 0.0, 0.0])
+        normal = arrival_times('normal', 1000, 12.0, random.Random(1))
+        middle = [offset for offset in normal if 4.0 <= offset <= 8.0]
+        self.assertGreater(len(middle), 600)
+
+    def test_seed_makes_runs_repeatable(self):
+        self.assertEqual(arrival_times('poisson', 50, 5.0, random.Random(7)),
+                         arrival_times('poisson', 50, 5.0, random.Random(7)))
+
+    def test_unknown_pattern(self):
+        with self.assertRaises(ValueError):
+            arrival_times('sine', 10, 1.0, random.Random())
+        with self.assertRaises(ValueError):
+            LoadTest('http://127.0.0.1:1', pattern='sine')
+
+
+class TestPercentile(unittest.TestCase):
+    def test_nearest_rank(self):
+        values = [float(value) for value in range(1, 101)]
+        self.assertEqual(percentile(values, 50), 50.0)
+        self.assertEqual(percentile(values, 99), 99.0)
+        self.assertEqual(percentile(values, 100), 100.0)
+        self.assertEqual(percentile([3.0], 95), 3.0)
+        self.assertEqual(percentile([], 50), 0.0)
+
+
+class TestLoadTest(unittest.TestCase):
+    def test_users_fetch_standups_and_post_reports(self):
+        with StubGeekbotServer(standups=3) as server:
+            results = LoadTest(server.url, users=20, duration=0.1, pattern='burst', concurrency=5).run()
+            self.assertEqual(server.connections, 20)
+            self.assertEqual(server.requests, 40)
+        for operation in ('get_standups', 'post_report'):
+            stats = results['operations'][operation]
+            self.assertEqual(stats['count'], 20)
+            self.assertEqual(stats['errors'], {})
+            self.assertTrue(0 < stats['p50'] <= stats['p95'] <= stats['p99'] <= stats['max'])
+        self.assertEqual(results['errors'], {})
+        self.assertGreater(results['operations_per_second'], 0)
+
+    def test_errors_are_counted_by_exception_class(self):
+        def client_factory():
+            return APIClient(base_url=server.url, retry_policy=RetryPolicy(max_attempts=1))
+
+        with StubGeekbotServer(error_rate=1.0) as server:
+            results = LoadTest(server.url, users=5, duration=0, pattern='burst',
+                               client_factory=client_factory).run()
+        self.assertEqual(results['errors'], {'StandupAPIError': 5})
+        self.assertEqual(results['operations']['post_report']['count'], 0)
+
+
+class TestStubProcess(unittest.TestCase):
+    def test_reports_what_the_server_saw(self):
+        with StubProcess(standups=2) as stub, APIClient(base_url=stub.url) as client:
+            client.set_headers('key')
+            self.assertEqual(len(client.get_standups()), 2)
+        self.assertEqual(stub.stats['requests'], 1)
+        self.assertEqual(stub.stats['connections'], 1)
+        self.assertEqual(stub.stats['responses'], {200: 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,14 @@
 ## test_main.py
+import os
+import tempfile
 import unittest
-from unittest.mock import patch
+from unittest.mock import ANY, MagicMock, patch
 from click.testing import CliRunner
 from geekbot_cli.main import main
 from geekbot_cli.exceptions import APIKeyNotFoundError, StandupException
+from geekbot_cli.models import Question, Standup
+from geekbot_cli.stub_server import StubGeekbotServer
+from geekbot_cli.workspaces import Workspace
 
 
 class TestMain(unittest.TestCase):
@@ -33,6 +38,19 @@ class TestMain(unittest.TestCase):
         self.assertNotEqual(result.exit_code, 0)
         self.assertIn("Error: Generic Error", result.output)
 
+    @patch('geekbot_cli.cli.CLI.start', autospec=True)
+    @patch('geekbot_cli.main.all_workspaces')
+    def test_all_profiles_closes_every_client(self, mock_all_workspaces, mock_start):
+        workspaces = [Workspace(profile, MagicMock(), MagicMock()) for profile in ('default', 'work')]
+        mock_all_workspaces.return_value = workspaces
+        result = self.runner.invoke(main, ['--all-profiles'])
+        self.assertEqual(result.exit_code, 0)
+        cli = mock_start.call_args.args[0]
+        self.assertIsNone(cli.api_client)
+        self.assertIs(cli.workspaces, workspaces)
+        for workspace in workspaces:
+            workspace.api_client.__exit__.assert_called_once()
+
     @patch('geekbot_cli.cli.CLI.start')
     def test_main_workflow(self, mock_start):
         """
@@ -42,6 +60,173 @@ class TestMain(unittest.TestCase):
         self.assertEqual(result.exit_code, 0)
         mock_start.assert_called_once()
 
+    @patch('geekbot_cli.cli.CLI.start')
+    def test_main_refresh_flag(self, mock_start):
+        result = self.runner.invoke(main, ['--refresh'])
+        self.assertEqual(result.exit_code, 0)
+        mock_start.assert_called_once_with(refresh=True)
+
+    @patch('geekbot_cli.config_manager.ConfigManager.get_api_key')
+    @patch('geekbot_cli.cli.CLI.start', autospec=True)
+    @patch('geekbot_cli.daemon.DaemonClient.connect')
+    def test_main_uses_running_daemon(self, mock_connect, mock_start, mock_get_api_key):
+        mock_connect.return_value.holds_key.return_value = True
+        with patch.dict('os.environ', {'GEEKBOT_API_KEY': 'test_api_key'}):
+            result = self.runner.invoke(main, ['--refresh'])
+        self.assertEqual(result.exit_code, 0)
+        mock_connect.assert_called_once_with(refresh=True)
+        mock_connect.return_value.holds_key.assert_called_once_with('test_api_key')
+        mock_get_api_key.assert_not_called()
+        cli = mock_start.call_args.args[0]
+        self.assertIs(cli.api_client, mock_connect.return_value)
+        self.assertIsNone(cli.standup_cache)
+        mock_connect.return_value.__exit__.assert_called_once()
+
+    @patch('geekbot_cli.cli.CLI.start', autospec=True)
+    @patch('geekbot_cli.daemon.DaemonClient.connect')
+    def test_daemon_with_another_key_is_not_used(self, mock_connect, mock_start):
+        mock_connect.return_value.holds_key.return_value = False
+        with patch.dict('os.environ', {'GEEKBOT_API_KEY': 'other_api_key'}):
+            result = self.runner.invoke(main)
+        self.assertEqual(result.exit_code, 0)
+        cli = mock_start.call_args.args[0]
+        self.assertIsNot(cli.api_client, mock_connect.return_value)
+        self.assertIsNotNone(cli.standup_cache)
+        mock_connect.return_value.__exit__.assert_called_once()
+
+    @patch('geekbot_cli.daemon.DaemonClient.connect', return_value=None)
+    def test_daemon_status_without_daemon(self, mock_connect):
+        result = self.runner.invoke(main, ['daemon', '--status'])
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn("No geekbot daemon is running.", result.output)
+
+    @patch('geekbot_cli.daemon.is_supported', return_value=False)
+    def test_daemon_on_platforms_without_unix_sockets(self, mock_is_supported):
+        result = self.runner.invoke(main, ['daemon'])
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn("needs Unix domain sockets", result.output)
+
+    @patch('geekbot_cli.cache.StandupCache.fetch', return_value=[
+        Standup(1, 'Daily', (Question(101, 'What did you do?', 'EEEEEE', 'text', []),))
+    ])
+    @patch('geekbot_cli.api_client.APIClient.post_report', return_value={'id': 1})
+    @patch('geekbot_cli.config_manager.ConfigManager.get_api_key', return_value='test_api_key')
+    def test_submit(self, mock_get_api_key, mock_post_report, mock_fetch):
+        with self.runner.isolated_filesystem():
+            with open('reports.jsonl', 'w') as reports:
+                reports.write('{"standup_id": 1, "answers": {"101": {"text": "Done"}}}\n')
+            result = self.runner.invoke(main, ['submit', '--from', 'reports.jsonl'])
+            self.assertEqual(result.exit_code, 0)
+            self.assertIn('"status": "ok"', result.output)
+            self.assertIn('1 submitted, 0 failed, 0 already done', result.output)
+            mock_post_report.assert_called_once_with(1, {'101': {'text': 'Done'}}, idempotency_key=ANY)
+
+            result = self.runner.invoke(main, ['submit', '--from', 'reports.jsonl'])
+            self.assertIn('0 submitted, 0 failed, 1 already done', result.output)
+            mock_post_report.assert_called_once()
+
+    @patch('geekbot_cli.cache.StandupCache.fetch', return_value=[
+        Standup(1, 'Daily', (Question(101, 'How many?', 'EEEEEE', 'numeric', []),))
+    ])
+    @patch('geekbot_cli.api_client.APIClient.post_report', return_value={'id': 1})
+    @patch('geekbot_cli.config_manager.ConfigManager.get_api_key', return_value='test_api_key')
+    def test_submit_rejects_invalid_records_without_posting(self, mock_get_api_key, mock_post_report, mock_fetch):
+        with self.runner.isolated_filesystem():
+            with open('reports.jsonl', 'w') as reports:
+                reports.write('{"standup_id": 1, "answers": {"101": {"text": "many"}}}\n')
+                reports.write('{"standup_id": 1, "answers": {"101": {"text": "3"}}}\n')
+            result = self.runner.invoke(main, ['submit', '--from', 'reports.jsonl'])
+            self.assertIn('"code": "not_numeric"', result.output)
+            self.assertIn('1 submitted, 1 failed, 0 already done', result.output)
+            mock_post_report.assert_called_once_with(1, {'101': {'text': '3'}}, idempotency_key=ANY)
+            result = self.runner.invoke(main, ['submit', '--from', 'reports.jsonl', '--restart', '--no-validate'])
+            self.assertIn('2 submitted', result.output)
+            mock_fetch.assert_called_once()
+
+    @patch('geekbot_cli.store.ReportStore.count', return_value=12)
+    @patch('geekbot_cli.store.ReportStore.sync', return_value={'fetched': 3, 'new': 2, 'high_water': 1, 'elapsed': 0.1})
+    @patch('geekbot_cli.config_manager.ConfigManager.get_api_key', return_value='test_api_key')
+    def test_sync(self, mock_get_api_key, mock_sync, mock_count):
+        with self.runner.isolated_filesystem() as data_home:
+            with patch.dict('os.environ', {'XDG_DATA_HOME': data_home}):
+                result = self.runner.invoke(main, ['sync', '--standup', '5'])
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn('Fetched 3 report(s), 2 new', result.output)
+        self.assertIn('12 stored locally', result.output)
+        self.assertEqual(mock_sync.call_args.kwargs['standup_id'], 5)
+
+    @patch('geekbot_cli.config_manager.ConfigManager.save_api_key')
+    @patch('geekbot_cli.config_manager.ConfigManager.profiles', return_value=['work-1'])
+    def test_profile_add_rejects_a_clashing_name(self, mock_profiles, mock_save_api_key):
+        result = self.runner.invoke(main, ['profile', 'add', 'work_1'], input='key\n')
+        self.assertEqual(result.exit_code, 2)
+        self.assertIn('profile work-1', result.output)
+        mock_save_api_key.assert_not_called()
+
+    @patch('geekbot_cli.store.ReportStore.search', return_value=[])
+    def test_search_uses_the_profile_store(self, mock_search):
+        with self.runner.isolated_filesystem() as data_home:
+            with patch.dict('os.environ', {'XDG_DATA_HOME': data_home}):
+                self.runner.invoke(main, ['--profile', 'work', 'search', 'billing'])
+                self.assertEqual(sorted(os.listdir(os.path.join(data_home, 'geekbot-cli'))), ['reports-work.sqlite3'])
+
+    @patch('geekbot_cli.store.ReportStore.search', return_value=[{
+        'report_id': 1, 'standup_id': 5, 'question_id': 501, 'question': 'What did you do?',
+        'username': 'alice', 'timestamp': 1700000000, 'snippet': 'Deployed \x02billing\x03', 'rank': -1.0
+    }])
+    def test_search(self, mock_search):
+        with self.runner.isolated_filesystem() as data_home:
+            with patch.dict('os.environ', {'XDG_DATA_HOME': data_home}):
+                result = self.runner.invoke(main, ['search', 'billing', '--standup', '5', '--since', '2024-01-01'])
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn('alice (standup 5) What did you do?', result.output)
+        self.assertIn('Deployed billing', result.output)
+        self.assertEqual(mock_search.call_args.kwargs['standup_id'], 5)
+        self.assertIsNotNone(mock_search.call_args.kwargs['since'])
+
+    @patch('geekbot_cli.api_client.APIClient.iter_report_pages')
+    @patch('geekbot_cli.config_manager.ConfigManager.get_api_key', return_value='test_api_key')
+    def test_export(self, mock_get_api_key, mock_iter_report_pages):
+        mock_iter_report_pages.side_effect = lambda **filters: iter([[{'id': filters['standup_id']}]])
+        with self.runner.isolated_filesystem():
+            result = self.runner.invoke(main, ['export', '-o', 'out.ndjson', '--standup', '1', '--standup', '2',
+                                               '--since', '2024-01-01'])
+            self.assertEqual(result.exit_code, 0)
+            with open('out.ndjson') as exported:
+                self.assertEqual(exported.read(), '{"id": 1}\n{"id": 2}\n')
+        self.assertIn('Exported 2 report(s), 2 row(s)', result.output)
+        self.assertIsNotNone(mock_iter_report_pages.call_args.kwargs['after'])
+
+    def test_export_parquet_needs_output(self):
+        result = self.runner.invoke(main, ['export', '--format', 'parquet'])
+        self.assertEqual(result.exit_code, 2)
+        self.assertIn('--output', result.output)
+
+    @patch('geekbot_cli.config_manager.ConfigManager.get_api_key', side_effect=APIKeyNotFoundError())
+    def test_submit_without_api_key(self, mock_get_api_key):
+        with self.runner.isolated_filesystem():
+            open('reports.jsonl', 'w').close()
+            result = self.runner.invoke(main, ['submit', '--from', 'reports.jsonl'])
+            self.assertEqual(result.exit_code, 1)
+            self.assertIn('Error: API key not found.', result.output)
+
+    @patch('geekbot_cli.outbox.Outbox.failed', return_value=[])
+    @patch('geekbot_cli.outbox.Outbox.pending', return_value=[{'key': 'abc'}])
+    def test_outbox_status(self, mock_pending, mock_failed):
+        result = self.runner.invoke(main, ['outbox', 'status'])
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn('1 report(s) waiting, 0 rejected', result.output)
+
+    @patch('geekbot_cli.outbox.Outbox.flush')
+    @patch('geekbot_cli.outbox.Outbox.depth', return_value=2)
+    @patch('geekbot_cli.config_manager.ConfigManager.get_api_key', return_value='test_api_key')
+    def test_outbox_flush(self, mock_get_api_key, mock_depth, mock_flush):
+        mock_flush.return_value = {'sent': 2, 'failed': 0, 'remaining': 0, 'elapsed': 0.5, 'rate': 4.0, 'busy': False}
+        result = self.runner.invoke(main, ['outbox', 'flush'])
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn('Sent 2 report(s) in 0.5s (4.0/s), 0 rejected, 0 still queued', result.output)
+        self.assertEqual(mock_flush.call_args.kwargs['max_attempts'], 5)
+
     @patch('geekbot_cli.config_manager.ConfigManager.get_api_key')
     def test_main_api_key_retrieval(self, mock_get_api_key):
         """
@@ -61,5 +246,72 @@ class TestMain(unittest.TestCase):
         result = self.runner.invoke(main)
         self.assertNotEqual(result.exit_code, 0)
 
+
+class TestReportCommand(unittest.TestCase):
+    def setUp(self):
+        self.runner = CliRunner()
+        self.server = StubGeekbotServer(standups=3).start()
+        self.directory = tempfile.TemporaryDirectory()
+        self.environment = patch.dict('os.environ', {
+            'GEEKBOT_API_URL': self.server.url,
+            'XDG_CACHE_HOME': self.directory.name,
+            'XDG_DATA_HOME': self.directory.name,
+        })
+        self.environment.start()
+        self.api_key = patch('geekbot_cli.config_manager.ConfigManager.get_api_key', return_value='key')
+        self.api_key.start()
+
+    def tearDown(self):
+        self.api_key.stop()
+        self.environment.stop()
+        self.directory.cleanup()
+        self.server.stop()
+
+    def test_standup_id_posts_in_a_single_request(self):
+        result = self.runner.invoke(main, ['report', '--standup', '2', '--answer', '201=Shipped it'])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('Report submitted successfully!', result.output)
+        self.assertEqual(self.server.requests, 1)
+        self.assertEqual(self.server.reports[0]['standup_id'], 2)
+
+    def test_standup_name_is_looked_up_once_then_cached(self):
+        result = self.runner.invoke(main, ['report', '--standup', 'standup 3', '--answer', '301=Done'])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(self.server.requests, 2)
+        result = self.runner.invoke(main, ['report', '--standup', 'Standup 3', '--answer', '301=Done'])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(self.server.requests, 3)
+
+    def test_answers_from_stdin(self):
+        result = self.runner.invoke(main, ['report', '--standup', '1'], input='## 100\nShipped it\n## 101\nNothing\n')
+        self.assertEqual(result.exit_code, 0, result.output)
+        result = self.runner.invoke(main, ['report', '--standup', '1', '--answer', '100=-'], input='From stdin\n')
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(len(self.server.reports), 2)
+
+    @patch('click.edit', side_effect=lambda text, **kwargs: text.replace('of standup 2?\n', 'of standup 2?\nDone'))
+    def test_edit_fills_in_the_questions(self, mock_edit):
+        result = self.runner.invoke(main, ['report', '--standup', '2', '--edit'])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('## 200 Question 0 of standup 2?', mock_edit.call_args.args[0])
+        self.assertEqual(len(self.server.reports), 1)
+
+    def test_answers_to_cached_standups_are_checked(self):
+        result = self.runner.invoke(main, ['report', '--standup', 'standup 2', '--answer', '999=Done'])
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn('Error: Question 999: standup 2 has no such question', result.output)
+        self.assertEqual(self.server.reports, [])
+
+    def test_usage_errors(self):
+        result = self.runner.invoke(main, ['report', '--standup', '1', '--answer', 'Shipped it'])
+        self.assertEqual(result.exit_code, 2)
+        result = self.runner.invoke(main, ['report', '--standup', 'planning', '--answer', '100=x'])
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn("No standup matches 'planning'", result.output)
+        result = self.runner.invoke(main, ['report', '--standup', '1'], input='# nothing\n')
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn('No answers were given', result.output)
+        self.assertEqual(self.server.reports, [])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -1,3 +1,4 @@
+import json
 import unittest
 from geekbot_cli.models import Standup, Question
 
@@ -39,5 +40,57 @@ class TestQuestion(unittest.TestCase):
         }
         self.assertEqual(question.to_dict(), expected_dict)
 
+class TestFromDict(unittest.TestCase):
+    def setUp(self):
+        # Parsed from JSON, like a response body, so equal strings are distinct objects.
+        self.data = json.loads(json.dumps([
+            {
+                'id': standup_id,
+                'name': f"Standup {standup_id}",
+                'channel': '#general',
+                'questions': [
+                    {'id': standup_id * 10, 'text': 'How do you feel?', 'color': 'EEEEEE',
+                     'answer_type': 'multiple_choice', 'answer_choices': ['Good', 'Bad']}
+                ]
+            }
+            for standup_id in (1, 2)
+        ]))
+
+    def test_round_trip(self):
+        standups = Standup.from_dicts(self.data)
+        self.assertEqual(standups[0].id, 1)
+        self.assertEqual(standups[0].name, 'Standup 1')
+        self.assertEqual(standups[0].questions[0].answer_choices, ('Good', 'Bad'))
+        expected = dict(self.data[0])
+        del expected['channel']
+        self.assertEqual(standups[0].to_dict(), expected)
+        self.assertEqual(Standup.from_dicts([standup.to_dict() for standup in standups]), standups)
+
+    def test_repeated_strings_are_shared(self):
+        first, second = (standup.questions[0] for standup in Standup.from_dicts(self.data))
+        self.assertIs(first.color, second.color)
+        self.assertIs(first.text, second.text)
+        self.assertIs(first.answer_choices[0], second.answer_choices[0])
+
+    def test_instances_have_no_dict(self):
+        standup = Standup.from_dict(self.data[0])
+        self.assertFalse(hasattr(standup, '__dict__'))
+        self.assertFalse(hasattr(standup.questions[0], '__dict__'))
+
+    def test_defaults_for_missing_fields(self):
+        question = Question.from_dict({'id': 3})
+        self.assertEqual((question.text, question.answer_type, question.answer_choices), ('', 'text', ()))
+
+    def test_equal_models_hash_equal(self):
+        first, second = Standup.from_dicts(json.loads(json.dumps(self.data[:1])) * 2)
+        self.assertEqual(hash(first), hash(second))
+        self.assertEqual(hash(first.questions[0]), hash(second.questions[0]))
+        self.assertEqual(len({first, second}), 1)
+
+    def test_non_string_choices_are_kept(self):
+        question = Question.from_dict({'id': 4, 'answer_choices': ['Yes', 1, None]})
+        self.assertEqual(question.answer_choices, ('Yes', 1, None))
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,130 @@
+## test_outbox.py
+import json
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import Mock
+from geekbot_cli.exceptions import (
+    DeadlineExceededError,
+    StandupConnectionError,
+    StandupServerError,
+    StandupValidationError
+)
+from geekbot_cli.outbox import Outbox, _file_lock
+
+class TestOutbox(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name) / 'outbox.jsonl'
+        self.outbox = Outbox(self.path)
+        self.sleep = Mock()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_enqueue_and_pending(self):
+        key = self.outbox.enqueue(1, {'101': {'text': 'Answer'}}, error='Server error')
+        pending = self.outbox.pending()
+        self.assertEqual(len(pending), 1)
+        self.assertEqual(pending[0]['key'], key)
+        self.assertEqual(pending[0]['answers'], {'101': {'text': 'Answer'}})
+        self.assertEqual(self.outbox.depth(), 1)
+
+    def test_enqueue_keeps_given_idempotency_key(self):
+        self.assertEqual(self.outbox.enqueue(1, {}, idempotency_key='abc'), 'abc')
+
+    def test_flush_sends_and_compacts(self):
+        first = self.outbox.enqueue(1, {'101': {'text': 'One'}})
+        second = self.outbox.enqueue(2, {'201': {'text': 'Two'}})
+        api_client = Mock()
+
+        stats = self.outbox.flush(api_client, sleep=self.sleep)
+
+        self.assertEqual((stats['sent'], stats['failed'], stats['remaining']), (2, 0, 0))
+        # The outbox is the only retry layer: each attempt posts once.
+        api_client.post_report.assert_any_call(1, {'101': {'text': 'One'}}, idempotency_key=first, retry=False)
+        api_client.post_report.assert_any_call(2, {'201': {'text': 'Two'}}, idempotency_key=second, retry=False)
+        self.assertEqual(self.outbox.depth(), 0)
+        self.assertEqual(self.path.read_text(), '')
+
+    def test_flush_backs_off_on_transient_errors(self):
+        self.outbox.enqueue(1, {'101': {'text': 'One'}})
+        api_client = Mock()
+        api_client.post_report.side_effect = [StandupServerError(), StandupConnectionError(), {'id': 1}]
+
+        stats = self.outbox.flush(api_client, max_attempts=3, base_delay=1, sleep=self.sleep)
+
+        self.assertEqual(stats['sent'], 1)
+        self.assertEqual(self.sleep.call_count, 2)
+        self.assertLessEqual(self.sleep.call_args_list[0].args[0], 1)
+        self.assertLessEqual(self.sleep.call_args_list[1].args[0], 2)
+
+    def test_flush_stops_while_service_is_down(self):
+        self.outbox.enqueue(1, {'101': {'text': 'One'}})
+        self.outbox.enqueue(2, {'201': {'text': 'Two'}})
+        api_client = Mock()
+        api_client.post_report.side_effect = StandupServerError()
+
+        stats = self.outbox.flush(api_client, max_attempts=2, sleep=self.sleep)
+
+        self.assertEqual((stats['sent'], stats['remaining']), (0, 2))
+        self.assertEqual(api_client.post_report.call_count, 2)
+        self.assertEqual(self.outbox.depth(), 2)
+
+    def test_flush_stops_at_the_deadline(self):
+        self.outbox.enqueue(1, {'101': {'text': 'One'}})
+        api_client = Mock()
+        api_client.post_report.side_effect = DeadlineExceededError("Deadline exceeded.")
+
+        stats = self.outbox.flush(api_client, max_attempts=5, sleep=self.sleep)
+
+        self.assertEqual((stats['sent'], stats['failed'], stats['remaining']), (0, 0, 1))
+        api_client.post_report.assert_called_once()
+        self.sleep.assert_not_called()
+
+    def test_flush_keeps_rejected_reports(self):
+        self.outbox.enqueue(1, {'101': {'text': 'One'}})
+        api_client = Mock()
+        api_client.post_report.side_effect = StandupValidationError("Bad answer")
+
+        stats = self.outbox.flush(api_client, sleep=self.sleep)
+
+        self.assertEqual(stats['failed'], 1)
+        self.assertEqual(self.outbox.depth(), 0)
+        failed = self.outbox.failed()
+        self.assertEqual(failed[0]['answers'], {'101': {'text': 'One'}})
+        self.assertIn('StandupValidationError', failed[0]['error'])
+
+    def test_flush_skips_when_another_process_drains(self):
+        self.outbox.enqueue(1, {'101': {'text': 'One'}})
+        api_client = Mock()
+        with _file_lock(self.outbox._drain_lock_path):
+            stats = self.outbox.flush(api_client, sleep=self.sleep)
+        self.assertTrue(stats['busy'])
+        self.assertEqual(stats['remaining'], 1)
+        api_client.post_report.assert_not_called()
+
+    def test_torn_last_line_is_ignored(self):
+        self.outbox.enqueue(1, {'101': {'text': 'One'}})
+        with open(self.path, 'a') as journal:
+            journal.write('{"op": "queued", "key": "torn", "stand')
+        self.outbox.enqueue(2, {'201': {'text': 'Two'}})
+        self.assertEqual([entry['standup_id'] for entry in self.outbox.pending()], [1, 2])
+
+    def test_concurrent_appends(self):
+        threads = [
+            threading.Thread(target=lambda: [self.outbox.enqueue(1, {'101': {'text': 'x' * 100}}) for _ in range(25)])
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        lines = self.path.read_text().splitlines()
+        self.assertEqual(len(lines), 100)
+        for line in lines:
+            json.loads(line)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from geekbot_cli.models import Standup
+from geekbot_cli.picker import RecentStandups, StandupIndex, StandupPicker
+
+NAMES = ['Daily Standup', 'Weekly Retro', 'Design Sync', 'Daily Design', 'Standup Eng']
+
+
+def make_standups(names=NAMES):
+    return [Standup(standup_id, name, ()) for standup_id, name in enumerate(names, 1)]
+
+
+def names(standups):
+    return [standup.name for standup in standups]
+
+
+class TestStandupIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = StandupIndex(make_standups())
+
+    def test_empty_query_lists_everything_in_order(self):
+        self.assertEqual(names(self.index.search('  ')), NAMES)
+
+    def test_ranks_name_prefix_then_word_prefix_then_fuzzy(self):
+        self.assertEqual(names(self.index.search('standup')), ['Standup Eng', 'Daily Standup'])
+        self.assertEqual(names(self.index.search('ds')), ['Daily Standup', 'Design Sync', 'Daily Design'])
+
+    def test_tokens_match_words_in_any_order(self):
+        self.assertEqual(names(self.index.search('STAND daily')), ['Daily Standup'])
+
+    def test_no_match(self):
+        self.assertEqual(self.index.search('zz'), [])
+
+    def test_recent_standups_come_first_within_a_rank(self):
+        index = StandupIndex(make_standups(), recent_ids=[4, 3])
+        self.assertEqual(names(index.search(''))[:3], ['Daily Design', 'Design Sync', 'Daily Standup'])
+        self.assertEqual(names(index.search('daily')), ['Daily Design', 'Daily Standup'])
+
+    def test_recent_standups_by_key(self):
+        index = StandupIndex(make_standups(), recent_ids=[('work', 4)], key=lambda standup: ('work', standup.id))
+        self.assertEqual(names(index.search(''))[0], 'Daily Design')
+
+    def test_typing_and_erasing_match_a_fresh_search(self):
+        typed = 'daily st'
+        keystrokes = [typed[:length] for length in range(1, len(typed) + 1)]
+        for query in keystrokes + keystrokes[::-1] + ['design']:
+            fresh = StandupIndex(make_standups()).search(query)
+            self.assertEqual(self.index.search(query), fresh, query)
+
+    def test_added_standups_are_found(self):
+        self.index.search('retro')
+        self.index.add(Standup(6, 'Retro Planning', ()))
+        self.assertEqual(names(self.index.search('retro')), ['Retro Planning', 'Weekly Retro'])
+        self.assertEqual(len(self.index), 6)
+
+
+class TestStandupPicker(unittest.TestCase):
+    def setUp(self):
+        self.standups = make_standups([f"Standup {number}" for number in range(1, 101)])
+        self.picker = StandupPicker(StandupIndex(self.standups), height=5)
+
+    def rows(self):
+        return [text.strip() for style, text in self.picker.fragments() if text.strip() and style != 'italic']
+
+    def test_renders_only_the_visible_window(self):
+        self.assertEqual(self.rows(), [f"Standup {number}" for number in range(1, 6)])
+        self.assertEqual(self.picker.fragments()[-1], ('italic', ' 100/100 standups'))
+
+    def test_moving_scrolls_the_window(self):
+        self.picker.move(7)
+        self.assertEqual(self.picker.selected.name, 'Standup 8')
+        self.assertEqual(self.rows(), [f"Standup {number}" for number in range(4, 9)])
+        self.picker.move(-100)
+        self.assertEqual((self.picker.cursor, self.picker.top), (0, 0))
+
+    def test_query_resets_the_highlight(self):
+        self.picker.move(3)
+        self.picker.set_query('standup 10')
+        self.assertEqual(names(self.picker.results), ['Standup 10', 'Standup 100'])
+        self.assertEqual(self.picker.selected.name, 'Standup 10')
+
+    def test_no_results_selects_nothing(self):
+        self.picker.set_query('zz')
+        self.picker.move(1)
+        self.assertIsNone(self.picker.selected)
+
+    def test_refresh_keeps_the_highlighted_standup(self):
+        index = StandupIndex(recent_ids=[200])
+        picker = StandupPicker(index, height=5)
+        for standup in self.standups[:3]:
+            index.add(standup)
+        picker.refresh()
+        picker.move(1)
+        index.add(Standup(200, 'Standup 200', ()))
+        picker.refresh()
+        self.assertEqual(names(picker.results[:2]), ['Standup 200', 'Standup 1'])
+        self.assertEqual(picker.selected.name, 'Standup 2')
+
+
+class TestRecentStandups(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name) / 'recent.json'
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_touch_moves_to_front_and_caps_the_list(self):
+        recent = RecentStandups(self.path, limit=3)
+        for standup_id in (1, 2, 3, 1, 4):
+            recent.touch('default', standup_id)
+        self.assertEqual(recent.load(), [('default', 4), ('default', 1), ('default', 3)])
+        self.assertEqual(os.listdir(self.directory.name), ['recent.json'])
+
+    def test_same_id_in_two_profiles_is_remembered_apart(self):
+        recent = RecentStandups(self.path)
+        recent.touch('default', 1)
+        recent.touch('work', 1)
+        self.assertEqual(recent.load(), [('work', 1), ('default', 1)])
+
+    def test_bare_ids_belong_to_the_default_profile(self):
+        self.path.write_text('[3, ["work", 2], "junk"]')
+        self.assertEqual(RecentStandups(self.path).load(), [('default', 3), ('work', 2)])
+
+    def test_missing_or_corrupt_file_is_empty(self):
+        recent = RecentStandups(self.path)
+        self.assertEqual(recent.load(), [])
+        self.path.write_text('{not json')
+        self.assertEqual(recent.load(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+from unittest.mock import Mock
+from geekbot_cli.exceptions import StandupNotFoundError
+from geekbot_cli.models import Question, Standup
+from geekbot_cli.report import answers_template, find_standup, parse_answer, parse_answers, resolve_standup
+
+STANDUPS = [
+    Standup(1, 'Daily Standup', (Question(101, 'What did you do?', 'EEEEEE', 'text', []),
+                                 Question(102, 'How do you feel?', 'EEEEEE', 'multiple_choice', ['Good', 'Bad']))),
+    Standup(2, 'Weekly Retro', ()),
+    Standup(3, 'Daily Sync', ()),
+]
+
+
+class TestAnswers(unittest.TestCase):
+    def test_parse_answer(self):
+        self.assertEqual(parse_answer('101=Shipped it'), (101, 'Shipped it'))
+        self.assertEqual(parse_answer('101=a=b'), (101, 'a=b'))
+        for value in ('Shipped it', 'x=1', '=text'):
+            with self.assertRaises(ValueError):
+                parse_answer(value)
+
+    def test_parse_answers(self):
+        document = "# comment\n## 101 What did you do?\nShipped it\n\nand more\n## 102\n\n## 103:\nFine\n"
+        self.assertEqual(parse_answers(document), {101: 'Shipped it\n\nand more', 103: 'Fine'})
+
+    def test_template_round_trips(self):
+        template = answers_template(STANDUPS[0], {102: 'Good'})
+        self.assertIn('## 101 What did you do?', template)
+        self.assertIn('# One of: Good, Bad', template)
+        self.assertEqual(parse_answers(template), {102: 'Good'})
+        self.assertEqual(parse_answers(template.replace('## 101 What did you do?\n', '## 101 What did you do?\nDone')),
+                         {101: 'Done', 102: 'Good'})
+
+
+class TestFindStandup(unittest.TestCase):
+    def test_by_id_and_name(self):
+        self.assertIs(find_standup(STANDUPS, '2'), STANDUPS[1])
+        self.assertIsNone(find_standup(STANDUPS, '9'))
+        self.assertIs(find_standup(STANDUPS, 'daily standup'), STANDUPS[0])
+        self.assertIs(find_standup(STANDUPS, 'retro'), STANDUPS[1])
+        self.assertIsNone(find_standup(STANDUPS, 'planning'))
+
+    def test_ambiguous_name(self):
+        with self.assertRaises(StandupNotFoundError) as raised:
+            find_standup(STANDUPS, 'daily')
+        self.assertIn('Daily Standup (1), Daily Sync (3)', str(raised.exception))
+
+
+class TestResolveStandup(unittest.TestCase):
+    def test_id_is_trusted_without_fetching(self):
+        fetch = Mock(return_value=STANDUPS)
+        self.assertEqual(resolve_standup('7', lambda: [], fetch, need_questions=False), (7, None))
+        self.assertEqual(resolve_standup('1', lambda: STANDUPS, fetch, need_questions=True), (1, STANDUPS[0]))
+        fetch.assert_not_called()
+
+    def test_fetches_names_and_questions_missing_from_the_cache(self):
+        fetch = Mock(return_value=STANDUPS)
+        self.assertEqual(resolve_standup('retro', lambda: [], fetch, need_questions=False), (2, STANDUPS[1]))
+        self.assertEqual(resolve_standup('1', lambda: [], fetch, need_questions=True), (1, STANDUPS[0]))
+        self.assertEqual(fetch.call_count, 2)
+        with self.assertRaises(StandupNotFoundError):
+            resolve_standup('planning', lambda: [], fetch, need_questions=False)
+
+
+if __name__ == '__main__':
+    unittest.main()
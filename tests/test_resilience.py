@@ -0,0 +1,125 @@
+## test_resilience.py
+import threading
+import unittest
+from email.utils import formatdate
+import time
+from geekbot_cli.exceptions import CircuitOpenError, DeadlineExceededError
+from geekbot_cli.resilience import CircuitBreaker, Deadline, RetryPolicy, TokenBucket, parse_retry_after
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TestParseRetryAfter(unittest.TestCase):
+    def test_seconds(self):
+        self.assertEqual(parse_retry_after('5'), 5.0)
+
+    def test_http_date(self):
+        self.assertAlmostEqual(parse_retry_after(formatdate(time.time() + 30, usegmt=True)), 30, delta=2)
+
+    def test_invalid(self):
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after('soon'))
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_exponential_backoff_with_jitter(self):
+        policy = RetryPolicy(max_attempts=5, backoff_base=1, backoff_max=3)
+        for attempt, bound in enumerate([1, 2, 3, 3]):
+            delay = policy.delay(attempt)
+            self.assertGreaterEqual(delay, 0)
+            self.assertLessEqual(delay, bound)
+        self.assertIsNone(policy.delay(4))
+
+    def test_retry_after_takes_precedence(self):
+        policy = RetryPolicy(max_retry_after=10)
+        self.assertEqual(policy.delay(0, retry_after=4), 4)
+        self.assertIsNone(policy.delay(0, retry_after=11))
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_rate(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, capacity=2, clock=clock, sleep=clock.sleep)
+        for _ in range(6):
+            bucket.acquire()
+        self.assertAlmostEqual(clock.now, 2.0)
+
+    def test_deadline(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1, capacity=1, clock=clock, sleep=clock.sleep)
+        bucket.acquire()
+        with self.assertRaises(DeadlineExceededError):
+            bucket.acquire(Deadline(0.5, clock=clock))
+
+    def test_shared_between_threads(self):
+        bucket = TokenBucket(rate=1000, capacity=10)
+        threads = [threading.Thread(target=lambda: [bucket.acquire() for _ in range(10)]) for _ in range(4)]
+        start = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertGreaterEqual(time.monotonic() - start, 0.025)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_opens_after_threshold_and_recovers(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+        breaker.record_failure()
+        breaker.before_call()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, 'open')
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_call()
+
+        clock.now = 10
+        self.assertEqual(breaker.state, 'half-open')
+        breaker.before_call()  # Trial call
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_call()  # Only one trial at a time
+        breaker.record_success()
+        self.assertEqual(breaker.state, 'closed')
+
+    def test_failed_trial_reopens(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+        breaker.record_failure()
+        clock.now = 10
+        breaker.before_call()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, 'open')
+
+    def test_released_trial_lets_another_through(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+        self.assertFalse(breaker.before_call())
+        breaker.record_failure()
+        clock.now = 10
+        self.assertTrue(breaker.before_call())
+        breaker.release_trial()
+        self.assertTrue(breaker.before_call())
+        self.assertEqual(breaker.state, 'half-open')
+
+
+class TestDeadline(unittest.TestCase):
+    def test_remaining_and_check(self):
+        clock = FakeClock()
+        deadline = Deadline(5, clock=clock)
+        self.assertEqual(deadline.remaining(), 5)
+        clock.now = 6
+        self.assertEqual(deadline.remaining(), 0)
+        with self.assertRaises(DeadlineExceededError):
+            deadline.check()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+## test_startup.py
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+from geekbot_cli.startup import PhaseTimer, in_background
+
+ROOT = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ('rich', 'prompt_toolkit', 'requests', 'keyring')
+
+
+def loaded_modules_after(code: str) -> set:
+    """
+    Runs code in a fresh interpreter and returns which heavy modules it loaded.
+    """
+    probe = code + f'\nimport sys\nprint(" ".join(m for m in {HEAVY_MODULES!r} if m in sys.modules))'
+    result = subprocess.run([sys.executable, '-c', probe], cwd=ROOT, capture_output=True, text=True, check=True)
+    return set(result.stdout.split())
+
+
+class TestStartupImports(unittest.TestCase):
+    def test_import_main_is_lightweight(self):
+        self.assertEqual(loaded_modules_after('import geekbot_cli.main'), set())
+
+    def test_version_is_lightweight(self):
+        code = (
+            'from click.testing import CliRunner\n'
+            'from geekbot_cli.main import main\n'
+            'assert CliRunner().invoke(main, ["--version"]).exit_code == 0'
+        )
+        self.assertEqual(loaded_modules_after(code), set())
+
+    def test_clear_api_key_only_loads_keyring(self):
+        code = (
+            'from unittest.mock import patch\n'
+            'from click.testing import CliRunner\n'
+            'from geekbot_cli.main import main\n'
+            'with patch("keyring.delete_password"):\n'
+            '    CliRunner().invoke(main, ["--clear-api-key"], input="y\\n")'
+        )
+        self.assertEqual(loaded_modules_after(code), {'keyring'})
+
+    def test_daemon_run_skips_requests_and_keyring(self):
+        code = (
+            'from unittest.mock import patch\n'
+            'from click.testing import CliRunner\n'
+            'from geekbot_cli.main import main\n'
+            'with patch("geekbot_cli.daemon.DaemonClient.connect"), patch("geekbot_cli.cli.CLI.start"):\n'
+            '    assert CliRunner().invoke(main, []).exit_code == 0'
+        )
+        self.assertEqual(loaded_modules_after(code), {'rich'})
+
+    def test_cli_defers_prompt_toolkit(self):
+        self.assertNotIn('prompt_toolkit', loaded_modules_after('import geekbot_cli.cli'))
+
+class TestInBackground(unittest.TestCase):
+    def test_result_and_exception_reach_the_future(self):
+        self.assertEqual(in_background(sum, [1, 2]).result(timeout=5), 3)
+        with self.assertRaises(ZeroDivisionError):
+            in_background(divmod, 1, 0).result(timeout=5)
+
+
+class TestPhaseTimer(unittest.TestCase):
+    def test_summary_shows_overlap(self):
+        ticks = iter([0.0, 0.0, 0.3, 0.05, 0.25])
+        timer = PhaseTimer(clock=lambda: next(ticks))
+        with timer.phase('credentials'):
+            pass
+        with self.assertRaises(RuntimeError), timer.phase('standups'):
+            raise RuntimeError
+        lines = timer.summary().splitlines()
+        self.assertEqual([line.split()[0] for line in lines[:2]], ['credentials', 'standups'])
+        self.assertEqual(lines[-1], "2 phases take 500.0 ms back to back, 300.0 ms pipelined (200.0 ms overlapped)")
+
+
+if __name__ == '__main__':
+    unittest.main()
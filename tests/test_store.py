@@ -0,0 +1,125 @@
+## test_store.py
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from geekbot_cli.api_client import APIClient
+from geekbot_cli.exceptions import SearchQueryError
+from geekbot_cli.store import MATCH_END, MATCH_START, ReportStore
+from geekbot_cli.stub_server import StubGeekbotServer, make_report, make_standups
+
+
+class TestReportStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.store = ReportStore(Path(self.tmp_dir.name) / 'reports.sqlite3')
+        self.server = StubGeekbotServer(standups=2).start()
+        for index in range(30):
+            self.server.add_report(1 + index % 2, timestamp=1000 + index)
+        self.client = APIClient(base_url=self.server.url)
+        self.client.set_headers('test_api_key')
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop()
+        self.store.close()
+        self.tmp_dir.cleanup()
+
+    def test_first_sync_stores_everything(self):
+        stats = self.store.sync(self.client, 'workspace', page_size=8)
+        self.assertEqual(stats['fetched'], 30)
+        self.assertEqual(stats['new'], 30)
+        self.assertEqual(stats['high_water'], 1029)
+        self.assertEqual(self.store.count(), 30)
+        answers = self.store.connection.execute('SELECT COUNT(*) FROM answers').fetchone()[0]
+        self.assertEqual(answers, 90)
+
+    def test_unchanged_resync_costs_one_request(self):
+        self.store.sync(self.client, 'workspace', page_size=8)
+        requests_before = self.server.requests
+        stats = self.store.sync(self.client, 'workspace', page_size=8)
+        self.assertEqual(self.server.requests - requests_before, 1)
+        self.assertEqual(stats['new'], 0)
+
+    def test_incremental_sync_fetches_new_reports(self):
+        self.store.sync(self.client, 'workspace', page_size=8)
+        self.server.add_report(1, timestamp=1029)
+        self.server.add_report(2, timestamp=1100)
+        stats = self.store.sync(self.client, 'workspace', page_size=8)
+        self.assertEqual(stats['new'], 2)
+        self.assertEqual(stats['high_water'], 1100)
+        self.assertEqual(self.store.count(), 32)
+
+    def test_high_water_is_kept_per_scope(self):
+        self.store.sync(self.client, 'workspace', standup_id=1)
+        self.assertEqual(self.store.high_water(ReportStore.scope('workspace', 1)), 1028)
+        self.assertIsNone(self.store.high_water(ReportStore.scope('workspace')))
+        self.assertIsNone(self.store.high_water(ReportStore.scope('other', 1)))
+
+    def test_upsert_replaces_answers(self):
+        report = self.server.reports[0]
+        self.store.upsert([report])
+        edited = json.loads(json.dumps(report))
+        edited['questions'][0]['answer'] = 'Edited'
+        self.store.upsert([edited])
+        rows = self.store.connection.execute(
+            'SELECT answer FROM answers WHERE report_id = ? ORDER BY id', (report['id'],)
+        ).fetchall()
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0][0], 'Edited')
+
+
+class TestReportSearch(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.store = ReportStore(Path(self.tmp_dir.name) / 'reports.sqlite3')
+        standups = make_standups(2, questions=2)
+        reports = [
+            make_report(1, standups[0], 1000, {'101': {'text': 'Deployed the billing service'}}),
+            make_report(2, standups[0], 2000, {'100': {'text': 'Reviewing the deploy scripts'}}),
+            make_report(3, standups[1], 3000, {'201': {'text': 'Deploying tomorrow'}}),
+            make_report(4, standups[1], 4000, {'201': {'text': 'Nothing to report'}}),
+        ]
+        reports[2]['member'] = {'id': 'U2', 'username': 'alice'}
+        self.store.upsert(reports)
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp_dir.cleanup()
+
+    def search_ids(self, query, **filters):
+        return sorted(result['report_id'] for result in self.store.search(query, **filters))
+
+    def test_stemmed_match_with_snippet(self):
+        results = self.store.search('deploy')
+        self.assertEqual(sorted(result['report_id'] for result in results), [1, 2, 3])
+        snippet = next(result['snippet'] for result in results if result['report_id'] == 1)
+        self.assertIn(f"{MATCH_START}Deployed{MATCH_END}", snippet)
+
+    def test_filters(self):
+        self.assertEqual(self.search_ids('deploy', standup_id=2), [3])
+        self.assertEqual(self.search_ids('deploy', question_id=100), [2])
+        self.assertEqual(self.search_ids('deploy', user='alice'), [3])
+        self.assertEqual(self.search_ids('deploy', user='U2'), [3])
+        self.assertEqual(self.search_ids('deploy', since=2000, until=3000), [2])
+
+    def test_index_follows_updates(self):
+        report = make_report(1, make_standups(1, questions=2)[0], 1000, {'101': {'text': 'Rewrote the parser'}})
+        self.store.upsert([report])
+        self.assertEqual(self.search_ids('billing'), [])
+        self.assertEqual(self.search_ids('parser'), [1])
+        self.store.connection.execute("INSERT INTO answers_fts (answers_fts) VALUES ('integrity-check')")
+
+    def test_invalid_query(self):
+        with self.assertRaises(SearchQueryError):
+            self.store.search('"unterminated')
+
+    def test_existing_store_is_indexed(self):
+        self.store.connection.executescript('DROP TABLE answers_fts')
+        self.store.close()
+        self.store = ReportStore(self.store.path)
+        self.assertEqual(self.search_ids('deploy'), [1, 2, 3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+## test_streaming.py
+import json
+import unittest
+from geekbot_cli.streaming import iter_json_array
+
+
+def split(data: bytes, size: int):
+    return [data[index:index + size] for index in range(0, len(data), size)]
+
+
+class TestIterJsonArray(unittest.TestCase):
+    def setUp(self):
+        self.items = [
+            {'id': 1, 'name': 'Café ☕ standup', 'questions': [{'id': 10, 'text': 'a "quoted" ] [ text'}]},
+            12345,
+            -1.5e3,
+            'plain string',
+            True,
+            None,
+            [],
+            {}
+        ]
+        self.data = json.dumps(self.items, ensure_ascii=False).encode('utf-8')
+
+    def test_any_chunk_size(self):
+        for size in (1, 2, 3, 7, 64, len(self.data)):
+            self.assertEqual(list(iter_json_array(split(self.data, size))), self.items, size)
+
+    def test_empty_array_and_whitespace(self):
+        self.assertEqual(list(iter_json_array([b' \n[ ', b' ] '])), [])
+        self.assertEqual(list(iter_json_array([b'[1 ,', b'\n2 ]'])), [1, 2])
+
+    def test_elements_are_yielded_before_the_end(self):
+        consumed = []
+
+        def chunks():
+            for chunk in [b'[{"id": 1}', b', {"id": 2}', b']']:
+                consumed.append(chunk)
+                yield chunk
+        elements = iter_json_array(chunks())
+        self.assertEqual(next(elements), {'id': 1})
+        self.assertEqual(len(consumed), 1)
+
+    def test_number_split_across_chunks(self):
+        self.assertEqual(list(iter_json_array([b'[12', b'34, 5', b'6]'])), [1234, 56])
+
+    def test_malformed(self):
+        for data in (b'{"id": 1}', b'[1, 2', b'[1 2]', b'[{"id": }]', b''):
+            with self.assertRaises(ValueError, msg=data):
+                list(iter_json_array(split(data, 2)))
+
+
+if __name__ == '__main__':
+    unittest.main()
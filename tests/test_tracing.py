@@ -0,0 +1,139 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from geekbot_cli import tracing
+from geekbot_cli.api_client import APIClient
+from geekbot_cli.config_manager import ConfigManager
+from geekbot_cli.startup import in_background
+from geekbot_cli.stub_server import StubGeekbotServer
+
+
+class StaticResolver:
+    name = 'static'
+
+    def resolve(self):
+        return 'key'
+
+
+class TestTracing(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'trace.jsonl')
+
+    def tearDown(self):
+        tracing.stop()
+        self.directory.cleanup()
+
+    def read_spans(self):
+        with open(self.path, encoding='utf-8') as trace_file:
+            return {record['name']: record for record in map(json.loads, trace_file)}
+
+    def test_off_by_default_and_free(self):
+        self.assertFalse(tracing.is_enabled())
+        span = tracing.span('anything', {'key': 1})
+        self.assertIs(span, tracing.NO_SPAN)
+        with span as opened:
+            opened.set('status', 200)
+        self.assertIsNone(tracing.current_span())
+
+    def test_spans_nest_and_record_attributes_and_errors(self):
+        tracing.start(self.path, attributes={'command': 'test'})
+        with tracing.span('outer', {'size': 3}) as outer:
+            outer.set('status', 200)
+            with self.assertRaises(ValueError):
+                with tracing.span('inner'):
+                    raise ValueError('bad')
+        tracing.stop()
+        spans = self.read_spans()
+        self.assertEqual(set(spans), {'geekbot', 'outer', 'inner'})
+        self.assertEqual(spans['geekbot']['attributes'], {'command': 'test'})
+        self.assertEqual(spans['outer']['parent_id'], spans['geekbot']['span_id'])
+        self.assertEqual(spans['inner']['parent_id'], spans['outer']['span_id'])
+        self.assertEqual(spans['outer']['attributes'], {'size': 3, 'status': 200})
+        self.assertEqual(spans['inner']['error'], 'ValueError: bad')
+        self.assertEqual(len({record['trace_id'] for record in spans.values()}), 1)
+        self.assertFalse(tracing.is_enabled())
+
+    def test_background_work_nests_under_the_starting_span(self):
+        tracing.start(self.path)
+        with tracing.span('startup'):
+            def work():
+                with tracing.span('background'):
+                    return threading.current_thread().name
+            thread_name = in_background(work, name='tracing-test').result()
+        tracing.stop()
+        spans = self.read_spans()
+        self.assertEqual(spans['background']['parent_id'], spans['startup']['span_id'])
+        self.assertEqual(spans['background']['thread'], thread_name)
+
+    def test_otlp_format(self):
+        path = os.path.join(self.directory.name, 'trace.json')
+        tracing.start(path)
+        with tracing.span('http.request', {'http.status_code': 503, 'http.url': 'http://x', 'ok': False}):
+            pass
+        tracing.stop()
+        with open(path, encoding='utf-8') as trace_file:
+            exported = json.load(trace_file)
+        resource_spans = exported['resourceSpans'][0]
+        self.assertEqual(resource_spans['resource']['attributes'][0],
+                         {'key': 'service.name', 'value': {'stringValue': 'geekbot-cli'}})
+        spans = {span['name']: span for span in resource_spans['scopeSpans'][0]['spans']}
+        request = spans['http.request']
+        self.assertEqual(len(request['traceId']), 32)
+        self.assertEqual(request['parentSpanId'], spans['geekbot']['spanId'])
+        self.assertLessEqual(int(request['startTimeUnixNano']), int(request['endTimeUnixNano']))
+        attributes = {attribute['key']: attribute['value'] for attribute in request['attributes']}
+        self.assertEqual(attributes['http.status_code'], {'intValue': '503'})
+        self.assertEqual(attributes['ok'], {'boolValue': False})
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            tracing.Tracer(self.path, 'xml')
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'trace.jsonl')
+        tracing.start(self.path)
+
+    def tearDown(self):
+        tracing.stop()
+        self.directory.cleanup()
+
+    def spans(self):
+        tracing.stop()
+        with open(self.path, encoding='utf-8') as trace_file:
+            return [json.loads(line) for line in trace_file]
+
+    def test_api_client_records_requests_connections_and_decoding(self):
+        with StubGeekbotServer(standups=2) as server, APIClient(base_url=server.url) as client:
+            client.set_headers('key')
+            client.get_standups()
+            client.post_report(1, {100: {'text': 'Done'}})
+        spans = self.spans()
+        names = [span['name'] for span in spans]
+        self.assertEqual(names.count('http.request'), 2)
+        self.assertEqual(names.count('http.connect'), 1)
+        connect = next(span for span in spans if span['name'] == 'http.connect')
+        tcp = next(span for span in spans if span['name'] == 'net.connect')
+        self.assertEqual(tcp['parent_id'], connect['span_id'])
+        get, post = [span for span in spans if span['name'] == 'http.request']
+        self.assertEqual(get['attributes']['http.status_code'], 200)
+        self.assertGreater(get['attributes']['http.response_content_length'], 0)
+        self.assertIn('http.time_to_headers_ms', get['attributes'])
+        self.assertEqual(post['attributes']['http.method'], 'POST')
+        self.assertGreater(post['attributes']['http.request_content_length'], 0)
+        decode = next(span for span in spans if span['name'] == 'json.decode')
+        self.assertEqual(decode['attributes']['standups'], 2)
+
+    def test_config_manager_records_each_resolver(self):
+        ConfigManager(resolvers=[StaticResolver()]).get_api_key()
+        resolve = next(span for span in self.spans() if span['name'] == 'credentials.resolve')
+        self.assertEqual(resolve['attributes'], {'resolver': 'static', 'found': True})
+
+
+if __name__ == '__main__':
+    unittest.main()
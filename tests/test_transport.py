@@ -0,0 +1,215 @@
+import os
+import subprocess
+import sys
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
+from geekbot_cli.api_client import APIClient
+from geekbot_cli.exceptions import (
+    InvalidAPIKeyError,
+    StandupAPIError,
+    StandupConnectionError,
+    StandupNotFoundError,
+    StandupValidationError
+)
+from geekbot_cli.resilience import RetryPolicy
+from geekbot_cli.stub_server import StubGeekbotServer
+from geekbot_cli.transport import (
+    HTTP2Transport,
+    RequestsTransport,
+    StdlibTransport,
+    default_transport,
+    make_transport
+)
+
+try:
+    import h2  # noqa: F401
+    import httpx  # noqa: F401
+    HAS_HTTP2 = True
+except ImportError:
+    HAS_HTTP2 = False
+
+
+class TransportContract:
+    """
+    The behaviour every transport must share, run against the stub server.
+    """
+    TRANSPORT = None
+    LONG_ANSWER = {101: {'text': '12:00:01 ERROR request failed at worker.py:42\n' * 500}}
+
+    def client(self, server, **kwargs) -> APIClient:
+        client = APIClient(base_url=server.url, transport=self.TRANSPORT, **kwargs)
+        client.set_headers('test_api_key')
+        return client
+
+    def test_calls_reuse_one_connection(self):
+        with StubGeekbotServer(standups=3, http2=HAS_HTTP2) as server, self.client(server) as client:
+            self.assertEqual(client.transport.name, self.TRANSPORT)
+            self.assertEqual(len(client.get_standups()), 3)
+            self.assertEqual(client.post_report(1, {101: {'text': 'Answer'}})['standup_id'], 1)
+            self.assertEqual(len(client.get_reports(standup_id=1, limit=5)), 1)
+        self.assertEqual(server.requests, 3)
+        self.assertEqual(server.connections, 1)
+
+    def test_responses_are_decoded_and_counted(self):
+        with StubGeekbotServer(standups=100, http2=HAS_HTTP2) as server, self.client(server) as client:
+            self.assertEqual(len(client.get_standups()), 100)
+            standups, _, _ = client.stream_standups()
+            self.assertEqual(len(list(standups)), 100)
+        self.assertEqual(client.transfer.requests, 2)
+        self.assertEqual(client.transfer.bytes_received, server.bytes_sent)
+        self.assertLess(client.transfer.bytes_received * 5, client.transfer.bytes_received_decoded)
+
+    def test_gzipped_reports_are_counted(self):
+        with StubGeekbotServer(standups=3, http2=HAS_HTTP2) as server, \
+                self.client(server, compress_requests=True) as client:
+            client.post_report(1, self.LONG_ANSWER)
+        self.assertEqual(server.reports[0]['questions'][1]['answer'], self.LONG_ANSWER[101]['text'])
+        self.assertEqual(client.transfer.bytes_sent, server.bytes_received)
+        self.assertLess(client.transfer.bytes_sent * 10, client.transfer.bytes_sent_uncompressed)
+
+    def test_first_standup_arrives_before_the_download_ends(self):
+        with StubGeekbotServer(standups=5, stream_delay=0.05, http2=HAS_HTTP2) as server, \
+                self.client(server) as client:
+            start = time.perf_counter()
+            standups, _, _ = client.stream_standups(chunk_size=1)
+            first = next(standups)
+            first_latency = time.perf_counter() - start
+            self.assertEqual(first.id, 1)
+            self.assertEqual([standup.id for standup in standups], [2, 3, 4, 5])
+            self.assertLess(first_latency, time.perf_counter() - start - 0.1)
+
+    def test_errors_map_to_standup_exceptions(self):
+        with StubGeekbotServer(standups=1, http2=HAS_HTTP2) as server, self.client(server) as client:
+            with self.assertRaises(StandupNotFoundError):
+                client.post_report(99, {101: {'text': 'Answer'}})
+            with self.assertRaises(StandupValidationError):
+                client.post_report(1, {})
+            client.headers.pop('Authorization')
+            with self.assertRaises(InvalidAPIKeyError):
+                client.post_report(1, {101: {'text': 'Answer'}})
+            with self.assertRaises(StandupAPIError) as raised:
+                client.get_standups()
+        # The message reads the same whichever transport raised it.
+        self.assertIn(f"401 Client Error: Unauthorized for url: {server.url}/v1/standups", str(raised.exception))
+
+    def test_transient_failures_are_retried(self):
+        with StubGeekbotServer(standups=3, error_rate=0.5, seed=1, http2=HAS_HTTP2) as server, \
+                self.client(server, retry_policy=RetryPolicy(max_attempts=20), sleep=Mock()) as client:
+            for _ in range(5):
+                self.assertEqual(len(client.get_standups()), 3)
+        self.assertEqual(server.responses[200], 5)
+        self.assertGreater(server.responses[503], 0)
+
+    def test_unreachable_service(self):
+        sleep = Mock()
+        with APIClient(base_url='http://127.0.0.1:9', timeout=0.5, transport=self.TRANSPORT, sleep=sleep) as client:
+            client.set_headers('test_api_key')
+            self.assertFalse(client.warm_up())
+            with self.assertRaises(StandupConnectionError):
+                client.get_standups()
+        # Connection failures are retried like with the requests transport.
+        self.assertGreater(sleep.call_count, 0)
+
+    def post_concurrently(self) -> StubGeekbotServer:
+        with StubGeekbotServer(standups=3, latency=0.05, http2=HAS_HTTP2) as server, \
+                self.client(server) as client, ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda _: client.post_report(1, {101: {'text': 'Answer'}}), range(16)))
+        self.assertEqual(len({result['id'] for result in results}), 16)
+        self.assertEqual(server.requests, 16)
+        return server
+
+    def test_concurrent_requests(self):
+        self.assertLessEqual(self.post_concurrently().connections, 8)
+
+
+class TestRequestsTransport(TransportContract, unittest.TestCase):
+    TRANSPORT = 'requests'
+
+    def test_session_is_exposed(self):
+        with APIClient(transport='requests') as client:
+            self.assertIs(client.session, client.transport.session)
+
+
+class TestStdlibTransport(TransportContract, unittest.TestCase):
+    TRANSPORT = 'stdlib'
+
+    def test_stale_keep_alive_connections_are_replaced(self):
+        with StubGeekbotServer(standups=3, http2=HAS_HTTP2) as server, self.client(server) as client:
+            client.get_standups()
+            # Break the idle connection, as when the server drops it after its keep-alive timeout.
+            self.break_idle_connections(client)
+            self.assertEqual(len(client.get_standups()), 3)
+        self.assertEqual(server.connections, 2)
+
+    def break_idle_connections(self, client):
+        for connections in client.transport._idle.values():
+            for connection in connections:
+                connection.sock.shutdown(2)
+
+    def test_posts_are_only_resent_with_an_idempotency_key(self):
+        with StubGeekbotServer(standups=3, http2=HAS_HTTP2) as server, \
+                self.client(server, retry_policy=RetryPolicy(max_attempts=1)) as client:
+            client.get_standups()
+            self.break_idle_connections(client)
+            with self.assertRaises(StandupConnectionError):
+                client.post_report(1, {101: {'text': 'Answer'}})
+            client.get_standups()
+            self.break_idle_connections(client)
+            client.post_report(1, {101: {'text': 'Answer'}}, idempotency_key='abc')
+        self.assertEqual(len(server.reports), 1)
+
+
+@unittest.skipIf(not HAS_HTTP2, "httpx and h2 are not installed")
+class TestHTTP2Transport(TransportContract, unittest.TestCase):
+    TRANSPORT = 'http2'
+
+    def test_concurrent_requests(self):
+        # Every request was a stream of one multiplexed connection.
+        self.assertEqual(self.post_concurrently().connections, 1)
+
+
+class TestTransportSelection(unittest.TestCase):
+    def test_default_is_requests_unless_configured(self):
+        with patch.dict(os.environ, {'GEEKBOT_TRANSPORT': ''}):
+            self.assertEqual(default_transport(), 'requests')
+            self.assertIsInstance(APIClient().transport, RequestsTransport)
+        with patch.dict(os.environ, {'GEEKBOT_TRANSPORT': 'stdlib'}):
+            self.assertIsInstance(APIClient().transport, StdlibTransport)
+            self.assertIsNone(APIClient().session)
+            # A session still means the requests transport.
+            session = Mock()
+            self.assertIs(APIClient(session=session).session, session)
+
+    @unittest.skipIf(not HAS_HTTP2, "httpx and h2 are not installed")
+    def test_http2_by_name(self):
+        transport = make_transport('http2')
+        self.assertIsInstance(transport, HTTP2Transport)
+        transport.close()
+
+    def test_unknown_transport(self):
+        with self.assertRaises(ValueError):
+            make_transport('carrier-pigeon')
+
+    def test_transport_instances_are_used_as_is(self):
+        transport = StdlibTransport()
+        self.assertIs(APIClient(transport=transport).transport, transport)
+
+    def test_stdlib_transport_works_without_requests(self):
+        code = (
+            "import sys; sys.modules['requests'] = sys.modules['urllib3'] = None\n"
+            "from geekbot_cli.api_client import APIClient\n"
+            "from geekbot_cli.stub_server import StubGeekbotServer\n"
+            "with StubGeekbotServer(standups=2) as server, APIClient(base_url=server.url) as client:\n"
+            "    client.set_headers('key')\n"
+            "    print(client.transport.name, len(client.get_standups()))\n"
+        )
+        environment = dict(os.environ, GEEKBOT_TRANSPORT='')
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                                env=environment).stdout
+        self.assertEqual(output.strip(), 'stdlib 2')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+from geekbot_cli.exceptions import StandupValidationError
+from geekbot_cli.models import Question, Standup
+from geekbot_cli.validation import FieldError, ReportValidator, StandupValidator
+
+STANDUP = Standup(1, 'Daily', (
+    Question(101, 'What did you do?', 'EEEEEE', 'text', []),
+    Question(102, 'How many hours?', 'EEEEEE', 'numeric', []),
+    Question(103, 'How do you feel?', 'EEEEEE', 'multiple_choice', ['Good', 'Bad']),
+    Question(104, 'Anything new?', 'EEEEEE', 'video', []),
+))
+
+
+def codes(errors):
+    return [(error.question_id, error.code) for error in errors]
+
+
+class TestStandupValidator(unittest.TestCase):
+    def test_valid_answers(self):
+        validator = StandupValidator(STANDUP)
+        answers = {101: {'text': 'Shipped'}, '102': {'text': ' 7.5 '}, 103: {'text': 'Good'}, 104: {'text': 'x'}}
+        self.assertEqual(validator.errors(answers), [])
+        self.assertEqual(validator.errors({'101': {'text': 'Shipped'}}), [])
+
+    def test_field_errors(self):
+        errors = StandupValidator(STANDUP).errors({
+            '101': {'text': '  '},
+            '102': {'text': 'seven'},
+            103: {'text': 'good'},
+            104: 'plain text',
+            '999': {'text': 'Shipped'},
+        })
+        self.assertEqual(codes(errors), [('101', 'empty'), ('102', 'not_numeric'), (103, 'not_a_choice'),
+                                         (104, 'not_text'), ('999', 'unknown_question')])
+        self.assertEqual(str(errors[2]), "Question 103: expected one of Good, Bad, got 'good'")
+        self.assertEqual(codes(StandupValidator(STANDUP).errors({102: {'text': 'nan'}})), [(102, 'not_numeric')])
+
+    def test_report_level_errors(self):
+        self.assertEqual(codes(StandupValidator(STANDUP).errors({})), [(None, 'no_answers')])
+        errors = StandupValidator(STANDUP, require_all=True).errors({'101': {'text': 'Shipped'}})
+        self.assertEqual(codes(errors), [(102, 'missing_answer'), (103, 'missing_answer'), (104, 'missing_answer')])
+
+
+class TestReportValidator(unittest.TestCase):
+    def test_compiles_each_standup_once(self):
+        validator = ReportValidator([STANDUP])
+        validator.errors(1, {101: {'text': 'a'}})
+        compiled = validator._validators[1]
+        validator.errors(1, {101: {'text': 'b'}})
+        self.assertIs(validator._validators[1], compiled)
+        self.assertEqual(codes(validator.errors(2, {101: {'text': 'a'}})), [(None, 'unknown_standup')])
+
+    def test_check_raises_with_the_errors(self):
+        with self.assertRaises(StandupValidationError) as raised:
+            ReportValidator([STANDUP]).check(1, {102: {'text': 'x'}, 999: {'text': 'y'}})
+        self.assertEqual(codes(raised.exception.errors), [(102, 'not_numeric'), (999, 'unknown_question')])
+        self.assertIn("Question 102: expected a number, got 'x'", str(raised.exception))
+        self.assertEqual(StandupValidationError('Bad').errors, [])
+
+    def test_validate_many(self):
+        reports = [(1, {101: {'text': 'a'}}), (1, {102: {'text': 'b'}}), (3, {101: {'text': 'c'}})]
+        invalid = dict(ReportValidator([STANDUP]).validate_many(reports))
+        self.assertEqual(sorted(invalid), [1, 2])
+        self.assertEqual(invalid[1], [FieldError(102, 'not_numeric', "expected a number, got 'b'")])
+
+
+if __name__ == '__main__':
+    unittest.main()
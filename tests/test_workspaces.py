@@ -0,0 +1,74 @@
+import os
+import tempfile
+import threading
+import unittest
+from concurrent.futures import Future
+from unittest.mock import MagicMock, patch
+from geekbot_cli.config_manager import ConfigManager
+from geekbot_cli.exceptions import APIKeyNotFoundError, StandupServerError
+from geekbot_cli.models import Standup
+from geekbot_cli.workspaces import Workspace, WorkspaceStandup, merge_standups
+
+
+def make_workspace(profile):
+    return Workspace(profile, MagicMock(), MagicMock())
+
+
+def resolved(result=None, error=None):
+    future = Future()
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+    return future
+
+
+class TestWorkspaceStandup(unittest.TestCase):
+    def test_labels_the_name_and_keeps_the_original(self):
+        standup = Standup(7, 'Daily Standup', ('question',))
+        workspace = make_workspace('work')
+        labelled = WorkspaceStandup(standup, workspace)
+        self.assertEqual((labelled.id, labelled.name, labelled.questions), (7, 'Daily Standup (work)', ('question',)))
+        self.assertIs(labelled.standup, standup)
+        self.assertIs(labelled.workspace, workspace)
+
+
+class TestForProfile(unittest.TestCase):
+    def test_profiles_keep_their_files_apart(self):
+        with tempfile.TemporaryDirectory() as home, \
+                patch.dict(os.environ, {'XDG_CACHE_HOME': home, 'XDG_DATA_HOME': home}):
+            default = Workspace.for_profile(ConfigManager(), 'default', connect=False)
+            work = Workspace.for_profile(ConfigManager(), 'work', connect=False)
+        self.assertIsNone(work.api_client)
+        self.assertEqual(work.config_manager.profile, 'work')
+        self.assertEqual(os.path.basename(default.report_store_path), 'reports.sqlite3')
+        self.assertEqual(os.path.basename(work.report_store_path), 'reports-work.sqlite3')
+        self.assertEqual(work.standup_cache.path.name, 'standups-work.json')
+        self.assertEqual(work.outbox.path.name, 'outbox-work.jsonl')
+
+
+class TestMergeStandups(unittest.TestCase):
+    def test_yields_workspaces_as_they_finish(self):
+        work, oss = make_workspace('work'), make_workspace('oss')
+        slow = Future()
+        skipped = []
+        merged = merge_standups([(work, slow), (oss, resolved([Standup(2, 'Retro', ())]))], skipped)
+        self.assertEqual(next(merged).name, 'Retro (oss)')
+        threading.Timer(0.01, slow.set_result, [[Standup(1, 'Daily', ())]]).start()
+        self.assertEqual([standup.name for standup in merged], ['Daily (work)'])
+        self.assertEqual(skipped, [])
+
+    def test_failed_workspaces_are_skipped(self):
+        loads = [
+            (make_workspace('default'), resolved(error=APIKeyNotFoundError())),
+            (make_workspace('work'), resolved(error=APIKeyNotFoundError())),
+            (make_workspace('oss'), resolved(error=StandupServerError('Server error: 503'))),
+            (make_workspace('side'), resolved([Standup(3, 'Sync', ())])),
+        ]
+        skipped = []
+        self.assertEqual([standup.name for standup in merge_standups(loads, skipped)], ['Sync (side)'])
+        self.assertEqual(sorted(skipped), ['oss: Server error: 503', 'work: no API key found'])
+
+
+if __name__ == '__main__':
+    unittest.main()